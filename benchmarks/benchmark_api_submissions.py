@@ -0,0 +1,105 @@
+# Measure the submission throughput of the HTTP/JSON API with many concurrent clients on keep-alive
+# connections: every submission saved in its own DB transaction (batch size 1) compared with saving
+# all submissions that arrive while the previous batch is written in one transaction. The API runs in
+# its own process without the task starter, so only accepting and saving submissions is measured;
+# the submitted tasks stay queued and are never started.
+#
+# Usage: python benchmarks/benchmark_api_submissions.py [--clients 50] [--requests 100] [--batch-sizes 1 1000]
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+# Token of the benchmarked API
+TOKEN = "benchmark"
+
+
+def serve(port: int, batch_size: int) -> None:
+    import tasklit.settings.consts as settings
+    import tasklit.src.utils.database as database
+
+    from tasklit.src.utils.api import start_api_server
+
+    settings.API_BATCH_SIZE = batch_size
+
+    async def run() -> None:
+        server = await start_api_server(database.get_sql_engine(), "127.0.0.1", port, token=TOKEN)
+        async with server:
+            await server.serve_forever()
+
+    asyncio.run(run())
+
+
+async def run_client(port: int, requests: int, client: int) -> None:
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+
+    for index in range(requests):
+        body = json.dumps({"command": "true", "job_name": f"benchmark_strauss_{client}_{index}"}).encode()
+        writer.write(b"POST /tasks HTTP/1.1\r\nHost: localhost\r\nContent-Type: application/json\r\n"
+                     b"Authorization: Bearer %s\r\nContent-Length: %d\r\n\r\n%s" % (TOKEN.encode(), len(body), body))
+        await writer.drain()
+
+        status = await reader.readline()
+        assert b" 202 " in status, status
+        length = 0
+        while (line := await reader.readline()) != b"\r\n":
+            if line.lower().startswith(b"content-length:"):
+                length = int(line.split(b":")[1])
+        await reader.readexactly(length)
+
+    writer.close()
+
+
+async def submit_all(port: int, clients: int, requests: int) -> float:
+    started = time.perf_counter()
+    await asyncio.gather(*[run_client(port, requests, client) for client in range(clients)])
+    return time.perf_counter() - started
+
+
+def measure(batch_size: int, clients: int, requests: int) -> None:
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        server = subprocess.Popen(
+            [sys.executable, __file__, "--serve", str(port), "--batch-sizes", str(batch_size)],
+            env=dict(os.environ, HOME=temp_dir)
+        )
+
+        try:
+            for _ in range(100):
+                try:
+                    socket.create_connection(("127.0.0.1", port)).close()
+                    break
+                except ConnectionRefusedError:
+                    time.sleep(0.1)
+
+            elapsed = asyncio.run(submit_all(port, clients, requests))
+        finally:
+            server.terminate()
+            server.wait()
+
+    submissions = clients * requests
+    print(f"batch size={batch_size:<5} clients={clients:<4} submissions={submissions:<6} "
+          f"total={elapsed:>7.2f}s rate={submissions / elapsed:>8.0f}/s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 1000])
+    parser.add_argument("--serve", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args.serve, args.batch_sizes[0])
+    else:
+        for batch_size in args.batch_sizes:
+            measure(batch_size, args.clients, args.requests)
@@ -0,0 +1,65 @@
+# Measure the start-up time of CLI commands, each run in a fresh interpreter as from a shell script,
+# compared with importing the app helpers (Streamlit, pandas, SQLAlchemy) that a command built on
+# them would load. Also lists the heavy modules each command imports, which should stay empty for 'list'.
+#
+# Usage: python benchmarks/benchmark_cli_startup.py [--tasks 100] [--runs 10]
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+HEAVY_MODULES = ["streamlit", "pandas", "sqlalchemy", "numpy", "altair"]
+
+COMMANDS = {
+    "--help": "from tasklit.cli import main; main(['--help'])",
+    "list": "from tasklit.cli import main; main(['list'])",
+    "list --json": "from tasklit.cli import main; main(['list', '--json'])",
+    "helpers import": "import tasklit.src.utils.helpers",
+}
+
+
+def measure(name: str, code: str, env: dict, runs: int) -> None:
+    # Report the heavy modules loaded by the command.
+    loaded = subprocess.run(
+        [sys.executable, "-c", f"import sys\ntry:\n    {code}\nexcept SystemExit:\n    pass\n"
+                               f"print(' '.join(sorted(m for m in {HEAVY_MODULES!r} if m in sys.modules)))"],
+        env=env, capture_output=True, text=True, check=True
+    ).stdout.splitlines()[-1]
+
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], env=env, stdout=subprocess.DEVNULL, check=False)
+        timings.append(time.perf_counter() - started)
+
+    print(f"{name:<15} median={statistics.median(timings) * 1000:>7.1f}ms min={min(timings) * 1000:>7.1f}ms "
+          f"heavy modules: {loaded or '-'}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tasks", type=int, default=100)
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        # Commands run against a DB with registered tasks in a separate home folder.
+        env = dict(os.environ, HOME=temp_dir)
+        subprocess.run([sys.executable, "-c", f"""
+import tasklit.src.utils.database as database
+from tasklit.src.utils.tasks import Schedule, Task
+schedule = Schedule.create(datetime.now(), timedelta(hours=1), None, "Interval", "Scheduled")
+database.insert_tasks([Task("true", f"benchmark_strauss_{{index}}", schedule, pid=index + 1)
+                       for index in range({args.tasks})], database.get_sql_engine())
+"""], env=env, check=True)
+
+        subprocess.run([sys.executable, "-c", "pass"], env=env, check=True)
+        started = time.perf_counter()
+        subprocess.run([sys.executable, "-c", "pass"], env=env, check=True)
+        print(f"{'interpreter':<15} {(time.perf_counter() - started) * 1000:>14.1f}ms")
+
+        for name, code in COMMANDS.items():
+            measure(name, code, env, args.runs)
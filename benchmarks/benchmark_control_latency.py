@@ -0,0 +1,116 @@
+# Measure the latency of task actions over the control channel: round trips of state, pause, resume and
+# run-now requests sent to the scheduler daemon's control socket and forwarded to the scheduler process
+# of a task, a state snapshot of all tasks, and the time until a kill action has returned and the running
+# job of the task has exited, killing by process ID (terminating the scheduler process and its children,
+# which waits for them to exit) compared with asking the scheduler process to stop over its control socket.
+# Runs in a temporary tasklit home folder, every task runs 'sleep 600' hourly, starting now.
+#
+# Usage: python benchmarks/benchmark_control_latency.py [--tasks 20] [--rounds 200]
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from datetime import datetime, timedelta
+
+
+def percentiles(latencies: list) -> str:
+    latencies = sorted(latencies)
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    return f"p50={statistics.median(latencies) * 1000:>7.2f}ms p99={p99 * 1000:>7.2f}ms"
+
+
+def wait_for_job_exit(job_process) -> float:
+    from tasklit.src.utils.processes import is_process_running
+
+    started = time.perf_counter()
+    while is_process_running(job_process.pid, job_process.create_time()):
+        time.sleep(0.001)
+    return time.perf_counter() - started
+
+
+def run(tasks: int, rounds: int) -> None:
+    import psutil
+
+    import tasklit.settings.consts as settings
+    import tasklit.src.utils.control as control
+    import tasklit.src.utils.database as database
+    import tasklit.src.utils.processes as processes
+
+    from tasklit.src.utils.task_control import start_task_control
+    from tasklit.src.utils.tasks import Schedule, Task
+
+    os.makedirs(settings.BASE_LOG_DIR, exist_ok=True)
+    sql_engine = database.get_sql_engine()
+    server = start_task_control(sql_engine)
+
+    schedule = Schedule.create(datetime.now(), timedelta(hours=1), None, settings.INTERVAL_FREQUENCY, "Now")
+    started = [Task("sleep 600", f"benchmark_strauss_{index}", schedule) for index in range(tasks)]
+    for task in started:
+        processes.start_scheduler_process(task)
+    task_ids = database.insert_tasks(started, sql_engine)
+
+    try:
+        # Wait until every scheduler process listens on its socket and runs its job.
+        job_processes = {}
+        while len(job_processes) < tasks:
+            for task in started:
+                # Scheduler processes also run the resource tracker of their output buffer.
+                jobs = [child for child in psutil.Process(task.pid).children() if child.name() == "sleep"]
+                if jobs and os.path.exists(control.get_scheduler_socket_path(task.job_name)):
+                    job_processes[task.task_id] = jobs[0]
+            time.sleep(0.05)
+
+        with control.ControlClient(settings.CONTROL_SOCKET_PATH) as client:
+            for command in [control.STATE_COMMAND, control.PAUSE_COMMAND, control.RESUME_COMMAND,
+                            control.RUN_NOW_COMMAND]:
+                latencies = []
+                for index in range(rounds):
+                    request_started = time.perf_counter()
+                    client.request(command, task_id=task_ids[index % tasks])
+                    latencies.append(time.perf_counter() - request_started)
+                print(f"{command:<8} one task   {percentiles(latencies)}")
+
+            latencies = []
+            for _ in range(max(rounds // 10, 1)):
+                request_started = time.perf_counter()
+                client.request(control.STATE_COMMAND)
+                latencies.append(time.perf_counter() - request_started)
+            print(f"state    {tasks} tasks {percentiles(latencies)}")
+
+        killed, stopped = [], []
+        for index, task in enumerate(started):
+            job_process = job_processes[task.task_id]
+            request_started = time.perf_counter()
+            if index % 2:
+                processes.stop_task_process(task.job_name, task.pid, task.process_created)
+                stopped.append(time.perf_counter() - request_started + wait_for_job_exit(job_process))
+            else:
+                processes.terminate_process(task.pid, task.process_created)
+                killed.append(time.perf_counter() - request_started + wait_for_job_exit(job_process))
+
+        print(f"kill, terminated by process ID      {percentiles(killed)}")
+        print(f"kill, stopped over control socket   {percentiles(stopped)}")
+    finally:
+        server.close()
+        for task in started:
+            if processes.is_process_running(task.pid, task.process_created):
+                processes.terminate_process(task.pid, task.process_created)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tasks", type=int, default=20)
+    parser.add_argument("--rounds", type=int, default=200)
+    parser.add_argument("--run", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run:
+        run(args.tasks, args.rounds)
+    else:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            subprocess.run([sys.executable, __file__, "--run", "--tasks", str(args.tasks), "--rounds", str(args.rounds)],
+                           env=dict(os.environ, HOME=temp_dir), check=True)
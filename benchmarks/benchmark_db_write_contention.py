@@ -0,0 +1,77 @@
+# Measure processes table write throughput with many concurrent writer processes,
+# comparing a default SQLite engine (rollback journal) with the tuned shared engine.
+#
+# Usage: python benchmarks/benchmark_db_write_contention.py [--writers 8] [--rows 200]
+import argparse
+import os
+import tempfile
+import time
+
+from datetime import datetime
+from multiprocessing import get_context
+
+from sqlalchemy import create_engine
+from sqlalchemy.exc import OperationalError
+
+import tasklit.src.utils.database as database
+
+
+def get_engine(engine_path: str, tuned: bool):
+    if tuned:
+        return database.get_sql_engine(engine_path)
+
+    return create_engine(engine_path, echo=False)
+
+
+def write_rows(engine_path: str, tuned: bool, writer_id: int, rows: int) -> int:
+    """
+    Insert rows one transaction at a time, like concurrent job submissions do.
+
+    Returns:
+        amount of failed inserts.
+    """
+    sql_engine = get_engine(engine_path, tuned)
+    failed = 0
+
+    for row in range(rows):
+        record = {
+            "created": datetime.now(),
+            "process id": os.getpid(),
+            "job name": f"benchmark_{writer_id}_{row}",
+            "command": "sleep 1",
+        }
+        try:
+            database.insert_process(record, sql_engine)
+        except OperationalError:
+            failed += 1
+
+    return failed
+
+
+def run(writers: int, rows: int, tuned: bool) -> None:
+    with tempfile.TemporaryDirectory() as temp_dir:
+        engine_path = f"sqlite:///{temp_dir}/benchmark.db"
+        database.initialize_database(get_engine(engine_path, tuned))
+
+        with get_context("spawn").Pool(writers) as pool:
+            started = time.perf_counter()
+            failed = sum(pool.starmap(
+                write_rows, [(engine_path, tuned, writer_id, rows) for writer_id in range(writers)]
+            ))
+            elapsed = time.perf_counter() - started
+
+        written = writers * rows - failed
+        print(
+            f"{'tuned (WAL)' if tuned else 'default':<12} writers={writers:<3} "
+            f"rows/s={written / elapsed:>9.1f} failed={failed:<5} elapsed={elapsed:.2f}s"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--writers", type=int, default=8)
+    parser.add_argument("--rows", type=int, default=200)
+    args = parser.parse_args()
+
+    for tuned in (False, True):
+        run(args.writers, args.rows, tuned)
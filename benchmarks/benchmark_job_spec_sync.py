@@ -0,0 +1,79 @@
+# Measure how long reloading a large job spec directory takes when no job has changed,
+# for a single file and for jobs spread over many files (one of which has been modified).
+#
+# Usage: python benchmarks/benchmark_job_spec_sync.py [--jobs 5000] [--files 50]
+import argparse
+import json
+import os
+import tempfile
+import time
+
+import tasklit.src.utils.database as database
+
+from tasklit.src.utils.job_spec_sync import sync_job_specs, JobSpecDirectory
+from tasklit.src.utils.job_specs import get_job_spec_fingerprint, get_job_spec_schedule
+from tasklit.src.utils.tasks import Schedule, Task
+
+
+def write_spec_files(spec_dir: str, jobs: int, files: int) -> None:
+    jobs_per_file = jobs // files
+
+    for file_index in range(files):
+        entries = [
+            {
+                "command": f"echo {file_index}-{job_index}",
+                "job_name": f"job_{file_index}_{job_index}",
+                "frequency": "Interval",
+                "unit": "Minutes",
+                "quantity": job_index % 59 + 1,
+            }
+            for job_index in range(jobs_per_file)
+        ]
+        with open(os.path.join(spec_dir, f"jobs_{file_index}.json"), "w") as spec_file:
+            json.dump(entries, spec_file)
+
+
+def run(jobs: int, files: int) -> None:
+    with tempfile.TemporaryDirectory() as temp_dir:
+        spec_dir = os.path.join(temp_dir, "jobs")
+        os.mkdir(spec_dir)
+        write_spec_files(spec_dir, jobs, files)
+
+        sql_engine = database.get_sql_engine(f"sqlite:///{temp_dir}/benchmark.db")
+        spec_directory = JobSpecDirectory(spec_dir)
+
+        started = time.perf_counter()
+        job_specs = spec_directory.load()
+        first_load = time.perf_counter() - started
+
+        # Register the jobs as running tasks without starting scheduler processes.
+        tasks = []
+        for job_name, job_spec in job_specs.items():
+            start, interval_duration, execution_type = get_job_spec_schedule(job_spec)
+            schedule = Schedule.create(
+                start, interval_duration, job_spec.weekdays, job_spec.frequency, execution_type, job_spec.cron
+            )
+            tasks.append(Task(job_spec.command, job_name, schedule, spec_hash=get_job_spec_fingerprint(job_spec)))
+        database.insert_tasks(tasks, sql_engine)
+
+        os.utime(os.path.join(spec_dir, "jobs_0.json"))
+
+        started = time.perf_counter()
+        result = sync_job_specs(spec_directory.load(), sql_engine)
+        reload = time.perf_counter() - started
+
+        print(
+            f"jobs={jobs:<6} files={files:<4} first load={first_load * 1000:>7.1f}ms "
+            f"reload + diff={reload * 1000:>7.1f}ms unchanged={result.unchanged}"
+        )
+        sql_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--jobs", type=int, default=5000)
+    parser.add_argument("--files", type=int, default=50)
+    args = parser.parse_args()
+
+    run(args.jobs, 1)
+    run(args.jobs, args.files)
@@ -0,0 +1,68 @@
+# Measure the 'last update' refresh of the task table: one getmtime call per task, as the column
+# used to be filled, compared with one pass over the log folder that is cached until the folder changes.
+# Every task has an execution log and a stdout log in a temporary log folder.
+#
+# Usage: python benchmarks/benchmark_last_update.py [--tasks 100 1000 5000] [--repeat 5]
+import argparse
+import os
+import tempfile
+import time
+
+import pandas as pd
+
+import tasklit.settings.consts as settings
+import tasklit.src.utils.helpers as helper_functions
+
+
+def get_task_df(log_dir: str, tasks: int) -> pd.DataFrame:
+    job_names = [f"benchmark_strauss_{index}" for index in range(tasks)]
+
+    for job_name in job_names:
+        for suffix in [".txt", "_stdout.txt"]:
+            with open(os.path.join(log_dir, f"{job_name}{suffix}"), "w") as file:
+                file.write("run\n")
+
+    # Let the folder settle, so that its timestamps can be cached.
+    timestamp = time.time() - 60
+    os.utime(log_dir, (timestamp, timestamp))
+
+    return pd.DataFrame({"task_id": range(tasks), "job name": job_names})
+
+
+def refresh_per_task(df: pd.DataFrame) -> None:
+    # Former 'update_df_process_last_update_info'.
+    df["last update"] = df["job name"].apply(
+        lambda x: helper_functions.check_last_process_info_update(x) if x else ""
+    )
+
+
+def refresh_folder_scan(df: pd.DataFrame) -> None:
+    helper_functions._log_update_cache.clear()
+    helper_functions.update_df_process_last_update_info(df)
+
+
+def measure(name: str, refresh, df: pd.DataFrame, repeat: int) -> None:
+    timings = []
+
+    for _ in range(repeat):
+        started = time.perf_counter()
+        refresh(df)
+        timings.append(time.perf_counter() - started)
+
+    print(f"{name:<12} tasks={len(df):<6} best={min(timings) * 1000:>8.2f}ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tasks", type=int, nargs="+", default=[100, 1000, 5000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    for tasks in args.tasks:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            settings.BASE_LOG_DIR = temp_dir
+            task_df = get_task_df(temp_dir, tasks)
+
+            measure("per task", refresh_per_task, task_df, args.repeat)
+            measure("folder scan", refresh_folder_scan, task_df, args.repeat)
+            measure("cached", helper_functions.update_df_process_last_update_info, task_df, args.repeat)
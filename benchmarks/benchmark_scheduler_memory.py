@@ -0,0 +1,83 @@
+# Measure the memory of scheduler processes started from a process that has loaded the app
+# (Streamlit, pandas, Altair, SQLAlchemy), comparing processes forked from it, as scheduler
+# processes used to be started, with processes started from the minimal scheduler entry module.
+# RSS counts pages shared with the parent, USS only the memory a process adds on its own.
+#
+# Usage: python benchmarks/benchmark_scheduler_memory.py [--tasks 10]
+import argparse
+import os
+import tempfile
+import time
+
+from datetime import datetime, timedelta
+from multiprocessing import get_context
+from typing import List
+
+import psutil
+
+# Load the app like the Streamlit server does.
+import tasklit.pages.homepage  # noqa: F401
+import tasklit.settings.consts as settings
+import tasklit.src.utils.helpers as helper_functions
+import tasklit.src.utils.scheduler as scheduler
+
+from tasklit.src.utils.ring_buffer import remove_output_buffer
+from tasklit.src.utils.tasks import Schedule, Task
+
+
+def get_tasks(count: int) -> List[Task]:
+    # Hourly jobs: the scheduler processes only wait during the measurement.
+    schedule = Schedule.create(datetime.now(), timedelta(hours=1), None, "Interval", "Scheduled")
+
+    return [Task("true", f"benchmark_memory_{index}", schedule) for index in range(count)]
+
+
+def start_forked(tasks: List[Task]) -> List[int]:
+    pids = []
+
+    for task in tasks:
+        process = get_context("fork").Process(target=scheduler.schedule_process_job, args=(task,))
+        process.start()
+        pids.append(process.pid)
+
+    return pids
+
+
+def start_entry_module(tasks: List[Task]) -> List[int]:
+    return [helper_functions.start_scheduler_process(task) for task in tasks]
+
+
+def measure(name: str, pids: List[int]) -> None:
+    # Let the processes finish starting up.
+    time.sleep(2)
+
+    processes = [psutil.Process(pid) for pid in pids]
+    memory = [process.memory_full_info() for process in processes]
+    rss = sum(info.rss for info in memory) / len(memory) / 2 ** 20
+    uss = sum(info.uss for info in memory) / len(memory) / 2 ** 20
+
+    print(f"{name:<14} processes={len(pids):<4} RSS per process={rss:>7.1f}MB USS per process={uss:>7.1f}MB")
+
+    for process in processes:
+        process.terminate()
+    psutil.wait_procs(processes, timeout=5)
+
+    # Terminated scheduler processes leave their output buffers behind.
+    for pid in pids:
+        remove_output_buffer(pid)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tasks", type=int, default=10)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        settings.BASE_LOG_DIR = temp_dir
+
+        parent = psutil.Process(os.getpid()).memory_full_info()
+        print(f"{'app process':<14} RSS={parent.rss / 2 ** 20:.1f}MB")
+
+        tasks = get_tasks(args.tasks)
+        measure("forked", start_forked(tasks))
+        measure("entry module", start_entry_module(tasks))
@@ -0,0 +1,75 @@
+# Measure the scheduling lag of interval jobs: the time between the moment a run is due
+# and the moment the scheduler starts it. Compares the wall-clock polling loop interval schedules
+# used to run in with the monotonic-clock loop used now.
+# The job itself is replaced by a no-op, so only the scheduler is measured.
+#
+# Usage: python benchmarks/benchmark_scheduling_lag.py [--interval 1.3] [--runs 20]
+import argparse
+import time
+
+from datetime import datetime, timedelta
+from typing import List
+from unittest.mock import patch
+
+import numpy as np
+
+import tasklit.src.utils.scheduler as scheduler
+
+
+class BenchmarkDone(Exception):
+    pass
+
+
+def measure_wall_clock_loop(interval: timedelta, runs: int) -> List[float]:
+    lags = []
+    start = datetime.now()
+
+    # Former interval loop of 'schedule_process_job', checking the schedule once per second.
+    while len(lags) < runs:
+        now = datetime.now()
+        if scheduler.process_should_execute(now, start, interval, None):
+            start += interval
+            lags.append((now - start).total_seconds())
+        else:
+            time.sleep(1)
+
+    return lags
+
+
+def measure_monotonic_loop(interval: timedelta, runs: int) -> List[float]:
+    lags = []
+    first_run = time.monotonic() + interval.total_seconds()
+
+    def record_run(*args) -> None:
+        lags.append(time.monotonic() - (first_run + len(lags) * interval.total_seconds()))
+        if len(lags) == runs:
+            raise BenchmarkDone
+
+    with patch.object(scheduler, "execute_job", record_run):
+        try:
+            scheduler.run_interval_schedule(
+                "true", "/dev/null", "benchmark", datetime.now() + interval, interval, None
+            )
+        except BenchmarkDone:
+            pass
+
+    return lags
+
+
+def report(name: str, lags: List[float]) -> None:
+    p50, p95, p99 = np.percentile(np.array(lags) * 1000, [50, 95, 99])
+    print(f"{name:<12} runs={len(lags):<4} p50={p50:>8.2f}ms p95={p95:>8.2f}ms p99={p99:>8.2f}ms "
+          f"max={max(lags) * 1000:>8.2f}ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--interval", type=float, default=1.3, help="interval in seconds")
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    interval_duration = timedelta(seconds=args.interval)
+
+    report("wall clock", measure_wall_clock_loop(interval_duration, args.runs))
+    report("monotonic", measure_monotonic_loop(interval_duration, args.runs))
+    report("monotonic", measure_monotonic_loop(interval_duration / 10, args.runs * 10))
@@ -0,0 +1,50 @@
+# Measure the status refresh of the task table: one psutil lookup per task, as the status used
+# to be read, compared with one snapshot of all processes joined to the tasks.
+# Tasks point at processes that exist on this system as well as at processes that are gone.
+#
+# Usage: python benchmarks/benchmark_status_refresh.py [--tasks 100 1000 5000] [--repeat 5]
+import argparse
+import time
+
+import pandas as pd
+import psutil
+
+import tasklit.src.utils.helpers as helper_functions
+
+
+def get_task_df(tasks: int) -> pd.DataFrame:
+    existing_pids = psutil.pids()
+    missing_pids = range(max(existing_pids) + 1, max(existing_pids) + 1 + tasks)
+    pids = [existing_pids[index % len(existing_pids)] if index % 2 else missing_pids[index] for index in range(tasks)]
+
+    return pd.DataFrame({"task_id": range(tasks), "process id": pids, "process created": None})
+
+
+def refresh_per_task(df: pd.DataFrame) -> None:
+    # Former 'update_process_status_info'.
+    df["running"] = df["process id"].apply(helper_functions.is_process_running)
+
+
+def measure(name: str, refresh, df: pd.DataFrame, repeat: int) -> None:
+    timings = []
+
+    for _ in range(repeat):
+        started = time.perf_counter()
+        refresh(df)
+        timings.append(time.perf_counter() - started)
+
+    print(f"{name:<10} tasks={len(df):<6} best={min(timings) * 1000:>8.1f}ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tasks", type=int, nargs="+", default=[100, 1000, 5000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"processes on this system: {len(psutil.pids())}")
+
+    for tasks in args.tasks:
+        task_df = get_task_df(tasks)
+        measure("per task", refresh_per_task, task_df, args.repeat)
+        measure("snapshot", helper_functions.update_process_status_info, task_df, args.repeat)
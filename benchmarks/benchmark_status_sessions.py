@@ -0,0 +1,69 @@
+# Measure the cost of rendering the task table for many open dashboards at once: every session
+# refreshing the task state itself, as the homepage used to, compared with every session reading
+# the snapshot published by the shared status monitor. Sessions render concurrently in threads,
+# like Streamlit runs them; the status monitor runs in the background during the measurement.
+#
+# Usage: python benchmarks/benchmark_status_sessions.py [--tasks 1000] [--sessions 1 10 50] [--renders 5]
+import argparse
+import tempfile
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+import tasklit.settings.consts as settings
+import tasklit.src.utils.database as database
+import tasklit.src.utils.helpers as helper_functions
+import tasklit.src.utils.status_monitor as status_monitor
+
+from tasklit.src.utils.tasks import Schedule, Task
+
+
+def render_per_session(sql_engine) -> None:
+    # Former homepage refresh.
+    process_df = helper_functions.get_process_df(sql_engine)
+    helper_functions.update_process_status_info(process_df)
+    helper_functions.update_df_process_last_update_info(process_df)
+
+
+def render_snapshot(sql_engine) -> None:
+    status_monitor.get_status_monitor(sql_engine).get_snapshot().df.copy()
+
+
+def measure(name: str, render, sql_engine, sessions: int, renders: int) -> None:
+    def run_session(_) -> None:
+        for _ in range(renders):
+            render(sql_engine)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=sessions) as executor:
+        list(executor.map(run_session, range(sessions)))
+    elapsed = time.perf_counter() - started
+
+    print(f"{name:<12} sessions={sessions:<4} renders={sessions * renders:<5} "
+          f"total={elapsed * 1000:>9.1f}ms per render={elapsed / (sessions * renders) * 1000:>7.2f}ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tasks", type=int, default=1000)
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 10, 50])
+    parser.add_argument("--renders", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        settings.BASE_LOG_DIR = temp_dir
+        sql_engine = database.get_sql_engine(f"sqlite:///{temp_dir}/benchmark.db")
+
+        # Register tasks without starting scheduler processes.
+        schedule = Schedule.create(datetime.now(), timedelta(hours=1), None, "Interval", "Scheduled")
+        database.insert_tasks(
+            [Task("true", f"benchmark_strauss_{index}", schedule, pid=index + 1) for index in range(args.tasks)],
+            sql_engine
+        )
+
+        status_monitor.start_status_monitor(sql_engine)
+
+        for sessions in args.sessions:
+            measure("per session", render_per_session, sql_engine, sessions, args.renders)
+            measure("snapshot", render_snapshot, sql_engine, sessions, args.renders)
@@ -0,0 +1,78 @@
+# Measure the cost of rendering the task table with thousands of tasks: the full process df
+# serialized into the page, as the homepage used to, compared with filtering, sorting and
+# serializing only the displayed page. Serialization is measured with the protobuf message
+# Streamlit sends to the browser for st.table, the payload size is its serialized size.
+#
+# Usage: python benchmarks/benchmark_task_table.py [--tasks 1000 5000 20000] [--renders 5]
+import argparse
+import time
+
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from streamlit.elements.legacy_data_frame import marshall_data_frame
+from streamlit.proto.DataFrame_pb2 import DataFrame
+
+import tasklit.settings.consts as settings
+
+from tasklit.src.utils.task_table import (
+    get_task_page,
+    HIDDEN_COLUMNS,
+    RUNNING_TASKS,
+    TaskTableQuery
+)
+
+
+def get_process_df(tasks: int) -> pd.DataFrame:
+    created = datetime(2021, 1, 1)
+    return pd.DataFrame(
+        {
+            "task_id": range(1, tasks + 1),
+            "created": [f"{created + timedelta(minutes=index):{settings.DATE_FORMAT}}" for index in range(tasks)],
+            "process id": range(10000, 10000 + tasks),
+            "process created": [created.timestamp()] * tasks,
+            "job name": [f"benchmark_strauss_{index}" for index in range(tasks)],
+            "command": [f"ping -c 1 host{index}" for index in range(tasks)],
+            "last update": [f"{created + timedelta(seconds=index):{settings.DATE_FORMAT}}" for index in range(tasks)],
+            "running": [index % 3 != 0 for index in range(tasks)],
+            "cpu %": [0.1] * tasks,
+            "memory (MB)": [12.5] * tasks,
+        }
+    )
+
+
+def render_full(process_df: pd.DataFrame) -> int:
+    # Former homepage table.
+    proto_df = DataFrame()
+    marshall_data_frame(process_df.drop(columns=HIDDEN_COLUMNS), proto_df)
+    return proto_df.ByteSize()
+
+
+def render_page(process_df: pd.DataFrame) -> int:
+    page_df, _, _ = get_task_page(process_df, TaskTableQuery(RUNNING_TASKS, "strauss", "last update", True))
+    proto_df = DataFrame()
+    marshall_data_frame(page_df, proto_df)
+    return proto_df.ByteSize()
+
+
+def measure(name: str, render, process_df: pd.DataFrame, renders: int) -> None:
+    started = time.perf_counter()
+    for _ in range(renders):
+        payload = render(process_df)
+    elapsed = time.perf_counter() - started
+
+    print(f"{name:<6} tasks={len(process_df):<6} per render={elapsed / renders * 1000:>8.1f}ms "
+          f"payload={payload / 1024:>8.1f}KiB")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tasks", type=int, nargs="+", default=[1000, 5000, 20000])
+    parser.add_argument("--renders", type=int, default=5)
+    args = parser.parse_args()
+
+    for tasks in args.tasks:
+        process_df = get_process_df(tasks)
+        measure("full", render_full, process_df, args.renders)
+        measure("page", render_page, process_df, args.renders)
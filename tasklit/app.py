@@ -1,15 +1,30 @@
-from sqlalchemy import create_engine
-
 import tasklit.settings.consts as settings
+import tasklit.src.utils.database as database
 import tasklit.src.utils.helpers as helper_functions
 
+from tasklit.src.utils.control import is_daemon_running
+from tasklit.src.utils.job_spec_sync import start_job_spec_sync
+from tasklit.src.utils.retention import start_retention_gc
+from tasklit.src.utils.status_monitor import start_status_monitor
+
 from tasklit.pages.homepage import homepage
 
 # Check if the log folder exists and - if not - create one.
 helper_functions.create_folder_if_not_exists(settings.BASE_LOG_DIR)
 
-# Initialize sql alchemy engine to access process information
-sql_engine = create_engine(settings.APP_ENGINE_PATH, echo=False)
+# Get the shared sql alchemy engine to access process information
+sql_engine = database.get_sql_engine()
+
+# Leave the background services to the scheduler daemon ('tasklit daemon') if it is running
+if not is_daemon_running():
+    # Clean up old process information, run history and logs in the background
+    start_retention_gc(sql_engine)
+
+    # Keep tasks in sync with the job spec files in the jobs folder
+    start_job_spec_sync(sql_engine)
+
+# Refresh the task state shared by all app sessions in the background
+start_status_monitor(sql_engine)
 
 # Render application homepage
 homepage(sql_engine)
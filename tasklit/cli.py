@@ -0,0 +1,538 @@
+"""
+Command line interface of tasklit. Besides starting the app ('tasklit' / 'tasklit ui'), tasks can be
+submitted, listed, inspected and killed without a browser. Commands import only what they need,
+Streamlit and pandas are only imported to run the app, so that scripted calls start quickly.
+"""
+import argparse
+import codecs
+import json
+import os
+import signal
+import sqlite3
+import sys
+import threading
+import time
+
+from datetime import datetime, timedelta
+from typing import (
+    Any,
+    Dict,
+    List,
+    Optional
+)
+
+import tasklit.settings.consts as settings
+
+# Columns of the processes table shown by 'tasklit list'
+LIST_COLUMNS = ["task_id", "job name", "process id", "running", "created", "command"]
+
+
+def get_db_path(engine_path: str = settings.APP_ENGINE_PATH) -> str:
+    """
+    Get the path of the SQLite DB file of a sql alchemy DB URL.
+
+    Args:
+        engine_path: sql alchemy DB URL.
+
+    Returns:
+        path of the DB file.
+    """
+    return engine_path[len("sqlite:///"):]
+
+
+def read_tasks(db_path: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Read all rows of the processes table with the stdlib SQLite driver, read-only,
+    so that listing tasks does not need to import sql alchemy or set up the DB schema.
+
+    Args:
+        db_path: (optional) path of the DB file, the app DB if not set.
+
+    Raises:
+        sqlite3.OperationalError: if the DB cannot be read.
+
+    Returns:
+        process information rows, keyed by column, ordered by task ID.
+            Empty if no task has been submitted yet.
+    """
+    db_path = db_path or get_db_path()
+
+    if not os.path.isfile(db_path):
+        return []
+
+    connection = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True, timeout=settings.DB_BUSY_TIMEOUT)
+    connection.row_factory = sqlite3.Row
+
+    try:
+        return [dict(row) for row in connection.execute("SELECT * FROM processes ORDER BY task_id")]
+    except sqlite3.OperationalError as exc:
+        if "no such table" in str(exc):
+            return []
+        raise exc
+    finally:
+        connection.close()
+
+
+def find_task(tasks: List[Dict[str, Any]], task: str) -> Optional[Dict[str, Any]]:
+    """
+    Find a task by task ID or job name.
+
+    Args:
+        tasks: process information rows.
+        task: task ID or job name.
+
+    Returns:
+        process information row, None if there is no such task.
+    """
+    for row in tasks:
+        if str(row["task_id"]) == task or row["job name"] == task:
+            return row
+
+    return None
+
+
+def is_task_running(row: Dict[str, Any]) -> bool:
+    """
+    Check whether the scheduler process of a task is running.
+
+    Args:
+        row: process information row.
+
+    Returns:
+        True/False based on the result of the check.
+    """
+    from tasklit.src.utils.processes import is_process_running
+
+    # Tables saved by earlier app versions, not migrated yet, have no process creation times.
+    return row["process id"] is not None and is_process_running(row["process id"], row.get("process created"))
+
+
+def get_schedule_interval(args: argparse.Namespace) -> timedelta:
+    """
+    Get the interval of a submitted task, as selected in the 'New task' UI.
+
+    Args:
+        args: parsed 'submit' arguments.
+
+    Raises:
+        ValueError: if the interval is not positive.
+
+    Returns:
+        interval between job executions, one day unless an interval has been given.
+    """
+    if args.every is None:
+        return timedelta(days=1)
+
+    if args.every <= 0:
+        raise ValueError("The interval has to be positive.")
+
+    return settings.DATE_TRANSLATION[args.unit] * args.every
+
+
+def submit(args: argparse.Namespace) -> int:
+    """
+    Start a task and save it to the processes table.
+
+    Args:
+        args: parsed command line arguments.
+
+    Returns:
+        exit code.
+    """
+    import tasklit.src.utils.database as database
+
+    from tasklit.src.utils.job_names import get_job_name
+    from tasklit.src.utils.processes import is_process_running, start_scheduler_process, terminate_process
+    from tasklit.src.utils.tasks import Schedule, Task
+
+    if args.cron:
+        frequency = settings.CRON_FREQUENCY
+    elif args.every is not None:
+        frequency = settings.INTERVAL_FREQUENCY
+    else:
+        frequency = settings.IMMEDIATE_FREQUENCY
+
+    try:
+        interval = get_schedule_interval(args)
+    except ValueError as exc:
+        print(f"tasklit: {exc}", file=sys.stderr)
+        return 2
+
+    schedule = Schedule.create(datetime.now(), interval, None, frequency, "Now", args.cron, args.timezone)
+    task = Task(args.command, args.name or get_job_name(), schedule)
+
+    os.makedirs(settings.BASE_LOG_DIR, exist_ok=True)
+    start_scheduler_process(task)
+
+    try:
+        database.insert_tasks([task], database.get_sql_engine())
+    except Exception as exc:
+        # A scheduler process without a task could not be found and stopped anymore.
+        if is_process_running(task.pid, task.process_created):
+            terminate_process(task.pid, task.process_created)
+        raise exc
+
+    print(f"Submitted task {task.job_name} with task_id {task.task_id} to execute {task.command}.")
+
+    return 0
+
+
+def list_tasks(args: argparse.Namespace) -> int:
+    """
+    Print the tasks of the processes table with their status.
+
+    Args:
+        args: parsed command line arguments.
+
+    Returns:
+        exit code.
+    """
+    tasks = read_tasks()
+
+    for row in tasks:
+        row["running"] = is_task_running(row)
+
+    if args.running:
+        tasks = [row for row in tasks if row["running"]]
+
+    rows = [{column: row[column] for column in LIST_COLUMNS} for row in tasks]
+
+    if args.json:
+        print(json.dumps(rows, default=str))
+        return 0
+
+    cells = [LIST_COLUMNS] + [["" if row[column] is None else str(row[column]) for column in LIST_COLUMNS]
+                              for row in rows]
+    widths = [max(len(line[index]) for line in cells) for index in range(len(LIST_COLUMNS) - 1)]
+
+    for line in cells:
+        print("  ".join([cell.ljust(width) for cell, width in zip(line, widths)] + [line[-1]]))
+
+    return 0
+
+
+def follow_log(filename: str, row: Dict[str, Any], offset: int) -> None:
+    """
+    Print output appended to a log file until the task's process has exited.
+
+    Args:
+        filename: path to the log file.
+        row: process information row of the task.
+        offset: position in the log file up to which it has been printed.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+
+    while True:
+        finished = not is_task_running(row)
+
+        try:
+            with open(filename, "rb") as reader:
+                reader.seek(offset)
+                chunk = reader.read()
+        except FileNotFoundError:
+            chunk = b""
+
+        if chunk:
+            sys.stdout.write(decoder.decode(chunk))
+            sys.stdout.flush()
+            offset += len(chunk)
+
+        # Output written before the process exited has been read above.
+        if finished:
+            return
+
+        time.sleep(1 / settings.LOG_STREAM_MAX_FPS)
+
+
+def logs(args: argparse.Namespace) -> int:
+    """
+    Print the stdout log or the execution log of a task.
+
+    Args:
+        args: parsed command line arguments.
+
+    Returns:
+        exit code.
+    """
+    row = find_task(read_tasks(), args.task)
+
+    if row is None:
+        print(f"tasklit: no task {args.task}.", file=sys.stderr)
+        return 1
+
+    suffix = "" if args.history else "_stdout"
+    filename = f"{settings.BASE_LOG_DIR}/{row['job name']}{suffix}.txt"
+
+    try:
+        with open(filename, "rb") as reader:
+            content = reader.read()
+    except FileNotFoundError:
+        content = b""
+
+    lines = content.decode("utf-8", errors="replace").splitlines(keepends=True)
+    sys.stdout.write("".join(lines[-args.lines:] if args.lines else lines))
+    sys.stdout.flush()
+
+    if args.follow and not args.history:
+        try:
+            follow_log(filename, row, len(content))
+        except KeyboardInterrupt:
+            pass
+
+    return 0
+
+
+def kill(args: argparse.Namespace) -> int:
+    """
+    Terminate the scheduler process of a task, optionally removing the task.
+
+    Args:
+        args: parsed command line arguments.
+
+    Returns:
+        exit code.
+    """
+    import psutil
+
+    from tasklit.src.utils.processes import stop_task_process
+
+    row = find_task(read_tasks(), args.task)
+
+    if row is None:
+        print(f"tasklit: no task {args.task}.", file=sys.stderr)
+        return 1
+
+    if is_task_running(row):
+        try:
+            stop_task_process(row["job name"], row["process id"], row.get("process created"))
+        except psutil.NoSuchProcess:
+            # Scheduler processes exit on their own once their job has been terminated.
+            pass
+        print(f"Terminated task {row['job name']} with task_id {row['task_id']} "
+              f"and process id {row['process id']}.")
+    elif not args.remove:
+        print(f"tasklit: task {row['job name']} is not running.", file=sys.stderr)
+        return 1
+
+    if args.remove:
+        import tasklit.src.utils.database as database
+
+        database.delete_processes([row["task_id"]], database.get_sql_engine())
+        print(f"Removed task {row['job name']} with task_id {row['task_id']}.")
+
+    return 0
+
+
+def control_task(args: argparse.Namespace) -> int:
+    """
+    Pause, resume or run a task right away through the scheduler daemon.
+
+    Args:
+        args: parsed command line arguments.
+
+    Returns:
+        exit code.
+    """
+    from tasklit.src.utils.control import send_daemon_request, ControlError, RUN_NOW_COMMAND
+
+    row = find_task(read_tasks(), args.task)
+
+    if row is None:
+        print(f"tasklit: no task {args.task}.", file=sys.stderr)
+        return 1
+
+    try:
+        task = send_daemon_request(args.control_command, task_id=row["task_id"])
+    except ControlError as exc:
+        print(f"tasklit: {exc}", file=sys.stderr)
+        return 1
+    except OSError:
+        print("tasklit: the scheduler daemon is not running, start it with 'tasklit daemon'.", file=sys.stderr)
+        return 1
+
+    running_now = " and runs its job now" if args.control_command == RUN_NOW_COMMAND else ""
+    print(f"Task {task['job_name']} with task_id {task['task_id']} is {task['state']}{running_now}.")
+
+    return 0
+
+
+def daemon(args: argparse.Namespace) -> int:
+    """
+    Run the scheduler daemon until interrupted: the background services of the app (retention garbage collection
+    and job spec folder sync), the task starter and the control socket for the task actions of the app and the CLI.
+
+    Args:
+        args: parsed command line arguments.
+
+    Returns:
+        exit code.
+    """
+    import tasklit.src.utils.database as database
+
+    from tasklit.src.utils.control import CONTROL_SUPPORTED
+    from tasklit.src.utils.job_spec_sync import start_job_spec_sync
+    from tasklit.src.utils.retention import start_retention_gc
+    from tasklit.src.utils.task_control import start_task_control
+    from tasklit.src.utils.task_starter import start_task_starter
+
+    stop_event = threading.Event()
+    signal.signal(signal.SIGTERM, lambda signum, frame: stop_event.set())
+
+    os.makedirs(settings.BASE_LOG_DIR, exist_ok=True)
+    sql_engine = database.get_sql_engine()
+    control_server = None
+
+    if CONTROL_SUPPORTED:
+        try:
+            control_server = start_task_control(sql_engine)
+        except OSError as exc:
+            print(f"tasklit: {exc} Is the daemon running already?", file=sys.stderr)
+            return 1
+
+    start_retention_gc(sql_engine)
+    start_job_spec_sync(sql_engine)
+    start_task_starter(sql_engine)
+
+    print("tasklit daemon running, press Ctrl+C to stop.")
+
+    try:
+        while not stop_event.wait(1):
+            pass
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if control_server is not None:
+            control_server.close()
+
+    return 0
+
+
+def api(args: argparse.Namespace) -> int:
+    """
+    Serve the HTTP/JSON API and start the tasks submitted through it, until interrupted.
+
+    Args:
+        args: parsed command line arguments.
+
+    Returns:
+        exit code.
+    """
+    import tasklit.src.utils.database as database
+
+    from tasklit.src.utils.api import get_api_token, serve_api
+
+    token = get_api_token()
+
+    if args.print_token:
+        print(token)
+        return 0
+
+    print(f"tasklit API listening on http://{args.host}:{args.port}, press Ctrl+C to stop.")
+    print(f"Requests have to send the token in {settings.API_TOKEN_PATH} as 'Authorization: Bearer <token>'.")
+
+    try:
+        serve_api(database.get_sql_engine(), args.host, args.port)
+    except KeyboardInterrupt:
+        pass
+
+    return 0
+
+
+def ui(args: argparse.Namespace) -> int:
+    """
+    Run the tasklit app with Streamlit.
+
+    Args:
+        args: parsed command line arguments.
+
+    Returns:
+        exit code.
+    """
+    from streamlit import cli as stcli
+
+    file_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "app.py")
+
+    sys.argv = ["streamlit", "run", file_path, "--global.developmentMode=false", f"--server.port={args.port}",
+                "--browser.gatherUsageStats=False"]
+
+    return stcli.main()
+
+
+def get_parser() -> argparse.ArgumentParser:
+    """
+    Get the parser of the command line arguments.
+
+    Returns:
+        argument parser with a sub-parser per command.
+    """
+    parser = argparse.ArgumentParser(prog="tasklit", description="A browser-based task scheduling system.")
+    parser.set_defaults(func=ui, port=8501)
+    commands = parser.add_subparsers(title="commands")
+
+    ui_parser = commands.add_parser("ui", help="run the app (default)")
+    ui_parser.add_argument("--port", type=int, default=8501, help="port of the app")
+    ui_parser.set_defaults(func=ui)
+
+    submit_parser = commands.add_parser("submit", help="submit a new task")
+    submit_parser.add_argument("command", help="command to execute, run without a shell")
+    submit_parser.add_argument("--name", help="job name, a random name if not set")
+    schedule_group = submit_parser.add_mutually_exclusive_group()
+    schedule_group.add_argument("--every", type=int, metavar="N", help="run every N units, starting now")
+    schedule_group.add_argument("--cron", metavar="EXPRESSION", help="run on a cron schedule")
+    submit_parser.add_argument("--unit", choices=list(settings.TIME_VALUES), default=settings.DEFAULT_TIME_UNIT,
+                               help="unit of the interval")
+    submit_parser.add_argument("--timezone", help="IANA timezone of the cron schedule, the local timezone if not set")
+    submit_parser.set_defaults(func=submit)
+
+    list_parser = commands.add_parser("list", help="list tasks")
+    list_parser.add_argument("--running", action="store_true", help="only list running tasks")
+    list_parser.add_argument("--json", action="store_true", help="print the tasks as JSON")
+    list_parser.set_defaults(func=list_tasks)
+
+    logs_parser = commands.add_parser("logs", help="print the output of a task")
+    logs_parser.add_argument("task", help="task ID or job name")
+    logs_parser.add_argument("--history", action="store_true", help="print the execution log instead")
+    logs_parser.add_argument("-n", "--lines", type=int, default=0, help="only print the last N lines")
+    logs_parser.add_argument("-f", "--follow", action="store_true", help="keep printing new output until the task ends")
+    logs_parser.set_defaults(func=logs)
+
+    kill_parser = commands.add_parser("kill", help="terminate a task")
+    kill_parser.add_argument("task", help="task ID or job name")
+    kill_parser.add_argument("--remove", action="store_true", help="also remove the task from the task table")
+    kill_parser.set_defaults(func=kill)
+
+    for name, control_command, description in [("pause", "pause", "skip the scheduled runs of a task"),
+                                               ("resume", "resume", "run a paused task on its schedule again"),
+                                               ("run-now", "run_now", "run the job of a task right away")]:
+        control_parser = commands.add_parser(name, help=f"{description}, through the scheduler daemon")
+        control_parser.add_argument("task", help="task ID or job name")
+        control_parser.set_defaults(func=control_task, control_command=control_command)
+
+    daemon_parser = commands.add_parser(
+        "daemon", help="run the scheduler daemon: retention, job spec sync and task control for the app"
+    )
+    daemon_parser.set_defaults(func=daemon)
+
+    api_parser = commands.add_parser("api", help="serve the HTTP/JSON API for submitting and managing tasks")
+    api_parser.add_argument("--host", default=settings.API_HOST, help="interface to listen on")
+    api_parser.add_argument("--port", type=int, default=settings.API_PORT, help="port to listen on")
+    api_parser.add_argument("--print-token", action="store_true",
+                            help="print the token API requests have to send, and exit")
+    api_parser.set_defaults(func=api)
+
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Run a tasklit command.
+
+    Args:
+        argv: (optional) command line arguments, the arguments of the process if not set.
+
+    Returns:
+        exit code.
+    """
+    args = get_parser().parse_args(argv)
+
+    return args.func(args)
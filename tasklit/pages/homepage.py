@@ -6,10 +6,17 @@ import streamlit as st
 
 from sqlalchemy import engine
 
+import tasklit.settings.consts as settings
+import tasklit.src.utils.database as database
 import tasklit.src.utils.helpers as helper_functions
+import tasklit.src.utils.live_updates as live_updates
+import tasklit.src.utils.status_monitor as status_monitor
+import tasklit.src.utils.task_table as task_table
 
 from tasklit.pages.layouts.homepage_new_task import layout_homepage_define_new_task
+from tasklit.pages.layouts.homepage_import_tasks import layout_homepage_import_tasks
 from tasklit.pages.layouts.homepage_explore_task import layout_homepage_explore_task
+from tasklit.pages.layouts.homepage_timeline import layout_homepage_timeline
 
 
 @helper_functions.app_exception_handler
@@ -24,27 +31,57 @@ def homepage(sql_engine: engine) -> None:
     st.write("# 🕙 Tasklit")
     st.text(f"A browser-based task scheduling system. Running on {socket.gethostname()}.")
 
-    # Prepare and display process dataframe
-    process_df = helper_functions.get_process_df(sql_engine)
-    helper_functions.update_process_status_info(process_df)
-    helper_functions.update_df_process_last_update_info(process_df)
-    st.table(process_df)
+    # Display the outcome of the action that triggered the last app refresh
+    helper_functions.show_refresh_message()
+
+    # Display the latest task state published by the status monitor
+    # Only the selected page of the task table is sent to the browser.
+    snapshot = status_monitor.get_status_monitor(sql_engine).get_snapshot()
+    process_df = snapshot.df.copy()
+    table_query = task_table.select_task_table_query()
+    table_slot = st.empty()
+    live_updates.render_task_table(table_slot, snapshot, table_query)
+    status_slot = st.empty()
 
     # In case process df has any processes that are no longer running (but still alive)
-    # provide user an option to remove them.
-    if False in process_df["running"].values:
+    # provide user an option to remove them. Tasks submitted through the API whose
+    # scheduler process has not been started yet are kept.
+    not_running = process_df[~process_df["running"].astype(bool) & process_df["process id"].notna()]
+    if not not_running.empty:
         if st.button("Remove processes that are not running."):
-            running = process_df[process_df["running"]]
-            running.to_sql("processes", con=sql_engine, if_exists="replace", index=False)
+            database.delete_processes(not_running["task_id"], sql_engine)
+            status_monitor.invalidate(sql_engine)
 
             helper_functions.refresh_app()
 
     # Render and handle UI elements for defining new tasks
-    layout_homepage_define_new_task(process_df, sql_engine)
+    layout_homepage_define_new_task(sql_engine)
+
+    # Render and handle UI elements for importing many tasks at once
+    layout_homepage_import_tasks(sql_engine)
 
     # Render and handle UI elements for exploring existing tasks
-    layout_homepage_explore_task(process_df)
+    live_log = layout_homepage_explore_task(process_df, sql_engine)
+
+    # Render the timeline of upcoming runs
+    layout_homepage_timeline(process_df, sql_engine)
 
     # Handle user triggered app refresh
     if st.button("Refresh"):
         helper_functions.refresh_app()
+
+    auto_refresh = st.checkbox(
+        f"Auto-refresh task table (every {settings.AUTO_REFRESH_INTERVAL} seconds)",
+        value=settings.AUTO_REFRESH_INTERVAL > 0
+    )
+
+    # Keep the task table and live log output up to date without running the page again
+    live_updates.run_live_updates(
+        sql_engine,
+        snapshot,
+        table_slot,
+        status_slot,
+        [live_log] if live_log is not None else [],
+        table_query,
+        settings.AUTO_REFRESH_INTERVAL if auto_refresh else 0
+    )
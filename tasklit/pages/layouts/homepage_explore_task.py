@@ -1,17 +1,30 @@
 import os
 import sys
+import pandas as pd
 import streamlit as st
 
+from typing import Optional
+
 import tasklit.settings.consts as settings
+import tasklit.src.utils.control as control
+import tasklit.src.utils.database as database
 import tasklit.src.utils.helpers as helper_functions
+import tasklit.src.utils.status_monitor as status_monitor
+
+from tasklit.src.utils.log_stream import LogStream
+from tasklit.src.utils.task_states import PAUSED_STATE, RUNNING_STATE
 
 
-def layout_homepage_explore_task(process_df) -> None:
+def layout_homepage_explore_task(process_df, sql_engine) -> Optional[LogStream]:
     """
     Render and process homepage UI layout for exploring an existing task.
 
     Args:
         process_df: df with current process information.
+        sql_engine: sql engine for removing queued tasks.
+
+    Returns:
+        live stdout output of the explored task, if it should be followed.
     """
     with st.expander("Explore task"):
         explore_task_id = st.selectbox("task_id", process_df["task_id"].unique())
@@ -20,6 +33,9 @@ def layout_homepage_explore_task(process_df) -> None:
             current_task_row = process_df[process_df["task_id"] == explore_task_id].iloc[0]
             current_job_name = current_task_row["job name"]
             current_task_pid = current_task_row["process id"]
+            current_task_created = current_task_row["process created"]
+            if pd.isna(current_task_created):
+                current_task_created = None
 
             # Display task execution log
             st.write("## Task Execution Log")
@@ -29,21 +45,69 @@ def layout_homepage_explore_task(process_df) -> None:
                 )
             )
 
-            # Display task STDOUT log
+            # Display task STDOUT log, running tasks serve their latest output from memory
             st.write("## Task Stdout Log")
+            output_tail = None
+
+            if current_task_row["running"]:
+                output_tail = helper_functions.read_job_output_tail(current_task_pid)
+
             st.code(
-                helper_functions.display_process_log_file(
+                output_tail if output_tail is not None else helper_functions.display_process_log_file(
                     f"{settings.BASE_LOG_DIR}/{current_job_name}_stdout.txt"
                 )
             )
 
+            # Task actions take effect right away through the scheduler daemon, if it is running
+            daemon_task = helper_functions.get_daemon_task_state(explore_task_id)
+
+            if daemon_task is not None and daemon_task["state"] in (RUNNING_STATE, PAUSED_STATE):
+                st.write(f"Task state: **{daemon_task['state']}**")
+                pause_col, run_col = st.columns(2)
+                command = None
+
+                if daemon_task["state"] == PAUSED_STATE:
+                    if pause_col.button("Resume"):
+                        command = control.RESUME_COMMAND
+                elif pause_col.button("Pause"):
+                    command = control.PAUSE_COMMAND
+
+                if run_col.button("Run now"):
+                    command = control.RUN_NOW_COMMAND
+
+                if command is not None:
+                    task = control.send_daemon_request(command, task_id=int(explore_task_id))
+
+                    helper_functions.refresh_app(
+                        f"Task {current_job_name} with task_id {explore_task_id} is {task['state']}"
+                        f"{' and runs its job now' if command == control.RUN_NOW_COMMAND else ''}."
+                    )
+
             if st.checkbox("Kill task"):
                 if st.button("Click to confirm"):
-                    helper_functions.terminate_process(current_task_pid)
+                    if daemon_task is not None:
+                        control.send_daemon_request(control.CANCEL_COMMAND, task_id=int(explore_task_id))
+                    elif pd.isna(current_task_pid):
+                        # Queued tasks have no scheduler process yet, they are removed before they are started
+                        database.delete_processes([int(explore_task_id)], sql_engine)
+                        status_monitor.invalidate(sql_engine)
+                    else:
+                        helper_functions.stop_task_process(current_job_name, current_task_pid, current_task_created)
 
-                    st.success(
+                    helper_functions.refresh_app(
+                        f"Removed queued task {current_job_name} with task_id {current_task_row['task_id']}."
+                        if pd.isna(current_task_pid) else
                         f"Terminated task {current_job_name} with task_id {current_task_row['task_id']}"
                         f" and process id {current_task_pid}."
                     )
 
-                    helper_functions.refresh_app(4)
+            # Stream new stdout output of a running task, once the rest of the page has been rendered
+            if current_task_row["running"] and st.checkbox("Follow live output"):
+                return LogStream(
+                    f"{settings.BASE_LOG_DIR}/{current_job_name}_stdout.txt",
+                    lambda: not helper_functions.is_process_running(current_task_pid, current_task_created),
+                    st.container(),
+                    backlog_bytes=settings.LOG_STREAM_BACKLOG_BYTES
+                )
+
+    return None
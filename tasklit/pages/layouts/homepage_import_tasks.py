@@ -0,0 +1,43 @@
+import os
+import streamlit as st
+
+import tasklit.src.utils.helpers as helper_functions
+import tasklit.src.utils.job_specs as job_specs
+import tasklit.src.utils.status_monitor as status_monitor
+
+from tasklit.src.utils.cron import read_user_crontab
+
+
+def layout_homepage_import_tasks(sql_engine) -> None:
+    """
+    Render and process homepage UI layout for submitting many tasks at once
+    from a job file or the crontab of the current user.
+
+    Args:
+        sql_engine: sql engine for saving process information.
+    """
+    with st.expander("Import tasks"):
+        uploaded_file = st.file_uploader(
+            "Job file with columns / keys: command, job_name, frequency, unit, quantity, weekdays, start, cron",
+            type=list(job_specs.JOB_SPEC_FORMATS)
+        )
+
+        if uploaded_file is not None:
+            source = uploaded_file.name
+            file_format = os.path.splitext(uploaded_file.name)[1]
+            imported_job_specs = job_specs.load_job_specs(uploaded_file.getvalue(), file_format)
+        elif st.checkbox("Import my crontab"):
+            source = "your crontab"
+            imported_job_specs = job_specs.load_job_specs(read_user_crontab(), "crontab")
+        else:
+            return
+
+        st.text(f"Found {len(imported_job_specs)} tasks in {source}.")
+
+        if imported_job_specs and st.button("Submit all"):
+            task_ids = job_specs.submit_job_specs(imported_job_specs, sql_engine)
+            status_monitor.invalidate(sql_engine)
+
+            helper_functions.refresh_app(
+                f"Submitted {len(task_ids)} tasks with task_ids {task_ids[0]} - {task_ids[-1]}."
+            )
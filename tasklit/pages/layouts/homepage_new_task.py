@@ -3,16 +3,19 @@ import sys
 import streamlit as st
 
 import tasklit.settings.consts as settings
+import tasklit.src.utils.calendars as calendars
 import tasklit.src.utils.helpers as helper_functions
+import tasklit.src.utils.status_monitor as status_monitor
+import tasklit.src.utils.timezones as timezones
 from tasklit.src.utils.job_names import get_job_name
+from tasklit.src.utils.tasks import Schedule, Task
 
 
-def layout_homepage_define_new_task(process_df, sql_engine) -> None:
+def layout_homepage_define_new_task(sql_engine) -> None:
     """
     Render and process homepage UI layout for defining a new task.
 
     Args:
-        process_df: df with current process information.
         sql_engine: sql engine for saving df into sql.
     """
     with st.expander("New task"):
@@ -32,7 +35,8 @@ def layout_homepage_define_new_task(process_df, sql_engine) -> None:
             "Select Frequency", (
                 settings.IMMEDIATE_FREQUENCY,
                 settings.INTERVAL_FREQUENCY,
-                settings.DAILY_FREQUENCY
+                settings.DAILY_FREQUENCY,
+                settings.CRON_FREQUENCY
             )
         )
 
@@ -40,36 +44,45 @@ def layout_homepage_define_new_task(process_df, sql_engine) -> None:
             frequency, unit_select_col, slider_select_col
         )
 
+        cron_expression = None
+        if frequency == settings.CRON_FREQUENCY:
+            cron_expression = helper_functions.select_cron_expression(unit_select_col, slider_select_col)
+
         interval_duration = helper_functions.get_interval_duration(time_unit, time_unit_quantity, weekdays)
 
         # Get execution start date settings
         execution_schedule_col, date_input_col, time_slider_col = st.columns(3)
         execution = execution_schedule_col.selectbox("Execution", ("Now", "Scheduled"))
+        timezone_names = timezones.get_timezone_names()
+        timezone_name = execution_schedule_col.selectbox(
+            "Timezone", timezone_names, index=timezone_names.index(timezones.get_local_timezone_name())
+        )
+        calendar_name = execution_schedule_col.selectbox(
+            "Calendar", [None] + calendars.list_calendars(), format_func=lambda name: name or "No calendar"
+        )
         start = helper_functions.get_command_execution_start(
             execution,
             frequency,
             weekdays,
             date_input_col,
-            time_slider_col
+            time_slider_col,
+            timezone_name
         )
 
-        if st.button(f"Submit"):
-            new_task_id = helper_functions.get_task_id(process_df)
-
-            helper_functions.submit_job(
-                command,
-                job_name,
+        if st.button(f"Submit") and (frequency != settings.CRON_FREQUENCY or cron_expression):
+            schedule = Schedule.create(
                 start,
                 interval_duration,
                 weekdays,
                 frequency,
                 execution,
-                new_task_id,
-                sql_engine,
+                cron_expression,
+                timezone_name,
+                calendar_name
             )
+            new_task_id = helper_functions.submit_job(Task(command, job_name, schedule), sql_engine)
+            status_monitor.invalidate(sql_engine)
 
-            st.success(
+            helper_functions.refresh_app(
                 f"Submitted task {job_name} with task_id {new_task_id} to execute {command}."
             )
-
-            helper_functions.refresh_app(4)
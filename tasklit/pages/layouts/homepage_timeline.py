@@ -0,0 +1,33 @@
+from datetime import datetime, timezone
+
+import streamlit as st
+
+import tasklit.settings.consts as settings
+import tasklit.src.utils.timeline as timeline
+
+
+def layout_homepage_timeline(process_df, sql_engine) -> None:
+    """
+    Render homepage UI layout with a timeline of the upcoming runs of all running tasks.
+
+    Args:
+        process_df: df with current process information.
+        sql_engine: sql engine for reading task schedules.
+    """
+    with st.expander("Upcoming runs"):
+        view = st.radio("Timeline", list(settings.TIMELINE_VIEWS))
+        horizon, bin_size = settings.TIMELINE_VIEWS[view]
+
+        schedule_df = timeline.get_schedule_df(sql_engine)
+        running_task_ids = process_df.loc[process_df["running"].astype(bool), "task_id"]
+        schedule_df = schedule_df[schedule_df["task_id"].isin(running_task_ids)]
+
+        now = datetime.now(timezone.utc)
+        runs_df = timeline.count_upcoming_runs(schedule_df, now, now + horizon, bin_size)
+
+        if runs_df.empty:
+            st.text("No upcoming runs.")
+            return
+
+        st.text(f"{runs_df['runs'].sum()} runs of {runs_df['task_id'].nunique()} tasks.")
+        st.altair_chart(timeline.get_timeline_chart(runs_df), use_container_width=True)
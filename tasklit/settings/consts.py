@@ -12,27 +12,51 @@ if not os.path.isdir(HOME_DIR):
 # DB Path
 APP_ENGINE_PATH = f"sqlite:///{HOME_DIR}/process_data.db"
 
+# DB connection settings
+DB_POOL_SIZE = 5
+DB_MAX_OVERFLOW = 10
+DB_BUSY_TIMEOUT = 30
+DB_JOURNAL_MODE = "WAL"
+DB_SYNCHRONOUS = "NORMAL"
+
 # Formats
 FORMAT = {
     "task_id": [],
     "created": [],
     "process id": [],
+    "process created": [],
     "job name": [],
     "command": [],
     "last update": [],
     "running": [],
+    "cpu %": [],
+    "memory (MB)": [],
 }
 DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
 
+# Process information read in one pass over the process table per status refresh
+PROCESS_STATUS_ATTRS = ["pid", "status", "create_time", "cpu_percent", "memory_info"]
+# Allowed difference (seconds) between the saved and the current creation time of a task's process,
+# process creation times are derived from the boot time, which can shift slightly with clock adjustments.
+PROCESS_CREATE_TIME_TOLERANCE = 1.0
+# Minimum age (seconds) of the last log folder change before log file timestamps are cached:
+# file systems record modification times with limited precision, so a folder that has just changed
+# may change again without getting a new modification time.
+LOG_DIR_SETTLE_TIME = 1.0
+
 # Execution frequencies
 IMMEDIATE_FREQUENCY = "Once"
 INTERVAL_FREQUENCY = "Interval"
 DAILY_FREQUENCY = "Daily"
+CRON_FREQUENCY = "Cron"
+DEFAULT_CRON_EXPRESSION = "0 * * * *"
 
 # Datetime values and translation settings
-TIME_VALUES = {"Minutes": 59, "Hours": 59, "Days": 364, "Weeks": 51}
+TIME_VALUES = {"Milliseconds": 999, "Seconds": 59, "Minutes": 59, "Hours": 59, "Days": 364, "Weeks": 51}
 DATE_TRANSLATION = {"Days": timedelta(days=1), "Hours": timedelta(hours=1), "Minutes": timedelta(minutes=1),
-                    "Weeks": timedelta(weeks=1)}
+                    "Weeks": timedelta(weeks=1), "Seconds": timedelta(seconds=1),
+                    "Milliseconds": timedelta(milliseconds=1)}
+DEFAULT_TIME_UNIT = "Minutes"
 WEEK_DAYS = {
     0: "Mon",
     1: "Tue",
@@ -43,10 +67,80 @@ WEEK_DAYS = {
     6: "Sun"
 }
 
+# Upcoming runs timeline: horizon and bin size per view
+TIMELINE_VIEWS = {
+    "Next 24h": (timedelta(hours=24), timedelta(minutes=15)),
+    "Next 7d": (timedelta(days=7), timedelta(hours=2)),
+}
+
 # Log directories
 BASE_LOG_DIR = os.path.join(HOME_DIR, "logs")
 DEFAULT_LOG_DIR_OUT = f"{BASE_LOG_DIR}/stdout.txt"
 
+# Job spec files that are kept in sync with the running tasks
+JOB_SPEC_DIR = os.path.join(HOME_DIR, "jobs")
+JOB_SPEC_SYNC_INTERVAL = 5
+
+# Seconds between refreshes of the task state shared by all app sessions
+STATUS_MONITOR_INTERVAL = 2
+
+# Minimum seconds between updates of the task table of an open page, 0 to only update on user input
+AUTO_REFRESH_INTERVAL = 5
+
+# Tasks per page of the task table, only the displayed page is sent to the browser
+TASK_TABLE_PAGE_SIZE = 50
+
+# Local HTTP/JSON API for submitting and managing tasks from other programs ('tasklit api')
+API_HOST = "127.0.0.1"
+API_PORT = 8502
+API_MAX_BODY_BYTES = 1024 * 1024
+# Secret that API requests have to send as 'Authorization: Bearer <token>', created on first use
+API_TOKEN_PATH = os.path.join(HOME_DIR, "api_token")
+# Maximum amount of submitted tasks saved per DB transaction
+API_BATCH_SIZE = 1000
+# Submitted tasks whose scheduler process is started per batch, and seconds between checks for submitted tasks
+TASK_START_BATCH_SIZE = 50
+TASK_START_INTERVAL = 5
+# Seconds before a queued task whose scheduler process could not be started is tried again,
+# doubled after every further failure up to the maximum
+TASK_START_RETRY_DELAY = 5
+TASK_START_MAX_RETRY_DELAY = 300
+
+# Control channel: Unix domain socket of the scheduler daemon ('tasklit daemon') for task actions of the app
+# and the command line, and folder of the sockets that scheduler processes listen on for the daemon's requests
+CONTROL_SOCKET_PATH = os.path.join(HOME_DIR, "tasklit.sock")
+CONTROL_SOCKET_DIR = os.path.join(HOME_DIR, "control")
+# Seconds to wait for the answer to a control request, and maximum size of a control message
+CONTROL_TIMEOUT = 5
+CONTROL_MAX_MESSAGE_BYTES = 1024 * 1024
+# Seconds a scheduler process asked to stop waits for its running job to exit after terminating it,
+# and again after killing it. Both together have to stay below CONTROL_TIMEOUT.
+SCHEDULER_STOP_TIMEOUT = 1
+
+# Holiday and blackout calendars (ICS or CSV files) that schedules can refer to by file name
+CALENDAR_DIR = os.path.join(HOME_DIR, "calendars")
+
+# Module run by scheduler processes, started with the pickled task on stdin
+SCHEDULER_MODULE = "tasklit.src.utils.scheduler"
+
+# Live log streaming
+LOG_STREAM_MAX_FPS = 4
+LOG_STREAM_HEARTBEAT = 1
+LOG_STREAM_BACKLOG_BYTES = 64 * 1024
+
+# In-memory output buffers of running jobs
+OUTPUT_BUFFER_SIZE = 1024 * 1024
+OUTPUT_READ_SIZE = 64 * 1024
+
+# Retention of process information, run history and logs
+RETENTION_MAX_AGE = timedelta(days=30)
+RETENTION_MAX_RUNS_PER_TASK = 1000
+RETENTION_MAX_LOG_BYTES = 1024 * 1024 * 1024
+RETENTION_MAX_CHANGES = 10000
+GC_BATCH_SIZE = 50
+GC_BATCH_PAUSE = 1
+GC_INTERVAL = 300
+
 if os.name == 'nt':
     DEFAULT_TEST_COMMAND = 'ping 8.8.8.8'
 else:
@@ -0,0 +1,513 @@
+"""
+Local HTTP/JSON API for submitting and managing tasks from other programs, served with asyncio:
+
+    GET    /tasks              list tasks
+    POST   /tasks              submit a task (a job definition, see 'parse_job_spec') or a list of tasks
+    GET    /tasks/<id>         inspect a task
+    GET    /tasks/<id>/runs    run history of a task
+    DELETE /tasks/<id>         cancel a task: stop its scheduler process, '?remove=true' also removes it
+
+Requests have to send the secret of the install (see 'get_api_token') as 'Authorization: Bearer <token>',
+bodies have to be sent as 'Content-Type: application/json'. Requests naming another host than the local
+machine, or sent by web pages of other origins, are rejected, so that web pages opened in a browser
+cannot submit tasks, neither directly nor through DNS rebinding.
+
+Submitted tasks are saved in batches, one DB transaction for all submissions that arrive while
+the previous batch is being saved, and answered with '202 Accepted' once saved. Their scheduler
+processes are started in the background by the task starter.
+"""
+import asyncio
+import hmac
+import json
+import logging
+import os
+import secrets
+
+from datetime import datetime
+from http import HTTPStatus
+from typing import (
+    Any,
+    Dict,
+    List,
+    Optional,
+    Tuple
+)
+from urllib.parse import parse_qs, urlsplit
+
+from sqlalchemy import engine
+from sqlalchemy.engine import Row
+
+import tasklit.settings.consts as settings
+import tasklit.src.utils.database as database
+import tasklit.src.utils.processes as processes
+import tasklit.src.utils.task_starter as task_starter
+
+from tasklit.src.utils.job_specs import get_job_spec_task, parse_job_specs
+from tasklit.src.utils.task_states import cancel_task, format_task
+
+logger = logging.getLogger(__name__)
+
+# Host names of the local machine accepted in the 'Host' and 'Origin' headers
+LOCAL_HOSTS = ("localhost", "127.0.0.1", "::1")
+
+
+class HTTPError(Exception):
+    """
+    Request that cannot be handled, answered with an error status and message.
+    """
+
+    def __init__(self, status: HTTPStatus, message: Optional[str] = None) -> None:
+        """
+        Args:
+            status: HTTP status of the response.
+            message: (optional) error message, the status phrase if not set.
+        """
+        super().__init__(message or status.phrase)
+        self.status = status
+
+
+def get_api_token() -> str:
+    """
+    Get the secret that API requests have to send, creating it on first use.
+    Only the user running tasklit can read it.
+
+    Returns:
+        API token.
+    """
+    try:
+        with open(settings.API_TOKEN_PATH, "r", encoding="utf-8") as reader:
+            if token := reader.read().strip():
+                return token
+    except FileNotFoundError:
+        pass
+
+    token = secrets.token_urlsafe(32)
+    os.makedirs(os.path.dirname(settings.API_TOKEN_PATH), exist_ok=True)
+
+    with open(os.open(settings.API_TOKEN_PATH, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), "w",
+              encoding="utf-8") as writer:
+        writer.write(token)
+
+    return token
+
+
+def check_request(method: str, headers: Dict[str, str], token: str, hosts: Tuple[str, ...] = LOCAL_HOSTS) -> None:
+    """
+    Check that a request has been sent to the local machine by a client knowing the API token.
+
+    Args:
+        method: HTTP method.
+        headers: request headers, keyed by lower case name.
+        token: API token.
+        hosts: host names the API may be addressed by.
+
+    Raises:
+        HTTPError: if the request names another host, comes from a web page of another origin,
+            does not send the token, or sends a body that is not JSON.
+    """
+    try:
+        host = urlsplit(f"//{headers.get('host', '')}").hostname
+        origin = urlsplit(headers["origin"]).hostname if "origin" in headers else None
+    except ValueError:
+        raise HTTPError(HTTPStatus.BAD_REQUEST, "Malformed 'Host' or 'Origin' header.")
+
+    if host not in hosts:
+        raise HTTPError(HTTPStatus.FORBIDDEN, "The API may only be addressed as localhost.")
+
+    if "origin" in headers and origin not in hosts:
+        raise HTTPError(HTTPStatus.FORBIDDEN, "Requests of other origins are not allowed.")
+
+    scheme, _, sent_token = headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not hmac.compare_digest(sent_token.strip().encode(), token.encode()):
+        raise HTTPError(HTTPStatus.UNAUTHORIZED, f"Send the token in {settings.API_TOKEN_PATH} "
+                                                 f"as 'Authorization: Bearer <token>'.")
+
+    if method in ("POST", "PUT", "PATCH") and \
+            headers.get("content-type", "").split(";")[0].strip().lower() != "application/json":
+        raise HTTPError(HTTPStatus.UNSUPPORTED_MEDIA_TYPE, "Send request bodies as 'application/json'.")
+
+
+def read_task_runs(job_name: str) -> List[Dict[str, str]]:
+    """
+    Read the run history of a job from its execution log.
+
+    Args:
+        job_name: name of the job.
+
+    Returns:
+        runs with their time and log message, oldest first. Empty if the job has not run yet.
+    """
+    try:
+        with open(f"{settings.BASE_LOG_DIR}/{job_name}.txt", "r", encoding="utf-8") as reader:
+            lines = reader.read().splitlines()
+    except FileNotFoundError:
+        return []
+
+    runs = []
+    date_length = len(datetime.now().strftime(settings.DATE_FORMAT))
+
+    for line in lines:
+        if len(line) > date_length:
+            runs.append({"time": line[:date_length], "message": line[date_length + 1:].split(" ", 1)[0]})
+
+    return runs
+
+
+class TaskApi:
+    """
+    Request handling of the HTTP/JSON API. All DB access and process control runs in the default executor,
+    so that slow requests do not hold up the event loop.
+    """
+
+    def __init__(self, sql_engine: engine, token: Optional[str] = None, hosts: Tuple[str, ...] = LOCAL_HOSTS) -> None:
+        """
+        Args:
+            sql_engine: sql alchemy engine to use.
+            token: (optional) token requests have to send, the token of the install if not set.
+            hosts: host names the API may be addressed by.
+        """
+        self.sql_engine = sql_engine
+        self.hosts = hosts
+        self._token = token
+        self._submissions: Optional[asyncio.Queue] = None
+        self._writer: Optional[asyncio.Task] = None
+
+    @property
+    def token(self) -> str:
+        """
+        Token that HTTP requests have to send, read when the first connection is served.
+        """
+        if self._token is None:
+            self._token = get_api_token()
+
+        return self._token
+
+    async def handle(self, method: str, target: str, body: bytes) -> Tuple[HTTPStatus, Any]:
+        """
+        Handle an API request.
+
+        Args:
+            method: HTTP method.
+            target: request target, path and query.
+            body: request body.
+
+        Raises:
+            HTTPError: if the request cannot be handled.
+
+        Returns:
+            response status and JSON content.
+        """
+        url = urlsplit(target)
+        query = parse_qs(url.query)
+        path = [part for part in url.path.split("/") if part]
+
+        if not path or path[0] != "tasks" or len(path) > 3 or (len(path) == 3 and path[2] != "runs"):
+            raise HTTPError(HTTPStatus.NOT_FOUND)
+
+        if len(path) == 1:
+            if method == "GET":
+                return HTTPStatus.OK, await self.list_tasks(query.get("state", [None])[0])
+            if method == "POST":
+                return HTTPStatus.ACCEPTED, await self.submit_tasks(body)
+            raise HTTPError(HTTPStatus.METHOD_NOT_ALLOWED)
+
+        try:
+            task_id = int(path[1])
+        except ValueError:
+            raise HTTPError(HTTPStatus.NOT_FOUND)
+
+        if len(path) == 3 and method == "GET":
+            return HTTPStatus.OK, await self.get_task_runs(task_id)
+        if len(path) == 2 and method == "GET":
+            return HTTPStatus.OK, await self.get_task(task_id)
+        if len(path) == 2 and method == "DELETE":
+            remove = query.get("remove", ["false"])[0].lower() in ("1", "true", "yes")
+            return HTTPStatus.OK, await self.cancel_task(task_id, remove)
+
+        raise HTTPError(HTTPStatus.METHOD_NOT_ALLOWED)
+
+    async def _run(self, func, *args) -> Any:
+        return await asyncio.get_running_loop().run_in_executor(None, func, *args)
+
+    def _read_process_cache(self) -> database.ProcessChangeCache:
+        process_cache = database.get_process_cache(self.sql_engine)
+        process_cache.refresh()
+
+        return process_cache
+
+    def _find_task(self, task_id: int) -> Row:
+        if (row := self._read_process_cache().rows_by_id.get(task_id)) is None:
+            raise HTTPError(HTTPStatus.NOT_FOUND, f"No task {task_id}.")
+
+        return row
+
+    async def list_tasks(self, state: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        List all tasks, ordered by task ID.
+
+        Args:
+            state: (optional) only list tasks in this state.
+
+        Returns:
+            task information.
+        """
+        def read_tasks() -> List[Dict[str, Any]]:
+            # The state of all tasks is checked in one process table snapshot.
+            running_processes = processes.get_running_processes()
+            return [format_task(row, running_processes=running_processes) for row in self._read_process_cache().rows]
+
+        tasks = await self._run(read_tasks)
+
+        return [task for task in tasks if state is None or task["state"] == state]
+
+    async def get_task(self, task_id: int) -> Dict[str, Any]:
+        """
+        Inspect a task.
+
+        Args:
+            task_id: task ID.
+
+        Raises:
+            HTTPError: if there is no such task.
+
+        Returns:
+            task information.
+        """
+        return await self._run(lambda: format_task(self._find_task(task_id)))
+
+    async def get_task_runs(self, task_id: int) -> List[Dict[str, str]]:
+        """
+        Get the run history of a task.
+
+        Args:
+            task_id: task ID.
+
+        Raises:
+            HTTPError: if there is no such task.
+
+        Returns:
+            runs of the task, oldest first.
+        """
+        return await self._run(lambda: read_task_runs(self._find_task(task_id)["job name"]))
+
+    async def cancel_task(self, task_id: int, remove: bool = False) -> Dict[str, Any]:
+        """
+        Cancel a task: stop its scheduler process, queued tasks are removed before they are started.
+
+        Args:
+            task_id: task ID.
+            remove: whether to remove the task from the processes table.
+
+        Raises:
+            HTTPError: if there is no such task.
+
+        Returns:
+            task ID and whether the task has been removed.
+        """
+        return {
+            "task_id": task_id,
+            "removed": await self._run(lambda: cancel_task(self._find_task(task_id), remove, self.sql_engine))
+        }
+
+    async def submit_tasks(self, body: bytes) -> Dict[str, Any]:
+        """
+        Validate and save submitted tasks, which are started by the task starter.
+        The request waits until the batch holding its tasks has been saved.
+
+        Args:
+            body: JSON job definition, or list of job definitions.
+
+        Raises:
+            HTTPError: if the body is not valid JSON or any job definition is invalid.
+
+        Returns:
+            IDs and job names of the saved tasks, in submission order.
+        """
+        try:
+            entries = json.loads(body)
+            job_specs = parse_job_specs(entries if isinstance(entries, list) else [entries])
+            tasks = [get_job_spec_task(job_spec) for job_spec in job_specs]
+        except (TypeError, ValueError) as exc:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, str(exc))
+
+        if self._writer is None or self._writer.done():
+            self._submissions = asyncio.Queue()
+            self._writer = asyncio.get_running_loop().create_task(self._write_submissions())
+
+        saved = asyncio.get_running_loop().create_future()
+        await self._submissions.put((tasks, saved))
+        await saved
+
+        return {
+            "task_ids": [task.task_id for task in tasks],
+            "job_names": [task.job_name for task in tasks],
+        }
+
+    async def _write_submissions(self) -> None:
+        # Submissions arriving while a batch is saved make up the next batch.
+        while True:
+            batch = [await self._submissions.get()]
+            size = len(batch[0][0])
+
+            while not self._submissions.empty() and size < settings.API_BATCH_SIZE:
+                batch.append(self._submissions.get_nowait())
+                size += len(batch[-1][0])
+
+            tasks = [task for submitted, _ in batch for task in submitted]
+
+            try:
+                await self._run(database.insert_tasks, tasks, self.sql_engine)
+            except Exception as exc:
+                logger.exception("Saving submitted tasks failed.")
+                for _, saved in batch:
+                    if not saved.done():
+                        saved.set_exception(exc)
+                continue
+
+            for _, saved in batch:
+                if not saved.done():
+                    saved.set_result(None)
+
+            task_starter.get_task_starter(self.sql_engine).wake()
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """
+        Serve the HTTP/1.1 requests of a client connection, keeping it open between requests.
+
+        Args:
+            reader: stream of the client connection.
+            writer: stream of the client connection.
+        """
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    return
+
+                keep_alive = True
+
+                try:
+                    method, target, version = request_line.decode("latin-1").split()
+                    headers = await read_headers(reader)
+                    keep_alive = headers.get("connection", "").lower() != "close" and version == "HTTP/1.1"
+                    length = int(headers.get("content-length", 0))
+
+                    if length > settings.API_MAX_BODY_BYTES:
+                        keep_alive = False
+                        raise HTTPError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE)
+
+                    try:
+                        check_request(method, headers, self.token, self.hosts)
+                    except HTTPError:
+                        # The body of a rejected request is not read.
+                        keep_alive = False
+                        raise
+
+                    status, content = await self.handle(method, target, await reader.readexactly(length))
+                except HTTPError as exc:
+                    status, content = exc.status, {"error": str(exc)}
+                except ValueError:
+                    status, content, keep_alive = HTTPStatus.BAD_REQUEST, {"error": "Malformed request."}, False
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    return
+                except Exception as exc:
+                    logger.exception("API request failed.")
+                    status, content = HTTPStatus.INTERNAL_SERVER_ERROR, {"error": str(exc)}
+
+                writer.write(format_response(status, content, keep_alive))
+                await writer.drain()
+
+                if not keep_alive:
+                    return
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+
+async def read_headers(reader: asyncio.StreamReader) -> Dict[str, str]:
+    """
+    Read the headers of an HTTP request.
+
+    Args:
+        reader: stream of the client connection.
+
+    Raises:
+        ValueError: if a header line is malformed.
+
+    Returns:
+        headers, keyed by lower case name.
+    """
+    headers = {}
+
+    while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+        name, value = line.decode("latin-1").split(":", 1)
+        headers[name.strip().lower()] = value.strip()
+
+    return headers
+
+
+def format_response(status: HTTPStatus, content: Any, keep_alive: bool = True) -> bytes:
+    """
+    Get an HTTP response with JSON content.
+
+    Args:
+        status: HTTP status.
+        content: content to send as JSON.
+        keep_alive: whether the connection is kept open.
+
+    Returns:
+        raw HTTP response.
+    """
+    body = json.dumps(content).encode("utf-8")
+    headers = (
+        f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+        f"Content-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+    )
+
+    return headers.encode("latin-1") + body
+
+
+async def start_api_server(sql_engine: engine,
+                           host: str = settings.API_HOST,
+                           port: int = settings.API_PORT,
+                           token: Optional[str] = None) -> asyncio.AbstractServer:
+    """
+    Start serving the API on the running event loop.
+
+    Args:
+        sql_engine: sql alchemy engine to use.
+        host: interface to listen on, only the local machine by default.
+        port: port to listen on, 0 for any free port.
+        token: (optional) token requests have to send, the token of the install if not set.
+
+    Returns:
+        the listening server.
+    """
+    # Listening on another interface, the API may also be addressed by its name or address.
+    hosts = LOCAL_HOSTS + ((host,) if host not in ("", "0.0.0.0", "::") else ())
+
+    return await asyncio.start_server(TaskApi(sql_engine, token, hosts).handle_connection, host, port)
+
+
+def serve_api(sql_engine: engine, host: str = settings.API_HOST, port: int = settings.API_PORT) -> None:
+    """
+    Serve the API and start the submitted tasks until interrupted.
+
+    Args:
+        sql_engine: sql alchemy engine to use.
+        host: interface to listen on, only the local machine by default.
+        port: port to listen on.
+    """
+    async def serve() -> None:
+        server = await start_api_server(sql_engine, host, port)
+        logger.info("Serving the tasklit API on %s.", ", ".join(str(s.getsockname()) for s in server.sockets))
+
+        async with server:
+            await server.serve_forever()
+
+    os.makedirs(settings.BASE_LOG_DIR, exist_ok=True)
+    task_starter.start_task_starter(sql_engine)
+    asyncio.run(serve())
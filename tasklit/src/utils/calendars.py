@@ -0,0 +1,359 @@
+import bisect
+import calendar
+import csv
+import io
+import os
+import re
+
+from datetime import date, datetime, time, timedelta, timezone
+from typing import (
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    Union
+)
+
+import tasklit.settings.consts as settings
+import tasklit.src.utils.timezones as timezones
+
+CALENDAR_FORMATS = ("ics", "csv")
+
+# Named calendars, keyed by file path, with the (mtime, size) signature of the file they were read from.
+_calendar_cache: Dict[str, Tuple[Tuple[int, int], "Calendar"]] = {}
+
+
+class Calendar:
+    """
+    Days and time windows during which scheduled jobs are not executed, e.g. holidays and maintenance windows.
+
+    Holidays are precomputed into one bitmap per year, bit N standing for day N of the year,
+    so checking a day and finding the next open day are bit operations.
+    Blackout windows are merged into sorted, non-overlapping windows that are searched by bisection.
+    All times are wall clock times of the schedule the calendar is used with.
+    """
+
+    def __init__(self, name: str, holidays: Iterable[date] = (),
+                 blackouts: Iterable[Tuple[datetime, datetime]] = ()) -> None:
+        """
+        Args:
+            name: calendar name.
+            holidays: days without job executions.
+            blackouts: (start, end) windows without job executions, end exclusive.
+        """
+        self.name = name
+        self._day_bitmaps: Dict[int, int] = {}
+
+        for holiday in holidays:
+            self._day_bitmaps[holiday.year] = \
+                self._day_bitmaps.get(holiday.year, 0) | 1 << holiday.timetuple().tm_yday
+
+        self._window_starts: List[datetime] = []
+        self._window_ends: List[datetime] = []
+
+        for start, end in sorted(window for window in blackouts if window[0] < window[1]):
+            if self._window_ends and start <= self._window_ends[-1]:
+                self._window_ends[-1] = max(self._window_ends[-1], end)
+            else:
+                self._window_starts.append(start)
+                self._window_ends.append(end)
+
+    def __repr__(self) -> str:
+        return f"Calendar({self.name!r})"
+
+    def is_holiday(self, day: date) -> bool:
+        """
+        Check whether a day is a holiday.
+
+        Args:
+            day: day to check.
+
+        Returns:
+            True/False based on the result of the check.
+        """
+        return bool(self._day_bitmaps.get(day.year, 0) >> day.timetuple().tm_yday & 1)
+
+    def is_blocked(self, moment: datetime) -> bool:
+        """
+        Check whether jobs may not be executed at a given time.
+
+        Args:
+            moment: wall clock time to check.
+
+        Returns:
+            True/False based on the result of the check.
+        """
+        if self.is_holiday(moment.date()):
+            return True
+
+        index = bisect.bisect_right(self._window_starts, moment) - 1
+
+        return index >= 0 and moment < self._window_ends[index]
+
+    def next_allowed(self, moment: datetime) -> datetime:
+        """
+        Get the first time at or after a given time at which jobs may be executed.
+
+        Args:
+            moment: wall clock time from which on to search.
+
+        Returns:
+            first unblocked wall clock time.
+        """
+        while True:
+            day = moment.date()
+
+            if self.is_holiday(day):
+                moment = datetime.combine(self._next_open_day(day), time())
+                continue
+
+            index = bisect.bisect_right(self._window_starts, moment) - 1
+
+            if index >= 0 and moment < self._window_ends[index]:
+                moment = self._window_ends[index]
+                continue
+
+            return moment
+
+    def get_blocked_windows(self, start: datetime, end: datetime) -> List[Tuple[datetime, datetime]]:
+        """
+        Get the windows during which jobs may not be executed between two times:
+        holidays as whole days and blackout windows, merged where they overlap.
+
+        Args:
+            start: wall clock time from which on to search.
+            end: wall clock time up to which to search, exclusive.
+
+        Returns:
+            sorted (start, end) windows within the searched time, end exclusive.
+        """
+        windows = [
+            (datetime.combine(day, time()), datetime.combine(day + timedelta(days=1), time()))
+            for day in (start.date() + timedelta(days=offset) for offset in range((end.date() - start.date()).days + 1))
+            if self.is_holiday(day)
+        ]
+
+        first = max(bisect.bisect_right(self._window_starts, start) - 1, 0)
+        last = bisect.bisect_left(self._window_starts, end)
+        windows.extend(zip(self._window_starts[first:last], self._window_ends[first:last]))
+
+        merged: List[Tuple[datetime, datetime]] = []
+
+        for window_start, window_end in sorted(windows):
+            if merged and window_start <= merged[-1][1]:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], window_end))
+            else:
+                merged.append((window_start, window_end))
+
+        return [
+            (max(window_start, start), min(window_end, end)) for window_start, window_end in merged
+            if window_start < end and window_end > start
+        ]
+
+    def _next_open_day(self, day: date) -> date:
+        year = day.year
+        day_of_year = day.timetuple().tm_yday
+
+        while True:
+            days_in_year = 366 if calendar.isleap(year) else 365
+            open_days = (~self._day_bitmaps.get(year, 0) & ((1 << (days_in_year + 1)) - 2)) >> day_of_year
+
+            if open_days:
+                # Position of the lowest set bit: the first open day at or after 'day_of_year'.
+                open_day = day_of_year + (open_days & -open_days).bit_length() - 1
+                return date(year, 1, 1) + timedelta(days=open_day - 1)
+
+            year, day_of_year = year + 1, 1
+
+
+def _parse_ics_value(value: str, params: Dict[str, str]) -> Union[date, datetime]:
+    if params.get("VALUE") == "DATE" or len(value) == 8:
+        return datetime.strptime(value, "%Y%m%d").date()
+
+    moment = datetime.strptime(value.rstrip("Z"), "%Y%m%dT%H%M%S")
+
+    if value.endswith("Z"):
+        moment = moment.replace(tzinfo=timezone.utc)
+    elif "TZID" in params:
+        moment = moment.replace(tzinfo=timezones.get_timezone(params["TZID"]))
+    else:
+        return moment
+
+    # Times of a fixed timezone are converted into local wall clock times.
+    return moment.astimezone(timezones.get_timezone()).replace(tzinfo=None)
+
+
+def parse_calendar_ics(content: str) -> Tuple[List[date], List[Tuple[datetime, datetime]]]:
+    """
+    Read the events of an iCalendar file: all-day events become holidays,
+    events with start and end time become blackout windows.
+
+    Args:
+        content: iCalendar file content.
+
+    Raises:
+        ValueError: if an event has no valid start or is recurring.
+
+    Returns:
+        holidays and blackout windows.
+    """
+    holidays, blackouts = [], []
+    event: Optional[Dict[str, Union[date, datetime]]] = None
+    event_number = 0
+
+    # Long lines are folded into lines starting with a space or tab.
+    for line in re.sub(r"\r?\n[ \t]", "", content).splitlines():
+        name_part, _, value = line.partition(":")
+        name, *param_parts = name_part.split(";")
+        name = name.upper()
+        params = dict(param.split("=", 1) for param in param_parts if "=" in param)
+
+        if name == "BEGIN" and value.upper() == "VEVENT":
+            event = {}
+            event_number += 1
+        elif name == "END" and value.upper() == "VEVENT" and event is not None:
+            if "DTSTART" not in event:
+                raise ValueError(f"Event {event_number}: missing DTSTART.")
+
+            start = event["DTSTART"]
+            if isinstance(start, datetime):
+                blackouts.append((start, event.get("DTEND", start)))
+            else:
+                end = event.get("DTEND", start + timedelta(days=1))
+                holidays.extend(start + timedelta(days=offset) for offset in range(max((end - start).days, 1)))
+            event = None
+        elif event is not None and name in ("DTSTART", "DTEND"):
+            try:
+                event[name] = _parse_ics_value(value.strip(), params)
+            except ValueError as exc:
+                raise ValueError(f"Event {event_number}: invalid {name} '{value}'.") from exc
+        elif event is not None and name in ("RRULE", "RDATE"):
+            raise ValueError(f"Event {event_number}: recurring events are not supported, list every occurrence.")
+
+    return holidays, blackouts
+
+
+def parse_calendar_csv(content: str) -> Tuple[List[date], List[Tuple[datetime, datetime]]]:
+    """
+    Read a CSV calendar with the columns 'start' and 'end' (optional for holidays).
+    Rows with dates are holidays, from start to end inclusive; rows with datetimes are blackout windows.
+
+    Args:
+        content: CSV file content.
+
+    Raises:
+        ValueError: if a row has invalid dates or a blackout window has no end.
+
+    Returns:
+        holidays and blackout windows.
+    """
+    holidays, blackouts = [], []
+
+    for row_number, row in enumerate(csv.DictReader(io.StringIO(content)), start=2):
+        start, end = (row.get("start") or "").strip(), (row.get("end") or "").strip()
+
+        try:
+            if len(start) == 10 and len(end) in (0, 10):
+                first_day = date.fromisoformat(start)
+                last_day = date.fromisoformat(end) if end else first_day
+                holidays.extend(first_day + timedelta(days=offset) for offset in range((last_day - first_day).days + 1))
+            elif end:
+                blackouts.append((datetime.fromisoformat(start), datetime.fromisoformat(end)))
+            else:
+                raise ValueError("blackout windows need an end")
+        except ValueError as exc:
+            raise ValueError(f"Row {row_number}: {exc}.") from exc
+
+    return holidays, blackouts
+
+
+def load_calendar(content: Union[str, bytes], file_format: str, name: str) -> Calendar:
+    """
+    Read a calendar from the contents of an iCalendar or CSV file.
+
+    Args:
+        content: file content.
+        file_format: file format, one of CALENDAR_FORMATS.
+        name: calendar name.
+
+    Raises:
+        ValueError: if the format is not supported or the file is invalid.
+
+    Returns:
+        calendar.
+    """
+    if isinstance(content, bytes):
+        content = content.decode("utf-8-sig")
+
+    file_format = file_format.lower().lstrip(".")
+
+    if file_format == "ics":
+        holidays, blackouts = parse_calendar_ics(content)
+    elif file_format == "csv":
+        holidays, blackouts = parse_calendar_csv(content)
+    else:
+        raise ValueError(f"Unsupported calendar format '{file_format}', use one of {list(CALENDAR_FORMATS)}.")
+
+    return Calendar(name, holidays, blackouts)
+
+
+def list_calendars(calendar_dir: str = settings.CALENDAR_DIR) -> List[str]:
+    """
+    Get the names of all calendars of the calendar directory.
+
+    Args:
+        calendar_dir: folder with iCalendar and CSV calendar files.
+
+    Returns:
+        sorted list of calendar names, the file names without extension.
+    """
+    if not os.path.isdir(calendar_dir):
+        return []
+
+    return sorted(
+        os.path.splitext(file_name)[0] for file_name in os.listdir(calendar_dir)
+        if os.path.splitext(file_name)[1].lstrip(".") in CALENDAR_FORMATS
+    )
+
+
+def get_calendar(name: Optional[str], calendar_dir: str = settings.CALENDAR_DIR) -> Optional[Calendar]:
+    """
+    Get a calendar of the calendar directory by name. Calendar files are only read again
+    once they have been modified, so looking up a calendar before every run is cheap.
+
+    Args:
+        name: (optional) calendar name.
+        calendar_dir: folder with iCalendar and CSV calendar files.
+
+    Raises:
+        ValueError: if the calendar file is invalid.
+
+    Returns:
+        calendar, None if no name is given or there is no calendar with this name.
+    """
+    if not name:
+        return None
+
+    for file_format in CALENDAR_FORMATS:
+        path = os.path.join(calendar_dir, f"{name}.{file_format}")
+        try:
+            stat = os.stat(path)
+            break
+        except FileNotFoundError:
+            continue
+    else:
+        return None
+
+    signature = (stat.st_mtime_ns, stat.st_size)
+    cached = _calendar_cache.get(path)
+
+    if cached is None or cached[0] != signature:
+        with open(path, "rb") as calendar_file:
+            try:
+                cached = (signature, load_calendar(calendar_file.read(), file_format, name))
+            except ValueError as exc:
+                raise ValueError(f"{os.path.basename(path)}: {exc}") from exc
+        _calendar_cache[path] = cached
+
+    return cached[1]
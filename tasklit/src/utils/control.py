@@ -0,0 +1,395 @@
+"""
+Control channel: framed JSON requests and responses over Unix domain sockets.
+
+The scheduler daemon ('tasklit daemon') listens on CONTROL_SOCKET_PATH for the task actions of the app and the
+command line interface, and every scheduler process listens on a socket of its own for the daemon's requests,
+so that pausing, resuming, running or cancelling a task takes effect right away. Each message is a JSON object
+preceded by its length as a 4-byte big-endian integer:
+
+    request:   {"command": "pause", "task_id": 1}
+    response:  {"ok": true, "result": {...}}  or  {"ok": false, "error": "No task 1."}
+
+A connection can carry any number of requests, each one is answered before the next one is read.
+Imported by scheduler processes, this module must stay light: it may only use the standard library.
+"""
+import hashlib
+import json
+import logging
+import os
+import socket
+import socketserver
+import struct
+import threading
+
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Optional
+)
+
+import tasklit.settings.consts as settings
+
+logger = logging.getLogger(__name__)
+
+# Commands of the scheduler daemon
+SUBMIT_COMMAND = "submit"
+CANCEL_COMMAND = "cancel"
+# Commands of the scheduler daemon, forwarded to the scheduler process of the task
+PAUSE_COMMAND = "pause"
+RESUME_COMMAND = "resume"
+RUN_NOW_COMMAND = "run_now"
+# Commands of the scheduler daemon and of scheduler processes
+STATE_COMMAND = "state"
+# Commands of scheduler processes
+STOP_COMMAND = "stop"
+
+# Whether the platform supports Unix domain sockets, tasks can only be terminated without them.
+CONTROL_SUPPORTED = hasattr(socket, "AF_UNIX")
+
+# Length prefix of a message.
+_LENGTH = struct.Struct(">I")
+
+
+class ControlError(Exception):
+    """
+    Control request that has been rejected, or answered with an error.
+    """
+
+
+def get_scheduler_socket_path(job_name: str) -> str:
+    """
+    Get the path of the control socket of a job's scheduler process. Names are hashed
+    to stay within the length limit of socket paths.
+
+    Args:
+        job_name: name of the job.
+
+    Returns:
+        socket path.
+    """
+    return os.path.join(settings.CONTROL_SOCKET_DIR, f"{hashlib.md5(job_name.encode('utf-8')).hexdigest()[:16]}.sock")
+
+
+def remove_scheduler_socket(job_name: str) -> bool:
+    """
+    Remove the control socket left behind by a job's scheduler process that has been terminated.
+
+    Args:
+        job_name: name of the job.
+
+    Returns:
+        True if a socket has been removed, False if there is none or a scheduler process is listening on it.
+    """
+    socket_path = get_scheduler_socket_path(job_name)
+
+    try:
+        ControlClient(socket_path).close()
+        return False
+    except ConnectionRefusedError:
+        pass
+    except OSError:
+        return False
+
+    try:
+        os.unlink(socket_path)
+    except FileNotFoundError:
+        return False
+
+    return True
+
+
+def send_message(connection: socket.socket, message: Dict[str, Any]) -> None:
+    """
+    Send a message as one frame.
+
+    Args:
+        connection: connected socket.
+        message: JSON object to send.
+
+    Raises:
+        OSError: if the message cannot be sent.
+    """
+    data = json.dumps(message).encode("utf-8")
+    connection.sendall(_LENGTH.pack(len(data)) + data)
+
+
+def _receive_exactly(connection: socket.socket, size: int) -> bytes:
+    data = bytearray()
+
+    while len(data) < size:
+        chunk = connection.recv(size - len(data))
+        if not chunk:
+            break
+        data += chunk
+
+    return bytes(data)
+
+
+def receive_message(connection: socket.socket) -> Optional[Dict[str, Any]]:
+    """
+    Receive the next message of a connection.
+
+    Args:
+        connection: connected socket.
+
+    Raises:
+        ConnectionError: if the connection is closed in the middle of a message.
+        ValueError: if the message is too large or not a JSON object.
+        OSError: if the message cannot be received.
+
+    Returns:
+        received JSON object, None if the connection has been closed.
+    """
+    header = _receive_exactly(connection, _LENGTH.size)
+    if not header:
+        return None
+
+    if len(header) < _LENGTH.size:
+        raise ConnectionError("The connection has been closed in the middle of a message.")
+
+    (length,) = _LENGTH.unpack(header)
+    if length > settings.CONTROL_MAX_MESSAGE_BYTES:
+        raise ValueError(f"Messages may not be larger than {settings.CONTROL_MAX_MESSAGE_BYTES} bytes.")
+
+    data = _receive_exactly(connection, length)
+    if len(data) < length:
+        raise ConnectionError("The connection has been closed in the middle of a message.")
+
+    message = json.loads(data)
+    if not isinstance(message, dict):
+        raise ValueError("Messages have to be JSON objects.")
+
+    return message
+
+
+class ControlClient:
+    """
+    Connection to a control socket.
+    """
+
+    def __init__(self, socket_path: str, timeout: float = settings.CONTROL_TIMEOUT) -> None:
+        """
+        Args:
+            socket_path: path of the control socket.
+            timeout: seconds to wait for a connection or a response.
+
+        Raises:
+            OSError: if nothing is listening on the socket, or Unix domain sockets are not supported.
+        """
+        if not CONTROL_SUPPORTED:
+            raise OSError("Unix domain sockets are not supported on this platform.")
+
+        self._connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._connection.settimeout(timeout)
+
+        try:
+            self._connection.connect(socket_path)
+        except OSError as exc:
+            self._connection.close()
+            raise exc
+
+    def request(self, command: str, **arguments: Any) -> Any:
+        """
+        Send a request and wait for its response.
+
+        Args:
+            command: command to run.
+            **arguments: arguments of the command.
+
+        Raises:
+            ControlError: if the request has been answered with an error.
+            OSError: if the request cannot be sent or the response cannot be received in time.
+
+        Returns:
+            result of the command.
+        """
+        send_message(self._connection, dict(arguments, command=command))
+
+        try:
+            response = receive_message(self._connection)
+        except ValueError as exc:
+            raise ConnectionError(f"Malformed response: {exc}")
+
+        if response is None:
+            raise ConnectionError("The connection has been closed before the response has been received.")
+
+        if not response.get("ok"):
+            raise ControlError(response.get("error") or "The request has failed.")
+
+        return response.get("result")
+
+    def close(self) -> None:
+        self._connection.close()
+
+    def __enter__(self) -> "ControlClient":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def send_request(socket_path: str, command: str, **arguments: Any) -> Any:
+    """
+    Send a single request to a control socket.
+
+    Args:
+        socket_path: path of the control socket.
+        command: command to run.
+        **arguments: arguments of the command.
+
+    Raises:
+        ControlError: if the request has been answered with an error.
+        OSError: if nothing is listening on the socket or the request fails.
+
+    Returns:
+        result of the command.
+    """
+    with ControlClient(socket_path) as client:
+        return client.request(command, **arguments)
+
+
+def send_daemon_request(command: str, **arguments: Any) -> Any:
+    """
+    Send a single request to the scheduler daemon.
+
+    Args:
+        command: command to run.
+        **arguments: arguments of the command.
+
+    Raises:
+        ControlError: if the request has been answered with an error.
+        OSError: if the daemon is not running or the request fails.
+
+    Returns:
+        result of the command.
+    """
+    return send_request(settings.CONTROL_SOCKET_PATH, command, **arguments)
+
+
+def is_daemon_running() -> bool:
+    """
+    Check whether the scheduler daemon is listening on its control socket.
+
+    Returns:
+        True/False based on the result of the check.
+    """
+    try:
+        ControlClient(settings.CONTROL_SOCKET_PATH).close()
+    except OSError:
+        return False
+
+    return True
+
+
+class _ControlRequestHandler(socketserver.BaseRequestHandler):
+    """
+    Answers the requests of a connection to a control server.
+    """
+
+    def handle(self) -> None:
+        while True:
+            try:
+                request = receive_message(self.request)
+            except ValueError as exc:
+                send_message(self.request, {"ok": False, "error": f"Malformed request: {exc}"})
+                return
+            except OSError:
+                return
+
+            if request is None:
+                return
+
+            send_message(self.request, self.server.control_server.respond(request))
+
+
+class ControlServer:
+    """
+    Answers control requests on a Unix domain socket, each connection in a thread of its own.
+    """
+
+    def __init__(self, socket_path: str, handler: Callable[[Dict[str, Any]], Any], replace: bool = False) -> None:
+        """
+        Args:
+            socket_path: path of the control socket.
+            handler: function returning the JSON result of a request, raising ControlError to reject it.
+            replace: whether to take over the socket path while another server is listening on it.
+        """
+        self.socket_path = socket_path
+        self.handler = handler
+        self.replace = replace
+        self._server: Optional[socketserver.BaseServer] = None
+        self._inode: Optional[int] = None
+
+    def respond(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Get the response to a request.
+
+        Args:
+            request: received request.
+
+        Returns:
+            response with the result of the request, or the error it failed with.
+        """
+        try:
+            return {"ok": True, "result": self.handler(request)}
+        except ControlError as exc:
+            return {"ok": False, "error": str(exc)}
+        except Exception as exc:
+            logger.exception("Control request %s failed.", request.get("command"))
+            return {"ok": False, "error": str(exc)}
+
+    def start(self) -> "ControlServer":
+        """
+        Listen on the socket, replacing the socket file left behind by a server that is no longer running,
+        and answer requests in the background. Only the user running tasklit can connect.
+
+        Raises:
+            OSError: if another server is listening on the socket (unless replacing it),
+                or Unix domain sockets are not supported.
+
+        Returns:
+            the started server.
+        """
+        if not CONTROL_SUPPORTED:
+            raise OSError("Unix domain sockets are not supported on this platform.")
+
+        os.makedirs(os.path.dirname(self.socket_path), exist_ok=True)
+
+        if os.path.exists(self.socket_path):
+            if not self.replace:
+                try:
+                    ControlClient(self.socket_path).close()
+                    raise OSError(f"Another process is listening on {self.socket_path}.")
+                except ConnectionRefusedError:
+                    pass
+            os.unlink(self.socket_path)
+
+        server = socketserver.ThreadingUnixStreamServer(self.socket_path, _ControlRequestHandler)
+        server.daemon_threads = True
+        server.control_server = self
+        os.chmod(self.socket_path, 0o600)
+
+        self._server = server
+        self._inode = os.stat(self.socket_path).st_ino
+
+        threading.Thread(target=server.serve_forever, name="tasklit-control", daemon=True).start()
+
+        return self
+
+    def close(self) -> None:
+        """
+        Stop answering requests and remove the socket file, unless it has been taken over by another server.
+        """
+        if self._server is None:
+            return
+
+        self._server.shutdown()
+        self._server.server_close()
+        self._server = None
+
+        try:
+            if os.stat(self.socket_path).st_ino == self._inode:
+                os.unlink(self.socket_path)
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,377 @@
+import calendar
+import re
+import subprocess
+
+from datetime import datetime, timedelta
+from typing import (
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple
+)
+
+from tasklit.src.utils.timezones import to_utc
+
+MACROS = {
+    "@yearly": "0 0 1 1 *",
+    "@annually": "0 0 1 1 *",
+    "@monthly": "0 0 1 * *",
+    "@weekly": "0 0 * * 0",
+    "@daily": "0 0 * * *",
+    "@midnight": "0 0 * * *",
+    "@hourly": "0 * * * *",
+}
+
+MONTH_NAMES = {name: number for number, name in enumerate(
+    ["jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"], start=1
+)}
+WEEKDAY_NAMES = {name: number for number, name in enumerate(["sun", "mon", "tue", "wed", "thu", "fri", "sat"])}
+
+# Bits 0, 7, 14, 21 and 28: shifted by the day offset of a weekday, this marks
+# every day of a month that falls on that weekday.
+_EVERY_SEVENTH_DAY = sum(1 << (7 * week) for week in range(5))
+
+# Upper bound for the search of the next fire time, e.g. '0 0 29 2 *' only fires in leap years.
+_MAX_SEARCH_YEARS = 8
+
+
+class _Field(NamedTuple):
+    name: str
+    low: int
+    high: int
+    names: Dict[str, int]
+
+
+_SECOND = _Field("second", 0, 59, {})
+_MINUTE = _Field("minute", 0, 59, {})
+_HOUR = _Field("hour", 0, 23, {})
+_DAY = _Field("day of month", 1, 31, {})
+_MONTH = _Field("month", 1, 12, MONTH_NAMES)
+_WEEKDAY = _Field("day of week", 0, 7, WEEKDAY_NAMES)
+
+
+def _parse_value(value: str, field: _Field) -> int:
+    number = field.names.get(value.lower()) if not value.isdigit() else int(value)
+
+    if number is None or not field.low <= number <= field.high:
+        raise ValueError(f"invalid {field.name} '{value}'")
+
+    return number
+
+
+def compile_field(expression: str, field: _Field) -> int:
+    """
+    Compile one field of a cron expression into a bitset, bit N is set if value N matches.
+
+    Args:
+        expression: field expression, e.g. '*', '*/15', '1-5', 'mon,wed,fri' or '0-30/10'.
+        field: field definition with value range and names.
+
+    Raises:
+        ValueError: if the expression is invalid.
+
+    Returns:
+        bitset of matching values.
+    """
+    bits = 0
+
+    for part in expression.split(","):
+        range_part, _, step_part = part.partition("/")
+        step = int(step_part) if step_part.isdigit() else None
+
+        if step_part and not step:
+            raise ValueError(f"invalid {field.name} step '{step_part}'")
+
+        if range_part in ("*", "?"):
+            low, high = field.low, field.high
+        elif "-" in range_part:
+            low, high = (_parse_value(value, field) for value in range_part.split("-", 1))
+        else:
+            low = _parse_value(range_part, field)
+            high = field.high if step else low
+
+        if low > high:
+            raise ValueError(f"invalid {field.name} range '{range_part}'")
+
+        for value in range(low, high + 1, step or 1):
+            bits |= 1 << value
+
+    return bits
+
+
+def _next_bit(bits: int, start: int) -> Optional[int]:
+    """
+    Find the lowest set bit at or above position 'start'.
+    """
+    remaining = bits >> start
+
+    if not remaining:
+        return None
+
+    return start + (remaining & -remaining).bit_length() - 1
+
+
+class CronSchedule:
+    """
+    Cron expression compiled into one bitset per field. The next fire time is found
+    with a few bit scans per calendar unit instead of checking minute after minute.
+
+    Supported are 5-field expressions (minute hour day-of-month month day-of-week),
+    6-field expressions with a leading seconds field and the '@hourly', '@daily', ... macros.
+    As in Vixie cron, a day matches either field if both day-of-month and day-of-week are restricted.
+    """
+
+    def __init__(self, expression: str) -> None:
+        """
+        Args:
+            expression: cron expression.
+
+        Raises:
+            ValueError: if the expression is invalid.
+        """
+        self.expression = expression.strip()
+        fields = MACROS.get(self.expression.lower(), self.expression).split()
+
+        if len(fields) == 5:
+            fields = ["0"] + fields
+        elif len(fields) != 6:
+            raise ValueError(f"Cron expression '{expression}' must have 5 or 6 fields.")
+
+        try:
+            self.seconds, self.minutes, self.hours, self.days, self.months, weekdays = (
+                compile_field(field_expression, field)
+                for field_expression, field in zip(fields, (_SECOND, _MINUTE, _HOUR, _DAY, _MONTH, _WEEKDAY))
+            )
+        except ValueError as exc:
+            raise ValueError(f"Cron expression '{expression}': {exc}.") from exc
+
+        # Both 0 and 7 stand for Sunday.
+        self.weekdays = (weekdays | weekdays >> 7) & 0x7F
+        # As in Vixie cron, fields starting with '*' (e.g. '*/2') do not restrict the day for the OR rule.
+        self.days_restricted = not fields[3].startswith(("*", "?"))
+        self.weekdays_restricted = not fields[5].startswith(("*", "?"))
+        self._month_days: Dict[Tuple[int, int], int] = {}
+
+    def __repr__(self) -> str:
+        return f"CronSchedule({self.expression!r})"
+
+    def month_days(self, year: int, month: int) -> int:
+        """
+        Get the days of a month on which the schedule fires.
+
+        Args:
+            year: year.
+            month: month.
+
+        Returns:
+            bitset of matching days, bit N is set if day N matches.
+        """
+        key = (year, month)
+
+        if key not in self._month_days:
+            first_weekday, days_in_month = calendar.monthrange(year, month)
+            # Cron counts weekdays from Sunday = 0, python from Monday = 0.
+            first_weekday = (first_weekday + 1) % 7
+            weekday_days = 0
+
+            for offset in range(7):
+                if self.weekdays >> ((first_weekday + offset) % 7) & 1:
+                    weekday_days |= _EVERY_SEVENTH_DAY << (offset + 1)
+
+            if self.days_restricted and self.weekdays_restricted:
+                days = self.days | weekday_days
+            else:
+                days = self.days & weekday_days
+
+            self._month_days[key] = days & ((1 << (days_in_month + 1)) - 2)
+
+        return self._month_days[key]
+
+    def next_fire_time(self, after: datetime) -> datetime:
+        """
+        Get the first fire time after a given datetime.
+
+        For timezone-aware datetimes, the expression is matched against the wall clock of their timezone:
+        wall clock times that occur twice when clocks are set back fire once, wall clock times
+        skipped when clocks are set forward fire right after the gap.
+
+        Args:
+            after: datetime after which to search, exclusive.
+
+        Raises:
+            ValueError: if the schedule never fires, e.g. on February 30th.
+
+        Returns:
+            next fire time, in the timezone of 'after'.
+        """
+        if after.tzinfo is not None:
+            return self._next_zoned_fire_time(after)
+
+        moment = after.replace(microsecond=0) + timedelta(seconds=1)
+        year, month, day = moment.year, moment.month, moment.day
+        hour, minute, second = moment.hour, moment.minute, moment.second
+
+        while year <= after.year + _MAX_SEARCH_YEARS:
+            next_month = _next_bit(self.months, month)
+            if next_month is None:
+                year, month, day, hour, minute, second = year + 1, 1, 1, 0, 0, 0
+                continue
+            if next_month != month:
+                month, day, hour, minute, second = next_month, 1, 0, 0, 0
+
+            next_day = _next_bit(self.month_days(year, month), day)
+            if next_day is None:
+                month, day, hour, minute, second = month + 1, 1, 0, 0, 0
+                if month > 12:
+                    year, month = year + 1, 1
+                continue
+            if next_day != day:
+                day, hour, minute, second = next_day, 0, 0, 0
+
+            next_hour = _next_bit(self.hours, hour)
+            if next_hour is None:
+                day, hour, minute, second = day + 1, 0, 0, 0
+                continue
+            if next_hour != hour:
+                hour, minute, second = next_hour, 0, 0
+
+            next_minute = _next_bit(self.minutes, minute)
+            if next_minute is None:
+                hour, minute, second = hour + 1, 0, 0
+                continue
+            if next_minute != minute:
+                minute, second = next_minute, 0
+
+            next_second = _next_bit(self.seconds, second)
+            if next_second is None:
+                minute, second = minute + 1, 0
+                continue
+
+            return datetime(year, month, day, hour, minute, next_second)
+
+        raise ValueError(f"Cron expression '{self.expression}' never fires.")
+
+    def _next_zoned_fire_time(self, after: datetime) -> datetime:
+        zone = after.tzinfo
+        local_time = self.next_fire_time(after.replace(tzinfo=None))
+
+        while True:
+            fire_time = to_utc(local_time, zone)
+            if fire_time > after:
+                return fire_time.astimezone(zone)
+            local_time = self.next_fire_time(local_time)
+
+    def fire_times(self, after: datetime, until: datetime) -> List[datetime]:
+        """
+        Get all fire times within a time window.
+
+        Args:
+            after: start of the window, exclusive.
+            until: end of the window, inclusive.
+
+        Returns:
+            list of fire times.
+        """
+        fire_times = []
+        moment = self.next_fire_time(after)
+
+        # Aware datetimes of the same timezone are compared by wall clock, timestamps also work around DST changes.
+        while moment.timestamp() <= until.timestamp() if moment.tzinfo else moment <= until:
+            fire_times.append(moment)
+            moment = self.next_fire_time(moment)
+
+        return fire_times
+
+
+def is_cron_expression(expression: str) -> bool:
+    """
+    Check whether a string is a valid cron expression.
+
+    Args:
+        expression: string to check.
+
+    Returns:
+        True/False based on the result of the check.
+    """
+    try:
+        CronSchedule(expression)
+    except ValueError:
+        return False
+
+    return True
+
+
+_CRONTAB_ENVIRONMENT = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*\s*=")
+# Shell syntax (pipes, redirects, command lists, quoting, expansions, variable assignments),
+# which does not work for tasks: their commands are split on spaces and run without a shell.
+_CRONTAB_SHELL_SYNTAX = re.compile(r"[|&;<>()$`\"'\\*?\[\]{}~]|^[A-Za-z_][A-Za-z0-9_]*=")
+
+
+def parse_crontab(content: str) -> List[Tuple[str, str]]:
+    """
+    Read the schedule lines of a crontab. Comments, empty lines and environment settings are skipped.
+
+    Args:
+        content: crontab content, e.g. the output of 'crontab -l'.
+
+    Raises:
+        ValueError: if a line has an invalid schedule, a command that reads from stdin ('%')
+            or a command that needs a shell (tasks are run without one).
+
+    Returns:
+        list of (cron expression, command) tuples.
+    """
+    entries = []
+
+    for line_number, line in enumerate(content.splitlines(), start=1):
+        line = line.strip()
+
+        if not line or line.startswith("#") or _CRONTAB_ENVIRONMENT.match(line):
+            continue
+
+        if line.startswith("@"):
+            expression, _, command = line.partition(" ")
+        else:
+            fields = line.split(None, 5)
+            if len(fields) < 6:
+                raise ValueError(f"Crontab line {line_number}: expected 5 schedule fields and a command.")
+            expression, command = " ".join(fields[:5]), fields[5]
+
+        if expression.lower() == "@reboot":
+            raise ValueError(f"Crontab line {line_number}: '@reboot' schedules are not supported.")
+
+        if re.search(r"(?<!\\)%", command):
+            raise ValueError(f"Crontab line {line_number}: commands reading from stdin ('%') are not supported.")
+
+        command = " ".join(command.replace("\\%", "%").split())
+
+        if shell_syntax := _CRONTAB_SHELL_SYNTAX.search(command):
+            raise ValueError(
+                f"Crontab line {line_number}: shell syntax ('{shell_syntax.group()}') is not supported, "
+                f"commands are run without a shell. Move the command into a script."
+            )
+
+        try:
+            CronSchedule(expression)
+        except ValueError as exc:
+            raise ValueError(f"Crontab line {line_number}: {exc}") from exc
+
+        entries.append((expression, command))
+
+    return entries
+
+
+def read_user_crontab() -> str:
+    """
+    Read the crontab of the current user.
+
+    Raises:
+        OSError: if the 'crontab' command is not available.
+
+    Returns:
+        crontab content, empty if the user has no crontab.
+    """
+    result = subprocess.run(["crontab", "-l"], stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+
+    return result.stdout if result.returncode == 0 else ""
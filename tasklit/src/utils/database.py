@@ -0,0 +1,644 @@
+import functools
+import os
+import threading
+
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    List,
+    Optional
+)
+
+from sqlalchemy import (
+    bindparam,
+    create_engine,
+    engine,
+    event,
+    func,
+    inspect,
+    select,
+    DDL,
+    Column,
+    DateTime,
+    Float,
+    Index,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    text
+)
+from sqlalchemy.engine import Row
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.pool import QueuePool
+
+import tasklit.settings.consts as settings
+
+from tasklit.src.utils.tasks import Task
+
+metadata = MetaData()
+
+processes_table = Table(
+    "processes",
+    metadata,
+    Column("task_id", Integer, primary_key=True),
+    Column("created", DateTime, nullable=False),
+    Column("process id", Integer),
+    # Creation time of the scheduler process (seconds since epoch), telling it apart from later processes
+    # that get the same process ID. None for tasks saved by earlier app versions.
+    Column("process created", Float),
+    Column("job name", String, nullable=False),
+    Column("command", String, nullable=False),
+    # Fingerprint of the job spec file entry a task was started from, None for tasks submitted in the UI.
+    Column("spec hash", String),
+    # Schedule of the task: first execution, interval in seconds, weekdays ("Mon,Tue"), cron expression,
+    # the IANA timezone whose wall clock the first run and cron expression refer to and the holiday calendar.
+    Column("frequency", String),
+    Column("first run", DateTime),
+    Column("interval", Float),
+    Column("weekdays", String),
+    Column("cron", String),
+    Column("timezone", String),
+    Column("calendar", String),
+    sqlite_autoincrement=True,
+)
+
+Index("ix_processes_process_id", processes_table.c["process id"])
+Index("ix_processes_job_name", processes_table.c["job name"])
+
+# Change feed of the processes table: every insert, update and delete of a task
+# appends a row with a new, monotonically increasing version.
+process_changes_table = Table(
+    "process_changes",
+    metadata,
+    Column("version", Integer, primary_key=True),
+    Column("task_id", Integer, nullable=False),
+    sqlite_autoincrement=True,
+)
+
+# Job spec file entries applied by the job spec sync, by job name, so that jobs whose task has been removed
+# (by the user or the retention garbage collection) are not submitted again until their entry changes.
+applied_job_specs_table = Table(
+    "applied_job_specs",
+    metadata,
+    Column("job name", String, primary_key=True),
+    Column("spec hash", String, nullable=False),
+)
+
+process_change_triggers = [
+    DDL(
+        "CREATE TRIGGER IF NOT EXISTS processes_after_insert AFTER INSERT ON processes BEGIN "
+        "INSERT INTO process_changes (task_id) VALUES (NEW.task_id); END"
+    ),
+    DDL(
+        "CREATE TRIGGER IF NOT EXISTS processes_after_update AFTER UPDATE ON processes BEGIN "
+        "INSERT INTO process_changes (task_id) VALUES (NEW.task_id); "
+        "INSERT INTO process_changes (task_id) SELECT OLD.task_id WHERE OLD.task_id != NEW.task_id; END"
+    ),
+    DDL(
+        "CREATE TRIGGER IF NOT EXISTS processes_after_delete AFTER DELETE ON processes BEGIN "
+        "INSERT INTO process_changes (task_id) VALUES (OLD.task_id); END"
+    ),
+]
+
+# Statements are built once and reused, so SQLAlchemy only compiles them on first use.
+insert_process_statement = processes_table.insert()
+select_processes_statement = select(processes_table).order_by(processes_table.c.task_id)
+select_processes_batch_statement = select(
+    processes_table
+).where(
+    processes_table.c.task_id > bindparam("cursor")
+).order_by(
+    processes_table.c.task_id
+).limit(
+    bindparam("limit")
+)
+select_job_names_statement = select(processes_table.c["job name"])
+# Tasks submitted through the API are saved before their scheduler process is started.
+select_queued_processes_statement = select(
+    processes_table
+).where(
+    processes_table.c["process id"].is_(None),
+    processes_table.c.task_id.not_in(bindparam("excluded_task_ids", expanding=True))
+).order_by(
+    processes_table.c.task_id
+).limit(
+    bindparam("limit")
+)
+update_process_statement = processes_table.update().where(
+    processes_table.c.task_id == bindparam("task_id_"),
+    processes_table.c["process id"].is_(None)
+).values(
+    {
+        processes_table.c["process id"]: bindparam("process_id"),
+        processes_table.c["process created"]: bindparam("process_created"),
+    }
+)
+select_spec_processes_statement = select(
+    processes_table.c.task_id,
+    processes_table.c["process id"],
+    processes_table.c["process created"],
+    processes_table.c["job name"],
+    processes_table.c["spec hash"]
+).where(
+    processes_table.c["spec hash"].isnot(None)
+)
+select_applied_job_specs_statement = select(applied_job_specs_table)
+insert_applied_job_spec_statement = applied_job_specs_table.insert()
+delete_applied_job_specs_statement = applied_job_specs_table.delete().where(
+    applied_job_specs_table.c["job name"].in_(bindparam("job_names", expanding=True))
+)
+select_started_processes_by_job_name_statement = select(
+    processes_table.c["process id"],
+    processes_table.c["process created"],
+    processes_table.c["job name"]
+).where(
+    processes_table.c["job name"].in_(bindparam("job_names", expanding=True)),
+    processes_table.c["process id"].isnot(None)
+)
+select_processes_by_id_statement = select(processes_table).where(
+    processes_table.c.task_id.in_(bindparam("task_ids", expanding=True))
+)
+delete_processes_statement = processes_table.delete().where(
+    processes_table.c.task_id.in_(bindparam("task_ids", expanding=True))
+)
+select_change_range_statement = select(
+    func.min(process_changes_table.c.version),
+    func.max(process_changes_table.c.version)
+)
+select_changed_task_ids_statement = select(
+    process_changes_table.c.task_id
+).where(
+    process_changes_table.c.version > bindparam("version")
+).distinct()
+prune_process_changes_statement = process_changes_table.delete().where(
+    process_changes_table.c.version.in_(
+        select(
+            process_changes_table.c.version
+        ).where(
+            process_changes_table.c.version <= bindparam("max_version")
+        ).order_by(
+            process_changes_table.c.version
+        ).limit(
+            bindparam("limit")
+        )
+    )
+)
+
+
+def configure_sqlite_connection(dbapi_connection, connection_record) -> None:
+    """
+    Tune every new SQLite connection for many concurrent writers:
+        -> write-ahead logging, so that readers and the writer do not block each other
+        -> relaxed fsync, which is safe in WAL mode
+        -> wait for locks instead of failing immediately.
+
+    Args:
+        dbapi_connection: raw sqlite3 connection.
+        connection_record: sql alchemy connection pool record.
+    """
+    cursor = dbapi_connection.cursor()
+    cursor.execute(f"PRAGMA journal_mode={settings.DB_JOURNAL_MODE}")
+    cursor.execute(f"PRAGMA synchronous={settings.DB_SYNCHRONOUS}")
+    cursor.execute(f"PRAGMA busy_timeout={settings.DB_BUSY_TIMEOUT * 1000}")
+    cursor.close()
+
+
+@functools.lru_cache(maxsize=None)
+def get_sql_engine(engine_path: str = settings.APP_ENGINE_PATH) -> engine:
+    """
+    Get the process-wide sql alchemy engine for a DB file. The engine, its connection pool
+    and the DB schema are set up on first use and shared by all app sessions afterwards.
+
+    Args:
+        engine_path: sql alchemy DB URL.
+
+    Returns:
+        sql alchemy engine.
+    """
+    sql_engine = create_engine(
+        engine_path,
+        echo=False,
+        poolclass=QueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        connect_args={"timeout": settings.DB_BUSY_TIMEOUT, "check_same_thread": False},
+    )
+    event.listen(sql_engine, "connect", configure_sqlite_connection)
+    initialize_database(sql_engine)
+
+    return sql_engine
+
+
+def migrate_legacy_processes_table(sql_engine: engine) -> None:
+    """
+    Rebuild a processes table that has been created by an earlier app version
+    according to the current schema, keeping all rows:
+        -> tables created by 'pandas.DataFrame.to_sql' have no primary key and indexes
+        -> tables without AUTOINCREMENT would hand out IDs of deleted tasks again.
+    Rows keep their task ID, except for rows whose task ID is missing or has already been taken by an
+    earlier row (pandas tables allowed duplicates): these are numbered after the existing tasks.
+    Columns added in later versions are appended to an otherwise current table.
+
+    Args:
+        sql_engine: sql alchemy engine to use for accessing DB file.
+    """
+    inspector = inspect(sql_engine)
+
+    if not inspector.has_table(processes_table.name):
+        return
+
+    with sql_engine.connect() as connection:
+        table_sql = connection.execute(
+            text("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = :name"),
+            {"name": processes_table.name}
+        ).scalar()
+
+    legacy_columns = {column["name"] for column in inspector.get_columns(processes_table.name)}
+
+    if inspector.get_pk_constraint(processes_table.name)["constrained_columns"] and \
+            "AUTOINCREMENT" in table_sql.upper():
+        with sql_engine.begin() as connection:
+            for column in processes_table.columns:
+                if column.name not in legacy_columns:
+                    connection.exec_driver_sql(
+                        f'ALTER TABLE processes ADD COLUMN "{column.name}" '
+                        f'{column.type.compile(dialect=sql_engine.dialect)}'
+                    )
+        return
+
+    legacy_indexes = [index["name"] for index in inspector.get_indexes(processes_table.name)]
+    columns = ", ".join(
+        f'"{column.name}"' for column in processes_table.columns if column.name in legacy_columns
+    )
+    renumbered_columns = ", ".join(
+        f'"{column.name}"' for column in processes_table.columns
+        if column.name in legacy_columns and column.name != "task_id"
+    )
+    # First row of every task ID, in table order
+    kept_rows = (
+        "SELECT MIN(rowid) FROM processes_legacy WHERE typeof(task_id) = 'integer' GROUP BY task_id"
+        if "task_id" in legacy_columns else "SELECT NULL"
+    )
+
+    with sql_engine.begin() as connection:
+        connection.exec_driver_sql("ALTER TABLE processes RENAME TO processes_legacy")
+        for index_name in legacy_indexes:
+            connection.exec_driver_sql(f'DROP INDEX "{index_name}"')
+        metadata.create_all(connection)
+        connection.exec_driver_sql(
+            f"INSERT INTO processes ({columns}) SELECT {columns} FROM processes_legacy "
+            f"WHERE rowid IN ({kept_rows}) ORDER BY rowid"
+        )
+        connection.exec_driver_sql(
+            f"INSERT INTO processes ({renumbered_columns}) SELECT {renumbered_columns} FROM processes_legacy "
+            f"WHERE rowid NOT IN ({kept_rows}) ORDER BY rowid"
+        )
+        connection.exec_driver_sql("DROP TABLE processes_legacy")
+
+
+def initialize_database(sql_engine: engine) -> None:
+    """
+    Create the DB schema (tables, indexes and change feed triggers) if it does not exist yet,
+    migrating tables created by earlier app versions.
+
+    Args:
+        sql_engine: sql alchemy engine to use for accessing DB file.
+
+    Raises:
+        OperationalError: if any sqlalchemy errors have been thrown.
+    """
+    try:
+        migrate_legacy_processes_table(sql_engine)
+        metadata.create_all(sql_engine)
+
+        with sql_engine.begin() as connection:
+            for trigger in process_change_triggers:
+                connection.execute(trigger)
+    except OperationalError as exc:
+        raise exc
+
+
+def insert_process(record: Dict[str, Any], sql_engine: engine) -> int:
+    """
+    Save process information to the processes table. Unless the record contains a task ID,
+    a new one is allocated by the DB within the insert itself, so that concurrent
+    submissions never get the same ID and no table read is needed.
+
+    Args:
+        record: process information, keyed by processes table column.
+        sql_engine: sql alchemy engine to use.
+
+    Raises:
+        OperationalError: if any sqlalchemy errors have been thrown.
+
+    Returns:
+        task ID of the saved process.
+    """
+    try:
+        with sql_engine.begin() as connection:
+            result = connection.execute(insert_process_statement, record)
+            return result.inserted_primary_key[0]
+    except OperationalError as exc:
+        raise exc
+
+
+def insert_tasks(tasks: Iterable[Task], sql_engine: engine) -> List[int]:
+    """
+    Save many tasks to the processes table in a single transaction, either all rows are saved or none.
+    The task IDs allocated by the DB are set on the tasks.
+
+    Args:
+        tasks: tasks to save.
+        sql_engine: sql alchemy engine to use.
+
+    Raises:
+        OperationalError: if any sqlalchemy errors have been thrown.
+
+    Returns:
+        task IDs of the saved tasks, in task order.
+    """
+    tasks = list(tasks)
+
+    try:
+        with sql_engine.begin() as connection:
+            task_ids = [
+                connection.execute(insert_process_statement, task.to_record()).inserted_primary_key[0]
+                for task in tasks
+            ]
+    except OperationalError as exc:
+        raise exc
+
+    for task, task_id in zip(tasks, task_ids):
+        task.task_id = task_id
+
+    return task_ids
+
+
+def fetch_processes(sql_engine: engine) -> List[Row]:
+    """
+    Read all rows of the processes table, ordered by task ID.
+
+    Args:
+        sql_engine: sql alchemy engine to use.
+
+    Raises:
+        OperationalError: if any sqlalchemy errors have been thrown.
+
+    Returns:
+        list of process information rows.
+    """
+    try:
+        with sql_engine.connect() as connection:
+            return connection.execute(select_processes_statement).fetchall()
+    except OperationalError as exc:
+        raise exc
+
+
+def fetch_queued_processes(limit: int, sql_engine: engine, excluded_task_ids: Iterable[int] = ()) -> List[Row]:
+    """
+    Read the oldest tasks whose scheduler process has not been started yet.
+
+    Args:
+        limit: maximum amount of tasks to read.
+        sql_engine: sql alchemy engine to use.
+        excluded_task_ids: (optional) IDs of tasks to leave out, e.g. tasks waiting to be retried.
+
+    Raises:
+        OperationalError: if any sqlalchemy errors have been thrown.
+
+    Returns:
+        list of process information rows, ordered by task ID.
+    """
+    try:
+        with sql_engine.connect() as connection:
+            return connection.execute(
+                select_queued_processes_statement, {"limit": limit, "excluded_task_ids": list(excluded_task_ids)}
+            ).fetchall()
+    except OperationalError as exc:
+        raise exc
+
+
+def update_task_processes(tasks: Iterable[Task], sql_engine: engine) -> List[int]:
+    """
+    Save the scheduler processes of started tasks in a single transaction.
+    A task is only updated while it has no process yet, so that of two task starters
+    (the daemon's and the API's) only the first one to save a task keeps its process.
+
+    Args:
+        tasks: saved tasks with their process ID and creation time set.
+        sql_engine: sql alchemy engine to use.
+
+    Raises:
+        OperationalError: if any sqlalchemy errors have been thrown.
+
+    Returns:
+        IDs of the tasks that have been removed from the processes table or started by another
+            task starter in the meantime.
+    """
+    removed = []
+
+    try:
+        with sql_engine.begin() as connection:
+            for task in tasks:
+                result = connection.execute(
+                    update_process_statement,
+                    {"task_id_": task.task_id, "process_id": task.pid, "process_created": task.process_created}
+                )
+                if not result.rowcount:
+                    removed.append(task.task_id)
+    except OperationalError as exc:
+        raise exc
+
+    return removed
+
+
+def delete_processes(task_ids: Iterable[int], sql_engine: engine) -> None:
+    """
+    Remove tasks from the processes table.
+
+    Args:
+        task_ids: IDs of the tasks to remove.
+        sql_engine: sql alchemy engine to use.
+
+    Raises:
+        OperationalError: if any sqlalchemy errors have been thrown.
+    """
+    task_ids = [int(task_id) for task_id in task_ids]
+
+    if not task_ids:
+        return
+
+    try:
+        with sql_engine.begin() as connection:
+            connection.execute(delete_processes_statement, {"task_ids": task_ids})
+    except OperationalError as exc:
+        raise exc
+
+
+def fetch_applied_job_specs(sql_engine: engine) -> Dict[str, str]:
+    """
+    Read the job spec file entries that have been applied by the job spec sync.
+
+    Args:
+        sql_engine: sql alchemy engine to use.
+
+    Raises:
+        OperationalError: if any sqlalchemy errors have been thrown.
+
+    Returns:
+        job spec fingerprints, keyed by job name.
+    """
+    try:
+        with sql_engine.connect() as connection:
+            return {row["job name"]: row["spec hash"]
+                    for row in connection.execute(select_applied_job_specs_statement)}
+    except OperationalError as exc:
+        raise exc
+
+
+def save_applied_job_specs(applied: Dict[str, str], removed: Iterable[str], sql_engine: engine) -> None:
+    """
+    Record job spec file entries that have been applied, and forget removed ones, in a single transaction.
+
+    Args:
+        applied: fingerprints of the applied job specs, keyed by job name.
+        removed: names of jobs that have been removed from the job spec files.
+        sql_engine: sql alchemy engine to use.
+
+    Raises:
+        OperationalError: if any sqlalchemy errors have been thrown.
+    """
+    job_names = list(applied) + list(removed)
+
+    if not job_names:
+        return
+
+    try:
+        with sql_engine.begin() as connection:
+            connection.execute(delete_applied_job_specs_statement, {"job_names": job_names})
+            if applied:
+                connection.execute(
+                    insert_applied_job_spec_statement,
+                    [{"job name": job_name, "spec hash": spec_hash} for job_name, spec_hash in applied.items()]
+                )
+    except OperationalError as exc:
+        raise exc
+
+
+def prune_process_changes(keep: int, limit: int, sql_engine: engine) -> int:
+    """
+    Remove the oldest entries of the processes table change feed, keeping at least
+    the latest 'keep' entries.
+
+    Args:
+        keep: amount of latest change feed entries to keep.
+        limit: maximum amount of entries to remove.
+        sql_engine: sql alchemy engine to use.
+
+    Raises:
+        OperationalError: if any sqlalchemy errors have been thrown.
+
+    Returns:
+        amount of removed entries.
+    """
+    try:
+        with sql_engine.begin() as connection:
+            _, max_version = connection.execute(select_change_range_statement).one()
+
+            if max_version is None or max_version <= keep:
+                return 0
+
+            return connection.execute(
+                prune_process_changes_statement,
+                {"max_version": max_version - keep, "limit": limit}
+            ).rowcount
+    except OperationalError as exc:
+        raise exc
+
+
+class ProcessChangeCache:
+    """
+    Process-wide copy of the processes table that is kept up to date through the change feed.
+    A refresh only reads the tasks that changed since the last version seen by the cache;
+    the whole table is only read on first use or if the needed part of the feed has been pruned.
+    """
+
+    def __init__(self, sql_engine: engine) -> None:
+        """
+        Args:
+            sql_engine: sql alchemy engine to use.
+        """
+        self.sql_engine = sql_engine
+        self.version: Optional[int] = None
+        self.rows: List[Row] = []
+        self.rows_by_id: Dict[int, Row] = {}
+        self._rows_by_id: Dict[int, Row] = {}
+        self._lock = threading.Lock()
+
+    def refresh(self) -> bool:
+        """
+        Apply changes made to the processes table since the last refresh.
+
+        Raises:
+            OperationalError: if any sqlalchemy errors have been thrown.
+
+        Returns:
+            True if the cached rows have changed.
+        """
+        with self._lock:
+            try:
+                with self.sql_engine.connect() as connection:
+                    min_version, max_version = connection.execute(select_change_range_statement).one()
+                    max_version = max_version or 0
+
+                    if max_version == self.version:
+                        return False
+
+                    if self.version is None or min_version is None or self.version < min_version - 1:
+                        self._rows_by_id = {
+                            row["task_id"]: row for row in connection.execute(select_processes_statement)
+                        }
+                    else:
+                        changed_task_ids = connection.execute(
+                            select_changed_task_ids_statement, {"version": self.version}
+                        ).scalars().all()
+
+                        for task_id in changed_task_ids:
+                            self._rows_by_id.pop(task_id, None)
+
+                        self._rows_by_id.update(
+                            (row["task_id"], row) for row in connection.execute(
+                                select_processes_by_id_statement, {"task_ids": changed_task_ids}
+                            )
+                        )
+            except OperationalError as exc:
+                raise exc
+
+            self.rows = [self._rows_by_id[task_id] for task_id in sorted(self._rows_by_id)]
+            # Published as a copy, so that readers never see a refresh half applied.
+            self.rows_by_id = dict(self._rows_by_id)
+            self.version = max_version
+
+            return True
+
+
+@functools.lru_cache(maxsize=None)
+def get_process_cache(sql_engine: engine) -> ProcessChangeCache:
+    """
+    Get the process-wide change feed cache of the processes table for an engine.
+
+    Args:
+        sql_engine: sql alchemy engine to use.
+
+    Returns:
+        processes table cache.
+    """
+    return ProcessChangeCache(sql_engine)
+
+
+# Pooled connections and caches must not be shared with forked child processes.
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=get_sql_engine.cache_clear)
+    os.register_at_fork(after_in_child=get_process_cache.cache_clear)
@@ -0,0 +1,39 @@
+"""
+Advisory locks on log files, so that the retention garbage collection can rewrite execution logs
+while scheduler processes append to them.
+
+Imported by scheduler processes, this module must stay light: it may only use the standard library.
+Locks are taken with 'fcntl.flock', where it is not available (Windows) files are not locked.
+"""
+import contextlib
+
+from typing import IO, Iterator
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+
+@contextlib.contextmanager
+def locked_file(file: IO) -> Iterator[IO]:
+    """
+    Hold an exclusive lock on an open file, waiting until other processes have released theirs.
+
+    Args:
+        file: open file to lock.
+
+    Returns:
+        the locked file, unlocked on exit.
+    """
+    if fcntl is None:
+        yield file
+        return
+
+    fcntl.flock(file.fileno(), fcntl.LOCK_EX)
+
+    try:
+        yield file
+    finally:
+        file.flush()
+        fcntl.flock(file.fileno(), fcntl.LOCK_UN)
@@ -1,28 +1,55 @@
 import os
-import sys
 import traceback
 import time
 
 from datetime import datetime, timedelta
-from multiprocessing import Process
 from pathlib import Path
-from subprocess import Popen
 from typing import (
+    Any,
     Callable,
+    Dict,
     List,
     Optional,
     Tuple
 )
 
+import numpy as np
 import pandas as pd
 import psutil
 import streamlit as st
 
 from sqlalchemy import engine
-from sqlalchemy.exc import OperationalError
 from streamlit.delta_generator import DeltaGenerator
 
 import tasklit.settings.consts as settings
+import tasklit.src.utils.control as control
+import tasklit.src.utils.database as database
+import tasklit.src.utils.timezones as timezones
+
+from tasklit.src.utils.control import ControlError
+from tasklit.src.utils.cron import CronSchedule
+from tasklit.src.utils.log_stream import stream_log_file
+from tasklit.src.utils.processes import (
+    get_task_process,
+    is_process_running,
+    start_scheduler_process,
+    stop_task_process,
+    terminate_child_processes,
+    terminate_process,
+    _EXITED_STATUSES
+)
+from tasklit.src.utils.ring_buffer import read_job_output_tail
+from tasklit.src.utils.scheduler import launch_command_process
+from tasklit.src.utils.tasks import get_interval_duration, Task
+
+# Session state key of the message to display after an app refresh.
+_REFRESH_MESSAGE_KEY = "tasklit_refresh_message"
+
+# Display dataframes of the processes table, keyed by engine, with the change version they reflect.
+_process_df_cache: Dict[Any, Tuple[int, pd.DataFrame]] = {}
+
+# Last modified timestamps of log files, keyed by log folder, with the folder modification time they reflect.
+_log_update_cache: Dict[str, Tuple[int, Dict[str, datetime]]] = {}
 
 
 def app_exception_handler(func: Callable) -> Callable:
@@ -48,64 +75,6 @@ def app_exception_handler(func: Callable) -> Callable:
     return inner
 
 
-def launch_command_process(command: str, log_filepath: str) -> Popen:
-    """
-    Start a subprocess for a given command and save
-    'stdout' and 'stderr' logs to a respective log file.
-
-    Args:
-        command: command to be executed.
-        log_filepath: path to the respective log file.
-
-    Raises:
-        OSError if log file cannot be created.
-
-    Returns:
-        a child process running the given command.
-    """
-    try:
-        with open(log_filepath, "w") as out:
-            return Popen(command.split(" "), stdout=out, stderr=out)
-    except OSError as exc:
-        raise exc
-
-
-def terminate_child_processes(parent_process: psutil.Process) -> None:
-    """
-    Check for any child processes spawned by the parent process and
-    - if found - terminate them.
-
-    Args:
-        parent_process: parent process object.
-    """
-    if child_processes := parent_process.children(recursive=True):
-
-        for child_process in child_processes:
-            child_process.terminate()
-
-        gone, alive = psutil.wait_procs(child_processes, timeout=3)
-
-        for process in alive:
-            process.terminate()
-
-
-def terminate_process(pid: int) -> None:
-    """
-    Terminate a running process and any child processes that
-    have been spawned by it.
-
-    Raises:
-        psutil.NoSuchProcess if related process cannot be found.
-    """
-    try:
-        parent = psutil.Process(pid)
-        terminate_child_processes(parent)
-        parent.terminate()
-        parent.kill()
-    except psutil.NoSuchProcess as exc:
-        raise exc
-
-
 def create_folder_if_not_exists(folder_name: str) -> None:
     """
     Check if a folder exists and create one if not.
@@ -136,23 +105,24 @@ def test_command_run(command: str) -> None:
     """
     Utility function to test command execution. Open a subprocess with
     the given command and log output to the default log file.
-    The log file will be read and displayed via Streamlit.
+    New log output is streamed to the UI until the process finishes.
+    Clicking 'Stop' interrupts the stream and terminates the test process.
 
     Args:
         command: command to be executed by the process.
     """
     test_command_process = launch_command_process(command, settings.DEFAULT_LOG_DIR_OUT)
-    stdout = st.empty()
-    stop = st.checkbox("Stop")
+    st.button("Stop")
 
-    while True:
-        poll = test_command_process.poll()
-
-        stdout.code(display_process_log_file(settings.DEFAULT_LOG_DIR_OUT))
-
-        if stop and poll is not None:
+    try:
+        stream_log_file(
+            settings.DEFAULT_LOG_DIR_OUT,
+            lambda: test_command_process.poll() is not None,
+            st.container()
+        )
+    finally:
+        if test_command_process.poll() is None:
             terminate_process(test_command_process.pid)
-            break
 
 
 def get_time_interval_info(unit_col: DeltaGenerator,
@@ -170,7 +140,8 @@ def get_time_interval_info(unit_col: DeltaGenerator,
     Returns:
         selected time interval and related execution frequency.
     """
-    time_unit = unit_col.selectbox("Select Unit", ("Minutes", "Hours", "Days", "Weeks"))
+    time_units = list(settings.TIME_VALUES)
+    time_unit = unit_col.selectbox("Select Unit", time_units, index=time_units.index(settings.DEFAULT_TIME_UNIT))
     time_unit_quantity = slider_col.slider(
         f"Every x {time_unit}", min_value=1, max_value=settings.TIME_VALUES[time_unit]
     )
@@ -225,6 +196,31 @@ def get_execution_interval_information(execution_frequency: str,
     return time_unit, time_unit_quantity, weekdays
 
 
+def select_cron_expression(unit_col: DeltaGenerator,
+                           info_col: DeltaGenerator) -> Optional[str]:
+    """
+    Get a cron expression from UI inputs and show when it fires next.
+
+    Args:
+        unit_col: Streamlit column with UI element to enter the cron expression.
+        info_col: Streamlit column to display the next fire time or validation errors.
+
+    Returns:
+        cron expression, None if the entered expression is invalid.
+    """
+    cron_expression = unit_col.text_input("Cron expression", settings.DEFAULT_CRON_EXPRESSION)
+
+    try:
+        next_run = CronSchedule(cron_expression).next_fire_time(datetime.now())
+    except ValueError as exc:
+        info_col.error(str(exc))
+        return None
+
+    info_col.text(f"Next run on {next_run.strftime(settings.DATE_FORMAT)}.")
+
+    return cron_expression
+
+
 def calculate_execution_start(date_input_col: DeltaGenerator,
                               time_slider_col: DeltaGenerator) -> datetime:
     """
@@ -254,7 +250,7 @@ def calculate_execution_start(date_input_col: DeltaGenerator,
 
 def get_command_execution_start(execution_type: str, execution_frequency: str,
                                 weekdays: Optional[List[str]], date_col: DeltaGenerator,
-                                slider_col: DeltaGenerator) -> datetime:
+                                slider_col: DeltaGenerator, timezone_name: Optional[str] = None) -> datetime:
     """
     Get the start datetime of command execution.
 
@@ -264,322 +260,88 @@ def get_command_execution_start(execution_type: str, execution_frequency: str,
         weekdays: (optional) list with selected weekdays.
         date_col: Streamlit column with UI element to select execution date.
         slider_col: Streamlit column with UI (slider) element to select hr:min of execution.
+        timezone_name: (optional) timezone of the schedule, the local timezone if not set.
 
     Returns:
-        datetime object with the start date & time of execution.
+        datetime object with the start date & time of execution, as wall clock time of the schedule's timezone.
     """
-    start = datetime.now()
-
     if execution_type == "Scheduled":
         start = calculate_execution_start(date_col, slider_col)
 
         if execution_frequency == "Daily":
             while settings.WEEK_DAYS[start.weekday()] not in weekdays:
                 start += timedelta(days=1)
+    else:
+        start = datetime.now(timezones.get_timezone(timezone_name)).replace(tzinfo=None)
 
     st.text(f"First execution on {start.strftime(settings.DATE_FORMAT)}.")
 
     return start
 
 
-def refresh_app(to_wait: int = 0) -> None:
+def refresh_app(message: Optional[str] = None) -> None:
     """
-    (Optionally) wait for a given amount of time (in seconds)
-    and trigger Streamlit app refresh.
+    Trigger Streamlit app refresh, (optionally) with a success message
+    that is displayed once the app has been refreshed.
 
     Args:
-        to_wait: integer indicating amount of seconds to wait.
+        message: (optional) success message to display after the refresh.
 
     Raises:
         RerunException that stops and re-runs the app script.
     """
-    if to_wait:
-        empty_slot = st.empty()
-
-        for i in range(to_wait):
-            empty_slot.write(f"Refreshing in {to_wait - i} seconds...")
-            time.sleep(1)
+    if message:
+        st.session_state[_REFRESH_MESSAGE_KEY] = message
 
     raise st.script_runner.RerunException(st.script_request_queue.RerunData())
 
 
-def match_weekday(now: datetime,
-                  weekdays: Optional[List[str]]) -> bool:
-    """
-    Determine if 'today' is the day when a function must be executed.
-
-    Args:
-        now: datetime object representing current timestamp.
-        weekdays: optional list of ints from 0 to 6 corresponding to different days of the week,
-            e.g. 0 for Monday, etc.
-
-    Returns:
-        True/False based on the result of the check.
+def show_refresh_message() -> None:
     """
-    today = now.weekday()
-
-    try:
-        if not weekdays or settings.WEEK_DAYS[today] in weekdays:
-            return True
-    except KeyError as exc:
-        raise exc
-
-    return False
-
-
-def match_duration(now: datetime, start: datetime, duration: timedelta) -> bool:
+    Display the success message passed to 'refresh_app' before the app has been refreshed, once.
     """
-    Check whether the sum of process start date and interval timedelta is less
-    than current datetime. If yes -> process must be executed.
-
-    Args:
-        now: datetime.now().
-        start: datetime object with process start date.
-        duration: interval timedelta to check whether schedule has been met.
+    message = st.session_state.pop(_REFRESH_MESSAGE_KEY, None)
 
-    Returns:
-        True/False based on the result of the check.
-    """
-    return now > (start + duration)
+    if message:
+        st.success(message)
 
 
-def process_should_execute(now: datetime,
-                           start: datetime,
-                           duration: timedelta,
-                           weekdays: Optional[List[str]]) -> bool:
+def submit_job(task: Task, sql_engine: engine) -> int:
     """
-    Determine whether the process should execute or not:
-        -> is it the correct day of the week?
-        -> is it the correct scheduled interval?
+    Run a process job and save related process information to an SQL alchemy file.
+    If saving fails, the started process is stopped again.
 
     Args:
-        now: datetime.now()
-        start: datetime object with process start date.
-        duration: interval timedelta to check whether schedule has been met.
-        weekdays: optional list with selected weekdays.
+        task: task to execute on its schedule.
+        sql_engine: sql engine to use for saving task information to sql.
 
     Returns:
-        True/False based on the result of the check.
-    """
-    return match_weekday(now, weekdays) and match_duration(now, start, duration)
-
-
-def write_job_execution_log(job_name: str, command: str, now: datetime, msg: str) -> None:
+        ID allocated for the new task.
     """
-    Save job execution information to a log file.
+    start_scheduler_process(task)
 
-    Args:
-        job_name: name of the job for which to write the log.
-        command: command that was executed.
-        now: datetime object with current timestamp.
-        msg: message to be logged.
-
-    Raises:
-        OSError if log file creation fails.
-    """
-    now_str = now.strftime(settings.DATE_FORMAT)
-
-    for suffix in [".txt", "_stdout.txt"]:
-        try:
-            with open(f"{settings.BASE_LOG_DIR}/{job_name}{suffix}", "a") as file:
-                if suffix == "_stdout.txt":
-                    file.write(f"\n{'=' * 70} \n")
-                file.write(f"{now_str} {msg} {command}\n")
-        except OSError as exc:
-            raise exc
-
-
-def execute_job(command: str, log_filepath: str,
-                job_name: str, now: datetime) -> None:
-    """
-    Interface for running a job:
-        -> launch a process
-        -> wait for the process to finish
-        -> write job execution log.
-
-    Args:
-        command: command to be executed.
-        log_filepath:
-        job_name: name generated for the job.
-        now: datetime.now()
-    """
-    launched_process = launch_command_process(command, log_filepath)
-    launched_process.wait()
-    write_job_execution_log(job_name, command, now, "Executed")
-
-
-def get_interval_duration(time_unit: str, time_unit_quantity: Optional[int],
-                          weekdays: Optional[List[str]]) -> timedelta:
-    """
-    Get the waiting interval to wait for until the next job execution.
-
-    Args:
-        time_unit: (optional) unit of execution time interval, e.g. 'hours', 'days', etc.
-        time_unit_quantity: (optional) amount of time interval units.
-        weekdays: (optional) list with selected weekdays.
-
-    Returns:
-        timedelta: time interval to wait before next schedule.
-    """
     try:
-        return timedelta(days=1) if weekdays or not time_unit else \
-            settings.DATE_TRANSLATION[time_unit] * time_unit_quantity
-    except KeyError as exc:
+        return database.insert_tasks([task], sql_engine)[0]
+    except Exception as exc:
+        if is_process_running(task.pid, task.process_created):
+            terminate_process(task.pid, task.process_created)
         raise exc
 
 
-def schedule_process_job(command: str, job_name: str, start: datetime,
-                         interval_duration: timedelta, weekdays: Optional[List[str]],
-                         execution_frequency: str, execution_type: str) -> None:
+def get_daemon_task_state(task_id: int) -> Optional[Dict[str, Any]]:
     """
-    Launch a scheduler process that spawns job execution processes if launch conditions are met.
-    Checks for current date. If date criterion is met -> start the process with command execution.
+    Get the state of a task from the scheduler daemon, over its control socket.
 
     Args:
-        command: command to be executed.
-        job_name: name generated for the job.
-        start: execution datetime.
-        interval_duration: interval to wait before scheduling the next job execution.
-        weekdays: (optional) list with selected weekdays.
-        execution_frequency: frequency of execution: "Interval" / "Daily"
-        execution_type: type of execution schedule: is execution "Scheduled" or not.
-    """
-    stdout_log_file = f"{settings.BASE_LOG_DIR}/{job_name}_stdout.txt"
-
-    if execution_frequency == "Once":
-        execute_job(command, stdout_log_file, job_name, datetime.now())
-        return
-
-    # If process must be executed now, decrease start date by interval timedelta:
-    # this way 'match_duration' will return True in the 'process_should_execute' check.
-    if execution_type == "Now":
-        start -= interval_duration
-
-    while True:
-        now = datetime.now()
-        if process_should_execute(now, start, interval_duration, weekdays):
-            execute_job(command, stdout_log_file, job_name, now)
-            start += interval_duration
-        else:
-            time.sleep(1)
-
-
-def create_process_info_dataframe(command: str,
-                                  job_name: str,
-                                  pid: int,
-                                  task_id: int) -> pd.DataFrame:
-    """
-    Generate a dataframe with process information in the following format:
-
-    {
-        'task_id': [],
-        'created': [],
-        'process id': [],
-        'job name': [],
-        'command': [],
-        'last update': [],
-        'running': []
-    }.
-
-    Args:
-        command: command executed by the process.
-        job_name: job name allocated for the process.
-        pid: process ID.
         task_id: task ID.
 
     Returns:
-        pandas DF with process related information.
-    """
-    created = datetime.now()
-
-    return pd.DataFrame(
-        {
-            "task_id": [task_id],
-            "created": [created],
-            "process id": [pid],
-            "job name": [job_name],
-            "command": [command],
-            "last update": [None],
-            "running": [None],
-        }
-    )
-
-
-def save_df_to_sql(df: pd.DataFrame, sql_engine: engine) -> None:
-    """
-    Save dataframe with process information to a local sql alchemy DB file.
-
-    Args:
-        df: process information df.
-        sql_engine: sql alchemy engine to use.
-
-    Raises:
-        OperationalError: if any sqlalchemy errors have been thrown.
+        task information, None if the scheduler daemon is not running or does not know the task.
     """
     try:
-        df.to_sql("processes", con=sql_engine, if_exists="append", index=False)
-    except OperationalError as exc:
-        raise exc
-
-
-def start_scheduler_process(command: str, job_name: str, start: datetime,
-                            interval_duration: timedelta, weekdays: Optional[List[str]],
-                            execution_frequency: str, execution_type: str) -> int:
-    """
-    Run a process with the selected parameters.
-
-    Args:
-        command: command to be executed.
-        job_name: name allocated for the process job.
-        start: execution datetime.
-        interval_duration: interval to wait before scheduling the next job execution.
-        weekdays: (optional) list with selected weekdays.
-        execution_frequency: frequency of execution: "Interval" / "Daily"
-        execution_type: type of execution schedule: is execution "Scheduled" or not.
-
-    Returns:
-        ID of the started process.
-    """
-    process = Process(
-        target=schedule_process_job,
-        args=(
-            command,
-            job_name,
-            start,
-            interval_duration,
-            weekdays,
-            execution_frequency,
-            execution_type
-        )
-    )
-
-    process.start()
-
-    return process.pid
-
-
-def submit_job(command: str, job_name: str, start: datetime,
-               interval_duration: timedelta, weekdays: Optional[List[str]],
-               execution_frequency: str, execution_type: str,
-               task_id: int, sql_engine: engine) -> None:
-    """
-    Run a process job and save related process information to an SQL alchemy file.
-
-    Args:
-        command: command executed by the process.
-        job_name: job name allocated for the process.
-        start: start date of the job.
-        interval_duration: interval to wait before scheduling the next job execution.
-        weekdays: (optional) list with selected weekdays.
-        execution_frequency: frequency of execution: "Interval" / "Daily"
-        execution_type: type of execution schedule: is execution "Scheduled" or not.
-        task_id: task ID.
-        sql_engine: sql engine to use for saving DF information to sql.
-    """
-    started_process_id = start_scheduler_process(command, job_name, start, interval_duration,
-                                                 weekdays, execution_frequency, execution_type)
-    process_df = create_process_info_dataframe(command, job_name, started_process_id, task_id)
-    save_df_to_sql(process_df, sql_engine)
+        return control.send_daemon_request(control.STATE_COMMAND, task_id=int(task_id))
+    except (OSError, ControlError):
+        return None
 
 
 def read_log(filename: str) -> List[str]:
@@ -602,21 +364,6 @@ def read_log(filename: str) -> List[str]:
         raise exc
 
 
-def get_task_id(df: pd.DataFrame) -> int:
-    """
-    Generate an ID for a new task:
-        -> check for the last used ID
-        -> increment by 1
-
-    Args:
-        df: dataframe with process information and related task IDs.
-
-    Returns:
-        int: new task ID.
-    """
-    return df["task_id"].max() + 1 if df["task_id"].values else 1
-
-
 def check_last_process_info_update(job_name: str) -> Optional[datetime]:
     """
     Use 'last modified' timestamp of the job log file to check
@@ -636,43 +383,139 @@ def check_last_process_info_update(job_name: str) -> Optional[datetime]:
         return None
 
 
+def get_log_update_times(log_dir: Optional[str] = None) -> Dict[str, datetime]:
+    """
+    Get the 'last modified' timestamps of all job execution logs in one pass over the log folder.
+    Scheduler processes touch the folder whenever they log an execution, so the timestamps
+    are only read again once the modification time of the folder has changed.
+
+    Args:
+        log_dir: (optional) folder with job log files, settings.BASE_LOG_DIR if not set.
+
+    Returns:
+        dict with last modified timestamps of job execution logs, keyed by job name.
+    """
+    log_dir = log_dir or settings.BASE_LOG_DIR
+
+    try:
+        dir_mtime = os.stat(log_dir).st_mtime_ns
+    except OSError:
+        return {}
+
+    cached_mtime, update_times = _log_update_cache.get(log_dir, (None, None))
+
+    if cached_mtime == dir_mtime:
+        return update_times
+
+    update_times = {}
+
+    with os.scandir(log_dir) as entries:
+        for entry in entries:
+            if not entry.name.endswith(".txt") or entry.name.endswith("_stdout.txt"):
+                continue
+            try:
+                update_times[entry.name[:-len(".txt")]] = datetime.fromtimestamp(entry.stat().st_mtime)
+            except OSError:
+                # Removed since the folder was listed.
+                continue
+
+    if time.time_ns() - dir_mtime > settings.LOG_DIR_SETTLE_TIME * 1e9:
+        _log_update_cache[log_dir] = (dir_mtime, update_times)
+
+    return update_times
+
+
+def get_process_status_snapshot() -> pd.DataFrame:
+    """
+    Read the status of all processes of the system in a single pass over the process table.
+    The process objects are kept by psutil between calls, so CPU usage is measured
+    since the previous snapshot (and is 0 for processes seen for the first time).
+
+    Returns:
+        dataframe with 'status', 'create time', 'cpu %' and 'memory (MB)', indexed by 'process id'.
+    """
+    records = []
+
+    for process in psutil.process_iter(settings.PROCESS_STATUS_ATTRS, ad_value=None):
+        info = process.info
+        records.append((
+            info["pid"],
+            info["status"],
+            info["create_time"],
+            info["cpu_percent"],
+            info["memory_info"].rss / 2 ** 20 if info["memory_info"] else None,
+        ))
+
+    return pd.DataFrame.from_records(
+        records, columns=["process id", "status", "create time", "cpu %", "memory (MB)"], index="process id"
+    )
+
+
 def update_process_status_info(df: pd.DataFrame) -> None:
     """
     If process dataframe already exists, filter out dead and 'zombie' processes to only
-    show accurate process information.
+    show accurate process information. The status of all tasks is looked up in one process
+    snapshot, joined to the tasks by process ID and checked against the process creation time,
+    so that processes which got the ID of a finished task are not reported as running.
 
     Args:
         df: df with process information.
     """
-    df["running"] = df["process id"].apply(
-        lambda x: psutil.pid_exists(x) and psutil.Process(x).status() == "running")
+    pids = pd.to_numeric(df["process id"], errors="coerce").fillna(-1).astype("int64")
+    status = get_process_status_snapshot().reindex(pids.to_numpy())
+
+    # A process ID that now belongs to a process created at another time has been reused.
+    create_time = pd.to_numeric(df["process created"], errors="coerce").to_numpy()
+    same_process = np.isnan(create_time) | \
+        (np.abs(status["create time"].to_numpy() - create_time) <= settings.PROCESS_CREATE_TIME_TOLERANCE)
+    alive = (status["status"].notna() & ~status["status"].isin(_EXITED_STATUSES)).to_numpy()
+
+    df["running"] = alive & same_process
+    df["cpu %"] = np.where(same_process, status["cpu %"].to_numpy(), np.nan)
+    df["memory (MB)"] = np.where(same_process, status["memory (MB)"].round(1).to_numpy(), np.nan)
 
 
 def get_process_df(sql_engine: engine) -> pd.DataFrame:
     """
-    Check for and initialize process info dataframe has already been created.
-    If process dataframe already exists, filter out dead and 'zombie' processes to only
-    show accurate process information.
+    Get process information as a dataframe for display. The dataframe is only rebuilt
+    if the processes table has changed since the last call.
+    Status columns ('last update', 'running', 'cpu %', 'memory (MB)') are left empty and filled in separately.
+
+    Args:
+        sql_engine: sql alchemy engine to use.
+
+    Raises:
+        OperationalError: if any sqlalchemy errors have been thrown.
 
     Returns:
-        either an existing process dataframe or an empty one,
-            following the settings format.
+        process dataframe following the settings format,
+            empty if no processes have been submitted yet.
     """
-    try:
-        df = pd.read_sql_table("processes", con=sql_engine)
-    except ValueError:
-        df = pd.DataFrame(settings.FORMAT)
-    except OperationalError as exc:
-        raise exc
+    process_cache = database.get_process_cache(sql_engine)
+    process_cache.refresh()
+
+    version, df = _process_df_cache.get(sql_engine, (None, None))
+
+    if df is None or version != process_cache.version:
+        df = pd.DataFrame(process_cache.rows, columns=database.processes_table.columns.keys())
+
+        for column in settings.FORMAT:
+            if column not in df:
+                df[column] = None
+
+        df = df[list(settings.FORMAT)]
+        _process_df_cache[sql_engine] = (process_cache.version, df)
 
-    return df
+    return df.copy()
 
 
 def update_df_process_last_update_info(df: pd.DataFrame) -> None:
     """
-    Iterate over processes in process df and update respective process 'last update' values.
+    Update the 'last update' values of the processes in process df,
+    with the 'last modified' timestamps of their job log files.
 
     Args:
         df: df with process information.
     """
-    df["last update"] = df["job name"].apply(lambda x: check_last_process_info_update(x) if x else "")
+    update_times = get_log_update_times()
+    df["last update"] = df["job name"].apply(lambda x: update_times.get(x) if x else "")
@@ -0,0 +1,215 @@
+import logging
+import os
+import threading
+
+from typing import (
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple
+)
+
+from sqlalchemy import engine
+
+import tasklit.settings.consts as settings
+import tasklit.src.utils.database as database
+import tasklit.src.utils.processes as processes
+
+from tasklit.src.utils.job_specs import (
+    get_job_spec_fingerprint,
+    load_job_specs,
+    submit_job_specs,
+    JobSpec,
+    JOB_SPEC_FORMATS
+)
+
+logger = logging.getLogger(__name__)
+
+_sync_thread: Optional[threading.Thread] = None
+_sync_lock = threading.Lock()
+
+
+class JobSpecSyncResult(NamedTuple):
+    """
+    Outcome of syncing the job spec directory with the running tasks.
+
+    added: amount of started tasks, for new or changed jobs.
+    removed: amount of stopped tasks, for removed or changed jobs.
+    unchanged: amount of jobs that have been applied before and are left as they are.
+    """
+    added: int
+    removed: int
+    unchanged: int
+
+
+class JobSpecDirectory:
+    """
+    Directory of job spec files. Files are only parsed again once they have been modified,
+    so reloading a large, mostly unchanged directory is cheap.
+    """
+
+    def __init__(self, spec_dir: str = settings.JOB_SPEC_DIR) -> None:
+        """
+        Args:
+            spec_dir: folder with CSV, JSON and YAML job spec files.
+        """
+        self.spec_dir = spec_dir
+        self._files: Dict[str, Tuple[Tuple[int, int], List[JobSpec]]] = {}
+
+    def load(self) -> Dict[str, JobSpec]:
+        """
+        Read all job specs of the directory. Jobs without name are called '<file name>_<digest of their settings>',
+        so that adding or removing other jobs of a file does not rename them.
+
+        Raises:
+            ValueError: if any file is invalid or a job name is used more than once.
+
+        Returns:
+            job specs, keyed by job name.
+        """
+        files = {}
+
+        with os.scandir(self.spec_dir) as directory:
+            for entry in directory:
+                file_name, file_format = os.path.splitext(entry.name)
+                if not entry.is_file() or file_format.lstrip(".").lower() not in JOB_SPEC_FORMATS:
+                    continue
+
+                stat = entry.stat()
+                signature = (stat.st_mtime_ns, stat.st_size)
+                cached = self._files.get(entry.path)
+
+                if cached is None or cached[0] != signature:
+                    with open(entry.path, "rb") as spec_file:
+                        try:
+                            cached = (signature, load_job_specs(spec_file.read(), file_format, file_name,
+                                                             stable_names=True))
+                        except ValueError as exc:
+                            raise ValueError(f"{entry.name}: {exc}") from exc
+
+                files[entry.path] = cached
+
+        self._files = files
+        job_specs = {}
+
+        for path in sorted(files):
+            for job_spec in files[path][1]:
+                if job_spec.job_name in job_specs:
+                    raise ValueError(f"{os.path.basename(path)}: job name '{job_spec.job_name}' is used more than once.")
+                job_specs[job_spec.job_name] = job_spec
+
+        return job_specs
+
+
+def sync_job_specs(job_specs: Dict[str, JobSpec], sql_engine: engine) -> JobSpecSyncResult:
+    """
+    Apply the difference between job specs and the job specs applied before:
+        -> tasks of removed or changed jobs are stopped and removed
+        -> new and changed jobs are submitted in one batch
+        -> tasks of unchanged jobs keep running. Unchanged jobs whose task has been removed (by the user
+           or the retention garbage collection, e.g. after a 'Once' job has run) are not submitted again.
+    Tasks submitted in the UI are left alone.
+
+    Args:
+        job_specs: job specs, keyed by job name.
+        sql_engine: sql alchemy engine to use.
+
+    Raises:
+        OperationalError: if any sqlalchemy errors have been thrown.
+
+    Returns:
+        amount of added, removed and unchanged tasks.
+    """
+    fingerprints = {job_name: get_job_spec_fingerprint(job_spec) for job_name, job_spec in job_specs.items()}
+
+    with sql_engine.connect() as connection:
+        managed_rows = connection.execute(database.select_spec_processes_statement).fetchall()
+
+    applied = database.fetch_applied_job_specs(sql_engine)
+    # Jobs applied by earlier app versions are only known by their tasks.
+    for row in managed_rows:
+        applied.setdefault(row["job name"], row["spec hash"])
+
+    unchanged = {job_name for job_name, fingerprint in fingerprints.items() if applied.get(job_name) == fingerprint}
+    kept = set()
+    removed_rows = []
+
+    for row in managed_rows:
+        if row["job name"] in unchanged and fingerprints[row["job name"]] == row["spec hash"] and \
+                row["job name"] not in kept:
+            kept.add(row["job name"])
+        else:
+            removed_rows.append(row)
+
+    for row in removed_rows:
+        if row["process id"] is not None and \
+                processes.is_process_running(row["process id"], row["process created"]):
+            processes.terminate_process(row["process id"], row["process created"])
+
+    database.delete_processes([row["task_id"] for row in removed_rows], sql_engine)
+
+    added = [job_spec for job_name, job_spec in job_specs.items() if job_name not in unchanged]
+
+    if added:
+        submit_job_specs(added, sql_engine, managed=True)
+
+    database.save_applied_job_specs(
+        {job_spec.job_name: fingerprints[job_spec.job_name] for job_spec in added},
+        [job_name for job_name in applied if job_name not in fingerprints],
+        sql_engine
+    )
+
+    return JobSpecSyncResult(added=len(added), removed=len(removed_rows), unchanged=len(unchanged))
+
+
+def run_job_spec_sync(spec_directory: JobSpecDirectory, sql_engine: engine,
+                      stop_event: Optional[threading.Event] = None) -> None:
+    """
+    Sync the job spec directory every JOB_SPEC_SYNC_INTERVAL seconds until stopped.
+    Nothing is changed while the directory is missing or contains invalid files.
+
+    Args:
+        spec_directory: job spec directory to watch.
+        sql_engine: sql alchemy engine to use.
+        stop_event: (optional) event to stop the loop.
+    """
+    stop_event = stop_event or threading.Event()
+
+    while not stop_event.is_set():
+        try:
+            if os.path.isdir(spec_directory.spec_dir):
+                result = sync_job_specs(spec_directory.load(), sql_engine)
+
+                if result.added or result.removed:
+                    logger.info("Synced job specs: %s", result)
+        except Exception:
+            logger.exception("Job spec sync failed.")
+
+        stop_event.wait(settings.JOB_SPEC_SYNC_INTERVAL)
+
+
+def start_job_spec_sync(sql_engine: engine, spec_dir: str = settings.JOB_SPEC_DIR) -> threading.Thread:
+    """
+    Start watching the job spec directory in the background, once per process.
+
+    Args:
+        sql_engine: sql alchemy engine to use.
+        spec_dir: folder with job spec files.
+
+    Returns:
+        the sync thread.
+    """
+    global _sync_thread
+
+    with _sync_lock:
+        if _sync_thread is None or not _sync_thread.is_alive():
+            _sync_thread = threading.Thread(
+                target=run_job_spec_sync,
+                args=(JobSpecDirectory(spec_dir), sql_engine),
+                name="tasklit-job-spec-sync",
+                daemon=True
+            )
+            _sync_thread.start()
+
+    return _sync_thread
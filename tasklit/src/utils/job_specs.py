@@ -0,0 +1,358 @@
+import csv
+import hashlib
+import io
+import json
+
+from datetime import datetime, timedelta
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Union
+)
+
+from sqlalchemy import engine
+from sqlalchemy.exc import OperationalError
+
+import tasklit.settings.consts as settings
+import tasklit.src.utils.calendars as calendars
+import tasklit.src.utils.database as database
+import tasklit.src.utils.processes as processes
+import tasklit.src.utils.timezones as timezones
+
+from tasklit.src.utils.cron import parse_crontab, CronSchedule
+from tasklit.src.utils.job_names import get_job_name
+from tasklit.src.utils.tasks import get_interval_duration, Schedule, Task
+
+try:
+    import yaml
+
+    _YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+except ImportError:
+    yaml = None
+
+JOB_SPEC_FORMATS = ("csv", "json", "yaml", "yml", "crontab")
+
+
+class JobSpec(NamedTuple):
+    """
+    Definition of a task, with the same settings as the 'New task' UI.
+
+    command: command to be executed.
+    job_name: name allocated for the process job.
+    frequency: execution frequency: "Once" / "Interval" / "Daily" / "Cron".
+    unit: (interval only) unit of the execution interval, e.g. "Minutes".
+    quantity: (interval only) amount of interval units between executions.
+    weekdays: (daily only) weekdays on which the command is executed.
+    start: (optional) scheduled start of execution, immediately if not set.
+    cron: (cron only) 5- or 6-field cron expression.
+    timezone: (optional) IANA timezone of 'start' and the cron expression, the local timezone if not set.
+    calendar: (optional) name of the holiday and blackout calendar to follow.
+    """
+    command: str
+    job_name: str
+    frequency: str = settings.IMMEDIATE_FREQUENCY
+    unit: Optional[str] = None
+    quantity: Optional[int] = None
+    weekdays: Optional[Tuple[str, ...]] = None
+    start: Optional[datetime] = None
+    cron: Optional[str] = None
+    timezone: Optional[str] = None
+    calendar: Optional[str] = None
+
+
+def _parse_weekdays(value: Any) -> Tuple[str, ...]:
+    if isinstance(value, str):
+        value = value.replace(";", ",").split(",")
+
+    if isinstance(value, dict) or not all(isinstance(weekday, str) for weekday in value):
+        raise ValueError(f"weekdays have to be weekday names, not {value!r}")
+
+    weekdays = tuple(weekday.strip().capitalize() for weekday in value if weekday.strip())
+    unknown = [weekday for weekday in weekdays if weekday not in settings.WEEK_DAYS.values()]
+
+    if unknown:
+        raise ValueError(f"unknown weekdays {unknown}")
+
+    return weekdays
+
+
+def _parse_start(value: Any) -> datetime:
+    if isinstance(value, datetime):
+        return value
+
+    return datetime.fromisoformat(str(value).strip())
+
+
+def parse_job_spec(entry: Dict[str, Any], default_job_name: Optional[str] = None) -> JobSpec:
+    """
+    Validate a single job definition and convert it into a job spec.
+    Empty values are treated as missing, so that CSV files can leave columns blank.
+
+    Args:
+        entry: job definition with the keys 'command' (required), 'job_name', 'frequency',
+            'unit', 'quantity', 'weekdays', 'start', 'cron', 'timezone' and 'calendar'.
+        default_job_name: (optional) job name to use if the definition has none,
+            a random name is generated if not set.
+
+    Raises:
+        ValueError: if the definition is incomplete or contains invalid settings.
+
+    Returns:
+        job spec.
+    """
+    entry = {key: value for key, value in entry.items() if value not in (None, "")}
+    unknown_keys = set(entry) - set(JobSpec._fields)
+
+    if unknown_keys:
+        raise ValueError(f"unknown settings {sorted(unknown_keys)}")
+
+    if not str(entry.get("command", "")).strip():
+        raise ValueError("missing command")
+
+    frequency = entry.get("frequency", settings.IMMEDIATE_FREQUENCY)
+    unit = quantity = weekdays = cron = None
+
+    if frequency == settings.INTERVAL_FREQUENCY:
+        unit = entry.get("unit")
+        if unit not in settings.DATE_TRANSLATION:
+            raise ValueError(f"unit must be one of {list(settings.DATE_TRANSLATION)}")
+
+        quantity = int(entry.get("quantity", 1))
+        if not 1 <= quantity <= settings.TIME_VALUES[unit]:
+            raise ValueError(f"quantity must be between 1 and {settings.TIME_VALUES[unit]}")
+    elif frequency == settings.DAILY_FREQUENCY:
+        weekdays = _parse_weekdays(entry.get("weekdays", settings.WEEK_DAYS.values()))
+        if not weekdays:
+            raise ValueError("no weekdays selected")
+    elif frequency == settings.CRON_FREQUENCY:
+        cron = CronSchedule(str(entry.get("cron", ""))).expression
+    elif frequency != settings.IMMEDIATE_FREQUENCY:
+        raise ValueError(
+            f"frequency must be one of "
+            f"{[settings.IMMEDIATE_FREQUENCY, settings.INTERVAL_FREQUENCY, settings.DAILY_FREQUENCY, settings.CRON_FREQUENCY]}"
+        )
+
+    timezone_name = str(entry["timezone"]).strip() if "timezone" in entry else None
+    if timezone_name:
+        timezones.get_timezone(timezone_name)
+
+    calendar_name = str(entry["calendar"]).strip() if "calendar" in entry else None
+    if calendar_name and calendars.get_calendar(calendar_name) is None:
+        raise ValueError(f"unknown calendar '{calendar_name}', add it to {settings.CALENDAR_DIR}")
+
+    return JobSpec(
+        command=str(entry["command"]).strip(),
+        job_name=str(entry.get("job_name") or default_job_name or get_job_name()),
+        frequency=frequency,
+        unit=unit,
+        quantity=quantity,
+        weekdays=weekdays,
+        start=_parse_start(entry["start"]) if "start" in entry else None,
+        cron=cron,
+        timezone=timezone_name,
+        calendar=calendar_name,
+    )
+
+
+def parse_job_specs(entries: Iterable[Dict[str, Any]],
+                    name_prefix: Optional[str] = None,
+                    stable_names: bool = False) -> List[JobSpec]:
+    """
+    Validate job definitions and convert them into job specs.
+
+    Args:
+        entries: job definitions, see 'parse_job_spec'.
+        name_prefix: (optional) jobs without name are called '<name_prefix>_<position>',
+            random names are generated if not set.
+        stable_names: whether jobs without name are called '<name_prefix>_<digest of their settings>' instead,
+            so that their names do not change when other jobs are added or removed. Repeated identical jobs
+            get a '_2', '_3', ... suffix.
+
+    Raises:
+        ValueError: if any definition is invalid, naming the first invalid entry.
+
+    Returns:
+        list of job specs.
+    """
+    job_specs = []
+    repeats: Dict[str, int] = {}
+
+    for index, entry in enumerate(entries, start=1):
+        if not isinstance(entry, dict):
+            raise ValueError(f"Job {index}: expected a mapping of settings, got {type(entry).__name__}.")
+
+        try:
+            job_spec = parse_job_spec(entry, f"{name_prefix}_{index}" if name_prefix else None)
+        except (TypeError, ValueError) as exc:
+            raise ValueError(f"Job {index}: {exc}.") from exc
+
+        if stable_names and name_prefix and entry.get("job_name") in (None, ""):
+            digest = get_job_spec_fingerprint(job_spec._replace(job_name=""))[:10]
+            repeats[digest] = repeats.get(digest, 0) + 1
+            suffix = f"_{repeats[digest]}" if repeats[digest] > 1 else ""
+            job_spec = job_spec._replace(job_name=f"{name_prefix}_{digest}{suffix}")
+
+        job_specs.append(job_spec)
+
+    return job_specs
+
+
+def load_job_specs(content: Union[str, bytes], file_format: str,
+                   name_prefix: Optional[str] = None, stable_names: bool = False) -> List[JobSpec]:
+    """
+    Read job definitions from the contents of a CSV, JSON, YAML or crontab file.
+    CSV files have one job per row with the job settings as header,
+    JSON and YAML files contain a list of jobs (or a mapping with a 'jobs' list),
+    every schedule line of a crontab becomes a "Cron" job.
+
+    Args:
+        content: file content.
+        file_format: file format, one of JOB_SPEC_FORMATS.
+        name_prefix: (optional) prefix for names of jobs without name, see 'parse_job_specs'.
+        stable_names: whether names of jobs without name are derived from their settings, see 'parse_job_specs'.
+
+    Raises:
+        ValueError: if the format is not supported or any definition is invalid.
+        ImportError: if a YAML file is read without PyYAML being installed.
+
+    Returns:
+        list of job specs.
+    """
+    if isinstance(content, bytes):
+        content = content.decode("utf-8-sig")
+
+    file_format = file_format.lower().lstrip(".")
+
+    if file_format == "csv":
+        entries = list(csv.DictReader(io.StringIO(content)))
+    elif file_format == "json":
+        entries = json.loads(content)
+    elif file_format in ("yaml", "yml"):
+        if yaml is None:
+            raise ImportError("Reading YAML job files requires PyYAML: pip install pyyaml")
+        entries = yaml.load(content, Loader=_YamlLoader) or []
+    elif file_format == "crontab":
+        entries = [
+            {"command": command, "frequency": settings.CRON_FREQUENCY, "cron": cron_expression}
+            for cron_expression, command in parse_crontab(content)
+        ]
+        name_prefix = name_prefix or "crontab"
+    else:
+        raise ValueError(f"Unsupported job file format '{file_format}', use one of {list(JOB_SPEC_FORMATS)}.")
+
+    if isinstance(entries, dict):
+        entries = entries.get("jobs", [])
+
+    return parse_job_specs(entries, name_prefix, stable_names)
+
+
+def get_job_spec_fingerprint(job_spec: JobSpec) -> str:
+    """
+    Get a fingerprint of all settings of a job spec, so that changed jobs can be detected.
+
+    Args:
+        job_spec: job spec.
+
+    Returns:
+        hex digest identifying the job spec.
+    """
+    return hashlib.sha1(repr(tuple(job_spec)).encode("utf-8")).hexdigest()
+
+
+def get_job_spec_schedule(job_spec: JobSpec,
+                          now: Optional[datetime] = None) -> Tuple[datetime, timedelta, str]:
+    """
+    Translate a job spec into scheduler settings, the same way the 'New task' UI does.
+
+    Args:
+        job_spec: job spec.
+        now: (optional) current wall clock datetime of the job's timezone, used if the job starts immediately.
+
+    Returns:
+        execution start, interval duration and execution type ("Now" / "Scheduled").
+    """
+    interval_duration = get_interval_duration(
+        job_spec.unit, job_spec.quantity, job_spec.weekdays
+    )
+
+    if job_spec.start is None:
+        now = now or datetime.now(timezones.get_timezone(job_spec.timezone)).replace(tzinfo=None)
+        return now, interval_duration, "Now"
+
+    start = job_spec.start
+
+    if job_spec.frequency == settings.DAILY_FREQUENCY:
+        while settings.WEEK_DAYS[start.weekday()] not in job_spec.weekdays:
+            start += timedelta(days=1)
+
+    return start, interval_duration, "Scheduled"
+
+
+def get_job_spec_task(job_spec: JobSpec, managed: bool = False) -> Task:
+    """
+    Create the task of a job spec, with the schedule the 'New task' UI would create.
+
+    Args:
+        job_spec: job spec.
+        managed: whether the task is kept in sync with the job spec directory,
+            in which case its job spec fingerprint is set as well.
+
+    Returns:
+        task, without scheduler process.
+    """
+    start, interval_duration, execution_type = get_job_spec_schedule(job_spec)
+    schedule = Schedule.create(
+        start,
+        interval_duration,
+        job_spec.weekdays,
+        job_spec.frequency,
+        execution_type,
+        job_spec.cron,
+        job_spec.timezone,
+        job_spec.calendar
+    )
+
+    return Task(
+        job_spec.command,
+        job_spec.job_name,
+        schedule,
+        spec_hash=get_job_spec_fingerprint(job_spec) if managed else None
+    )
+
+
+def submit_job_specs(job_specs: List[JobSpec], sql_engine: engine, managed: bool = False) -> List[int]:
+    """
+    Start scheduler processes for a batch of jobs and save their process information
+    in a single transaction. If saving fails, the started processes are stopped again.
+
+    Args:
+        job_specs: jobs to submit.
+        sql_engine: sql alchemy engine to use.
+        managed: whether the tasks are kept in sync with the job spec directory,
+            in which case their job spec fingerprint is saved as well.
+
+    Raises:
+        OperationalError: if any sqlalchemy errors have been thrown.
+
+    Returns:
+        IDs allocated for the new tasks, in job spec order.
+    """
+    tasks = []
+
+    try:
+        for job_spec in job_specs:
+            task = get_job_spec_task(job_spec, managed)
+            processes.start_scheduler_process(task)
+            tasks.append(task)
+
+        return database.insert_tasks(tasks, sql_engine)
+    except (OperationalError, OSError) as exc:
+        for task in tasks:
+            if processes.is_process_running(task.pid, task.process_created):
+                processes.terminate_process(task.pid, task.process_created)
+        raise exc
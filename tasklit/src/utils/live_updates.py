@@ -0,0 +1,89 @@
+import math
+import time
+
+from typing import List
+
+import streamlit as st
+
+from sqlalchemy import engine
+from streamlit.delta_generator import DeltaGenerator
+
+import tasklit.settings.consts as settings
+import tasklit.src.utils.status_monitor as status_monitor
+
+from tasklit.src.utils.log_stream import LogStream
+from tasklit.src.utils.status_monitor import TaskSnapshot
+from tasklit.src.utils.task_table import (
+    get_task_page,
+    TaskTableQuery
+)
+
+
+def render_task_table(table_slot: DeltaGenerator, snapshot: TaskSnapshot, query: TaskTableQuery) -> None:
+    """
+    Render the selected page of the task table of a snapshot of the task state.
+
+    Args:
+        table_slot: Streamlit placeholder of the task table.
+        snapshot: snapshot of the task state.
+        query: filter, sort order and page of the task table to display.
+    """
+    page_df, tasks, page = get_task_page(snapshot.df, query)
+    pages = max(1, math.ceil(tasks / query.page_size))
+    first = (page - 1) * query.page_size
+
+    with table_slot.container():
+        st.table(page_df)
+        st.caption(f"Showing tasks {min(first + 1, tasks)}-{first + len(page_df)} of {tasks}, page {page} of {pages}.")
+
+
+def run_live_updates(sql_engine: engine,
+                     snapshot: TaskSnapshot,
+                     table_slot: DeltaGenerator,
+                     status_slot: DeltaGenerator,
+                     log_streams: List[LogStream],
+                     query: TaskTableQuery = TaskTableQuery(),
+                     refresh_interval: float = settings.AUTO_REFRESH_INTERVAL,
+                     frame_interval: float = 1 / settings.LOG_STREAM_MAX_FPS) -> None:
+    """
+    Keep the task table and the live log output of a rendered page up to date, once the rest
+    of the page has been rendered. Only these placeholders are updated, widgets and expanders
+    are not executed again. The loop waits for the status monitor to publish new task state,
+    Streamlit interrupts it as soon as the user interacts with the page.
+    Without auto-refresh the loop ends once all log streams have finished.
+
+    Args:
+        sql_engine: sql alchemy engine to use.
+        snapshot: snapshot of the task state the page has been rendered with.
+        table_slot: Streamlit placeholder of the task table.
+        status_slot: Streamlit placeholder for the time of the displayed task state.
+        log_streams: live log output to keep up to date.
+        query: filter, sort order and page of the task table to display.
+        refresh_interval: minimum amount of seconds between two task table updates, 0 for no auto-refresh.
+        frame_interval: minimum amount of seconds between two updates of the log output.
+    """
+    monitor = status_monitor.get_status_monitor(sql_engine)
+    shown = latest = snapshot
+    table_updated = last_update = time.monotonic()
+
+    while True:
+        log_streams = [log_stream for log_stream in log_streams if not log_stream.update()]
+        now = time.monotonic()
+
+        if not refresh_interval and not log_streams:
+            return
+
+        if refresh_interval:
+            latest = monitor.get_snapshot()
+
+            if latest is not shown and now - table_updated >= refresh_interval:
+                render_task_table(table_slot, latest, query)
+                shown, table_updated = latest, now
+
+            # Doubles as heartbeat, so that Streamlit can interrupt the script on user input.
+            if now - last_update >= settings.LOG_STREAM_HEARTBEAT:
+                status_slot.text(f"Task state as of {shown.refreshed:{settings.DATE_FORMAT}}.")
+                last_update = now
+
+        # Wake up for the next log frame or as soon as the next task state has been published.
+        latest = monitor.wait_for_snapshot(latest, frame_interval if log_streams else settings.LOG_STREAM_HEARTBEAT)
@@ -0,0 +1,190 @@
+import codecs
+import os
+import time
+
+from typing import (
+    BinaryIO,
+    Callable,
+    Optional
+)
+
+from streamlit.delta_generator import DeltaGenerator
+
+import tasklit.settings.consts as settings
+
+
+class LogTail:
+    """
+    Follow a growing log file and return only the text that has been appended
+    since the previous read. Incomplete trailing lines are held back until they
+    are terminated, so that every chunk handed to the UI consists of whole lines.
+    """
+
+    def __init__(self, filename: str, backlog_bytes: Optional[int] = None) -> None:
+        """
+        Args:
+            filename: path to the log file to follow.
+            backlog_bytes: (optional) amount of already existing log output to include
+                when the file is opened. By default the whole file is included.
+        """
+        self.filename = filename
+        self.offset = 0
+        self._backlog_bytes = backlog_bytes
+        self._file: Optional[BinaryIO] = None
+        self._decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self._pending = ""
+
+    def _open(self) -> bool:
+        """
+        Open the log file if it has not been opened yet.
+
+        Returns:
+            True if the file is available for reading.
+        """
+        if self._file is not None:
+            return True
+
+        try:
+            self._file = open(self.filename, "rb")
+        except FileNotFoundError:
+            return False
+
+        if self._backlog_bytes is not None:
+            size = os.fstat(self._file.fileno()).st_size
+            self.offset = max(0, size - self._backlog_bytes)
+
+        return True
+
+    def read_new(self, flush: bool = False) -> str:
+        """
+        Read log output appended since the last call.
+
+        Args:
+            flush: also return a trailing line that has not been terminated yet,
+                e.g. once the writing process has finished.
+
+        Returns:
+            newly appended complete lines, or an empty string if there are none.
+        """
+        if self._open():
+            size = os.fstat(self._file.fileno()).st_size
+
+            # Job stdout logs are re-created on every run, start over if the file shrank.
+            if size < self.offset:
+                self.offset = 0
+                self._decoder.reset()
+                self._pending = ""
+
+            if size > self.offset:
+                self._file.seek(self.offset)
+                data = self._file.read(size - self.offset)
+                self.offset += len(data)
+                self._pending += self._decoder.decode(data)
+
+        if flush:
+            text = self._pending + self._decoder.decode(b"", final=True)
+            self._pending = ""
+            return text
+
+        line_end = self._pending.rfind("\n") + 1
+        text, self._pending = self._pending[:line_end], self._pending[line_end:]
+
+        return text
+
+    def close(self) -> None:
+        """
+        Close the underlying log file handle.
+        """
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class LogStream:
+    """
+    Log output of a running process, pushed to a Streamlit container one frame at a time,
+    so that a single loop can keep several parts of the page up to date.
+    """
+
+    def __init__(self, filename: str,
+                 is_finished: Callable[[], bool],
+                 container: DeltaGenerator,
+                 backlog_bytes: Optional[int] = None) -> None:
+        """
+        Args:
+            filename: path to the log file to stream.
+            is_finished: callable that returns True once the writing process has stopped.
+            container: Streamlit container to render the log output into.
+            backlog_bytes: (optional) amount of already existing log output to display first.
+        """
+        self.filename = filename
+        self.is_finished = is_finished
+        self.finished = False
+        self._status = container.empty()
+        self._output = container.container()
+        self._tail = LogTail(filename, backlog_bytes)
+        self._received = 0
+        self._last_update = time.monotonic()
+
+    def update(self) -> bool:
+        """
+        Render the log output appended since the previous frame. While there is no new output,
+        a short status line is refreshed every LOG_STREAM_HEARTBEAT seconds so that Streamlit
+        can still interrupt the script on user input.
+
+        Returns:
+            True once the writing process has stopped and all of its output has been rendered.
+        """
+        if self.finished:
+            return True
+
+        finished = self.is_finished()
+        chunk = self._tail.read_new(flush=finished)
+
+        if chunk:
+            self._output.text(chunk.rstrip("\n"))
+            self._received += len(chunk)
+
+        if finished:
+            self._status.text(f"Finished streaming {self.filename} ({self._received} characters).")
+            self.finished = True
+            self.close()
+            return True
+
+        now = time.monotonic()
+        if chunk or now - self._last_update >= settings.LOG_STREAM_HEARTBEAT:
+            self._status.text(f"Streaming {self.filename} ({self._received} characters)...")
+            self._last_update = now
+
+        return False
+
+    def close(self) -> None:
+        """
+        Close the followed log file.
+        """
+        self._tail.close()
+
+
+def stream_log_file(filename: str,
+                    is_finished: Callable[[], bool],
+                    container: DeltaGenerator,
+                    backlog_bytes: Optional[int] = None,
+                    frame_interval: float = 1 / settings.LOG_STREAM_MAX_FPS) -> None:
+    """
+    Push log output to the UI as it is written, until 'is_finished' returns True.
+    Only newly appended lines are sent to the browser, at most once per frame interval.
+
+    Args:
+        filename: path to the log file to stream.
+        is_finished: callable that returns True once the writing process has stopped.
+        container: Streamlit container to render the log output into.
+        backlog_bytes: (optional) amount of already existing log output to display first.
+        frame_interval: minimum amount of seconds between two UI updates.
+    """
+    stream = LogStream(filename, is_finished, container, backlog_bytes)
+
+    try:
+        while not stream.update():
+            time.sleep(frame_interval)
+    finally:
+        stream.close()
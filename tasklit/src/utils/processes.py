@@ -0,0 +1,271 @@
+"""
+Control of the scheduler processes of tasks: starting, identifying, stopping and terminating them.
+
+Used by the app and the command line interface, this module must stay light:
+it may not import Streamlit, pandas or SQLAlchemy, so that CLI commands start quickly.
+"""
+import os
+import pickle
+import sys
+
+from subprocess import PIPE, Popen
+from typing import (
+    Dict,
+    Optional,
+    Tuple
+)
+
+import psutil
+
+import tasklit
+import tasklit.settings.consts as settings
+import tasklit.src.utils.control as control
+
+from tasklit.src.utils.control import ControlError
+from tasklit.src.utils.tasks import Task
+
+# Folder containing the tasklit package, so that scheduler processes can import it from any working directory.
+_PACKAGE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(tasklit.__file__)))
+
+# Validated process handles of tasks, keyed by process ID and creation time.
+_process_handles: Dict[Tuple[int, Optional[float]], psutil.Process] = {}
+
+# Statuses of processes that have exited but have not been reaped by their parent yet.
+_EXITED_STATUSES = (psutil.STATUS_ZOMBIE, psutil.STATUS_DEAD)
+
+
+def terminate_child_processes(parent_process: psutil.Process, timeout: float = 3) -> None:
+    """
+    Check for any child processes spawned by the parent process and
+    - if found - terminate them.
+
+    Args:
+        parent_process: parent process object.
+        timeout: seconds to wait for the child processes to exit before terminating them again.
+    """
+    if child_processes := parent_process.children(recursive=True):
+
+        for child_process in child_processes:
+            child_process.terminate()
+
+        gone, alive = psutil.wait_procs(child_processes, timeout=timeout)
+
+        for process in alive:
+            process.terminate()
+
+
+def stop_process_tree(pid: int, timeout: float) -> bool:
+    """
+    Terminate a process and its child processes, and kill the ones that have not exited within the timeout.
+
+    Args:
+        pid: process ID.
+        timeout: seconds to wait for the processes to exit after terminating them, and again after killing them.
+
+    Returns:
+        True if all processes have exited, False if any of them is still running.
+    """
+    try:
+        parent = psutil.Process(pid)
+        tree = [parent] + parent.children(recursive=True)
+    except psutil.NoSuchProcess:
+        return True
+
+    for signal_process in (psutil.Process.terminate, psutil.Process.kill):
+        for process in tree:
+            try:
+                signal_process(process)
+            except psutil.NoSuchProcess:
+                pass
+
+        gone, alive = psutil.wait_procs(tree, timeout=timeout)
+        # Killed processes that are not reaped by their parent (e.g. orphans in containers) stay zombies.
+        tree = [process for process in alive if _get_status(process) not in _EXITED_STATUSES]
+
+        if not tree:
+            return True
+
+    return False
+
+
+def _get_status(process: psutil.Process) -> str:
+    try:
+        return process.status()
+    except psutil.NoSuchProcess:
+        return psutil.STATUS_DEAD
+
+
+def get_task_process(pid: int, create_time: Optional[float] = None) -> Optional[psutil.Process]:
+    """
+    Get the process of a task, unless its process ID has been reused by an unrelated process
+    since the task was started. Validated process handles are kept between calls,
+    later checks only compare the creation time of the process behind the handle.
+
+    Args:
+        pid: process ID.
+        create_time: (optional) creation time of the task's process in seconds since epoch,
+            the process is not validated if not set (tasks saved by earlier app versions).
+
+    Returns:
+        process, None if there is no process with this ID or it is not the task's process.
+    """
+    key = (pid, create_time)
+    process = _process_handles.get(key)
+
+    if process is not None:
+        # Compares the creation time of the process that currently has the ID with the handle's.
+        if process.is_running():
+            return process
+        del _process_handles[key]
+        return None
+
+    try:
+        process = psutil.Process(pid)
+        if create_time is not None and \
+                abs(process.create_time() - create_time) > settings.PROCESS_CREATE_TIME_TOLERANCE:
+            return None
+    except psutil.NoSuchProcess:
+        return None
+
+    _process_handles[key] = process
+
+    return process
+
+
+def terminate_process(pid: int, create_time: Optional[float] = None) -> None:
+    """
+    Terminate a running process and any child processes that
+    have been spawned by it.
+
+    Args:
+        pid: process ID.
+        create_time: (optional) creation time of the process in seconds since epoch,
+            nothing is terminated if the process ID now belongs to another process.
+
+    Raises:
+        psutil.NoSuchProcess if related process cannot be found.
+    """
+    try:
+        parent = get_task_process(pid, create_time)
+        if parent is None:
+            raise psutil.NoSuchProcess(pid)
+
+        # Suspended, a scheduler process cannot start its next run (e.g. one requested to run now)
+        # once its running job has been terminated.
+        parent.suspend()
+        terminate_child_processes(parent)
+        parent.terminate()
+        parent.kill()
+    except psutil.NoSuchProcess as exc:
+        raise exc
+
+
+def stop_task_process(job_name: str, pid: int, create_time: Optional[float] = None) -> None:
+    """
+    Stop the scheduler process of a task and the job it is running. The scheduler process is asked to stop
+    over its control socket; scheduler processes that cannot be reached (started by earlier app versions)
+    are terminated.
+
+    Args:
+        job_name: name of the task's job.
+        pid: ID of the scheduler process.
+        create_time: (optional) creation time of the scheduler process in seconds since epoch.
+
+    Raises:
+        psutil.NoSuchProcess if the scheduler process cannot be reached and cannot be found.
+    """
+    try:
+        control.send_request(control.get_scheduler_socket_path(job_name), control.STOP_COMMAND, pid=int(pid))
+    except (OSError, ControlError):
+        terminate_process(pid, create_time)
+
+
+def is_process_running(pid: int, create_time: Optional[float] = None) -> bool:
+    """
+    Check whether a process exists, is still the same process and has not exited ('zombie').
+
+    Args:
+        pid: process ID.
+        create_time: (optional) creation time of the process in seconds since epoch.
+
+    Returns:
+        True/False based on the result of the check.
+    """
+    process = get_task_process(pid, create_time)
+
+    try:
+        return process is not None and process.status() not in _EXITED_STATUSES
+    except psutil.NoSuchProcess:
+        return False
+
+
+def get_running_processes() -> Dict[int, float]:
+    """
+    Take one snapshot of the process table, so that many tasks can be checked
+    in one pass instead of one process lookup per task.
+
+    Returns:
+        creation times in seconds since epoch of the processes that have not exited, by process ID.
+    """
+    return {
+        process.info["pid"]: process.info["create_time"]
+        for process in psutil.process_iter(["pid", "status", "create_time"], ad_value=None)
+        if process.info["status"] not in _EXITED_STATUSES
+    }
+
+
+def is_running_in_snapshot(running_processes: Dict[int, float], pid: int,
+                           create_time: Optional[float] = None) -> bool:
+    """
+    Check whether a process is running, and is still the same process, in a process table snapshot.
+
+    Args:
+        running_processes: snapshot of 'get_running_processes'.
+        pid: process ID.
+        create_time: (optional) creation time of the process in seconds since epoch.
+
+    Returns:
+        True/False based on the result of the check.
+    """
+    if int(pid) not in running_processes:
+        return False
+
+    current_create_time = running_processes[int(pid)]
+
+    return create_time is None or current_create_time is None or \
+        abs(current_create_time - create_time) <= settings.PROCESS_CREATE_TIME_TOLERANCE
+
+
+def start_scheduler_process(task: Task) -> int:
+    """
+    Run the scheduler process of a task and set its process ID on the task.
+    The process is started from the minimal scheduler entry module instead of being forked
+    from the Streamlit server, so it does not carry the memory of the app.
+
+    Args:
+        task: task to execute on its schedule.
+
+    Raises:
+        OSError if the scheduler process cannot be started.
+
+    Returns:
+        ID of the started process.
+    """
+    python_path = os.pathsep.join(filter(None, [_PACKAGE_ROOT, os.environ.get("PYTHONPATH")]))
+
+    try:
+        process = Popen(
+            [sys.executable, "-m", settings.SCHEDULER_MODULE],
+            stdin=PIPE,
+            env=dict(os.environ, PYTHONPATH=python_path)
+        )
+        with process.stdin:
+            process.stdin.write(pickle.dumps(task))
+    except OSError as exc:
+        raise exc
+
+    task.pid = process.pid
+    process_handle = get_task_process(process.pid)
+    task.process_created = process_handle.create_time() if process_handle is not None else None
+
+    return process.pid
@@ -0,0 +1,330 @@
+import logging
+import os
+import threading
+
+from datetime import datetime, timedelta
+from typing import (
+    List,
+    NamedTuple,
+    Optional,
+    Set
+)
+
+from sqlalchemy import engine
+
+import tasklit.settings.consts as settings
+import tasklit.src.utils.database as database
+import tasklit.src.utils.processes as processes
+
+from tasklit.src.utils.control import remove_scheduler_socket
+from tasklit.src.utils.file_locks import locked_file
+from tasklit.src.utils.ring_buffer import remove_output_buffer
+
+logger = logging.getLogger(__name__)
+
+# Smallest possible execution log entry: "<date> <time> Executed <command>\n".
+_MIN_RUN_ENTRY_BYTES = len("2021-01-01 00:00:00 Executed \n")
+
+_gc_thread: Optional[threading.Thread] = None
+_gc_lock = threading.Lock()
+
+
+class RetentionPolicy(NamedTuple):
+    """
+    Limits for how much process information, run history and log output is kept.
+
+    max_age: process information and logs of tasks that stopped running are removed after this age.
+    max_runs_per_task: amount of run history entries kept in the execution log of each task.
+    max_log_bytes: total size of the log folder above which logs of finished tasks are removed,
+        oldest first.
+    max_changes: amount of latest processes table change feed entries to keep.
+    """
+    max_age: timedelta = settings.RETENTION_MAX_AGE
+    max_runs_per_task: int = settings.RETENTION_MAX_RUNS_PER_TASK
+    max_log_bytes: int = settings.RETENTION_MAX_LOG_BYTES
+    max_changes: int = settings.RETENTION_MAX_CHANGES
+
+
+class _LogEntry(NamedTuple):
+    path: str
+    job_name: str
+    is_execution_log: bool
+    size: int
+    mtime: float
+
+
+def get_log_job_name(filename: str) -> str:
+    """
+    Get the name of the job a log file belongs to.
+
+    Args:
+        filename: log filename, e.g. 'nostalgic_strauss_stdout.txt'.
+
+    Returns:
+        job name.
+    """
+    job_name = filename[:-len(".txt")]
+
+    return job_name[:-len("_stdout")] if job_name.endswith("_stdout") else job_name
+
+
+def trim_execution_log(log_filepath: str, max_runs: int) -> int:
+    """
+    Only keep the latest run history entries of a job execution log. The log is rewritten in place
+    while holding its lock, so that entries appended by the scheduler process meanwhile are kept.
+
+    Args:
+        log_filepath: path to the job execution log.
+        max_runs: amount of entries to keep.
+
+    Raises:
+        FileNotFoundError if the log file is missing.
+
+    Returns:
+        amount of removed entries.
+    """
+    with open(log_filepath, "r+", encoding="utf-8") as file, locked_file(file):
+        lines = file.readlines()
+
+        if len(lines) <= max_runs:
+            return 0
+
+        file.seek(0)
+        file.writelines(lines[-max_runs:] if max_runs else [])
+        file.truncate()
+
+    return len(lines) - max_runs
+
+
+class RetentionCollector:
+    """
+    Incremental garbage collector for process information, run history and logs.
+    Every call to 'step' handles at most one batch of table rows and log files,
+    so that clean-up work is spread out instead of stalling the app.
+    """
+
+    def __init__(self, sql_engine: engine,
+                 policy: RetentionPolicy = RetentionPolicy(),
+                 log_dir: str = settings.BASE_LOG_DIR,
+                 batch_size: int = settings.GC_BATCH_SIZE) -> None:
+        """
+        Args:
+            sql_engine: sql alchemy engine to use for accessing DB file.
+            policy: retention limits to apply.
+            log_dir: folder with job log files.
+            batch_size: maximum amount of rows and log files handled per step.
+        """
+        self.sql_engine = sql_engine
+        self.policy = policy
+        self.log_dir = log_dir
+        self.batch_size = batch_size
+        self._task_cursor = 0
+        self._log_entries: List[_LogEntry] = []
+        self._log_bytes = 0
+        self._known_jobs: Set[str] = set()
+        self._log_pass_active = False
+        self._processes_done = self._logs_done = False
+
+    def step(self) -> int:
+        """
+        Run one batch of garbage collection. Once both the processes table and
+        the log folder have been fully examined, the pass is complete.
+
+        Returns:
+            amount of rows and log files that have been examined, 0 at the end of a pass.
+        """
+        examined = 0
+
+        if not self._processes_done:
+            processes_examined = self.collect_processes()
+            self._processes_done = not processes_examined
+            examined += processes_examined
+
+        if not self._logs_done:
+            logs_examined = self.collect_logs()
+            self._logs_done = not logs_examined
+            examined += logs_examined
+
+        if self._processes_done and self._logs_done:
+            self._processes_done = self._logs_done = False
+
+        return examined
+
+    def collect_processes(self) -> int:
+        """
+        Examine the next batch of the processes table: release output buffers and control sockets of tasks
+        that are no longer running and delete them once they are older than the maximum age.
+        At the end of a pass, one batch of old change feed entries is pruned.
+
+        Returns:
+            amount of examined rows, 0 once a full pass over the table has been completed.
+        """
+        with self.sql_engine.connect() as connection:
+            rows = connection.execute(
+                database.select_processes_batch_statement,
+                {"cursor": self._task_cursor, "limit": self.batch_size}
+            ).fetchall()
+
+        if not rows:
+            self._task_cursor = 0
+            database.prune_process_changes(self.policy.max_changes, self.batch_size, self.sql_engine)
+            return 0
+
+        self._task_cursor = rows[-1]["task_id"]
+        cutoff = datetime.now() - self.policy.max_age
+        expired = []
+        # Queued tasks have not been started yet, they are kept until the task starter gets to them.
+        stopped = [
+            row for row in rows
+            if row["process id"] is not None and
+            not processes.is_process_running(row["process id"], row["process created"])
+        ]
+
+        for row in stopped:
+            remove_output_buffer(row["process id"])
+
+            if row["created"] < cutoff:
+                expired.append(row["task_id"])
+
+        for job_name in self._get_unused_job_names({row["job name"] for row in stopped}):
+            remove_scheduler_socket(job_name)
+
+        database.delete_processes(expired, self.sql_engine)
+
+        return len(rows)
+
+    def _get_unused_job_names(self, job_names: Set[str]) -> Set[str]:
+        """
+        Leave out the job names of running tasks, control sockets are named after the job
+        and job names are not unique.
+
+        Args:
+            job_names: job names of tasks that are no longer running.
+
+        Returns:
+            job names that no running task uses.
+        """
+        if not job_names:
+            return job_names
+
+        with self.sql_engine.connect() as connection:
+            rows = connection.execute(
+                database.select_started_processes_by_job_name_statement, {"job_names": list(job_names)}
+            ).fetchall()
+
+        return job_names - {
+            row["job name"] for row in rows
+            if processes.is_process_running(row["process id"], row["process created"])
+        }
+
+    def _start_log_pass(self) -> None:
+        """
+        List log files for a new pass, oldest first, and look up which jobs are still known.
+        """
+        entries = []
+
+        with os.scandir(self.log_dir) as directory:
+            for entry in directory:
+                if not entry.is_file() or not entry.name.endswith(".txt"):
+                    continue
+
+                job_name = get_log_job_name(entry.name)
+                stat = entry.stat()
+                entries.append(
+                    _LogEntry(entry.path, job_name, entry.name == f"{job_name}.txt", stat.st_size, stat.st_mtime)
+                )
+
+        self._log_entries = sorted(entries, key=lambda log_entry: log_entry.mtime, reverse=True)
+        self._log_bytes = sum(log_entry.size for log_entry in entries)
+
+        with self.sql_engine.connect() as connection:
+            self._known_jobs = set(connection.execute(database.select_job_names_statement).scalars())
+
+    def collect_logs(self) -> int:
+        """
+        Examine the next batch of log files: trim the run history of known tasks and
+        remove logs of deleted tasks that are too old or exceed the total size limit.
+
+        Returns:
+            amount of examined log files, 0 once a full pass over the log folder has been completed.
+        """
+        if not self._log_entries:
+            if self._log_pass_active or not os.path.isdir(self.log_dir):
+                self._log_pass_active = False
+                return 0
+
+            self._start_log_pass()
+            self._log_pass_active = True
+
+            if not self._log_entries:
+                self._log_pass_active = False
+                return 0
+
+        cutoff = (datetime.now() - self.policy.max_age).timestamp()
+        examined = 0
+
+        while self._log_entries and examined < self.batch_size:
+            log_entry = self._log_entries.pop()
+            examined += 1
+
+            try:
+                if log_entry.job_name in self._known_jobs:
+                    if log_entry.is_execution_log and \
+                            log_entry.size > self.policy.max_runs_per_task * _MIN_RUN_ENTRY_BYTES:
+                        trim_execution_log(log_entry.path, self.policy.max_runs_per_task)
+                elif log_entry.mtime < cutoff or self._log_bytes > self.policy.max_log_bytes:
+                    os.remove(log_entry.path)
+                    self._log_bytes -= log_entry.size
+            except FileNotFoundError:
+                self._log_bytes -= log_entry.size
+
+        return examined
+
+
+def run_retention_gc(collector: RetentionCollector,
+                     stop_event: Optional[threading.Event] = None) -> None:
+    """
+    Run garbage collection steps until stopped. Batches follow each other with a short pause,
+    once a pass is complete the collector waits for GC_INTERVAL seconds.
+
+    Args:
+        collector: retention collector to run.
+        stop_event: (optional) event to stop the loop.
+    """
+    stop_event = stop_event or threading.Event()
+
+    while not stop_event.is_set():
+        try:
+            examined = collector.step()
+        except Exception:
+            logger.exception("Retention garbage collection step failed.")
+            examined = 0
+
+        stop_event.wait(settings.GC_BATCH_PAUSE if examined else settings.GC_INTERVAL)
+
+
+def start_retention_gc(sql_engine: engine,
+                       policy: RetentionPolicy = RetentionPolicy()) -> threading.Thread:
+    """
+    Start the background retention garbage collector once per process.
+
+    Args:
+        sql_engine: sql alchemy engine to use for accessing DB file.
+        policy: retention limits to apply.
+
+    Returns:
+        the garbage collector thread.
+    """
+    global _gc_thread
+
+    with _gc_lock:
+        if _gc_thread is None or not _gc_thread.is_alive():
+            _gc_thread = threading.Thread(
+                target=run_retention_gc,
+                args=(RetentionCollector(sql_engine, policy),),
+                name="tasklit-retention-gc",
+                daemon=True
+            )
+            _gc_thread.start()
+
+    return _gc_thread
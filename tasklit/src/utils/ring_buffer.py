@@ -0,0 +1,289 @@
+import os
+import struct
+
+from multiprocessing import shared_memory
+from typing import Optional, Tuple
+
+import tasklit.settings.consts as settings
+
+try:
+    from multiprocessing import resource_tracker
+except ImportError:
+    resource_tracker = None
+
+# The buffer header holds the total amount of bytes written since the last reset.
+_HEADER = struct.Struct("Q")
+
+
+def get_output_buffer_name(pid: int) -> str:
+    """
+    Derive the shared memory block name of a scheduler process's output buffer. Buffers are named by
+    process ID rather than job name, since job names are not unique and every running scheduler process
+    has its own ID.
+
+    Args:
+        pid: ID of the scheduler process.
+
+    Returns:
+        shared memory block name.
+    """
+    return f"tasklit_{int(pid)}"
+
+
+def _get_tracked_name(memory: shared_memory.SharedMemory) -> Optional[str]:
+    """
+    Get the name under which the multiprocessing resource tracker manages a shared memory block.
+    Only POSIX shared memory blocks are tracked, under their name with a leading slash.
+
+    Args:
+        memory: shared memory block.
+
+    Returns:
+        tracked name or None if shared memory blocks are not tracked on this platform.
+    """
+    if resource_tracker is None or os.name != "posix":
+        return None
+
+    return f"/{memory.name}"
+
+
+def _untrack(memory: shared_memory.SharedMemory) -> shared_memory.SharedMemory:
+    """
+    Stop the multiprocessing resource tracker from managing a shared memory block.
+    Output buffers are removed by their scheduler process or by retention clean-up,
+    not when whichever process happened to open them exits.
+
+    Args:
+        memory: shared memory block.
+
+    Returns:
+        the same shared memory block.
+    """
+    if (tracked_name := _get_tracked_name(memory)) is not None:
+        resource_tracker.unregister(tracked_name, "shared_memory")
+
+    return memory
+
+
+class OutputRingBuffer:
+    """
+    Fixed-size ring buffer in shared memory that holds the most recent output of a job.
+    The scheduler process of a job is the only writer; any process can attach
+    to the buffer by the scheduler's process ID and read the current tail without touching the filesystem.
+    """
+
+    def __init__(self, memory: shared_memory.SharedMemory) -> None:
+        """
+        Args:
+            memory: shared memory block backing the buffer.
+        """
+        self._memory = memory
+        self.capacity = memory.size - _HEADER.size
+        self._data = memory.buf[_HEADER.size:_HEADER.size + self.capacity]
+
+    @classmethod
+    def create(cls, pid: int,
+               capacity: int = settings.OUTPUT_BUFFER_SIZE) -> "OutputRingBuffer":
+        """
+        Create an empty output buffer for a scheduler process, replacing any leftover buffer
+        of an exited process that had the same process ID.
+
+        Args:
+            pid: ID of the scheduler process.
+            capacity: amount of output bytes to keep.
+
+        Returns:
+            empty output buffer.
+        """
+        name = get_output_buffer_name(pid)
+
+        try:
+            memory = shared_memory.SharedMemory(name, create=True, size=_HEADER.size + capacity)
+        except FileExistsError:
+            stale = shared_memory.SharedMemory(name)
+            stale.close()
+            stale.unlink()
+            memory = shared_memory.SharedMemory(name, create=True, size=_HEADER.size + capacity)
+
+        buffer = cls(_untrack(memory))
+        buffer.reset()
+
+        return buffer
+
+    @classmethod
+    def attach(cls, pid: int) -> Optional["OutputRingBuffer"]:
+        """
+        Attach to the output buffer of a scheduler process.
+
+        Args:
+            pid: ID of the scheduler process.
+
+        Returns:
+            output buffer or None if the scheduler process has no output buffer.
+        """
+        try:
+            memory = shared_memory.SharedMemory(get_output_buffer_name(pid))
+        except FileNotFoundError:
+            return None
+
+        return cls(_untrack(memory))
+
+    @property
+    def total_written(self) -> int:
+        """
+        Total amount of bytes written since the last reset.
+        """
+        return _HEADER.unpack_from(self._memory.buf, 0)[0]
+
+    def reset(self) -> None:
+        """
+        Discard buffered output, e.g. before a new job run starts.
+        """
+        _HEADER.pack_into(self._memory.buf, 0, 0)
+
+    def write(self, data: bytes) -> None:
+        """
+        Append output to the buffer, overwriting the oldest bytes once it is full.
+
+        Args:
+            data: output bytes.
+        """
+        total = self.total_written
+
+        if len(data) > self.capacity:
+            total += len(data) - self.capacity
+            data = data[-self.capacity:]
+
+        position = total % self.capacity
+        first_part = min(len(data), self.capacity - position)
+        self._data[position:position + first_part] = data[:first_part]
+        self._data[:len(data) - first_part] = data[first_part:]
+
+        # Publish the new size only after the data is in place.
+        _HEADER.pack_into(self._memory.buf, 0, total + len(data))
+
+    def _read_window(self, retries: int = 3) -> Tuple[int, bytes]:
+        """
+        Copy the buffered output, oldest byte first. Bytes that the writer overwrites
+        while they are being copied are dropped from the result.
+
+        Args:
+            retries: amount of attempts to get a consistent copy if the buffer is reset while reading.
+
+        Returns:
+            offset of the first returned byte in the job output and the buffered output.
+        """
+        for _ in range(retries):
+            start_total = self.total_written
+            snapshot = bytes(self._data)
+            end_total = self.total_written
+
+            if end_total < start_total:
+                continue
+
+            first = max(0, end_total - self.capacity)
+            length = start_total - first
+
+            if length <= 0:
+                return first, b""
+
+            start = first % self.capacity
+            if start + length <= self.capacity:
+                return first, snapshot[start:start + length]
+
+            return first, snapshot[start:] + snapshot[:start + length - self.capacity]
+
+        return 0, b""
+
+    def read(self) -> bytes:
+        """
+        Read the buffered output, oldest byte first.
+
+        Returns:
+            buffered output.
+        """
+        return self._read_window()[1]
+
+    def read_text(self) -> str:
+        """
+        Read the buffered output as text. If older output has already been overwritten,
+        the first (likely incomplete) line is dropped.
+
+        Returns:
+            buffered output text.
+        """
+        first, data = self._read_window()
+
+        if first and b"\n" in data:
+            data = data[data.index(b"\n") + 1:]
+
+        return data.decode("utf-8", errors="replace")
+
+    def close(self) -> None:
+        """
+        Detach from the shared memory block.
+        """
+        self._data.release()
+        self._memory.close()
+
+    def unlink(self) -> bool:
+        """
+        Remove the shared memory block, unless it has been removed already (e.g. by the retention clean-up).
+        Only the owning scheduler process, or the clean-up once it has exited, should call this.
+
+        Returns:
+            True if the shared memory block has been removed.
+        """
+        # SharedMemory.unlink() unregisters the block from the resource tracker again.
+        if (tracked_name := _get_tracked_name(self._memory)) is not None:
+            resource_tracker.register(tracked_name, "shared_memory")
+
+        try:
+            self._memory.unlink()
+        except FileNotFoundError:
+            if tracked_name is not None:
+                resource_tracker.unregister(tracked_name, "shared_memory")
+            return False
+
+        return True
+
+
+def read_job_output_tail(pid: int) -> Optional[str]:
+    """
+    Read the most recent output of a running job from the in-memory output buffer of its scheduler process.
+
+    Args:
+        pid: ID of the scheduler process.
+
+    Returns:
+        buffered output or None if the scheduler process has no output buffer.
+    """
+    output_buffer = OutputRingBuffer.attach(pid)
+
+    if output_buffer is None:
+        return None
+
+    try:
+        return output_buffer.read_text()
+    finally:
+        output_buffer.close()
+
+
+def remove_output_buffer(pid: int) -> bool:
+    """
+    Remove the output buffer of a scheduler process that is no longer running.
+
+    Args:
+        pid: ID of the scheduler process.
+
+    Returns:
+        True if an output buffer has been removed.
+    """
+    output_buffer = OutputRingBuffer.attach(pid)
+
+    if output_buffer is None:
+        return False
+
+    output_buffer.close()
+
+    return output_buffer.unlink()
@@ -0,0 +1,657 @@
+"""
+Scheduler processes: execute the jobs of a task on its schedule.
+
+Scheduler processes are started as 'python -m tasklit.src.utils.scheduler' with the pickled task on stdin,
+so that they do not inherit the Streamlit server. This module must therefore stay light:
+it may not import Streamlit, pandas, Altair, SQLAlchemy or modules that do.
+"""
+import math
+import os
+import pickle
+import sys
+import threading
+import time
+
+from datetime import datetime, timedelta, timezone
+from subprocess import PIPE, Popen, STDOUT
+from typing import (
+    Any,
+    Dict,
+    List,
+    Optional
+)
+
+import tasklit.settings.consts as settings
+import tasklit.src.utils.calendars as calendars
+import tasklit.src.utils.control as control
+import tasklit.src.utils.timezones as timezones
+
+from tasklit.src.utils.calendars import Calendar
+from tasklit.src.utils.control import ControlError, ControlServer
+from tasklit.src.utils.cron import CronSchedule
+from tasklit.src.utils.file_locks import locked_file
+from tasklit.src.utils.processes import stop_process_tree
+from tasklit.src.utils.ring_buffer import OutputRingBuffer
+from tasklit.src.utils.tasks import Task
+
+
+class SchedulerStopped(Exception):
+    """
+    Raised in the schedule loop of a scheduler process once it has been asked to stop.
+    """
+
+
+class SchedulerControl:
+    """
+    Pause, resume, run-now and stop requests for a scheduler process, received over its control socket.
+    Waiting for the next run ends as soon as a run or a stop is requested. A paused scheduler
+    skips its scheduled runs, the following runs stay on the schedule; requested runs are executed anyway.
+    """
+
+    def __init__(self, job_name: str) -> None:
+        """
+        Args:
+            job_name: name of the job.
+        """
+        self.job_name = job_name
+        self.paused = False
+        self._run_requested = False
+        self._stopping = False
+        self._stopped = False
+        self._job: Optional[Popen] = None
+        self._condition = threading.Condition()
+
+    def handle(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Apply a control request. Stopping terminates the running job, if any, and kills it
+        if it has not exited within SCHEDULER_STOP_TIMEOUT seconds.
+
+        Args:
+            request: control request.
+
+        Raises:
+            ControlError: if the command is unknown, the request is meant for another process,
+                or the running job cannot be stopped.
+
+        Returns:
+            state of the scheduler process.
+        """
+        command = request.get("command")
+
+        # The socket of a job is taken over by newer scheduler processes of the same job name.
+        if request.get("pid") not in (None, os.getpid()):
+            raise ControlError(f"Process {request['pid']} is not the scheduler process of {self.job_name}.")
+
+        with self._condition:
+            if command == control.PAUSE_COMMAND:
+                self.paused = True
+            elif command == control.RESUME_COMMAND:
+                self.paused = False
+            elif command == control.RUN_NOW_COMMAND:
+                self._run_requested = True
+            elif command == control.STOP_COMMAND:
+                self._stopping = True
+            elif command != control.STATE_COMMAND:
+                raise ControlError(f"Unknown command {command}.")
+
+            self._condition.notify_all()
+            state = self.get_state()
+            job = self._job
+
+        # The schedule loop starts no further runs while stopping, and ends once the running job
+        # has been stopped.
+        if command == control.STOP_COMMAND:
+            job_stopped = job is None or stop_process_tree(job.pid, settings.SCHEDULER_STOP_TIMEOUT)
+
+            with self._condition:
+                self._stopped = True
+                self._condition.notify_all()
+
+            # Lets the caller terminate the scheduler process instead.
+            if not job_stopped:
+                raise ControlError(f"The running job of {self.job_name} could not be stopped.")
+
+        return state
+
+    def job_started(self, process: Popen) -> None:
+        """
+        Keep track of the running job, so that stopping the scheduler process stops it.
+        A job started while the scheduler process is stopping is stopped right away.
+
+        Args:
+            process: process of the job.
+        """
+        with self._condition:
+            self._job = process
+            stopping = self._stopping
+
+        if stopping:
+            stop_process_tree(process.pid, settings.SCHEDULER_STOP_TIMEOUT)
+
+    def job_finished(self) -> None:
+        """
+        Forget the job that has finished running.
+        """
+        with self._condition:
+            self._job = None
+
+    def get_state(self) -> Dict[str, Any]:
+        """
+        Get the state of the scheduler process.
+
+        Returns:
+            job name, process ID, whether it is paused and whether a run has been requested.
+        """
+        return {
+            "job_name": self.job_name,
+            "pid": os.getpid(),
+            "paused": self.paused,
+            "run_requested": self._run_requested,
+        }
+
+    def take_run_request(self) -> bool:
+        """
+        Check whether a run has been requested since the last check.
+
+        Raises:
+            SchedulerStopped: if the scheduler process has been asked to stop.
+
+        Returns:
+            True/False based on the result of the check.
+        """
+        with self._condition:
+            self._raise_if_stopped()
+
+            requested, self._run_requested = self._run_requested, False
+
+            return requested
+
+    def wait(self, seconds: float) -> None:
+        """
+        Wait for the next run, or until a run or a stop is requested.
+
+        Args:
+            seconds: seconds to wait at most.
+
+        Raises:
+            SchedulerStopped: if the scheduler process has been asked to stop.
+        """
+        with self._condition:
+            self._condition.wait_for(lambda: self._run_requested or self._stopping, seconds)
+            self._raise_if_stopped()
+
+    def _raise_if_stopped(self) -> None:
+        # Called holding the condition: a stop in progress is waited for, so that no run starts meanwhile.
+        if self._stopping:
+            self._condition.wait_for(lambda: self._stopped)
+            raise SchedulerStopped()
+
+
+def run_requested(scheduler_control: Optional[SchedulerControl]) -> bool:
+    """
+    Check whether a run outside of the schedule has been requested over the control socket.
+
+    Args:
+        scheduler_control: (optional) control of the scheduler process.
+
+    Raises:
+        SchedulerStopped: if the scheduler process has been asked to stop.
+
+    Returns:
+        True/False based on the result of the check.
+    """
+    return scheduler_control is not None and scheduler_control.take_run_request()
+
+
+def is_paused(scheduler_control: Optional[SchedulerControl]) -> bool:
+    """
+    Check whether the scheduled runs have been paused over the control socket.
+
+    Args:
+        scheduler_control: (optional) control of the scheduler process.
+
+    Returns:
+        True/False based on the result of the check.
+    """
+    return scheduler_control is not None and scheduler_control.paused
+
+
+def wait_for_next_run(seconds: float, scheduler_control: Optional[SchedulerControl]) -> None:
+    """
+    Wait for the next run, or until a run or a stop is requested over the control socket.
+
+    Args:
+        seconds: seconds to wait at most.
+        scheduler_control: (optional) control of the scheduler process.
+
+    Raises:
+        SchedulerStopped: if the scheduler process has been asked to stop.
+    """
+    if scheduler_control is None:
+        time.sleep(seconds)
+    else:
+        scheduler_control.wait(seconds)
+
+
+def launch_command_process(command: str, log_filepath: str) -> Popen:
+    """
+    Start a subprocess for a given command and save
+    'stdout' and 'stderr' logs to a respective log file.
+
+    Args:
+        command: command to be executed.
+        log_filepath: path to the respective log file.
+
+    Raises:
+        OSError if log file cannot be created.
+
+    Returns:
+        a child process running the given command.
+    """
+    try:
+        with open(log_filepath, "w") as out:
+            return Popen(command.split(" "), stdout=out, stderr=out)
+    except OSError as exc:
+        raise exc
+
+
+def capture_process_output(process: Popen, log_filepath: str,
+                           output_buffer: OutputRingBuffer) -> None:
+    """
+    Copy the piped 'stdout' and 'stderr' output of a process to its log file and
+    to the in-memory output buffer of the job until the process closes its output.
+
+    Args:
+        process: child process started with piped output.
+        log_filepath: path to the respective log file.
+        output_buffer: in-memory buffer holding the most recent job output.
+
+    Raises:
+        OSError if log file cannot be created.
+    """
+    output_buffer.reset()
+
+    try:
+        with open(log_filepath, "wb") as out:
+            for chunk in iter(lambda: process.stdout.read1(settings.OUTPUT_READ_SIZE), b""):
+                out.write(chunk)
+                out.flush()
+                output_buffer.write(chunk)
+    except OSError as exc:
+        raise exc
+
+
+def match_weekday(now: datetime,
+                  weekdays: Optional[List[str]]) -> bool:
+    """
+    Determine if 'today' is the day when a function must be executed.
+
+    Args:
+        now: datetime object representing current timestamp.
+        weekdays: optional list of ints from 0 to 6 corresponding to different days of the week,
+            e.g. 0 for Monday, etc.
+
+    Returns:
+        True/False based on the result of the check.
+    """
+    today = now.weekday()
+
+    try:
+        if not weekdays or settings.WEEK_DAYS[today] in weekdays:
+            return True
+    except KeyError as exc:
+        raise exc
+
+    return False
+
+
+def match_duration(now: datetime, start: datetime, duration: timedelta) -> bool:
+    """
+    Check whether the sum of process start date and interval timedelta is less
+    than current datetime. If yes -> process must be executed.
+
+    Args:
+        now: datetime.now().
+        start: datetime object with process start date.
+        duration: interval timedelta to check whether schedule has been met.
+
+    Returns:
+        True/False based on the result of the check.
+    """
+    return now > (start + duration)
+
+
+def process_should_execute(now: datetime,
+                           start: datetime,
+                           duration: timedelta,
+                           weekdays: Optional[List[str]]) -> bool:
+    """
+    Determine whether the process should execute or not:
+        -> is it the correct day of the week?
+        -> is it the correct scheduled interval?
+
+    Args:
+        now: datetime.now()
+        start: datetime object with process start date.
+        duration: interval timedelta to check whether schedule has been met.
+        weekdays: optional list with selected weekdays.
+
+    Returns:
+        True/False based on the result of the check.
+    """
+    return match_weekday(now, weekdays) and match_duration(now, start, duration)
+
+
+def write_job_execution_log(job_name: str, command: str, now: datetime, msg: str) -> None:
+    """
+    Save job execution information to a log file.
+
+    Args:
+        job_name: name of the job for which to write the log.
+        command: command that was executed.
+        now: datetime object with current timestamp.
+        msg: message to be logged.
+
+    Raises:
+        OSError if log file creation fails.
+    """
+    now_str = now.strftime(settings.DATE_FORMAT)
+
+    for suffix in [".txt", "_stdout.txt"]:
+        try:
+            # Locked, so that entries are not lost while the execution log is trimmed.
+            with open(f"{settings.BASE_LOG_DIR}/{job_name}{suffix}", "a") as file, locked_file(file):
+                if suffix == "_stdout.txt":
+                    file.write(f"\n{'=' * 70} \n")
+                file.write(f"{now_str} {msg} {command}\n")
+        except OSError as exc:
+            raise exc
+
+    # Appending to a file leaves the folder untouched, mark the folder as changed
+    # so that the app knows to read the 'last update' of the jobs again.
+    os.utime(settings.BASE_LOG_DIR)
+
+
+def execute_job(command: str, log_filepath: str,
+                job_name: str, now: datetime,
+                output_buffer: Optional[OutputRingBuffer] = None,
+                scheduler_control: Optional[SchedulerControl] = None) -> None:
+    """
+    Interface for running a job:
+        -> launch a process
+        -> wait for the process to finish
+        -> write job execution log.
+
+    If an output buffer is given, process output is captured through a pipe
+    and written to both the log file and the buffer.
+
+    Args:
+        command: command to be executed.
+        log_filepath: path to the job stdout log file.
+        job_name: name generated for the job.
+        now: datetime.now()
+        output_buffer: (optional) in-memory buffer for the most recent job output.
+        scheduler_control: (optional) control of the scheduler process, which stops the job when asked to.
+    """
+    if output_buffer is None:
+        launched_process = launch_command_process(command, log_filepath)
+    else:
+        launched_process = Popen(command.split(" "), stdout=PIPE, stderr=STDOUT)
+
+    if scheduler_control is not None:
+        scheduler_control.job_started(launched_process)
+
+    try:
+        if output_buffer is not None:
+            capture_process_output(launched_process, log_filepath, output_buffer)
+
+        launched_process.wait()
+    finally:
+        if scheduler_control is not None:
+            scheduler_control.job_finished()
+
+    write_job_execution_log(job_name, command, now, "Executed")
+
+
+def get_next_cron_run(cron_schedule: CronSchedule, after: datetime, calendar: Optional[Calendar]) -> datetime:
+    """
+    Get the next fire time of a cron schedule that is not blocked by a calendar.
+    Blocked periods are skipped as a whole, instead of checking the fire times within them one by one.
+
+    Args:
+        cron_schedule: compiled cron expression.
+        after: timezone-aware datetime after which to search, exclusive.
+        calendar: (optional) holiday and blackout calendar.
+
+    Returns:
+        next fire time, in the timezone of 'after'.
+    """
+    zone = after.tzinfo
+    next_run = cron_schedule.next_fire_time(after)
+
+    while calendar is not None and calendar.is_blocked(next_run.replace(tzinfo=None)):
+        allowed = timezones.to_utc(calendar.next_allowed(next_run.replace(tzinfo=None)), zone)
+        next_run = cron_schedule.next_fire_time(allowed.astimezone(zone) - timedelta(seconds=1))
+
+    return next_run
+
+
+def run_cron_schedule(command: str, log_filepath: str, job_name: str, start: datetime,
+                      cron_expression: str, output_buffer: OutputRingBuffer,
+                      timezone_name: Optional[str] = None, calendar_name: Optional[str] = None,
+                      scheduler_control: Optional[SchedulerControl] = None) -> None:
+    """
+    Execute a job at every fire time of a cron expression, starting from a given datetime.
+    Fire times that pass while the job is still running, is paused or are blocked by the calendar are skipped.
+
+    Args:
+        command: command to be executed.
+        log_filepath: path to the job stdout log file.
+        job_name: name generated for the job.
+        start: wall clock datetime from which on the job is executed.
+        cron_expression: 5- or 6-field cron expression.
+        output_buffer: in-memory buffer for the most recent job output.
+        timezone_name: (optional) timezone whose wall clock the expression is matched against,
+            the local timezone if not set.
+        calendar_name: (optional) name of the holiday and blackout calendar to follow.
+        scheduler_control: (optional) control of the scheduler process, to pause, run now or stop.
+
+    Raises:
+        SchedulerStopped: if the scheduler process has been asked to stop.
+    """
+    zone = timezones.get_timezone(timezone_name)
+    cron_schedule = CronSchedule(cron_expression)
+    next_run = get_next_cron_run(
+        cron_schedule,
+        max(timezones.to_utc(start, zone), datetime.now(timezone.utc)).astimezone(zone) - timedelta(seconds=1),
+        calendars.get_calendar(calendar_name)
+    )
+
+    while True:
+        if run_requested(scheduler_control):
+            execute_job(command, log_filepath, job_name, datetime.now(), output_buffer, scheduler_control)
+            continue
+
+        now = datetime.now(timezone.utc)
+        if now >= next_run:
+            if not is_paused(scheduler_control):
+                execute_job(command, log_filepath, job_name, now.astimezone(), output_buffer, scheduler_control)
+            next_run = get_next_cron_run(
+                cron_schedule,
+                max(next_run, datetime.now(timezone.utc)).astimezone(zone),
+                calendars.get_calendar(calendar_name)
+            )
+        else:
+            wait_for_next_run(min((next_run - now).total_seconds(), 1), scheduler_control)
+
+
+def run_daily_schedule(command: str, log_filepath: str, job_name: str, first_run: datetime,
+                       weekdays: Optional[List[str]], output_buffer: OutputRingBuffer,
+                       timezone_name: Optional[str] = None, calendar_name: Optional[str] = None,
+                       scheduler_control: Optional[SchedulerControl] = None) -> None:
+    """
+    Execute a job every day at the wall clock time of the first run, only on selected weekdays
+    and outside of the holidays and blackout windows of a calendar.
+    Runs keep their time of day across DST changes: a time that occurs twice when clocks are set back
+    runs once, a time skipped when clocks are set forward runs right after the gap.
+    Runs that pass while the job is still running or is paused are skipped.
+
+    Args:
+        command: command to be executed.
+        log_filepath: path to the job stdout log file.
+        job_name: name generated for the job.
+        first_run: wall clock datetime of the first execution.
+        weekdays: (optional) list with selected weekdays, every day if not set.
+        output_buffer: in-memory buffer for the most recent job output.
+        timezone_name: (optional) timezone of the wall clock, the local timezone if not set.
+        calendar_name: (optional) name of the holiday and blackout calendar to follow.
+        scheduler_control: (optional) control of the scheduler process, to pause, run now or stop.
+
+    Raises:
+        SchedulerStopped: if the scheduler process has been asked to stop.
+    """
+    zone = timezones.get_timezone(timezone_name)
+    next_run = first_run
+
+    while True:
+        if run_requested(scheduler_control):
+            execute_job(command, log_filepath, job_name, datetime.now(), output_buffer, scheduler_control)
+            continue
+
+        calendar = calendars.get_calendar(calendar_name)
+        while not match_weekday(next_run, weekdays) or (calendar is not None and calendar.is_blocked(next_run)):
+            next_run += timedelta(days=1)
+
+        now = datetime.now(timezone.utc)
+        fire_time = timezones.to_utc(next_run, zone)
+
+        if now >= fire_time:
+            if not is_paused(scheduler_control):
+                execute_job(command, log_filepath, job_name, now.astimezone(), output_buffer, scheduler_control)
+            while timezones.to_utc(next_run, zone) <= datetime.now(timezone.utc):
+                next_run += timedelta(days=1)
+        else:
+            wait_for_next_run(min((fire_time - now).total_seconds(), 1), scheduler_control)
+
+
+def run_interval_schedule(command: str, log_filepath: str, job_name: str, first_run: datetime,
+                          interval_duration: timedelta, output_buffer: OutputRingBuffer,
+                          timezone_name: Optional[str] = None, calendar_name: Optional[str] = None,
+                          scheduler_control: Optional[SchedulerControl] = None) -> None:
+    """
+    Execute a job every interval, starting at a given datetime.
+
+    Only the first run is aligned to the wall clock, all later runs are timed with the monotonic clock:
+    changes of the system time (NTP steps, manual changes) cause neither double nor missed runs,
+    and runs do not drift by the time spent checking the schedule. Runs that pass while the job
+    is still running, is paused or blocked by the calendar are skipped, the following runs stay on the original grid.
+
+    Args:
+        command: command to be executed.
+        log_filepath: path to the job stdout log file.
+        job_name: name generated for the job.
+        first_run: wall clock datetime of the first execution.
+        interval_duration: interval between job executions, can be shorter than a second.
+        output_buffer: in-memory buffer for the most recent job output.
+        timezone_name: (optional) timezone of the first run and the calendar, the local timezone if not set.
+        calendar_name: (optional) name of the holiday and blackout calendar to follow.
+        scheduler_control: (optional) control of the scheduler process, to pause, run now or stop.
+
+    Raises:
+        SchedulerStopped: if the scheduler process has been asked to stop.
+    """
+    interval = interval_duration.total_seconds()
+    zone = timezones.get_timezone(timezone_name)
+    first_run = timezones.to_utc(first_run, zone)
+    next_run = time.monotonic() + max((first_run - datetime.now(timezone.utc)).total_seconds(), 0)
+
+    while True:
+        if run_requested(scheduler_control):
+            execute_job(command, log_filepath, job_name, datetime.now(), output_buffer, scheduler_control)
+            missed_runs = math.ceil((time.monotonic() - next_run) / interval)
+            if missed_runs > 0:
+                next_run += missed_runs * interval
+            continue
+
+        delay = next_run - time.monotonic()
+        if delay > 0:
+            wait_for_next_run(delay, scheduler_control)
+            continue
+
+        calendar = calendars.get_calendar(calendar_name)
+        if calendar is not None:
+            now = datetime.now(timezone.utc)
+            wall_now = now.astimezone(zone).replace(tzinfo=None)
+
+            if calendar.is_blocked(wall_now):
+                blocked = (timezones.to_utc(calendar.next_allowed(wall_now), zone) - now).total_seconds()
+                next_run += math.ceil(blocked / interval) * interval
+                continue
+
+        if not is_paused(scheduler_control):
+            execute_job(command, log_filepath, job_name, datetime.now(), output_buffer, scheduler_control)
+
+        next_run += interval
+        missed_runs = math.ceil((time.monotonic() - next_run) / interval)
+        if missed_runs > 0:
+            next_run += missed_runs * interval
+
+
+def schedule_process_job(task: Task) -> None:
+    """
+    Launch a scheduler process that spawns job execution processes if launch conditions are met.
+    While it runs, the scheduler process listens on its control socket for pause, resume, run-now
+    and stop requests of the scheduler daemon.
+
+    Args:
+        task: task to execute on its schedule.
+    """
+    schedule = task.schedule
+    stdout_log_file = f"{settings.BASE_LOG_DIR}/{task.job_name}_stdout.txt"
+    output_buffer = OutputRingBuffer.create(os.getpid())
+    scheduler_control = SchedulerControl(task.job_name)
+
+    # Newer scheduler processes of the same job name take over the socket.
+    control_server = ControlServer(control.get_scheduler_socket_path(task.job_name), scheduler_control.handle,
+                                   replace=True)
+    try:
+        control_server.start()
+    except OSError:
+        # The task still runs, it can only be terminated.
+        pass
+
+    try:
+        if schedule.frequency == settings.IMMEDIATE_FREQUENCY:
+            execute_job(task.command, stdout_log_file, task.job_name, datetime.now(), output_buffer,
+                        scheduler_control)
+        elif schedule.frequency == settings.CRON_FREQUENCY:
+            run_cron_schedule(task.command, stdout_log_file, task.job_name, schedule.first_run, schedule.cron,
+                              output_buffer, schedule.timezone, schedule.calendar, scheduler_control)
+        elif schedule.frequency == settings.INTERVAL_FREQUENCY:
+            run_interval_schedule(task.command, stdout_log_file, task.job_name, schedule.first_run,
+                                  schedule.interval, output_buffer, schedule.timezone, schedule.calendar,
+                                  scheduler_control)
+        else:
+            run_daily_schedule(task.command, stdout_log_file, task.job_name, schedule.first_run,
+                               schedule.weekdays, output_buffer, schedule.timezone, schedule.calendar,
+                               scheduler_control)
+    except SchedulerStopped:
+        pass
+    finally:
+        control_server.close()
+        output_buffer.close()
+        output_buffer.unlink()
+
+
+def main() -> None:
+    """
+    Entry point of scheduler processes: read the pickled task from stdin and execute it on its schedule.
+    """
+    task = pickle.load(sys.stdin.buffer)
+    sys.stdin.close()
+
+    schedule_process_job(task)
+
+
+if __name__ == "__main__":
+    main()
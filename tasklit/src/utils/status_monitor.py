@@ -0,0 +1,200 @@
+import functools
+import logging
+import threading
+
+from datetime import datetime
+from typing import (
+    NamedTuple,
+    Optional
+)
+
+import pandas as pd
+
+from sqlalchemy import engine
+
+import tasklit.settings.consts as settings
+import tasklit.src.utils.helpers as helper_functions
+
+logger = logging.getLogger(__name__)
+
+_monitor_thread: Optional[threading.Thread] = None
+_monitor_lock = threading.Lock()
+
+
+class TaskSnapshot(NamedTuple):
+    """
+    State of all tasks at one point in time, shared by all app sessions.
+
+    df: df with process information, status and last update of every task. Must not be modified.
+    refreshed: datetime of the refresh.
+    """
+    df: pd.DataFrame
+    refreshed: datetime
+
+
+class StatusMonitor:
+    """
+    Process-wide monitor of the task state. The processes table, process status and log update times
+    are refreshed every STATUS_MONITOR_INTERVAL seconds and published as a snapshot, which app sessions
+    read instead of refreshing the state themselves, so the refresh cost does not grow with the amount
+    of open dashboards.
+    """
+
+    def __init__(self, sql_engine: engine) -> None:
+        """
+        Args:
+            sql_engine: sql alchemy engine to use.
+        """
+        self.sql_engine = sql_engine
+        self._snapshot: Optional[TaskSnapshot] = None
+        self._stale = False
+        self._wakeup = threading.Event()
+        self._lock = threading.Lock()
+        self._published = threading.Condition()
+
+    def refresh(self) -> TaskSnapshot:
+        """
+        Read the task state and publish it as the latest snapshot.
+
+        Raises:
+            OperationalError: if any sqlalchemy errors have been thrown.
+
+        Returns:
+            the published snapshot.
+        """
+        with self._lock:
+            self._stale = False
+
+            try:
+                df = helper_functions.get_process_df(self.sql_engine)
+                helper_functions.update_process_status_info(df)
+                helper_functions.update_df_process_last_update_info(df)
+            except Exception as exc:
+                self._stale = True
+                raise exc
+
+            snapshot = TaskSnapshot(df, datetime.now())
+
+            with self._published:
+                self._snapshot = snapshot
+                self._published.notify_all()
+
+            return snapshot
+
+    def get_snapshot(self) -> TaskSnapshot:
+        """
+        Get the latest snapshot, which is only refreshed on the spot if there is none yet
+        or it has been invalidated.
+
+        Returns:
+            snapshot of the task state.
+        """
+        snapshot = self._snapshot
+
+        if snapshot is None or self._stale:
+            snapshot = self.refresh()
+
+        return snapshot
+
+    def wait_for_snapshot(self, snapshot: Optional[TaskSnapshot], timeout: float) -> Optional[TaskSnapshot]:
+        """
+        Wait until a snapshot other than the given one has been published.
+
+        Args:
+            snapshot: snapshot that has already been seen.
+            timeout: seconds to wait at most.
+
+        Returns:
+            the latest snapshot, which is still the given one if nothing has been published in time.
+        """
+        with self._published:
+            self._published.wait_for(lambda: self._snapshot is not snapshot, timeout)
+            return self._snapshot
+
+    def invalidate(self) -> None:
+        """
+        Mark the latest snapshot as outdated after tasks have been added or removed,
+        so that it is refreshed before it is read again.
+        """
+        self._stale = True
+        self._wakeup.set()
+
+    def wait(self, timeout: float) -> None:
+        """
+        Wait until the next refresh is due or the snapshot has been invalidated.
+
+        Args:
+            timeout: seconds to wait at most.
+        """
+        self._wakeup.wait(timeout)
+        self._wakeup.clear()
+
+
+@functools.lru_cache(maxsize=None)
+def get_status_monitor(sql_engine: engine) -> StatusMonitor:
+    """
+    Get the process-wide status monitor for an engine.
+
+    Args:
+        sql_engine: sql alchemy engine to use.
+
+    Returns:
+        status monitor.
+    """
+    return StatusMonitor(sql_engine)
+
+
+def invalidate(sql_engine: engine) -> None:
+    """
+    Let the status monitor know that tasks have been added or removed.
+
+    Args:
+        sql_engine: sql alchemy engine to use.
+    """
+    get_status_monitor(sql_engine).invalidate()
+
+
+def run_status_monitor(monitor: StatusMonitor,
+                       stop_event: Optional[threading.Event] = None) -> None:
+    """
+    Refresh the task state every STATUS_MONITOR_INTERVAL seconds,
+    or as soon as the snapshot has been invalidated, until stopped.
+
+    Args:
+        monitor: status monitor to run.
+        stop_event: (optional) event to stop the loop.
+    """
+    stop_event = stop_event or threading.Event()
+
+    while not stop_event.is_set():
+        try:
+            monitor.refresh()
+        except Exception:
+            logger.exception("Task status refresh failed.")
+
+        monitor.wait(settings.STATUS_MONITOR_INTERVAL)
+
+
+def start_status_monitor(sql_engine: engine) -> threading.Thread:
+    """
+    Start refreshing the task state in the background, once per process.
+
+    Args:
+        sql_engine: sql alchemy engine to use.
+
+    Returns:
+        the status monitor thread.
+    """
+    global _monitor_thread
+
+    with _monitor_lock:
+        if _monitor_thread is None or not _monitor_thread.is_alive():
+            _monitor_thread = threading.Thread(
+                target=run_status_monitor,
+                args=(get_status_monitor(sql_engine),),
+                name="tasklit-status-monitor",
+                daemon=True
+            )
+            _monitor_thread.start()
+
+    return _monitor_thread
@@ -0,0 +1,212 @@
+"""
+Control service of the scheduler daemon: task actions of the app and the command line interface, received over
+the daemon's control socket (see 'control'):
+
+    submit   {"tasks": <job definition or list of job definitions>}   save tasks, started by the task starter
+    cancel   {"task_id": 1, "remove": false}                            stop a task, queued tasks are removed
+    pause    {"task_id": 1}                                             skip the scheduled runs of a task
+    resume   {"task_id": 1}                                             run a paused task on its schedule again
+    run_now  {"task_id": 1}                                             run the job of a task right away
+    state    {"task_id": 1}                                             state of a task, of all tasks without ID
+
+Pause, resume and run-now requests are forwarded to the control socket of the task's scheduler process,
+which applies them while waiting for the next run.
+"""
+from typing import (
+    Any,
+    Dict,
+    List,
+    Optional,
+    Union
+)
+
+from sqlalchemy import engine
+from sqlalchemy.engine import Row
+
+import tasklit.settings.consts as settings
+import tasklit.src.utils.control as control
+import tasklit.src.utils.database as database
+import tasklit.src.utils.processes as processes
+import tasklit.src.utils.task_starter as task_starter
+
+from tasklit.src.utils.control import ControlError, ControlServer
+from tasklit.src.utils.job_specs import get_job_spec_task, parse_job_specs
+from tasklit.src.utils.task_states import cancel_task, format_task, PAUSED_STATE, RUNNING_STATE
+
+
+class TaskControl:
+    """
+    Request handling of the scheduler daemon's control socket. Tasks are looked up in the change feed cache
+    of the processes table, so that a request only reads the tasks that have changed since the last one.
+    """
+
+    def __init__(self, sql_engine: engine) -> None:
+        """
+        Args:
+            sql_engine: sql alchemy engine to use.
+        """
+        self.sql_engine = sql_engine
+
+    def handle(self, request: Dict[str, Any]) -> Any:
+        """
+        Handle a control request.
+
+        Args:
+            request: control request.
+
+        Raises:
+            ControlError: if the request cannot be handled.
+
+        Returns:
+            JSON result of the request.
+        """
+        command = request.get("command")
+        task_id = request.get("task_id")
+
+        if command == control.SUBMIT_COMMAND:
+            return self.submit_tasks(request.get("tasks"))
+
+        if task_id is not None and (not isinstance(task_id, int) or isinstance(task_id, bool)):
+            raise ControlError(f"Invalid task ID {task_id!r}.")
+
+        if command == control.STATE_COMMAND:
+            return self.get_state(task_id)
+
+        if command not in (control.CANCEL_COMMAND, control.PAUSE_COMMAND, control.RESUME_COMMAND,
+                           control.RUN_NOW_COMMAND):
+            raise ControlError(f"Unknown command {command}.")
+
+        if task_id is None:
+            raise ControlError(f"The {command} command needs a task ID.")
+
+        if command == control.CANCEL_COMMAND:
+            removed = cancel_task(self._find_task(task_id), bool(request.get("remove")), self.sql_engine)
+            return {"task_id": task_id, "removed": removed}
+
+        return self.forward(task_id, command)
+
+    def _read_process_cache(self) -> database.ProcessChangeCache:
+        process_cache = database.get_process_cache(self.sql_engine)
+        process_cache.refresh()
+
+        return process_cache
+
+    def _find_task(self, task_id: int) -> Row:
+        if (row := self._read_process_cache().rows_by_id.get(task_id)) is None:
+            raise ControlError(f"No task {task_id}.")
+
+        return row
+
+    def submit_tasks(self, entries: Any) -> Dict[str, Any]:
+        """
+        Validate and save submitted tasks, and let the task starter know.
+
+        Args:
+            entries: job definition, or list of job definitions.
+
+        Raises:
+            ControlError: if any job definition is invalid.
+
+        Returns:
+            IDs and job names of the saved tasks, in submission order.
+        """
+        try:
+            job_specs = parse_job_specs(entries if isinstance(entries, list) else [entries])
+            tasks = [get_job_spec_task(job_spec) for job_spec in job_specs]
+        except (TypeError, ValueError) as exc:
+            raise ControlError(str(exc))
+        database.insert_tasks(tasks, self.sql_engine)
+        task_starter.get_task_starter(self.sql_engine).wake()
+
+        return {
+            "task_ids": [task.task_id for task in tasks],
+            "job_names": [task.job_name for task in tasks],
+        }
+
+    def forward(self, task_id: int, command: str) -> Dict[str, Any]:
+        """
+        Forward a request to the scheduler process of a task.
+
+        Args:
+            task_id: task ID.
+            command: command for the scheduler process.
+
+        Raises:
+            ControlError: if there is no such task or its scheduler process cannot be reached.
+
+        Returns:
+            task information, in the state the scheduler process is in after the request.
+        """
+        row = self._find_task(task_id)
+
+        if row["process id"] is None:
+            raise ControlError(f"Task {task_id} has not been started yet.")
+
+        try:
+            scheduler_state = control.send_request(
+                control.get_scheduler_socket_path(row["job name"]), command, pid=row["process id"]
+            )
+        except (OSError, ControlError):
+            raise ControlError(f"Task {task_id} is not running, or was started by an earlier version of tasklit.")
+
+        return format_task(row, PAUSED_STATE if scheduler_state["paused"] else RUNNING_STATE)
+
+    def get_task_snapshot(self, row: Row, running_processes: Optional[Dict[int, float]] = None) -> Dict[str, Any]:
+        """
+        Get the state of a task. Running tasks are asked for their state over their control socket,
+        tasks whose scheduler process cannot be reached are checked by process ID.
+
+        Args:
+            row: process information row.
+            running_processes: (optional) process table snapshot to check unreachable scheduler processes in.
+
+        Returns:
+            task information.
+        """
+        if row["process id"] is not None:
+            try:
+                scheduler_state = control.send_request(
+                    control.get_scheduler_socket_path(row["job name"]), control.STATE_COMMAND, pid=row["process id"]
+                )
+                return format_task(row, PAUSED_STATE if scheduler_state["paused"] else RUNNING_STATE)
+            except (OSError, ControlError):
+                pass
+
+        return format_task(row, running_processes=running_processes)
+
+    def get_state(self, task_id: Optional[int] = None) -> Union[Dict[str, Any], List[Dict[str, Any]]]:
+        """
+        Get a snapshot of the state of a task, or of all tasks.
+
+        Args:
+            task_id: (optional) task ID, all tasks if not set.
+
+        Raises:
+            ControlError: if there is no such task.
+
+        Returns:
+            task information, a list ordered by task ID for all tasks.
+        """
+        if task_id is not None:
+            return self.get_task_snapshot(self._find_task(task_id))
+
+        running_processes = processes.get_running_processes()
+
+        return [self.get_task_snapshot(row, running_processes) for row in self._read_process_cache().rows]
+
+
+def start_task_control(sql_engine: engine, socket_path: Optional[str] = None) -> ControlServer:
+    """
+    Answer control requests on the scheduler daemon's control socket, in the background.
+
+    Args:
+        sql_engine: sql alchemy engine to use.
+        socket_path: (optional) path of the control socket, CONTROL_SOCKET_PATH if not set.
+
+    Raises:
+        OSError: if another daemon is listening on the socket, or Unix domain sockets are not supported.
+
+    Returns:
+        the started control server.
+    """
+    return ControlServer(socket_path or settings.CONTROL_SOCKET_PATH, TaskControl(sql_engine).handle).start()
@@ -0,0 +1,182 @@
+import functools
+import logging
+import threading
+import time
+
+from typing import (
+    Dict,
+    List,
+    Optional,
+    Tuple
+)
+
+import psutil
+
+from sqlalchemy import engine
+
+import tasklit.settings.consts as settings
+import tasklit.src.utils.database as database
+import tasklit.src.utils.processes as processes
+
+from tasklit.src.utils.tasks import Task
+
+logger = logging.getLogger(__name__)
+
+_starter_thread: Optional[threading.Thread] = None
+_starter_lock = threading.Lock()
+
+
+class TaskStarter:
+    """
+    Starts the scheduler processes of tasks that have been saved without one (submitted through the API).
+    Saving a task only takes a share of a DB transaction, starting its scheduler process takes much longer,
+    so submissions are accepted as fast as they can be saved and started here in the background, in order.
+    Tasks whose scheduler process cannot be started are left out for a growing delay before they are tried again,
+    so that they do not hold up the tasks queued after them.
+    """
+
+    def __init__(self, sql_engine: engine) -> None:
+        """
+        Args:
+            sql_engine: sql alchemy engine to use.
+        """
+        self.sql_engine = sql_engine
+        self._wakeup = threading.Event()
+        # Failed start attempts and monotonic retry time of queued tasks, by task ID
+        self.failed_tasks: Dict[int, Tuple[int, float]] = {}
+
+    def _get_retry_delay(self, attempts: int) -> float:
+        return min(settings.TASK_START_RETRY_DELAY * 2 ** (attempts - 1), settings.TASK_START_MAX_RETRY_DELAY)
+
+    def step(self) -> int:
+        """
+        Start the scheduler processes of the oldest batch of queued tasks and save them.
+        Tasks that have been cancelled, or started by another task starter, while their process was being started
+        are terminated again, as are all started tasks if they cannot be saved. Tasks whose scheduler process
+        cannot be started are logged and skipped until their retry delay has passed.
+
+        Raises:
+            OperationalError: if any sqlalchemy errors have been thrown.
+
+        Returns:
+            amount of started tasks.
+        """
+        now = time.monotonic()
+        waiting = [task_id for task_id, (_, retry_time) in self.failed_tasks.items() if retry_time > now]
+        tasks = [
+            Task.from_record(row)
+            for row in database.fetch_queued_processes(settings.TASK_START_BATCH_SIZE, self.sql_engine, waiting)
+        ]
+        started = []
+
+        try:
+            for task in tasks:
+                try:
+                    processes.start_scheduler_process(task)
+                except Exception:
+                    attempts = self.failed_tasks.get(task.task_id, (0, 0))[0] + 1
+                    delay = self._get_retry_delay(attempts)
+                    self.failed_tasks[task.task_id] = (attempts, time.monotonic() + delay)
+                    logger.exception("Starting task %s failed (attempt %s), trying again in %s seconds.",
+                                     task.task_id, attempts, delay)
+                    continue
+
+                self.failed_tasks.pop(task.task_id, None)
+                started.append(task)
+        finally:
+            try:
+                cancelled = set(database.update_task_processes(started, self.sql_engine))
+            except Exception as exc:
+                # Tasks stay queued if their process cannot be saved, they are started again on the next step.
+                self._terminate(started)
+                raise exc
+
+            self._terminate([task for task in started if task.task_id in cancelled])
+
+        return len(started)
+
+    @staticmethod
+    def _terminate(tasks: List[Task]) -> None:
+        for task in tasks:
+            try:
+                processes.terminate_process(task.pid, task.process_created)
+            except psutil.NoSuchProcess:
+                pass
+
+    def wake(self) -> None:
+        """
+        Let the starter know that tasks have been queued.
+        """
+        self._wakeup.set()
+
+    def wait(self, timeout: float) -> None:
+        """
+        Wait until tasks have been queued.
+
+        Args:
+            timeout: seconds to wait at most.
+        """
+        self._wakeup.wait(timeout)
+        self._wakeup.clear()
+
+
+@functools.lru_cache(maxsize=None)
+def get_task_starter(sql_engine: engine) -> TaskStarter:
+    """
+    Get the process-wide task starter for an engine.
+
+    Args:
+        sql_engine: sql alchemy engine to use.
+
+    Returns:
+        task starter.
+    """
+    return TaskStarter(sql_engine)
+
+
+def run_task_starter(starter: TaskStarter,
+                     stop_event: Optional[threading.Event] = None) -> None:
+    """
+    Start queued tasks batch by batch, checking for queued tasks every TASK_START_INTERVAL seconds
+    or as soon as tasks have been queued, until stopped.
+
+    Args:
+        starter: task starter to run.
+        stop_event: (optional) event to stop the loop.
+    """
+    stop_event = stop_event or threading.Event()
+
+    while not stop_event.is_set():
+        try:
+            started = starter.step()
+        except Exception:
+            logger.exception("Starting queued tasks failed.")
+            started = 0
+
+        if not started:
+            starter.wait(settings.TASK_START_INTERVAL)
+
+
+def start_task_starter(sql_engine: engine) -> threading.Thread:
+    """
+    Start queued tasks in the background, once per process.
+
+    Args:
+        sql_engine: sql alchemy engine to use.
+
+    Returns:
+        the task starter thread.
+    """
+    global _starter_thread
+
+    with _starter_lock:
+        if _starter_thread is None or not _starter_thread.is_alive():
+            _starter_thread = threading.Thread(
+                target=run_task_starter,
+                args=(get_task_starter(sql_engine),),
+                name="tasklit-task-starter",
+                daemon=True
+            )
+            _starter_thread.start()
+
+    return _starter_thread
@@ -0,0 +1,105 @@
+"""
+States of tasks and their JSON representation, shared by the HTTP/JSON API and the control service
+of the scheduler daemon, and cancelling tasks for both.
+
+Used by the scheduler daemon and the API server, this module must stay light:
+it may not import Streamlit or pandas.
+"""
+from typing import (
+    Any,
+    Dict,
+    Optional
+)
+
+import psutil
+
+from sqlalchemy import engine
+from sqlalchemy.engine import Row
+
+import tasklit.src.utils.database as database
+import tasklit.src.utils.processes as processes
+
+# Task states reported by the API and the control service
+QUEUED_STATE = "queued"
+RUNNING_STATE = "running"
+STOPPED_STATE = "stopped"
+# State of tasks whose scheduled runs have been paused
+PAUSED_STATE = "paused"
+
+
+def get_task_state(row: Row, running_processes: Optional[Dict[int, float]] = None) -> str:
+    """
+    Get the state of a task: queued until its scheduler process has been started, then running or stopped.
+
+    Args:
+        row: process information row.
+        running_processes: (optional) process table snapshot of 'processes.get_running_processes'
+            to check the scheduler process in, it is looked up on its own if not set.
+
+    Returns:
+        task state.
+    """
+    if row["process id"] is None:
+        return QUEUED_STATE
+
+    if running_processes is not None:
+        running = processes.is_running_in_snapshot(running_processes, row["process id"], row["process created"])
+    else:
+        running = processes.is_process_running(row["process id"], row["process created"])
+
+    return RUNNING_STATE if running else STOPPED_STATE
+
+
+def format_task(row: Row, state: Optional[str] = None,
+                running_processes: Optional[Dict[int, float]] = None) -> Dict[str, Any]:
+    """
+    Get the JSON representation of a task.
+
+    Args:
+        row: process information row.
+        state: (optional) state of the task, checked with 'get_task_state' if not set.
+        running_processes: (optional) process table snapshot to check the state in.
+
+    Returns:
+        task information.
+    """
+    return {
+        "task_id": row["task_id"],
+        "job_name": row["job name"],
+        "command": row["command"],
+        "created": row["created"].isoformat() if row["created"] else None,
+        "process_id": row["process id"],
+        "state": state or get_task_state(row, running_processes),
+        "frequency": row["frequency"],
+        "first_run": row["first run"].isoformat() if row["first run"] else None,
+        "interval": row["interval"],
+        "weekdays": row["weekdays"].split(",") if row["weekdays"] else None,
+        "cron": row["cron"],
+        "timezone": row["timezone"],
+        "calendar": row["calendar"],
+    }
+
+
+def cancel_task(row: Row, remove: bool, sql_engine: engine) -> bool:
+    """
+    Cancel a task: stop its scheduler process, queued tasks are removed before they are started.
+
+    Args:
+        row: process information row.
+        remove: whether to remove the task from the processes table.
+        sql_engine: sql alchemy engine to use.
+
+    Returns:
+        whether the task has been removed.
+    """
+    if row["process id"] is not None and processes.is_process_running(row["process id"], row["process created"]):
+        try:
+            processes.stop_task_process(row["job name"], row["process id"], row["process created"])
+        except psutil.NoSuchProcess:
+            pass
+
+    if remove or row["process id"] is None:
+        database.delete_processes([row["task_id"]], sql_engine)
+        return True
+
+    return False
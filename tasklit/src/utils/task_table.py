@@ -0,0 +1,107 @@
+import math
+
+from typing import (
+    NamedTuple,
+    Tuple
+)
+
+import pandas as pd
+import streamlit as st
+
+import tasklit.settings.consts as settings
+
+# Task table filters by status
+ALL_TASKS = "All"
+RUNNING_TASKS = "Running"
+STOPPED_TASKS = "Not running"
+
+# Columns of the process df that are not displayed
+HIDDEN_COLUMNS = ["process created"]
+
+
+class TaskTableQuery(NamedTuple):
+    """
+    Part of the task table to display, selected in the UI.
+
+    status: status filter: "All" / "Running" / "Not running".
+    search: (optional) job name or command substring to filter by, case insensitive.
+    sort_by: column to sort by.
+    descending: whether to sort in descending order.
+    page: page to display, starting at 1.
+    page_size: amount of tasks per page.
+    """
+    status: str = ALL_TASKS
+    search: str = ""
+    sort_by: str = "task_id"
+    descending: bool = False
+    page: int = 1
+    page_size: int = settings.TASK_TABLE_PAGE_SIZE
+
+
+def query_tasks(df: pd.DataFrame, query: TaskTableQuery) -> pd.DataFrame:
+    """
+    Filter and sort the tasks of a process df.
+
+    Args:
+        df: df with process information.
+        query: filter and sort order to apply.
+
+    Returns:
+        matching tasks in the requested order, a new df.
+    """
+    selected = pd.Series(True, index=df.index)
+
+    if query.status != ALL_TASKS:
+        running = df["running"].fillna(False).astype(bool)
+        selected &= running if query.status == RUNNING_TASKS else ~running
+
+    search = query.search.strip()
+    if search:
+        selected &= df["job name"].astype(str).str.contains(search, case=False, regex=False) | \
+            df["command"].astype(str).str.contains(search, case=False, regex=False)
+
+    tasks = df[selected]
+
+    # Mixed values (e.g. missing timestamps) are ordered by their text.
+    key = None if pd.api.types.infer_dtype(tasks[query.sort_by], skipna=True) != "mixed" else \
+        (lambda column: column.astype(str))
+
+    return tasks.sort_values(query.sort_by, ascending=not query.descending, na_position="last", kind="stable", key=key)
+
+
+def get_task_page(df: pd.DataFrame, query: TaskTableQuery) -> Tuple[pd.DataFrame, int, int]:
+    """
+    Get the page of the task table to display, so that only the visible tasks are sent to the browser.
+
+    Args:
+        df: df with process information.
+        query: filter, sort order and page to display.
+
+    Returns:
+        tasks on the page, without hidden columns, the amount of matching tasks and the page,
+            which is limited to the last page.
+    """
+    tasks = query_tasks(df, query)
+    pages = max(1, math.ceil(len(tasks) / query.page_size))
+    page = min(max(query.page, 1), pages)
+    start = (page - 1) * query.page_size
+
+    return tasks.iloc[start:start + query.page_size].drop(columns=HIDDEN_COLUMNS), len(tasks), page
+
+
+def select_task_table_query() -> TaskTableQuery:
+    """
+    Render UI elements for filtering, sorting and paging the task table.
+
+    Returns:
+        selected part of the task table.
+    """
+    status_col, search_col, sort_col, order_col, page_col = st.columns([2, 3, 2, 2, 1])
+
+    status = status_col.selectbox("Status", [ALL_TASKS, RUNNING_TASKS, STOPPED_TASKS])
+    search = search_col.text_input("Job name or command contains")
+    sort_by = sort_col.selectbox("Sort by", [column for column in settings.FORMAT if column not in HIDDEN_COLUMNS])
+    descending = order_col.selectbox("Order", ["Ascending", "Descending"]) == "Descending"
+    page = page_col.number_input("Page", min_value=1, value=1, step=1)
+
+    return TaskTableQuery(status, search, sort_by, descending, int(page))
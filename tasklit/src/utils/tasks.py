@@ -0,0 +1,226 @@
+from datetime import datetime, timedelta
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Tuple
+)
+
+import tasklit.settings.consts as settings
+import tasklit.src.utils.timezones as timezones
+
+
+def get_interval_duration(time_unit: str, time_unit_quantity: Optional[int],
+                          weekdays: Optional[List[str]]) -> timedelta:
+    """
+    Get the waiting interval to wait for until the next job execution.
+
+    Args:
+        time_unit: (optional) unit of execution time interval, e.g. 'hours', 'days', etc.
+        time_unit_quantity: (optional) amount of time interval units.
+        weekdays: (optional) list with selected weekdays.
+
+    Returns:
+        timedelta: time interval to wait before next schedule.
+    """
+    try:
+        return timedelta(days=1) if weekdays or not time_unit else \
+            settings.DATE_TRANSLATION[time_unit] * time_unit_quantity
+    except KeyError as exc:
+        raise exc
+
+
+class Schedule:
+    """
+    When a task is executed: the settings of the 'New task' UI, resolved into the first run.
+    Instances are small and picklable, so they are handed to scheduler processes as they are.
+    """
+
+    __slots__ = ("frequency", "first_run", "interval", "weekdays", "cron", "timezone", "calendar")
+
+    def __init__(self, frequency: str, first_run: Optional[datetime], interval: timedelta,
+                 weekdays: Optional[Iterable[str]] = None, cron: Optional[str] = None,
+                 timezone: Optional[str] = None, calendar: Optional[str] = None) -> None:
+        """
+        Args:
+            frequency: frequency of execution: "Once" / "Interval" / "Daily" / "Cron".
+            first_run: wall clock datetime of the first execution, the start date for "Cron".
+            interval: interval between job executions.
+            weekdays: (optional) selected weekdays.
+            cron: (optional) cron expression for the "Cron" frequency.
+            timezone: (optional) timezone of the schedule, the local timezone if not set.
+            calendar: (optional) name of the holiday and blackout calendar to follow.
+        """
+        self.frequency = frequency
+        self.first_run = first_run
+        self.interval = interval
+        self.weekdays = tuple(weekdays) if weekdays else None
+        self.cron = cron
+        self.timezone = timezone or timezones.get_local_timezone_name()
+        self.calendar = calendar
+
+    @classmethod
+    def create(cls, start: datetime, interval_duration: timedelta,
+               weekdays: Optional[Iterable[str]], execution_frequency: str,
+               execution_type: str, cron_expression: Optional[str] = None,
+               timezone_name: Optional[str] = None, calendar_name: Optional[str] = None) -> "Schedule":
+        """
+        Create a schedule from the settings of the 'New task' UI.
+
+        Args:
+            start: execution datetime.
+            interval_duration: interval to wait before scheduling the next job execution.
+            weekdays: (optional) selected weekdays.
+            execution_frequency: frequency of execution: "Once" / "Interval" / "Daily" / "Cron"
+            execution_type: type of execution schedule: is execution "Scheduled" or not.
+            cron_expression: (optional) cron expression for the "Cron" frequency.
+            timezone_name: (optional) timezone of the schedule, the local timezone if not set.
+            calendar_name: (optional) name of the holiday and blackout calendar to follow.
+
+        Returns:
+            schedule.
+        """
+        if execution_frequency in (settings.IMMEDIATE_FREQUENCY, settings.CRON_FREQUENCY) or execution_type == "Now":
+            first_run = start
+        else:
+            # Scheduled intervals are first executed once the interval has passed after the start date.
+            first_run = start + interval_duration
+
+        return cls(execution_frequency, first_run, interval_duration, weekdays, cron_expression,
+                   timezone_name, calendar_name)
+
+    @classmethod
+    def from_record(cls, record: Mapping[str, Any]) -> "Schedule":
+        """
+        Read a schedule from the schedule columns of a processes table row.
+
+        Args:
+            record: processes table row.
+
+        Returns:
+            schedule.
+        """
+        return cls(
+            record["frequency"],
+            record["first run"],
+            timedelta(seconds=record["interval"] or 0),
+            record["weekdays"].split(",") if record["weekdays"] else None,
+            record["cron"],
+            record["timezone"],
+            record["calendar"],
+        )
+
+    def to_record(self) -> Dict[str, Any]:
+        """
+        Get the schedule columns of a processes table row, so that upcoming runs
+        can be calculated without asking the scheduler process.
+
+        Returns:
+            dict with schedule related information, the first run as wall clock time of the schedule's timezone.
+        """
+        return {
+            "frequency": self.frequency,
+            "first run": self.first_run,
+            "interval": self.interval.total_seconds(),
+            "weekdays": ",".join(self.weekdays) if self.weekdays else None,
+            "cron": self.cron,
+            "timezone": self.timezone,
+            "calendar": self.calendar,
+        }
+
+    def _key(self) -> Tuple:
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __eq__(self, other: Any) -> bool:
+        return type(other) is type(self) and self._key() == other._key()
+
+    def __repr__(self) -> str:
+        return f"Schedule({self.frequency!r}, first_run={self.first_run!r}, interval={self.interval!r})"
+
+
+class Task:
+    """
+    A command executed by a scheduler process on a schedule, as saved in the processes table.
+    """
+
+    __slots__ = ("command", "job_name", "schedule", "pid", "process_created", "created", "task_id", "spec_hash")
+
+    def __init__(self, command: str, job_name: str, schedule: Schedule, pid: Optional[int] = None,
+                 created: Optional[datetime] = None, task_id: Optional[int] = None,
+                 spec_hash: Optional[str] = None, process_created: Optional[float] = None) -> None:
+        """
+        Args:
+            command: command to be executed.
+            job_name: name allocated for the process job.
+            schedule: execution schedule.
+            pid: (optional) ID of the scheduler process, set once it has been started.
+            created: (optional) creation datetime, now if not set.
+            task_id: (optional) task ID, allocated by the DB when the task is saved.
+            spec_hash: (optional) job spec fingerprint of tasks kept in sync with the job spec directory.
+            process_created: (optional) creation time of the scheduler process, in seconds since epoch.
+        """
+        self.command = command
+        self.job_name = job_name
+        self.schedule = schedule
+        self.pid = pid
+        self.created = created or datetime.now()
+        self.task_id = task_id
+        self.spec_hash = spec_hash
+        self.process_created = process_created
+
+    @classmethod
+    def from_record(cls, record: Mapping[str, Any]) -> "Task":
+        """
+        Read a task from a processes table row.
+
+        Args:
+            record: processes table row.
+
+        Returns:
+            task.
+        """
+        return cls(
+            record["command"],
+            record["job name"],
+            Schedule.from_record(record),
+            pid=record["process id"],
+            created=record["created"],
+            task_id=record["task_id"],
+            spec_hash=record["spec hash"],
+            process_created=record["process created"],
+        )
+
+    def to_record(self) -> Dict[str, Any]:
+        """
+        Get the processes table row of the task. The task ID is only included once allocated.
+
+        Returns:
+            dict with process and schedule related information.
+        """
+        record = {
+            "created": self.created,
+            "process id": self.pid,
+            "process created": self.process_created,
+            "job name": self.job_name,
+            "command": self.command,
+            "spec hash": self.spec_hash,
+        }
+
+        if self.task_id is not None:
+            record["task_id"] = self.task_id
+
+        record.update(self.schedule.to_record())
+
+        return record
+
+    def _key(self) -> Tuple:
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __eq__(self, other: Any) -> bool:
+        return type(other) is type(self) and self._key() == other._key()
+
+    def __repr__(self) -> str:
+        return f"Task({self.command!r}, {self.job_name!r}, task_id={self.task_id!r}, pid={self.pid!r})"
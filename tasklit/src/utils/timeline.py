@@ -0,0 +1,366 @@
+import functools
+
+from datetime import datetime, timedelta, timezone, tzinfo
+from typing import (
+    Dict,
+    List,
+    Optional,
+    Tuple
+)
+
+import altair as alt
+import numpy as np
+import pandas as pd
+
+from sqlalchemy import engine
+
+import tasklit.settings.consts as settings
+import tasklit.src.utils.calendars as calendars
+import tasklit.src.utils.database as database
+import tasklit.src.utils.timezones as timezones
+
+from tasklit.src.utils.calendars import Calendar
+from tasklit.src.utils.cron import CronSchedule
+
+SCHEDULE_COLUMNS = [
+    "task_id", "job name", "frequency", "first run", "interval", "weekdays", "cron", "timezone", "calendar"
+]
+
+_SECONDS_PER_DAY = 24 * 60 * 60
+# 1970-01-01 was a Thursday: weekday 3 counting from Monday (python), 4 counting from Sunday (cron).
+_EPOCH_WEEKDAY = 3
+_EPOCH_CRON_WEEKDAY = 4
+_ALL_WEEKDAYS = 0b1111111
+# UTC offsets of timezones only change at quarter hours.
+_OFFSET_STEP = 15 * 60
+
+
+@functools.lru_cache(maxsize=4096)
+def _get_cron_schedule(cron_expression: str) -> CronSchedule:
+    return CronSchedule(cron_expression)
+
+
+def _to_seconds(moment: datetime) -> int:
+    return int(pd.Timestamp(moment).value // 10 ** 9)
+
+
+def _to_datetime(seconds: int) -> datetime:
+    return pd.Timestamp(seconds, unit="s").to_pydatetime()
+
+
+def _to_wall_seconds(seconds: np.ndarray, zone: tzinfo) -> np.ndarray:
+    """
+    Convert times in seconds since epoch into wall clock times of a timezone, in seconds since epoch
+    as if the wall clock were UTC. Offsets are looked up once per quarter hour.
+    """
+    steps, index = np.unique(np.asarray(seconds, dtype=np.int64) // _OFFSET_STEP, return_inverse=True)
+    offsets = np.array([
+        datetime.fromtimestamp(step * _OFFSET_STEP, zone).utcoffset().total_seconds() for step in steps.tolist()
+    ], dtype=np.int64)
+
+    return seconds + offsets[index].reshape(np.shape(seconds))
+
+
+def _to_utc_seconds(wall_seconds: float, zone: tzinfo) -> float:
+    """
+    Convert a wall clock time of a timezone, in seconds since epoch as if the wall clock were UTC,
+    into seconds since epoch the way the scheduler does, see 'timezones.to_utc'.
+    """
+    whole_seconds = int(wall_seconds // 1)
+
+    return _to_seconds(timezones.to_utc(_to_datetime(whole_seconds), zone)) + wall_seconds - whole_seconds
+
+
+def get_blocked_windows(calendar: Optional[Calendar], start: int, end: int) -> np.ndarray:
+    """
+    Get the holidays and blackout windows of a calendar within a time window.
+
+    Args:
+        calendar: (optional) holiday and blackout calendar.
+        start: start of the window, wall clock time in seconds since epoch.
+        end: end of the window, wall clock time in seconds since epoch.
+
+    Returns:
+        array with the start and end (exclusive) of every blocked window, wall clock times in seconds since epoch.
+    """
+    windows = calendar.get_blocked_windows(_to_datetime(start), _to_datetime(end)) if calendar is not None else []
+
+    return np.array(
+        [(_to_seconds(window_start), _to_seconds(window_end)) for window_start, window_end in windows], dtype=np.int64
+    ).reshape(-1, 2)
+
+
+def _count_grid_runs(first_run: np.ndarray, interval: np.ndarray, low: np.ndarray, high: np.ndarray) -> np.ndarray:
+    """
+    Count the runs at 'first_run' + k * 'interval' (k >= 0) within [low, high).
+    """
+    first_k = np.maximum(np.ceil((low - first_run) / interval), 0)
+
+    return np.clip(np.ceil((high - first_run) / interval) - first_k, 0, None).astype(np.int64)
+
+
+def get_schedule_df(sql_engine: engine) -> pd.DataFrame:
+    """
+    Get the schedules of all tasks from the processes table cache.
+
+    Args:
+        sql_engine: sql alchemy engine to use.
+
+    Raises:
+        OperationalError: if any sqlalchemy errors have been thrown.
+
+    Returns:
+        dataframe with the SCHEDULE_COLUMNS of every task.
+    """
+    process_cache = database.get_process_cache(sql_engine)
+    process_cache.refresh()
+
+    return pd.DataFrame(process_cache.rows, columns=database.processes_table.columns.keys())[SCHEDULE_COLUMNS]
+
+
+def get_weekday_masks(weekdays: pd.Series) -> np.ndarray:
+    """
+    Convert comma separated weekdays ("Mon,Tue") into bitsets, bit 0 standing for Monday.
+    Tasks without weekday restriction run on every day.
+
+    Args:
+        weekdays: comma separated weekdays per task.
+
+    Returns:
+        array of weekday bitsets.
+    """
+    day_numbers = {day: number for number, day in settings.WEEK_DAYS.items()}
+
+    return np.array([
+        sum(1 << day_numbers[day] for day in task_weekdays.split(",")) if task_weekdays else _ALL_WEEKDAYS
+        for task_weekdays in weekdays
+    ], dtype=np.int64)
+
+
+def count_periodic_runs(schedule_df: pd.DataFrame, bin_starts: np.ndarray, start: int, end: int, bin_seconds: int,
+                        zone: tzinfo = timezone.utc, blocked_windows: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Count the runs of interval and daily tasks of one timezone per time bin.
+    Runs happen at 'first run' + k * 'interval': interval runs in real time from their first run on,
+    daily runs on the wall clock of the timezone.
+    The amount of runs within a bin follows from the bin edges without listing the runs themselves,
+    runs within blocked windows are subtracted the same way.
+
+    Args:
+        schedule_df: schedules of interval and daily tasks.
+        bin_starts: start of every bin, in seconds since epoch.
+        start: start of the window, in seconds since epoch.
+        end: end of the window, in seconds since epoch.
+        bin_seconds: length of a bin in seconds, a divisor of one day.
+        zone: (optional) timezone of the first runs and the blocked windows, UTC if not set.
+        blocked_windows: (optional) windows without runs, see 'get_blocked_windows'.
+
+    Returns:
+        array with the amount of runs per task (rows) and bin (columns).
+    """
+    wall_first_run = pd.to_datetime(schedule_df["first run"]).to_numpy().astype("datetime64[s]").astype(np.int64)
+    daily = (schedule_df["frequency"].to_numpy() == settings.DAILY_FREQUENCY)[:, None]
+    interval = schedule_df["interval"].to_numpy(dtype=np.float64)[:, None]
+    first_run = np.where(
+        daily[:, 0], wall_first_run, [_to_utc_seconds(wall_seconds, zone) for wall_seconds in wall_first_run.tolist()]
+    ).astype(np.float64)[:, None]
+
+    low = np.maximum(bin_starts, start)
+    high = np.minimum(bin_starts + bin_seconds, end)
+    low = np.where(daily, _to_wall_seconds(low, zone)[None, :], low[None, :])
+    high = np.where(daily, _to_wall_seconds(high, zone)[None, :], high[None, :])
+
+    runs = _count_grid_runs(first_run, interval, low, high)
+
+    for window_start, window_end in (blocked_windows if blocked_windows is not None else []).tolist():
+        window_start = np.where(daily, window_start, _to_utc_seconds(window_start, zone))
+        window_end = np.where(daily, window_end, _to_utc_seconds(window_end, zone))
+        runs -= _count_grid_runs(first_run, interval, np.maximum(low, window_start), np.minimum(high, window_end))
+
+    # Bins are at most a day long: daily tasks run at most once per bin, on the weekday of their first run in the bin.
+    first_k = np.maximum(np.ceil((low - first_run) / interval), 0)
+    run_weekdays = ((first_run + first_k * interval) // _SECONDS_PER_DAY + _EPOCH_WEEKDAY).astype(np.int64) % 7
+    weekday_masks = get_weekday_masks(schedule_df["weekdays"])[:, None]
+
+    return runs * ((weekday_masks >> run_weekdays) & 1)
+
+
+def _get_bit_table(bitsets: List[int], size: int) -> np.ndarray:
+    """
+    Expand bitsets into a boolean table: entry [i, v] is True if bit v of bitset i is set.
+    """
+    bits = np.array(bitsets, dtype=np.uint64)[:, None]
+
+    return ((bits >> np.arange(size, dtype=np.uint64)[None, :]) & np.uint64(1)).astype(bool)
+
+
+def count_cron_runs(schedule_df: pd.DataFrame, bin_starts: np.ndarray, start: int, end: int, bin_seconds: int,
+                    zone: tzinfo = timezone.utc, blocked_windows: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Count the runs of cron tasks of one timezone per time bin. Every field of every cron expression is expanded
+    into a small lookup table, which is then indexed with the wall clock minute grid of the whole window at once.
+
+    Args:
+        schedule_df: schedules of cron tasks.
+        bin_starts: start of every bin, in seconds since epoch.
+        start: start of the window, in seconds since epoch.
+        end: end of the window, in seconds since epoch.
+        bin_seconds: length of a bin in seconds, a multiple of one minute.
+        zone: (optional) timezone whose wall clock the cron expressions and first runs refer to, UTC if not set.
+        blocked_windows: (optional) windows without runs, see 'get_blocked_windows'.
+
+    Returns:
+        array with the amount of runs per task (rows) and bin (columns).
+    """
+    cron_schedules = [_get_cron_schedule(cron_expression) for cron_expression in schedule_df["cron"]]
+    counts = np.zeros((len(cron_schedules), len(bin_starts)), dtype=np.int64)
+
+    minutes = np.arange(-(-start // 60) * 60, end, 60)
+    if not len(minutes):
+        return counts
+
+    wall_minutes = _to_wall_seconds(minutes, zone)
+    grid = pd.DatetimeIndex(wall_minutes * 10 ** 9)
+    grid_weekdays = (wall_minutes // _SECONDS_PER_DAY + _EPOCH_CRON_WEEKDAY) % 7
+
+    minute_match = _get_bit_table([cron.minutes for cron in cron_schedules], 60)[:, grid.minute]
+    hour_match = _get_bit_table([cron.hours for cron in cron_schedules], 24)[:, grid.hour]
+    month_match = _get_bit_table([cron.months for cron in cron_schedules], 13)[:, grid.month]
+    day_match = _get_bit_table([cron.days for cron in cron_schedules], 32)[:, grid.day]
+    weekday_match = _get_bit_table([cron.weekdays for cron in cron_schedules], 7)[:, grid_weekdays]
+
+    days_restricted = np.array([cron.days_restricted for cron in cron_schedules])[:, None]
+    weekdays_restricted = np.array([cron.weekdays_restricted for cron in cron_schedules])[:, None]
+    date_match = np.where(
+        days_restricted & weekdays_restricted,
+        day_match | weekday_match,
+        np.where(weekdays_restricted, weekday_match, day_match)
+    )
+
+    # Scheduled cron tasks only fire from their start date on.
+    first_run = pd.to_datetime(schedule_df["first run"]).to_numpy().astype("datetime64[s]").astype(np.int64)
+    started = np.isnat(schedule_df["first run"].to_numpy(dtype="datetime64[s]"))[:, None] | \
+        (wall_minutes[None, :] >= first_run[:, None])
+
+    open_minutes = np.ones(len(minutes), dtype=bool)
+    if blocked_windows is not None and len(blocked_windows):
+        window_index = np.searchsorted(blocked_windows[:, 0], wall_minutes, side="right") - 1
+        open_minutes = (window_index < 0) | (wall_minutes >= blocked_windows[np.maximum(window_index, 0), 1])
+
+    runs_per_minute = np.array([bin(cron.seconds).count("1") for cron in cron_schedules])[:, None]
+    runs = (minute_match & hour_match & month_match & date_match & started & open_minutes[None, :]) * runs_per_minute
+
+    minute_bins = (minutes - bin_starts[0]) // bin_seconds
+    used_bins, first_minutes = np.unique(minute_bins, return_index=True)
+    counts[:, used_bins] = np.add.reduceat(runs, first_minutes, axis=1)
+
+    return counts
+
+
+def count_upcoming_runs(schedule_df: pd.DataFrame, start: datetime, end: datetime,
+                        bin_size: timedelta) -> pd.DataFrame:
+    """
+    Count the upcoming runs of all tasks per time bin, in one vectorized pass per schedule type,
+    timezone and calendar. Schedules follow the wall clock of their timezone
+    and skip the runs blocked by their calendar.
+    Tasks without schedule information, tasks that only run once and tasks whose timezone or calendar
+    cannot be loaded (their scheduler processes fail as well) are left out.
+
+    Args:
+        schedule_df: task schedules, see 'get_schedule_df'.
+        start: start of the time window, naive times are taken as UTC.
+        end: end of the time window, naive times are taken as UTC.
+        bin_size: length of a time bin, a divisor of one day and a multiple of one minute.
+
+    Returns:
+        dataframe with 'task_id', 'job name', bin 'start' and 'end' in UTC and the amount of 'runs',
+            one row per task and bin with at least one run.
+    """
+    bin_seconds = int(bin_size.total_seconds())
+    start_seconds, end_seconds = _to_seconds(start), _to_seconds(end)
+    bin_starts = np.arange(start_seconds - start_seconds % bin_seconds, end_seconds, bin_seconds)
+    counts = np.zeros((len(schedule_df), len(bin_starts)), dtype=np.int64)
+
+    frequency = schedule_df["frequency"].to_numpy()
+    periodic = np.isin(frequency, [settings.INTERVAL_FREQUENCY, settings.DAILY_FREQUENCY]) & \
+        schedule_df["first run"].notna().to_numpy() & (schedule_df["interval"].to_numpy(dtype=np.float64) > 0)
+    cron = (frequency == settings.CRON_FREQUENCY) & schedule_df["cron"].notna().to_numpy()
+
+    # Tasks without timezone follow the local wall clock, like their scheduler processes.
+    local_timezone = timezones.get_local_timezone_name()
+    groups: Dict[Tuple[str, Optional[str]], List[int]] = {}
+
+    for position, (timezone_name, calendar_name) in enumerate(zip(schedule_df["timezone"], schedule_df["calendar"])):
+        groups.setdefault((
+            timezone_name if isinstance(timezone_name, str) and timezone_name else local_timezone,
+            calendar_name if isinstance(calendar_name, str) and calendar_name else None
+        ), []).append(position)
+
+    for (timezone_name, calendar_name), positions in groups.items():
+        try:
+            zone = timezones.get_timezone(timezone_name)
+            calendar = calendars.get_calendar(calendar_name)
+        except ValueError:
+            continue
+
+        in_group = np.zeros(len(schedule_df), dtype=bool)
+        in_group[positions] = True
+        blocked_windows = get_blocked_windows(
+            calendar, int(_to_wall_seconds(start_seconds, zone)), int(_to_wall_seconds(end_seconds, zone))
+        )
+
+        if (periodic & in_group).any():
+            counts[periodic & in_group] = count_periodic_runs(
+                schedule_df[periodic & in_group], bin_starts, start_seconds, end_seconds, bin_seconds,
+                zone, blocked_windows
+            )
+
+        if (cron & in_group).any():
+            counts[cron & in_group] = count_cron_runs(
+                schedule_df[cron & in_group], bin_starts, start_seconds, end_seconds, bin_seconds,
+                zone, blocked_windows
+            )
+
+    task_index, bin_index = np.nonzero(counts)
+    bin_start_times = pd.to_datetime(bin_starts[bin_index], unit="s", utc=True)
+
+    return pd.DataFrame({
+        "task_id": schedule_df["task_id"].to_numpy()[task_index],
+        "job name": schedule_df["job name"].to_numpy()[task_index],
+        "start": bin_start_times,
+        "end": bin_start_times + bin_size,
+        "runs": counts[task_index, bin_index],
+    })
+
+
+def get_timeline_chart(runs_df: pd.DataFrame) -> alt.VConcatChart:
+    """
+    Build a Gantt-style chart of upcoming runs per task, with the total amount of runs
+    per time bin below it to show congestion windows.
+
+    Args:
+        runs_df: upcoming runs per task and time bin, see 'count_upcoming_runs'.
+
+    Returns:
+        altair chart.
+    """
+    base = alt.Chart(runs_df)
+    tooltip = ["job name:N", "task_id:Q", alt.Tooltip("start:T", format="%a %H:%M"), "runs:Q"]
+
+    tasks = base.mark_rect().encode(
+        x=alt.X("start:T", title=None),
+        x2="end:T",
+        y=alt.Y("job name:N", title=None),
+        color=alt.Color("runs:Q", scale=alt.Scale(scheme="blues")),
+        tooltip=tooltip
+    )
+    congestion = base.mark_bar().encode(
+        x=alt.X("start:T", title=None),
+        x2="end:T",
+        y=alt.Y("sum(runs):Q", title="runs"),
+        tooltip=[alt.Tooltip("start:T", format="%a %H:%M"), alt.Tooltip("sum(runs):Q", title="runs")]
+    ).properties(
+        height=100
+    )
+
+    return alt.vconcat(tasks, congestion)
@@ -0,0 +1,79 @@
+import functools
+import os
+
+from datetime import datetime, timezone, tzinfo
+from typing import List, Optional
+
+try:
+    import zoneinfo
+except ImportError:
+    from backports import zoneinfo
+
+DEFAULT_TIMEZONE = "UTC"
+
+
+@functools.lru_cache(maxsize=None)
+def get_timezone(timezone_name: Optional[str] = None) -> tzinfo:
+    """
+    Get a timezone by its IANA name. Every timezone is loaded once per process and kept,
+    so its transition table is not read again for later fire time calculations.
+
+    Args:
+        timezone_name: (optional) IANA timezone name, e.g. 'Europe/Berlin',
+            the local timezone if not set.
+
+    Raises:
+        ValueError: if the timezone is unknown.
+
+    Returns:
+        timezone.
+    """
+    timezone_name = timezone_name or get_local_timezone_name()
+
+    try:
+        return zoneinfo.ZoneInfo(timezone_name)
+    except (ValueError, zoneinfo.ZoneInfoNotFoundError) as exc:
+        raise ValueError(f"Unknown timezone '{timezone_name}'.") from exc
+
+
+@functools.lru_cache(maxsize=1)
+def get_local_timezone_name() -> str:
+    """
+    Get the IANA name of the local timezone, from the TZ environment variable or /etc/localtime.
+
+    Returns:
+        local timezone name, DEFAULT_TIMEZONE if it cannot be determined.
+    """
+    timezone_name = os.environ.get("TZ", "").lstrip(":")
+
+    if not timezone_name and os.path.islink("/etc/localtime"):
+        timezone_name = os.path.realpath("/etc/localtime").partition("zoneinfo/")[2]
+
+    return timezone_name if timezone_name in get_timezone_names() else DEFAULT_TIMEZONE
+
+
+@functools.lru_cache(maxsize=1)
+def get_timezone_names() -> List[str]:
+    """
+    Get the names of all available timezones.
+
+    Returns:
+        sorted list of IANA timezone names.
+    """
+    return sorted(zoneinfo.available_timezones())
+
+
+def to_utc(local_time: datetime, zone: tzinfo) -> datetime:
+    """
+    Convert a wall clock time of a timezone into UTC. Times that occur twice when clocks are
+    set back resolve to the first occurrence, times skipped when clocks are set forward
+    are moved forward by the length of the gap.
+
+    Args:
+        local_time: naive wall clock time.
+        zone: timezone of the wall clock.
+
+    Returns:
+        aware datetime in UTC.
+    """
+    return local_time.replace(tzinfo=zone, fold=0).astimezone(timezone.utc)
@@ -0,0 +1,275 @@
+import asyncio
+import http.client
+import json
+import os
+import tempfile
+import unittest
+
+from datetime import datetime, timedelta
+from http import HTTPStatus
+from unittest.mock import (
+    patch,
+    MagicMock
+)
+
+import tasklit.src.utils.database as database
+
+from tasklit.src.utils.api import (
+    check_request,
+    format_response,
+    get_api_token,
+    read_task_runs,
+    start_api_server,
+    HTTPError,
+    TaskApi
+)
+from tasklit.src.utils.tasks import Schedule, Task
+
+
+class ApiTestCase(unittest.IsolatedAsyncioTestCase):
+    """
+    Unittests for the HTTP/JSON API.
+    """
+
+    def setUp(self) -> None:
+        """
+        temp_dir: tempfile.TemporaryDirectory
+            Folder of the sample DB.
+        sql_engine: sqlalchemy engine
+            Engine for the sample DB.
+        """
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.sql_engine = database.get_sql_engine(f"sqlite:///{self.temp_dir.name}/process_data.db")
+
+    def tearDown(self) -> None:
+        self.sql_engine.dispose()
+        self.temp_dir.cleanup()
+
+    @staticmethod
+    def request(port: int, method: str, target: str, body: object = None, **headers: str):
+        connection = http.client.HTTPConnection("127.0.0.1", port)
+        headers = dict({"Authorization": "Bearer nostalgic", "Content-Type": "application/json"}, **headers)
+        try:
+            connection.request(method, target, json.dumps(body) if body is not None else None,
+                               {name.replace("_", "-"): value for name, value in headers.items()})
+            response = connection.getresponse()
+            return response.status, json.loads(response.read())
+        finally:
+            connection.close()
+
+    async def test_manage_tasks_over_localhost(self):
+        """
+        GIVEN an API server listening on localhost
+        WHEN tasks are submitted, listed, inspected and cancelled over HTTP
+        THEN check that submitted tasks are saved as queued and cancelled queued tasks are removed.
+        """
+        server = await start_api_server(self.sql_engine, "127.0.0.1", 0, token="nostalgic")
+        port = server.sockets[0].getsockname()[1]
+        loop = asyncio.get_running_loop()
+
+        async def request(method: str, target: str, body: object = None):
+            return await loop.run_in_executor(None, self.request, port, method, target, body)
+
+        async with server:
+            status, submitted = await request("POST", "/tasks", [
+                {"command": "ping 123", "job_name": "nostalgic_strauss"},
+                {"command": "ping 456", "frequency": "Interval", "unit": "Minutes", "quantity": 5},
+            ])
+            self.assertEqual(status, HTTPStatus.ACCEPTED)
+            self.assertEqual(submitted["task_ids"], [1, 2])
+
+            status, tasks = await request("GET", "/tasks?state=queued")
+            self.assertEqual(status, HTTPStatus.OK)
+            self.assertEqual([(task["task_id"], task["state"]) for task in tasks], [(1, "queued"), (2, "queued")])
+            self.assertEqual((tasks[1]["frequency"], tasks[1]["interval"]), ("Interval", 300.0))
+
+            status, task = await request("GET", "/tasks/1")
+            self.assertEqual((status, task["job_name"], task["command"]), (200, "nostalgic_strauss", "ping 123"))
+
+            status, cancelled = await request("DELETE", "/tasks/2")
+            self.assertEqual((status, cancelled), (200, {"task_id": 2, "removed": True}))
+
+            status, error = await request("GET", "/tasks/2")
+            self.assertEqual((status, error), (404, {"error": "No task 2."}))
+
+    async def test_rejected_requests_over_localhost(self):
+        """
+        GIVEN an API server listening on localhost
+        WHEN tasks are submitted without the token, to another host name, from a web page
+            of another origin, or as a form
+        THEN check that each submission is rejected with the matching status and no task is saved.
+        """
+        server = await start_api_server(self.sql_engine, "127.0.0.1", 0, token="nostalgic")
+        port = server.sockets[0].getsockname()[1]
+        loop = asyncio.get_running_loop()
+        task = {"command": "ping 123"}
+
+        async with server:
+            for headers, status in [
+                ({"Authorization": ""}, HTTPStatus.UNAUTHORIZED),
+                ({"Authorization": "Bearer strauss"}, HTTPStatus.UNAUTHORIZED),
+                ({"Host": "attacker.example:8502"}, HTTPStatus.FORBIDDEN),
+                ({"Origin": "http://attacker.example"}, HTTPStatus.FORBIDDEN),
+                ({"Content_Type": "text/plain"}, HTTPStatus.UNSUPPORTED_MEDIA_TYPE),
+                ({"Content_Type": "application/x-www-form-urlencoded"}, HTTPStatus.UNSUPPORTED_MEDIA_TYPE),
+            ]:
+                response = await loop.run_in_executor(None, lambda: self.request(port, "POST", "/tasks", task,
+                                                                                 **headers))
+                self.assertEqual(response[0], status, headers)
+
+            status, _ = await loop.run_in_executor(None, lambda: self.request(
+                port, "POST", "/tasks", task, Host=f"localhost:{port}", Origin=f"http://localhost:{port}"
+            ))
+            self.assertEqual(status, HTTPStatus.ACCEPTED)
+            status, tasks = await loop.run_in_executor(None, self.request, port, "GET", "/tasks")
+            self.assertEqual(len(tasks), 1)
+
+    def test_check_request(self):
+        """
+        GIVEN request headers
+        WHEN they are checked
+        THEN check that only requests to the local machine, from local origins, with the token
+            and JSON bodies pass.
+        """
+        headers = {"host": "127.0.0.1:8502", "authorization": "Bearer nostalgic",
+                   "content-type": "application/json; charset=utf-8"}
+
+        check_request("POST", headers, "nostalgic")
+        check_request("GET", dict(headers, host="[::1]:8502", origin="http://localhost:8501"), "nostalgic")
+        check_request("DELETE", {"host": "localhost", "authorization": "bearer nostalgic"}, "nostalgic")
+
+        for method, changed in [("POST", {"host": "rebinding.example:8502"}),
+                                ("GET", {"host": ""}),
+                                ("GET", {"origin": "null"}),
+                                ("GET", {"origin": "https://127.0.0.1.example"}),
+                                ("GET", {"authorization": "nostalgic"}),
+                                ("POST", {"content-type": "text/plain"})]:
+            with self.assertRaises(HTTPError):
+                check_request(method, dict(headers, **changed), "nostalgic")
+
+    def test_get_api_token(self):
+        """
+        GIVEN no API token yet
+        WHEN the token is read twice
+        THEN check that it is created once, kept, and only readable by the user.
+        """
+        token_path = os.path.join(self.temp_dir.name, "api_token")
+
+        with patch('tasklit.src.utils.api.settings.API_TOKEN_PATH', token_path):
+            token = get_api_token()
+
+            self.assertGreater(len(token), 20)
+            self.assertEqual(get_api_token(), token)
+            self.assertEqual(os.stat(token_path).st_mode & 0o777, 0o600)
+
+    @patch('tasklit.src.utils.api.database.insert_tasks', wraps=database.insert_tasks)
+    async def test_concurrent_submissions_are_batched(self,
+                                                      mock_insert_tasks: MagicMock):
+        """
+        GIVEN many concurrent submissions
+        WHEN they are handled
+        THEN check that every task gets its own ID and they are saved in fewer transactions than submissions.
+        """
+        api = TaskApi(self.sql_engine)
+
+        responses = await asyncio.gather(*[
+            api.handle("POST", "/tasks", json.dumps({"command": f"ping {index}"}).encode()) for index in range(20)
+        ])
+
+        task_ids = [task_id for _, content in responses for task_id in content["task_ids"]]
+        self.assertEqual(sorted(task_ids), list(range(1, 21)))
+        self.assertLess(mock_insert_tasks.call_count, 20)
+
+    async def test_invalid_requests(self):
+        """
+        GIVEN requests with invalid content, unknown paths and unsupported methods
+        WHEN they are handled
+        THEN check that they are rejected with the matching status.
+        """
+        api = TaskApi(self.sql_engine)
+
+        for (method, target, body), status in [
+            (("POST", "/tasks", b"nostalgic"), HTTPStatus.BAD_REQUEST),
+            (("POST", "/tasks", b'{"command": "ping 123", "frequency": "Hourly"}'), HTTPStatus.BAD_REQUEST),
+            (("POST", "/tasks", b'{"command": "ping 123", "frequency": "Daily", "weekdays": [1]}'),
+             HTTPStatus.BAD_REQUEST),
+            (("GET", "/processes", b""), HTTPStatus.NOT_FOUND),
+            (("GET", "/tasks/strauss", b""), HTTPStatus.NOT_FOUND),
+            (("PUT", "/tasks", b""), HTTPStatus.METHOD_NOT_ALLOWED),
+        ]:
+            with self.assertRaises(HTTPError) as context:
+                await api.handle(method, target, body)
+            self.assertEqual(context.exception.status, status)
+
+    @patch('tasklit.src.utils.api.processes.terminate_process')
+    @patch('tasklit.src.utils.api.processes.is_process_running')
+    async def test_cancel_running_task(self,
+                                       mock_is_running: MagicMock,
+                                       mock_terminate: MagicMock):
+        """
+        GIVEN a running task
+        WHEN it is cancelled
+        THEN check that its scheduler process is terminated and the task is kept.
+        """
+        schedule = Schedule("Once", datetime(2021, 1, 1), timedelta(days=1), timezone="UTC")
+        database.insert_tasks([Task("ping 123", "nostalgic_strauss", schedule, pid=123,
+                                    process_created=1609459200.0)], self.sql_engine)
+        mock_is_running.return_value = True
+
+        status, content = await TaskApi(self.sql_engine).handle("DELETE", "/tasks/1", b"")
+
+        self.assertEqual((status, content), (HTTPStatus.OK, {"task_id": 1, "removed": False}))
+        mock_terminate.assert_called_once_with(123, 1609459200.0)
+
+    @patch('tasklit.src.utils.api.processes.is_process_running')
+    @patch('tasklit.src.utils.api.processes.get_running_processes')
+    async def test_list_tasks_checks_one_process_snapshot(self,
+                                                          mock_get_running: MagicMock,
+                                                          mock_is_running: MagicMock):
+        """
+        GIVEN a running task, a task whose process has exited and a queued task
+        WHEN the tasks are listed
+        THEN check that their states are checked in one process table snapshot instead of one lookup per task.
+        """
+        schedule = Schedule("Once", datetime(2021, 1, 1), timedelta(days=1), timezone="UTC")
+        database.insert_tasks([Task("ping 123", "nostalgic_strauss", schedule, pid=123, process_created=1609459200.0),
+                               Task("ping 456", "gifted_bach", schedule, pid=456, process_created=1609459200.0),
+                               Task("ping 789", "queued_strauss", schedule)], self.sql_engine)
+        mock_get_running.return_value = {123: 1609459200.0}
+
+        status, tasks = await TaskApi(self.sql_engine).handle("GET", "/tasks", b"")
+
+        self.assertEqual([task["state"] for task in tasks], ["running", "stopped", "queued"])
+        mock_get_running.assert_called_once_with()
+        mock_is_running.assert_not_called()
+
+    def test_read_task_runs(self):
+        """
+        GIVEN a job execution log
+        WHEN the run history of the job is read
+        THEN check that every entry is returned with its time and message.
+        """
+        with patch('tasklit.src.utils.api.settings.BASE_LOG_DIR', self.temp_dir.name):
+            with open(os.path.join(self.temp_dir.name, "nostalgic_strauss.txt"), "w") as log_file:
+                log_file.write("2021-01-01 12:00:00 Executed ping 123\n2021-01-01 12:05:00 Executed ping 123\n")
+
+            runs = read_task_runs("nostalgic_strauss")
+            missing = read_task_runs("gifted_bach")
+
+        self.assertEqual(runs, [{"time": "2021-01-01 12:00:00", "message": "Executed"},
+                                {"time": "2021-01-01 12:05:00", "message": "Executed"}])
+        self.assertEqual(missing, [])
+
+    def test_format_response(self):
+        """
+        GIVEN a response status and content
+        WHEN the HTTP response is built
+        THEN check that it has the status line, JSON headers and body.
+        """
+        response = format_response(HTTPStatus.ACCEPTED, {"task_ids": [1]}, keep_alive=False)
+
+        self.assertEqual(
+            response,
+            b'HTTP/1.1 202 Accepted\r\nContent-Type: application/json\r\nContent-Length: 17\r\n'
+            b'Connection: close\r\n\r\n{"task_ids": [1]}'
+        )
@@ -0,0 +1,155 @@
+import os
+import tempfile
+import unittest
+
+from datetime import date, datetime
+
+from tasklit.src.utils.calendars import (
+    get_calendar,
+    list_calendars,
+    load_calendar,
+    parse_calendar_csv,
+    parse_calendar_ics,
+    Calendar
+)
+
+
+class CalendarsTestCase(unittest.TestCase):
+    """
+    Unittests for holiday and blackout calendars.
+    """
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        """
+        calendar: Calendar
+            Sample calendar with holidays around new year and two overlapping maintenance windows.
+        """
+        super(CalendarsTestCase, cls).setUpClass()
+        cls.calendar = Calendar(
+            "holidays",
+            [date(2021, 12, 24), date(2021, 12, 31), date(2022, 1, 1)],
+            [
+                (datetime(2021, 12, 20, 22), datetime(2021, 12, 21, 2)),
+                (datetime(2021, 12, 21, 1), datetime(2021, 12, 21, 4)),
+            ]
+        )
+
+    def test_is_blocked(self):
+        """
+        GIVEN a calendar with holidays and blackout windows
+        WHEN times are checked with the 'is_blocked' method
+        THEN check that holidays and times within (merged) windows are blocked, window ends are not.
+        """
+        self.assertTrue(self.calendar.is_blocked(datetime(2021, 12, 24, 12)))
+        self.assertTrue(self.calendar.is_blocked(datetime(2021, 12, 20, 22)))
+        self.assertTrue(self.calendar.is_blocked(datetime(2021, 12, 21, 3)))
+        self.assertFalse(self.calendar.is_blocked(datetime(2021, 12, 21, 4)))
+        self.assertFalse(self.calendar.is_blocked(datetime(2021, 12, 23, 23, 59)))
+
+    def test_next_allowed(self):
+        """
+        GIVEN a calendar with holidays and blackout windows
+        WHEN the first unblocked time is requested with the 'next_allowed' method
+        THEN check that holidays are skipped across the year change and windows until their end.
+        """
+        self.assertEqual(self.calendar.next_allowed(datetime(2021, 12, 31, 9)), datetime(2022, 1, 2))
+        self.assertEqual(self.calendar.next_allowed(datetime(2021, 12, 20, 23)), datetime(2021, 12, 21, 4))
+        self.assertEqual(self.calendar.next_allowed(datetime(2021, 12, 22, 9)), datetime(2021, 12, 22, 9))
+
+    def test_get_blocked_windows(self):
+        """
+        GIVEN a calendar with holidays and overlapping blackout windows
+        WHEN the blocked windows of a time range are requested with the 'get_blocked_windows' method
+        THEN check that windows are merged and cut to the range, holidays become whole days.
+        """
+        self.assertEqual(
+            self.calendar.get_blocked_windows(datetime(2021, 12, 20, 23), datetime(2021, 12, 24, 12)),
+            [
+                (datetime(2021, 12, 20, 23), datetime(2021, 12, 21, 4)),
+                (datetime(2021, 12, 24), datetime(2021, 12, 24, 12)),
+            ]
+        )
+        self.assertEqual(
+            self.calendar.get_blocked_windows(datetime(2021, 12, 31, 9), datetime(2022, 1, 3)),
+            [(datetime(2021, 12, 31, 9), datetime(2022, 1, 2))]
+        )
+        self.assertEqual(self.calendar.get_blocked_windows(datetime(2021, 12, 22), datetime(2021, 12, 23)), [])
+
+    def test_parse_calendar_ics(self):
+        """
+        GIVEN an iCalendar file with an all-day event and a timed event with folded lines
+        WHEN passed to the 'parse_calendar_ics' function
+        THEN check that the all-day event becomes holidays and the timed event a blackout window.
+        """
+        holidays, blackouts = parse_calendar_ics(
+            "BEGIN:VCALENDAR\r\n"
+            "BEGIN:VEVENT\r\n"
+            "SUMMARY:Christmas\r\n"
+            "DTSTART;VALUE=DATE:20211225\r\n"
+            "DTEND;VALUE=DATE:20211227\r\n"
+            "END:VEVENT\r\n"
+            "BEGIN:VEVENT\r\n"
+            "DTSTART:20211220T220000\r\n"
+            "DTEND:20211221T0\r\n"
+            " 20000\r\n"
+            "END:VEVENT\r\n"
+            "END:VCALENDAR\r\n"
+        )
+
+        self.assertEqual(holidays, [date(2021, 12, 25), date(2021, 12, 26)])
+        self.assertEqual(blackouts, [(datetime(2021, 12, 20, 22), datetime(2021, 12, 21, 2))])
+
+        with self.assertRaisesRegex(ValueError, "Event 1"):
+            parse_calendar_ics("BEGIN:VEVENT\nDTSTART:20211220T220000\nRRULE:FREQ=WEEKLY\nEND:VEVENT\n")
+
+    def test_parse_calendar_csv(self):
+        """
+        GIVEN a CSV calendar with a holiday, a holiday range and a blackout window
+        WHEN passed to the 'parse_calendar_csv' function
+        THEN check that holidays and blackout windows are returned, and that windows without end are rejected.
+        """
+        holidays, blackouts = parse_calendar_csv(
+            "start,end,description\n"
+            "2021-05-01,,Labour day\n"
+            "2021-08-02,2021-08-03,Summer break\n"
+            "2021-06-01 20:00,2021-06-01 22:00,Maintenance\n"
+        )
+
+        self.assertEqual(holidays, [date(2021, 5, 1), date(2021, 8, 2), date(2021, 8, 3)])
+        self.assertEqual(blackouts, [(datetime(2021, 6, 1, 20), datetime(2021, 6, 1, 22))])
+
+        with self.assertRaisesRegex(ValueError, "Row 2"):
+            parse_calendar_csv("start,end\n2021-06-01 20:00,\n")
+
+    def test_load_calendar_raises_error(self):
+        """
+        GIVEN a calendar file of an unsupported format
+        WHEN passed to the 'load_calendar' function
+        THEN check that ValueError is raised.
+        """
+        with self.assertRaises(ValueError):
+            load_calendar("", "xlsx", "holidays")
+
+    def test_get_calendar(self):
+        """
+        GIVEN a calendar directory with a CSV calendar
+        WHEN calendars are listed and requested by name
+        THEN check that the calendar is only read again once the file has been modified.
+        """
+        with tempfile.TemporaryDirectory() as calendar_dir:
+            path = os.path.join(calendar_dir, "holidays.csv")
+            with open(path, "w") as calendar_file:
+                calendar_file.write("start\n2021-05-01\n")
+
+            self.assertEqual(list_calendars(calendar_dir), ["holidays"])
+            calendar = get_calendar("holidays", calendar_dir)
+            self.assertTrue(calendar.is_holiday(date(2021, 5, 1)))
+            self.assertIs(get_calendar("holidays", calendar_dir), calendar)
+
+            with open(path, "w") as calendar_file:
+                calendar_file.write("start\n2021-05-02\n2021-05-03\n")
+
+            self.assertTrue(get_calendar("holidays", calendar_dir).is_holiday(date(2021, 5, 3)))
+            self.assertIsNone(get_calendar("vacations", calendar_dir))
+            self.assertIsNone(get_calendar(None, calendar_dir))
@@ -0,0 +1,318 @@
+import io
+import json
+import os
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from contextlib import redirect_stdout
+from datetime import datetime, timedelta
+from unittest.mock import (
+    patch,
+    MagicMock
+)
+
+import psutil
+
+import tasklit.src.utils.database as database
+
+from tasklit.cli import (
+    find_task,
+    main,
+    read_tasks
+)
+from tasklit.src.utils.tasks import Schedule, Task
+
+
+class CliTestCase(unittest.TestCase):
+    """
+    Unittests for the command line interface.
+    """
+
+    def setUp(self) -> None:
+        """
+        test_rows: List[Dict[str, Any]]
+            Sample process information rows.
+        """
+        self.test_rows = [
+            {"task_id": 1, "created": "2021-01-01 12:00:00", "process id": 123, "process created": 1609459200.0,
+             "job name": "nostalgic_strauss", "command": "ping 123"},
+            {"task_id": 2, "created": "2021-01-01 12:00:01", "process id": 124, "process created": None,
+             "job name": "gifted_bach", "command": "echo bach"},
+        ]
+
+    def test_list_is_lightweight(self):
+        """
+        GIVEN the command line interface
+        WHEN tasks are listed in a fresh interpreter
+        THEN check that none of the app's heavy dependencies are loaded.
+        """
+        heavy_modules = ["streamlit", "pandas", "altair", "sqlalchemy", "numpy"]
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            loaded = subprocess.run(
+                [sys.executable, "-c",
+                 f"import sys\nfrom tasklit.cli import main\nmain(['list'])\n"
+                 f"print([m for m in {heavy_modules} if m in sys.modules])"],
+                stdout=subprocess.PIPE, check=True, universal_newlines=True, env=dict(os.environ, HOME=temp_dir)
+            ).stdout.strip().splitlines()[-1]
+
+        self.assertEqual(loaded, "[]")
+
+    def test_daemon_is_lightweight(self):
+        """
+        GIVEN the command line interface
+        WHEN the scheduler daemon runs in a fresh interpreter until it is terminated
+        THEN check that neither Streamlit nor pandas are loaded.
+        """
+        heavy_modules = ["streamlit", "pandas", "altair", "numpy"]
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            loaded = subprocess.run(
+                [sys.executable, "-c",
+                 f"import os, signal, sys, threading, time\nfrom tasklit.cli import main\n"
+                 f"def stop():\n"
+                 f"    while signal.getsignal(signal.SIGTERM) == signal.SIG_DFL:\n"
+                 f"        time.sleep(0.01)\n"
+                 f"    os.kill(os.getpid(), signal.SIGTERM)\n"
+                 f"threading.Thread(target=stop, daemon=True).start()\nmain(['daemon'])\n"
+                 f"print([m for m in {heavy_modules} if m in sys.modules])"],
+                stdout=subprocess.PIPE, check=True, universal_newlines=True, env=dict(os.environ, HOME=temp_dir),
+                timeout=30
+            ).stdout.strip().splitlines()[-1]
+
+        self.assertEqual(loaded, "[]")
+
+    def test_read_tasks(self):
+        """
+        GIVEN a DB file with saved tasks, and a DB file that does not exist yet
+        WHEN the processes table is read without sql alchemy
+        THEN check that all tasks are returned in task ID order, or none for the missing DB.
+        """
+        schedule = Schedule.create(datetime(2021, 1, 1), timedelta(hours=1), None, "Interval", "Scheduled")
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            db_path = os.path.join(temp_dir, "process_data.db")
+            sql_engine = database.get_sql_engine(f"sqlite:///{db_path}")
+            database.insert_tasks([Task("ping 123", "nostalgic_strauss", schedule, pid=123),
+                                   Task("echo bach", "gifted_bach", schedule)], sql_engine)
+            sql_engine.dispose()
+
+            tasks = read_tasks(db_path)
+            missing = read_tasks(os.path.join(temp_dir, "missing.db"))
+
+        self.assertEqual([(row["task_id"], row["job name"], row["process id"]) for row in tasks],
+                         [(1, "nostalgic_strauss", 123), (2, "gifted_bach", None)])
+        self.assertEqual(missing, [])
+
+    @patch('tasklit.src.utils.processes.terminate_process')
+    @patch('tasklit.src.utils.processes.is_process_running')
+    def test_list_and_kill_legacy_tasks(self,
+                                        mock_is_running: MagicMock,
+                                        mock_terminate: MagicMock):
+        """
+        GIVEN a DB file with a processes table saved by an earlier app version, without process creation times
+        WHEN its tasks are listed and a running task is killed
+        THEN check that the task is listed and terminated without a process creation time.
+        """
+        mock_is_running.return_value = True
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            db_path = os.path.join(temp_dir, "process_data.db")
+            connection = sqlite3.connect(db_path)
+            with connection:
+                connection.execute('CREATE TABLE processes (task_id BIGINT, created TIMESTAMP, "process id" BIGINT, '
+                                   '"job name" TEXT, command TEXT, "last update" TIMESTAMP, running BOOLEAN)')
+                connection.execute("INSERT INTO processes VALUES (1, '2021-01-01 12:00:00', 123, "
+                                   "'nostalgic_strauss', 'ping 123', NULL, 1)")
+            connection.close()
+            output = io.StringIO()
+
+            with patch('tasklit.cli.get_db_path', return_value=db_path), redirect_stdout(output):
+                self.assertEqual(main(["list", "--json"]), 0)
+                self.assertEqual(main(["kill", "1"]), 0)
+
+        self.assertEqual(json.loads(output.getvalue().splitlines()[0])[0]["job name"], "nostalgic_strauss")
+        mock_is_running.assert_any_call(123, None)
+        mock_terminate.assert_called_once_with(123, None)
+
+    def test_find_task(self):
+        """
+        GIVEN process information rows
+        WHEN a task is looked up by task ID or job name
+        THEN check that the matching row is returned, or None for unknown tasks.
+        """
+        self.assertIs(find_task(self.test_rows, "2"), self.test_rows[1])
+        self.assertIs(find_task(self.test_rows, "nostalgic_strauss"), self.test_rows[0])
+        self.assertIsNone(find_task(self.test_rows, "3"))
+
+    @patch('tasklit.src.utils.processes.is_process_running')
+    @patch('tasklit.cli.read_tasks')
+    def test_list_running_tasks(self,
+                                mock_read_tasks: MagicMock,
+                                mock_is_running: MagicMock):
+        """
+        GIVEN a running and a stopped task
+        WHEN running tasks are listed as JSON
+        THEN check that only the running task is printed, checked against its process creation time.
+        """
+        mock_read_tasks.return_value = self.test_rows
+        mock_is_running.side_effect = lambda pid, create_time: pid == 123
+        output = io.StringIO()
+
+        with redirect_stdout(output):
+            exit_code = main(["list", "--running", "--json"])
+
+        self.assertEqual(exit_code, 0)
+        self.assertEqual([row["task_id"] for row in json.loads(output.getvalue())], [1])
+        mock_is_running.assert_any_call(123, 1609459200.0)
+
+    @patch('tasklit.src.utils.database.get_sql_engine')
+    @patch('tasklit.src.utils.database.insert_tasks')
+    @patch('tasklit.src.utils.processes.start_scheduler_process')
+    def test_submit_interval_task(self,
+                                  mock_start_process: MagicMock,
+                                  mock_insert_tasks: MagicMock,
+                                  mock_get_engine: MagicMock):
+        """
+        GIVEN a command to run every 10 seconds
+        WHEN it is submitted
+        THEN check that its scheduler process is started and the task is saved with an interval schedule.
+        """
+        with redirect_stdout(io.StringIO()):
+            exit_code = main(["submit", "ping 123", "--name", "nostalgic_strauss", "--every", "10",
+                              "--unit", "Seconds"])
+
+        task = mock_start_process.call_args[0][0]
+        self.assertEqual(exit_code, 0)
+        self.assertEqual((task.command, task.job_name), ("ping 123", "nostalgic_strauss"))
+        self.assertEqual((task.schedule.frequency, task.schedule.interval), ("Interval", timedelta(seconds=10)))
+        mock_insert_tasks.assert_called_with([task], mock_get_engine.return_value)
+
+    @patch('tasklit.src.utils.database.get_sql_engine')
+    @patch('tasklit.src.utils.database.insert_tasks')
+    @patch('tasklit.src.utils.processes.terminate_process')
+    @patch('tasklit.src.utils.processes.is_process_running')
+    @patch('tasklit.src.utils.processes.start_scheduler_process')
+    def test_submit_save_fails(self,
+                               mock_start_process: MagicMock,
+                               mock_is_running: MagicMock,
+                               mock_terminate: MagicMock,
+                               mock_insert_tasks: MagicMock,
+                               mock_get_engine: MagicMock):
+        """
+        GIVEN a command whose task cannot be saved
+        WHEN it is submitted
+        THEN check that its started scheduler process is terminated again and the error is raised.
+        """
+        def start(task: Task) -> int:
+            task.pid, task.process_created = 123, 1609459200.0
+            return task.pid
+
+        mock_start_process.side_effect = start
+        mock_is_running.return_value = True
+        mock_insert_tasks.side_effect = OSError("disk I/O error")
+
+        with self.assertRaises(OSError):
+            main(["submit", "ping 123", "--name", "nostalgic_strauss"])
+
+        mock_terminate.assert_called_once_with(123, 1609459200.0)
+
+    @patch('tasklit.src.utils.processes.terminate_process')
+    @patch('tasklit.src.utils.processes.is_process_running')
+    @patch('tasklit.cli.read_tasks')
+    def test_kill(self,
+                  mock_read_tasks: MagicMock,
+                  mock_is_running: MagicMock,
+                  mock_terminate: MagicMock):
+        """
+        GIVEN a running task whose scheduler process exits while its job is terminated, and an unknown task
+        WHEN they are killed
+        THEN check that the running task is terminated and killing the unknown task fails.
+        """
+        mock_read_tasks.return_value = self.test_rows
+        mock_is_running.return_value = True
+        mock_terminate.side_effect = psutil.NoSuchProcess(123)
+
+        with redirect_stdout(io.StringIO()), patch('sys.stderr', new_callable=io.StringIO):
+            self.assertEqual(main(["kill", "nostalgic_strauss"]), 0)
+            self.assertEqual(main(["kill", "3"]), 1)
+
+        mock_terminate.assert_called_once_with(123, 1609459200.0)
+
+    @patch('tasklit.src.utils.processes.is_process_running')
+    @patch('tasklit.cli.read_tasks')
+    def test_logs(self,
+                  mock_read_tasks: MagicMock,
+                  mock_is_running: MagicMock):
+        """
+        GIVEN a task with stdout output
+        WHEN its last lines are printed and followed
+        THEN check that the output is printed once and following ends with the task.
+        """
+        mock_read_tasks.return_value = self.test_rows
+        mock_is_running.return_value = False
+        output = io.StringIO()
+
+        with tempfile.TemporaryDirectory() as temp_dir, patch('tasklit.cli.settings.BASE_LOG_DIR', temp_dir):
+            with open(os.path.join(temp_dir, "gifted_bach_stdout.txt"), "w") as log_file:
+                log_file.write("first\nsecond\nthird\n")
+
+            with redirect_stdout(output):
+                exit_code = main(["logs", "gifted_bach", "-n", "2", "-f"])
+
+        self.assertEqual(exit_code, 0)
+        self.assertEqual(output.getvalue(), "second\nthird\n")
+
+    @patch('tasklit.src.utils.control.send_daemon_request')
+    @patch('tasklit.cli.read_tasks')
+    def test_control_task(self,
+                          mock_read_tasks: MagicMock,
+                          mock_send_request: MagicMock):
+        """
+        GIVEN a running task
+        WHEN it is paused and run now through the scheduler daemon, and paused while the daemon is not running
+        THEN check that the requests are sent for its task ID and a missing daemon is reported.
+        """
+        mock_read_tasks.return_value = self.test_rows
+        mock_send_request.side_effect = [
+            {"task_id": 1, "job_name": "nostalgic_strauss", "state": "paused"},
+            {"task_id": 1, "job_name": "nostalgic_strauss", "state": "paused"},
+            FileNotFoundError(),
+        ]
+        output = io.StringIO()
+
+        with redirect_stdout(output), patch('sys.stderr', new_callable=io.StringIO) as error_output:
+            self.assertEqual(main(["pause", "nostalgic_strauss"]), 0)
+            self.assertEqual(main(["run-now", "1"]), 0)
+            self.assertEqual(main(["pause", "1"]), 1)
+
+        self.assertEqual(
+            output.getvalue(),
+            "Task nostalgic_strauss with task_id 1 is paused.\n"
+            "Task nostalgic_strauss with task_id 1 is paused and runs its job now.\n"
+        )
+        self.assertIn("tasklit daemon", error_output.getvalue())
+        self.assertEqual([call[0][0] for call in mock_send_request.call_args_list], ["pause", "run_now", "pause"])
+        mock_send_request.assert_called_with("pause", task_id=1)
+
+    @patch('tasklit.src.utils.api.serve_api')
+    @patch('tasklit.src.utils.api.get_api_token')
+    def test_api_print_token(self,
+                             mock_get_token: MagicMock,
+                             mock_serve_api: MagicMock):
+        """
+        GIVEN the token of the HTTP/JSON API
+        WHEN the API command is run to print it
+        THEN check that only the token is printed and the API is not served.
+        """
+        mock_get_token.return_value = "nostalgic"
+        output = io.StringIO()
+
+        with redirect_stdout(output):
+            self.assertEqual(main(["api", "--print-token"]), 0)
+
+        self.assertEqual(output.getvalue(), "nostalgic\n")
+        mock_serve_api.assert_not_called()
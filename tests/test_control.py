@@ -0,0 +1,144 @@
+import os
+import socket
+import tempfile
+import unittest
+
+from unittest.mock import patch
+
+from tasklit.src.utils.control import (
+    get_scheduler_socket_path,
+    receive_message,
+    remove_scheduler_socket,
+    send_message,
+    send_request,
+    ControlClient,
+    ControlError,
+    ControlServer
+)
+
+
+class ControlTestCase(unittest.TestCase):
+    """
+    Unittests for the control channel.
+    """
+
+    def setUp(self) -> None:
+        """
+        temp_dir: tempfile.TemporaryDirectory
+            Folder of the sample control sockets.
+        socket_path: str
+            Path of the sample control socket.
+        """
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.socket_path = os.path.join(self.temp_dir.name, "control.sock")
+
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+
+    @staticmethod
+    def handle(request: dict) -> dict:
+        if request["command"] == "fail":
+            raise ControlError("No task 1.")
+        if request["command"] == "crash":
+            raise KeyError("task_id")
+        return {"echo": request}
+
+    def test_message_framing(self):
+        """
+        GIVEN a connected socket pair
+        WHEN messages are sent, and a truncated and an oversized frame are received
+        THEN check that messages arrive whole and in order, and broken frames are rejected.
+        """
+        left, right = socket.socketpair()
+
+        with left, right:
+            send_message(left, {"command": "pause", "task_id": 1})
+            send_message(left, {"command": "state"})
+            self.assertEqual(receive_message(right), {"command": "pause", "task_id": 1})
+            self.assertEqual(receive_message(right), {"command": "state"})
+
+            left.sendall(b"\xff\xff\xff\xff")
+            with self.assertRaises(ValueError):
+                receive_message(right)
+
+            left.sendall(b"\x00\x00\x00\x10{}")
+            left.close()
+            with self.assertRaises(ConnectionError):
+                receive_message(right)
+
+            self.assertIsNone(receive_message(right))
+
+    def test_requests_over_unix_socket(self):
+        """
+        GIVEN a control server
+        WHEN several requests are sent over one connection, including failing ones
+        THEN check that each one is answered with its result or error and the connection stays usable.
+        """
+        server = ControlServer(self.socket_path, self.handle).start()
+
+        try:
+            self.assertEqual(os.stat(self.socket_path).st_mode & 0o777, 0o600)
+
+            with ControlClient(self.socket_path) as client:
+                self.assertEqual(client.request("pause", task_id=1), {"echo": {"command": "pause", "task_id": 1}})
+
+                with self.assertRaises(ControlError) as context:
+                    client.request("fail")
+                self.assertEqual(str(context.exception), "No task 1.")
+
+                with self.assertRaises(ControlError), patch('tasklit.src.utils.control.logger'):
+                    client.request("crash")
+
+                self.assertEqual(client.request("state"), {"echo": {"command": "state"}})
+        finally:
+            server.close()
+
+        self.assertFalse(os.path.exists(self.socket_path))
+        with self.assertRaises(OSError):
+            send_request(self.socket_path, "state")
+
+    def test_server_socket_ownership(self):
+        """
+        GIVEN a socket file left behind by a terminated server, and a running server
+        WHEN servers are started on the same path
+        THEN check that the stale socket is replaced, a running server is only replaced if asked to,
+            and closing the replaced server keeps the new server's socket.
+        """
+        stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stale.bind(self.socket_path)
+        stale.close()
+
+        first = ControlServer(self.socket_path, self.handle).start()
+
+        with self.assertRaises(OSError):
+            ControlServer(self.socket_path, self.handle).start()
+
+        second = ControlServer(self.socket_path, lambda request: "second", replace=True).start()
+        first.close()
+
+        try:
+            self.assertEqual(send_request(self.socket_path, "state"), "second")
+        finally:
+            second.close()
+
+    def test_remove_scheduler_socket(self):
+        """
+        GIVEN the socket of a running scheduler process and a socket left behind by a terminated one
+        WHEN their sockets are removed
+        THEN check that only the socket left behind is removed.
+        """
+        with patch('tasklit.src.utils.control.settings.CONTROL_SOCKET_DIR', self.temp_dir.name):
+            server = ControlServer(get_scheduler_socket_path("nostalgic_strauss"), self.handle).start()
+            stale_path = get_scheduler_socket_path("gifted_bach")
+            stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            stale.bind(stale_path)
+            stale.close()
+
+            try:
+                self.assertFalse(remove_scheduler_socket("nostalgic_strauss"))
+                self.assertTrue(remove_scheduler_socket("gifted_bach"))
+                self.assertFalse(remove_scheduler_socket("gifted_bach"))
+            finally:
+                server.close()
+
+        self.assertFalse(os.path.exists(stale_path))
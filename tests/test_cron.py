@@ -0,0 +1,150 @@
+import unittest
+
+from datetime import datetime
+from unittest.mock import (
+    patch,
+    MagicMock
+)
+
+from tasklit.src.utils.cron import (
+    is_cron_expression,
+    parse_crontab,
+    read_user_crontab,
+    CronSchedule
+)
+from tasklit.src.utils.timezones import get_timezone
+
+
+class CronTestCase(unittest.TestCase):
+    """
+    Unittests for cron expression schedules and crontab parsing.
+    """
+
+    def test_cron_schedule_fields(self):
+        """
+        GIVEN cron expressions with lists, ranges, steps and names
+        WHEN compiled into a 'CronSchedule'
+        THEN check that the bitsets contain the matching values.
+        """
+        cron_schedule = CronSchedule("*/20 8-10 1,15 jan-mar mon,fri")
+
+        self.assertEqual(cron_schedule.minutes, 1 << 0 | 1 << 20 | 1 << 40)
+        self.assertEqual(cron_schedule.hours, 1 << 8 | 1 << 9 | 1 << 10)
+        self.assertEqual(cron_schedule.days, 1 << 1 | 1 << 15)
+        self.assertEqual(cron_schedule.months, 1 << 1 | 1 << 2 | 1 << 3)
+        self.assertEqual(cron_schedule.weekdays, 1 << 1 | 1 << 5)
+        self.assertEqual(cron_schedule.seconds, 1)
+        self.assertEqual(CronSchedule("0 0 * * 7").weekdays, 1)
+
+    def test_next_fire_time(self):
+        """
+        GIVEN cron expressions with 5 and 6 fields and macros
+        WHEN the next fire time after a datetime is requested
+        THEN check that the correct datetime is returned.
+        """
+        after = datetime(2021, 1, 1, 12, 34, 56)
+
+        for expression, next_fire_time in [
+            ("*/15 * * * *", datetime(2021, 1, 1, 12, 45)),
+            ("0 9 * * mon-fri", datetime(2021, 1, 4, 9)),
+            ("30 2 1,15 * *", datetime(2021, 1, 15, 2, 30)),
+            ("*/10 * * * * *", datetime(2021, 1, 1, 12, 35)),
+            ("@yearly", datetime(2022, 1, 1)),
+            ("0 0 29 2 *", datetime(2024, 2, 29)),
+            # Day of month and day of week are combined with OR: 13th of the month or a Friday.
+            ("0 0 13 * fri", datetime(2021, 1, 8)),
+            # Unless either field starts with '*': every other day that is a Monday,
+            # the 13th of a month that is a Sunday, Tuesday, Thursday or Saturday.
+            ("0 0 */2 * mon", datetime(2021, 1, 11)),
+            ("0 0 13 * */2", datetime(2021, 2, 13)),
+        ]:
+            self.assertEqual(CronSchedule(expression).next_fire_time(after), next_fire_time, expression)
+
+    def test_next_fire_time_raises_error(self):
+        """
+        GIVEN a cron expression for a date that does not exist
+        WHEN the next fire time is requested
+        THEN check that ValueError is raised.
+        """
+        with self.assertRaises(ValueError):
+            CronSchedule("0 0 30 2 *").next_fire_time(datetime(2021, 1, 1))
+
+    def test_fire_times(self):
+        """
+        GIVEN a cron expression firing every 6 hours
+        WHEN fire times within a day are requested
+        THEN check that all fire times of the window are returned.
+        """
+        self.assertEqual(
+            CronSchedule("0 */6 * * *").fire_times(datetime(2021, 1, 1), datetime(2021, 1, 2)),
+            [datetime(2021, 1, 1, hour) for hour in (6, 12, 18)] + [datetime(2021, 1, 2)]
+        )
+
+    def test_fire_times_dst(self):
+        """
+        GIVEN a cron expression firing every 30 minutes and timezone-aware datetimes
+        WHEN fire times around the DST changes are requested
+        THEN check that skipped wall clock times do not fire twice and repeated ones fire once.
+        """
+        zone = get_timezone("Europe/Berlin")
+        cron_schedule = CronSchedule("*/30 * * * *")
+
+        self.assertEqual(
+            [fire_time.strftime("%H:%M%z") for fire_time in cron_schedule.fire_times(
+                datetime(2021, 3, 28, 1, 15, tzinfo=zone), datetime(2021, 3, 28, 3, 45, tzinfo=zone)
+            )],
+            ["01:30+0100", "03:00+0200", "03:30+0200"]
+        )
+        self.assertEqual(
+            [fire_time.strftime("%H:%M%z") for fire_time in cron_schedule.fire_times(
+                datetime(2021, 10, 31, 1, 45, tzinfo=zone), datetime(2021, 10, 31, 3, 15, tzinfo=zone)
+            )],
+            ["02:00+0200", "02:30+0200", "03:00+0100"]
+        )
+
+    def test_is_cron_expression(self):
+        """
+        GIVEN valid and invalid cron expressions
+        WHEN passed to the 'is_cron_expression' function
+        THEN check that only valid expressions are accepted.
+        """
+        self.assertTrue(is_cron_expression("0 0 * * sun"))
+        self.assertTrue(is_cron_expression("@hourly"))
+
+        for expression in ["* * *", "60 * * * *", "* 24 * * *", "* * 0 * *", "*/0 * * * *", "5-1 * * * *"]:
+            self.assertFalse(is_cron_expression(expression), expression)
+
+    def test_parse_crontab(self):
+        """
+        GIVEN the content of a crontab
+        WHEN passed to the 'parse_crontab' function
+        THEN check that schedule lines are returned and invalid lines are reported.
+        """
+        self.assertEqual(
+            parse_crontab("MAILTO=me\n# comment\n0 * * * * ping  123\t-c 1\n@hourly date +\\%H\n"),
+            [("0 * * * *", "ping 123 -c 1"), ("@hourly", "date +%H")]
+        )
+
+        for content in ["0 * * * ping\n", "0 * * * * date +%H\n", "@reboot ping 123\n"]:
+            with self.assertRaises(ValueError):
+                parse_crontab(content)
+
+        for command in ["ping 123 | tee log", "ping 123 > log 2>&1", "cd /tmp && ping 123", "ping 123; ping 456",
+                        "echo 'ping 123'", "ping $HOST", "ls *.log", "~/ping.sh", "HOST=123 ping"]:
+            with self.assertRaisesRegex(ValueError, "shell syntax"):
+                parse_crontab(f"@hourly {command}\n")
+
+    @patch('tasklit.src.utils.cron.subprocess.run')
+    def test_read_user_crontab(self,
+                               mock_run: MagicMock):
+        """
+        GIVEN users with and without crontab
+        WHEN the 'read_user_crontab' function is called
+        THEN check that the crontab content or an empty string is returned.
+        """
+        mock_run.return_value.returncode = 0
+        mock_run.return_value.stdout = "@hourly ping 123\n"
+        self.assertEqual(read_user_crontab(), "@hourly ping 123\n")
+
+        mock_run.return_value.returncode = 1
+        self.assertEqual(read_user_crontab(), "")
@@ -0,0 +1,305 @@
+import os
+import tempfile
+import unittest
+
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from sqlalchemy import create_engine, inspect
+
+from tasklit.src.utils.database import (
+    delete_processes,
+    fetch_processes,
+    fetch_queued_processes,
+    get_sql_engine,
+    initialize_database,
+    insert_process,
+    insert_tasks,
+    prune_process_changes,
+    processes_table,
+    ProcessChangeCache,
+    update_task_processes
+)
+from tasklit.src.utils.tasks import Schedule, Task
+
+
+class DatabaseTestCase(unittest.TestCase):
+    """
+    Unittests for the processes table schema and queries.
+    """
+
+    def setUp(self) -> None:
+        """
+        sql_engine: sqlalchemy engine
+            Engine for an in-memory sample DB.
+        record: dict
+            Sample processes table row.
+        """
+        self.sql_engine = create_engine("sqlite://")
+        self.record = {
+            "task_id": 1,
+            "created": datetime(2021, 1, 1),
+            "process id": 123,
+            "job name": "nostalgic_strauss",
+            "command": "ping 123",
+        }
+
+    def tearDown(self) -> None:
+        self.sql_engine.dispose()
+
+    def test_initialize_database(self):
+        """
+        GIVEN an empty DB
+        WHEN passed to the 'initialize_database' function
+        THEN check that the processes table is created with a primary key and indexes.
+        """
+        initialize_database(self.sql_engine)
+
+        inspector = inspect(self.sql_engine)
+        self.assertEqual(inspector.get_pk_constraint("processes")["constrained_columns"], ["task_id"])
+        self.assertEqual(
+            sorted(index["column_names"][0] for index in inspector.get_indexes("processes")),
+            ["job name", "process id"]
+        )
+
+    def test_initialize_database_migrates_legacy_table(self):
+        """
+        GIVEN a DB with a processes table created by pandas
+        WHEN passed to the 'initialize_database' function
+        THEN check that the table is rebuilt with a primary key and existing rows are kept.
+        """
+        legacy_df = pd.DataFrame({key: [value] for key, value in self.record.items()})
+        legacy_df["last update"] = None
+        legacy_df["running"] = None
+        legacy_df.to_sql("processes", con=self.sql_engine, index=False)
+
+        initialize_database(self.sql_engine)
+
+        self.assertEqual(
+            inspect(self.sql_engine).get_pk_constraint("processes")["constrained_columns"],
+            ["task_id"]
+        )
+        self.assertEqual(
+            [dict(row._mapping) for row in fetch_processes(self.sql_engine)],
+            [dict(dict.fromkeys(processes_table.columns.keys()), **self.record)]
+        )
+
+    def test_initialize_database_migrates_legacy_table_with_duplicate_task_ids(self):
+        """
+        GIVEN a DB with a processes table created by pandas, in which two tasks share a task ID
+        WHEN passed to the 'initialize_database' function
+        THEN check that all rows are kept, the first row keeps the task ID and the other one is numbered
+            after the existing tasks.
+        """
+        legacy_df = pd.DataFrame([self.record, dict(self.record, task_id=3), dict(self.record, **{"job name": "copy"})])
+        legacy_df.to_sql("processes", con=self.sql_engine, index=False)
+
+        initialize_database(self.sql_engine)
+
+        self.assertEqual(
+            [(row["task_id"], row["job name"]) for row in fetch_processes(self.sql_engine)],
+            [(1, self.record["job name"]), (3, self.record["job name"]), (4, "copy")]
+        )
+
+    def test_insert_fetch_and_delete_processes(self):
+        """
+        GIVEN process information rows
+        WHEN they are inserted, fetched and deleted
+        THEN check that the processes table reflects every change.
+        """
+        initialize_database(self.sql_engine)
+        insert_process(self.record, self.sql_engine)
+        insert_process(dict(self.record, task_id=2), self.sql_engine)
+
+        self.assertEqual([row["task_id"] for row in fetch_processes(self.sql_engine)], [1, 2])
+
+        delete_processes([1], self.sql_engine)
+
+        self.assertEqual([row["task_id"] for row in fetch_processes(self.sql_engine)], [2])
+
+    def test_insert_process_allocates_task_ids(self):
+        """
+        GIVEN process information rows without task ID
+        WHEN they are inserted, also after the latest task has been deleted
+        THEN check that the DB allocates new, never reused task IDs.
+        """
+        initialize_database(self.sql_engine)
+        record = {key: value for key, value in self.record.items() if key != "task_id"}
+
+        self.assertEqual(insert_process(record, self.sql_engine), 1)
+        self.assertEqual(insert_process(record, self.sql_engine), 2)
+
+        delete_processes([2], self.sql_engine)
+
+        self.assertEqual(insert_process(record, self.sql_engine), 3)
+
+    def test_insert_tasks(self):
+        """
+        GIVEN a batch of tasks
+        WHEN passed to the 'insert_tasks' function
+        THEN check that all tasks are saved, read back equal and get their allocated task IDs in order.
+        """
+        initialize_database(self.sql_engine)
+        schedule = Schedule("Interval", datetime(2021, 1, 1), timedelta(minutes=5), timezone="UTC")
+        tasks = [
+            Task(f"ping {index}", "sleepy_strauss", schedule, pid=100 + index, created=datetime(2021, 1, 1))
+            for index in range(3)
+        ]
+
+        self.assertEqual(insert_tasks(tasks, self.sql_engine), [1, 2, 3])
+        self.assertEqual([task.task_id for task in tasks], [1, 2, 3])
+        self.assertEqual([Task.from_record(row) for row in fetch_processes(self.sql_engine)], tasks)
+
+    def test_fetch_and_update_queued_processes(self):
+        """
+        GIVEN saved tasks without scheduler process, one of which is removed
+        WHEN the queued tasks are read and their started processes are saved
+        THEN check that only tasks without process are read, and the removed task and tasks started
+            by another task starter are reported.
+        """
+        initialize_database(self.sql_engine)
+        schedule = Schedule("Once", datetime(2021, 1, 1), timedelta(days=1), timezone="UTC")
+        tasks = [Task(f"ping {index}", f"queued_strauss_{index}", schedule) for index in range(3)]
+        insert_tasks(tasks + [Task("ping 9", "started_strauss", schedule, pid=99)], self.sql_engine)
+
+        queued = [Task.from_record(row) for row in fetch_queued_processes(2, self.sql_engine)]
+        self.assertEqual([task.task_id for task in queued], [1, 2])
+        self.assertEqual([row["task_id"] for row in fetch_queued_processes(2, self.sql_engine, [1])], [2, 3])
+
+        delete_processes([2], self.sql_engine)
+        for task in queued:
+            task.pid, task.process_created = 100 + task.task_id, 1609459200.0
+
+        self.assertEqual(update_task_processes(queued, self.sql_engine), [2])
+        self.assertEqual([row["task_id"] for row in fetch_queued_processes(10, self.sql_engine)], [3])
+        self.assertEqual(fetch_processes(self.sql_engine)[0]["process id"], 101)
+
+        queued[0].pid = 201
+        self.assertEqual(update_task_processes(queued[:1], self.sql_engine), [1])
+        self.assertEqual(fetch_processes(self.sql_engine)[0]["process id"], 101)
+
+    def test_initialize_database_migrates_table_without_autoincrement(self):
+        """
+        GIVEN a DB with a processes table whose task IDs are not allocated with AUTOINCREMENT
+        WHEN passed to the 'initialize_database' function
+        THEN check that the table is rebuilt and new task IDs follow the existing ones.
+        """
+        with self.sql_engine.begin() as connection:
+            connection.execute(
+                'CREATE TABLE processes (task_id INTEGER PRIMARY KEY, created DATETIME NOT NULL, '
+                '"process id" INTEGER, "job name" VARCHAR NOT NULL, command VARCHAR NOT NULL)'
+            )
+            connection.execute('CREATE INDEX ix_processes_job_name ON processes ("job name")')
+        insert_process(dict(self.record, task_id=5), self.sql_engine)
+
+        initialize_database(self.sql_engine)
+        delete_processes([5], self.sql_engine)
+
+        self.assertEqual(
+            insert_process({key: value for key, value in self.record.items() if key != "task_id"}, self.sql_engine),
+            6
+        )
+
+    def test_initialize_database_adds_missing_columns(self):
+        """
+        GIVEN a DB with a processes table that lacks columns added in later versions
+        WHEN passed to the 'initialize_database' function
+        THEN check that the missing columns are added and existing rows are kept.
+        """
+        with self.sql_engine.begin() as connection:
+            connection.execute(
+                'CREATE TABLE processes (task_id INTEGER PRIMARY KEY AUTOINCREMENT, created DATETIME NOT NULL, '
+                '"process id" INTEGER, "job name" VARCHAR NOT NULL, command VARCHAR NOT NULL)'
+            )
+        insert_process(self.record, self.sql_engine)
+
+        initialize_database(self.sql_engine)
+
+        self.assertIsNone(fetch_processes(self.sql_engine)[0]["spec hash"])
+
+    def test_get_sql_engine(self):
+        """
+        GIVEN a path to a DB file
+        WHEN passed to the 'get_sql_engine' function multiple times
+        THEN check that one shared engine with WAL journal and busy timeout is returned.
+        """
+        with tempfile.TemporaryDirectory() as temp_dir:
+            engine_path = f"sqlite:///{os.path.join(temp_dir, 'process_data.db')}"
+            sql_engine = get_sql_engine(engine_path)
+
+            self.assertIs(get_sql_engine(engine_path), sql_engine)
+
+            with sql_engine.connect() as connection:
+                self.assertEqual(connection.exec_driver_sql("PRAGMA journal_mode").scalar(), "wal")
+                self.assertEqual(connection.exec_driver_sql("PRAGMA busy_timeout").scalar(), 30000)
+                self.assertTrue(inspect(connection).has_table("processes"))
+
+            sql_engine.dispose()
+            get_sql_engine.cache_clear()
+
+    def get_change_task_ids(self):
+        with self.sql_engine.connect() as connection:
+            return [row[0] for row in connection.execute("SELECT task_id FROM process_changes ORDER BY version")]
+
+    def test_change_feed_triggers(self):
+        """
+        GIVEN an initialized DB
+        WHEN tasks are inserted, updated and deleted
+        THEN check that every change is recorded in the change feed.
+        """
+        initialize_database(self.sql_engine)
+        insert_process(self.record, self.sql_engine)
+        insert_process(dict(self.record, task_id=2), self.sql_engine)
+
+        with self.sql_engine.begin() as connection:
+            connection.execute("UPDATE processes SET command = 'ping 456' WHERE task_id = 2")
+
+        delete_processes([1], self.sql_engine)
+
+        self.assertEqual(self.get_change_task_ids(), [1, 2, 2, 1])
+
+    def test_process_change_cache_refresh(self):
+        """
+        GIVEN a processes table change cache
+        WHEN the table is changed between refreshes
+        THEN check that the cache reflects the table and only reports actual changes.
+        """
+        initialize_database(self.sql_engine)
+        insert_process(self.record, self.sql_engine)
+        cache = ProcessChangeCache(self.sql_engine)
+
+        self.assertTrue(cache.refresh())
+        self.assertFalse(cache.refresh())
+        self.assertEqual([row["task_id"] for row in cache.rows], [1])
+
+        insert_process(dict(self.record, task_id=2, command="ping 456"), self.sql_engine)
+        delete_processes([1], self.sql_engine)
+
+        self.assertTrue(cache.refresh())
+
+        self.assertEqual([(row["task_id"], row["command"]) for row in cache.rows], [(2, "ping 456")])
+        self.assertEqual(list(cache.rows_by_id), [2])
+        self.assertEqual(cache.version, 3)
+
+    def test_process_change_cache_reloads_after_pruning(self):
+        """
+        GIVEN a processes table change cache that fell behind the pruned change feed
+        WHEN it is refreshed
+        THEN check that the whole table is read again.
+        """
+        initialize_database(self.sql_engine)
+        insert_process(self.record, self.sql_engine)
+        cache = ProcessChangeCache(self.sql_engine)
+        cache.refresh()
+
+        for task_id in range(2, 5):
+            insert_process(dict(self.record, task_id=task_id), self.sql_engine)
+        delete_processes([1], self.sql_engine)
+
+        self.assertEqual(prune_process_changes(1, 10, self.sql_engine), 4)
+        self.assertEqual(self.get_change_task_ids(), [1])
+
+        self.assertTrue(cache.refresh())
+        self.assertEqual([row["task_id"] for row in cache.rows], [2, 3, 4])
+        self.assertEqual(cache.version, 5)
@@ -1,40 +1,31 @@
+import tempfile
 import unittest
 
 from datetime import datetime, timedelta
 from unittest.mock import (
-    create_autospec,
     mock_open,
     patch,
-    MagicMock,
-    call
+    MagicMock
 )
 
 import pandas as pd
-import psutil
 
 from pandas.testing import assert_frame_equal
 from sqlalchemy.exc import OperationalError
 from streamlit.script_runner import RerunException
 
 from tasklit.src.utils.helpers import (
-    get_task_id,
     check_last_process_info_update,
     read_log,
-    terminate_child_processes,
-    terminate_process,
-    match_weekday,
     refresh_app,
-    launch_command_process,
+    show_refresh_message,
     display_process_log_file,
     update_df_process_last_update_info,
     get_process_df,
     update_process_status_info,
+    get_process_status_snapshot,
+    get_log_update_times,
     submit_job,
-    start_scheduler_process,
-    save_df_to_sql,
-    create_process_info_dataframe,
-    write_job_execution_log,
-    process_should_execute,
     app_exception_handler,
     create_folder_if_not_exists,
     test_command_run,
@@ -43,13 +34,12 @@ from tasklit.src.utils.helpers import (
     get_execution_interval_information,
     calculate_execution_start,
     get_command_execution_start,
-    match_duration,
-    schedule_process_job,
-    execute_job,
+    select_cron_expression,
     get_interval_duration
 )
 from tasklit.src.utils.job_names import get_job_name
-from tasklit.settings.consts import WEEK_DAYS, FORMAT, DEFAULT_LOG_DIR_OUT
+from tasklit.src.utils.tasks import Schedule, Task
+from tasklit.settings.consts import FORMAT, DEFAULT_LOG_DIR_OUT, PROCESS_STATUS_ATTRS
 import os
 
 if os.name == 'nt':
@@ -95,10 +85,13 @@ class UtilFunctionsTestCase(unittest.TestCase):
                 "task_id": cls.task_ids,
                 "created": [None],
                 "process id": [None],
+                "process created": [None],
                 "job name": [cls.test_job_name],
                 "command": [None],
                 "last update": [None],
                 "running": [None],
+                "cpu %": [None],
+                "memory (MB)": [None],
             }
         )
 
@@ -114,14 +107,6 @@ class UtilFunctionsTestCase(unittest.TestCase):
             raise ValueError("Exception was raised.")
         return None
 
-    def test_get_task_id(self):
-        """
-        GIVEN a dataframe with process information and related task IDs
-        WHEN passed to the 'get_task_id' function
-        THEN check that returned ID == the largest ID in column + 1.
-        """
-        self.assertEqual(get_task_id(self.test_df), max(self.task_ids) + 1)
-
     @patch('os.path.getmtime')
     def test_check_last_process_info_update(self,
                                             mock_getmtime: MagicMock):
@@ -155,6 +140,53 @@ class UtilFunctionsTestCase(unittest.TestCase):
             None
         )
 
+    @patch.dict('tasklit.src.utils.helpers._log_update_cache', clear=True)
+    def test_get_log_update_times(self):
+        """
+        GIVEN a log folder with job log files
+        WHEN passed to the 'get_log_update_times' function repeatedly
+        THEN check that the folder is only read again once it has changed.
+        """
+        with tempfile.TemporaryDirectory() as log_dir:
+            log_filepath = os.path.join(log_dir, f"{self.test_job_name}.txt")
+            for filepath in [log_filepath, os.path.join(log_dir, f"{self.test_job_name}_stdout.txt")]:
+                with open(filepath, "w") as file:
+                    file.write("run\n")
+            os.utime(log_filepath, (1609459200, 1609459200))
+            os.utime(log_dir, (1609459200, 1609459200))
+
+            with patch('tasklit.src.utils.helpers.os.scandir', wraps=os.scandir) as mock_scandir:
+                self.assertEqual(
+                    get_log_update_times(log_dir),
+                    {self.test_job_name: datetime.fromtimestamp(1609459200)}
+                )
+                get_log_update_times(log_dir)
+                mock_scandir.assert_called_once_with(log_dir)
+
+                os.utime(log_filepath, (1609459260, 1609459260))
+                os.utime(log_dir, (1609459260, 1609459260))
+                self.assertEqual(
+                    get_log_update_times(log_dir)[self.test_job_name],
+                    datetime.fromtimestamp(1609459260)
+                )
+                self.assertEqual(mock_scandir.call_count, 2)
+
+    @patch.dict('tasklit.src.utils.helpers._log_update_cache', clear=True)
+    def test_get_log_update_times_recently_changed_folder(self):
+        """
+        GIVEN a log folder that has just changed
+        WHEN passed to the 'get_log_update_times' function repeatedly
+        THEN check that the folder is read every time, as it may change again unnoticed.
+        """
+        with tempfile.TemporaryDirectory() as log_dir:
+            with patch('tasklit.src.utils.helpers.os.scandir', wraps=os.scandir) as mock_scandir:
+                get_log_update_times(log_dir)
+                get_log_update_times(log_dir)
+
+                self.assertEqual(mock_scandir.call_count, 2)
+
+        self.assertEqual(get_log_update_times(log_dir), {})
+
     def test_read_log_file_exists(self):
         """
         GIVEN a path to an existing log file
@@ -176,243 +208,42 @@ class UtilFunctionsTestCase(unittest.TestCase):
             with self.assertRaises(FileNotFoundError):
                 self.assertEqual(read_log(self.test_log_filename), self.log_readlines_output)
 
-    @patch('psutil.wait_procs')
-    def test_terminate_child_processes_processes_found(self,
-                                                       mock_wait_procs: MagicMock):
-        """
-        GIVEN a parent process object that has spawned child processes
-        WHEN passed to the 'terminate_child_processes' function
-        THEN check that related process termination methods are called.
-        """
-        parent_process = MagicMock()
-        parent_process.children.return_value = [
-            MagicMock(
-                name="Child Proc 1",
-                terminate=lambda: True
-            ),
-            MagicMock(
-                name="Child Proc 2",
-                terminate=lambda: True
-            )
-        ]
-        mock_wait_procs.return_value = ([], [
-            MagicMock(return_value=lambda: True),
-            MagicMock(return_value=lambda: True)
-        ])
-
-        # Check that process.terminate() is being called on child processes
-        for child_process in parent_process.children.return_value:
-            mock_terminate = create_autospec(child_process.teminate, return_value=True)
-
-            terminate_child_processes(parent_process)
-
-            mock_wait_procs.assert_called()
-            mock_terminate.assert_called()
-
-        # Check that process.terminate() is being called on any child processes
-        # that might have been left alive.
-        for alive_process in mock_wait_procs.return_value[1]:
-            mock_terminate = create_autospec(alive_process.terminate, return_value=True)
-
-            terminate_child_processes(parent_process)
-
-            mock_wait_procs.assert_called()
-            mock_terminate.assert_called()
-
-    @patch('psutil.wait_procs')
-    def test_terminate_child_processes_processes_not_found(self,
-                                                           mock_wait_procs: MagicMock):
-        """
-        GIVEN a parent process object that has NOT spawned child processes
-        WHEN passed to the 'terminate_child_processes' function
-        THEN check that related process termination methods are NOT called.
-        """
-        parent_process = MagicMock()
-        parent_process.children.return_value = []
-        mock_wait_procs.return_value = ([], [])
-
-        # Check that process.terminate() is not called
-        for child_process in parent_process.children.return_value:
-            mock_terminate = create_autospec(child_process.teminate, return_value=True)
-
-            terminate_child_processes(parent_process)
-
-            mock_wait_procs.assert_not_called()
-            mock_terminate.assert_not_called()
-
-        # Check that process.terminate() is not called
-        for alive_process in mock_wait_procs.return_value[1]:
-            mock_terminate = create_autospec(alive_process.terminate, return_value=True)
-
-            terminate_child_processes(parent_process)
-
-            mock_wait_procs.assert_not_called()
-            mock_terminate.assert_not_called()
-
-    @patch('tasklit.src.utils.helpers.terminate_child_processes')
-    def test_terminate_process_with_child_processes(self,
-                                                    mock_terminate_child_procs: MagicMock):
-        """
-        GIVEN an ID of an existing process
-        WHEN passed to the 'terminate_process' function
-        THEN check that related process termination methods have been called.
-        """
-        with patch('tasklit.src.utils.helpers.psutil.Process') as mock_psutil_process:
-            mock_psutil_process.return_value = MagicMock()
-            mock_terminate_child_procs.return_value = True
-            mock_psutil_process.terminate.return_value = lambda: True
-            mock_terminate = create_autospec(mock_psutil_process.terminate, return_value=True)
-
-            mock_psutil_process.kill.return_value = lambda: True
-            mock_kill = create_autospec(mock_psutil_process.kill, return_value=True)
-
-            terminate_process(self.test_process_id)
-
-            mock_terminate_child_procs.assert_called()
-            mock_terminate.assert_called()
-            mock_kill.assert_called()
-
-    def test_terminate_process_raises_error(self):
-        """
-        GIVEN an ID of a test process that does not exist
-        WHEN passed to the 'terminate_process' function
-        THEN check that psutil.NoSuchProcess error is raised.
-        """
-        with patch('tasklit.src.utils.helpers.psutil.Process') as mock_psutil_process:
-            mock_psutil_process.side_effect = psutil.NoSuchProcess("Cannot find the process.")
-            with self.assertRaises(psutil.NoSuchProcess):
-                terminate_process(self.test_process_id)
-
-    def test_match_weekday_day_matched(self):
-        """
-        GIVEN a number corresponding to a day of the week and a list of select weekdays
-        WHEN passed to the 'function_should_execute' function
-        THEN check that correct decision is made to execute a function if the days are mapped.
-        """
-        with patch('tasklit.src.utils.helpers.datetime') as mock_datetime:
-            for day_number, day in WEEK_DAYS.items():
-                mock_datetime.now.weekday.return_value = day_number
-                self.assertEqual(match_weekday(
-                    mock_datetime.now,
-                    list(WEEK_DAYS.values())
-                ), True)
-
-    def test_match_weekday_no_weekdays_provided(self):
-        """
-        GIVEN only a number representing today's date
-        WHEN passed to the 'function_should_execute' function
-        THEN check that correct decision is made to execute a function.
-        """
-        with patch('tasklit.src.utils.helpers.datetime') as mock_datetime:
-            self.assertEqual(
-                match_weekday(
-                    mock_datetime.now,
-                    []
-                ), True)
-
-    def test_match_weekday_no_execution(self):
-        """
-        GIVEN a number corresponding to a day of the week and a list of select weekdays
-        WHEN passed to the 'function_should_execute' function
-        THEN check that correct decision is made to NOT execute a function if the days cannot be mapped.
-        """
-        with patch('tasklit.src.utils.helpers.datetime') as mock_datetime:
-            for day_number, day in WEEK_DAYS.items():
-                mock_datetime.now.weekday.return_value = day_number
-                self.assertEqual(
-                    match_weekday(
-                        mock_datetime.now,
-                        ["Uknown Day"]
-                    ), False)
-
-    def test_match_weekday_raises_error(self):
-        """
-        GIVEN a number corresponding to a day of the week and a list of select weekdays
-        WHEN passed to the 'function_should_execute' function
-        THEN check that an error is raised if the number is missing in the app settings day mapping.
-        """
-        with patch('tasklit.src.utils.helpers.datetime') as mock_datetime:
-            for day_number, day in WEEK_DAYS.items():
-                mock_datetime.now.weekday.return_value = day_number
-
-                with patch('tasklit.settings.consts.WEEK_DAYS') as mocked_weekdays:
-                    mocked_weekdays.__getitem__.side_effect = KeyError("Failed to map the day.")
-
-                    with self.assertRaises(KeyError):
-                        match_weekday(
-                            mock_datetime.now,
-                            list(WEEK_DAYS.values())
-                        )
-
-    @patch('time.sleep')
-    @patch('tasklit.src.utils.helpers.st.empty')
+    @patch('tasklit.src.utils.helpers.st.session_state', new_callable=dict)
     @patch('tasklit.src.utils.helpers.st.script_request_queue.RerunData')
     def test_refresh_app(self,
                          mock_rerun_data: MagicMock,
-                         mock_st_empty: MagicMock,
-                         mock_sleep: MagicMock):
+                         mock_session_state: dict):
         """
-        GIVEN an optional amount of time to wait in seconds
+        GIVEN a success message
         WHEN passed to the 'refresh_app' function
-        THEN check that Streamlit methods for writing log output and refreshing the app are called.
+        THEN check that the app is refreshed right away and the message is displayed once afterwards.
         """
-        mock_st_empty.write.return_value = True
-        mock_rerun_data.return_value = True
-
         with self.assertRaises(RerunException):
-            refresh_app(5)
+            refresh_app("Submitted task.")
 
-            mock_st_empty.empty.write.assert_called()
-            mock_rerun_data.assert_called()
-            mock_sleep.assert_called()
+        mock_rerun_data.assert_called()
 
-    @patch('time.sleep')
-    @patch('tasklit.src.utils.helpers.st.empty')
+        with patch('tasklit.src.utils.helpers.st.success') as mock_st_success:
+            show_refresh_message()
+            show_refresh_message()
+
+            mock_st_success.assert_called_once_with("Submitted task.")
+
+    @patch('tasklit.src.utils.helpers.st.session_state', new_callable=dict)
     @patch('tasklit.src.utils.helpers.st.script_request_queue.RerunData')
     def test_refresh_app_raises_error(self,
                                       mock_rerun_data: MagicMock,
-                                      mock_st_empty: MagicMock,
-                                      mock_sleep: MagicMock):
+                                      mock_session_state: dict):
         """
-        GIVEN no time to wait in seconds
+        GIVEN no success message
         WHEN passed to the 'refresh_app' function
         THEN check that only Streamlit methods for refreshing the app are called.
         """
         with self.assertRaises(RerunException):
             refresh_app()
 
-            mock_st_empty.assert_not_called()
-            mock_sleep.assert_not_called()
-            mock_rerun_data.assert_called()
-
-    @patch('tasklit.src.utils.helpers.Popen')
-    def test_launch_command_process(self,
-                                    mock_popen: MagicMock):
-        """
-        GIVEN a command to execute and a respective job name
-        WHEN passed to the 'run_job' function
-        THEN check that correct object type is returned.
-        """
-        mock_popen.return_value = MagicMock()
-        with patch('builtins.open', mock_open(read_data=self.test_command)) as mock_file:
-            self.assertEqual(
-                launch_command_process(self.test_command, self.test_log_filename),
-                mock_popen.return_value
-            )
-            mock_file.assert_called_with(self.test_log_filename, 'w')
-
-    @patch('tasklit.src.utils.helpers.Popen')
-    def test_launch_command_process_raises_error(self,
-                                                 mock_popen: MagicMock):
-        """
-        GIVEN a command to execute and a respective job name
-        WHEN passed to the 'run_job' function
-        THEN check that an error is raised if log file creation fails.
-        """
-        mock_popen.side_effect = OSError("File creation failed.")
-        with patch('builtins.open', mock_open(read_data=self.test_command)):
-            with self.assertRaises(OSError):
-                launch_command_process(self.test_command, self.test_log_filename)
+        mock_rerun_data.assert_called()
+        self.assertEqual(mock_session_state, {})
 
     @patch('tasklit.src.utils.helpers.read_log')
     def test_display_process_log_file_exists(self,
@@ -444,312 +275,201 @@ class UtilFunctionsTestCase(unittest.TestCase):
         mock_read_log.assert_called()
         self.assertEqual(result, f"Waiting for {self.test_log_filename} to be created...")
 
-    @patch('tasklit.src.utils.helpers.check_last_process_info_update')
+    @patch('tasklit.src.utils.helpers.get_log_update_times')
     def test_update_df_process_last_update_info(self,
-                                                mock_check_update: MagicMock):
+                                                mock_get_update_times: MagicMock):
         """
         GIVEN a pandas dataframe with a 'last update' column
         WHEN passed to the 'update_df_process_last_update_info' function
         THEN check that 'last update' column is correctly populated.
         """
         last_update_date = "2021-01-01"
-        mock_check_update.return_value = last_update_date
+        mock_get_update_times.return_value = {self.test_job_name: last_update_date}
 
         update_df_process_last_update_info(self.test_df)
 
         self.assertEqual(self.test_df.at[0, "last update"], last_update_date)
 
-    @patch('tasklit.src.utils.helpers.pd.read_sql_table')
+    @patch.dict('tasklit.src.utils.helpers._process_df_cache', clear=True)
+    @patch('tasklit.src.utils.helpers.database.get_process_cache')
     def test_get_process_df_no_error_raised(self,
-                                            mock_pd_read_sql_table: MagicMock):
+                                            mock_get_process_cache: MagicMock):
         """
         GIVEN an sql engine for reading an SQL file
         WHEN passed to the 'get_process_df' function
         THEN check that a pandas dataframe with all the rows is returned.
         """
-        mock_pd_read_sql_table.return_value = self.test_df
+        mock_get_process_cache.return_value.version = 1
+        mock_get_process_cache.return_value.rows = [
+            (1, None, None, None, self.test_job_name, None, None, None, None, None, None, None, None, None)
+        ]
 
         assert_frame_equal(get_process_df("sql_engine"), self.test_df)
+        mock_get_process_cache.assert_called_with("sql_engine")
+        mock_get_process_cache.return_value.refresh.assert_called_once()
 
-    @patch('tasklit.src.utils.helpers.pd.read_sql_table')
+    @patch.dict('tasklit.src.utils.helpers._process_df_cache', clear=True)
+    @patch('tasklit.src.utils.helpers.pd.DataFrame')
+    @patch('tasklit.src.utils.helpers.database.get_process_cache')
+    def test_get_process_df_reuses_unchanged_df(self,
+                                                mock_get_process_cache: MagicMock,
+                                                mock_dataframe: MagicMock):
+        """
+        GIVEN an sql engine for reading an SQL file
+        WHEN passed to the 'get_process_df' function repeatedly
+        THEN check that the dataframe is only rebuilt if the processes table has changed.
+        """
+        mock_get_process_cache.return_value.version = 1
+        mock_get_process_cache.return_value.rows = []
+
+        get_process_df("sql_engine")
+        get_process_df("sql_engine")
+        self.assertEqual(mock_dataframe.call_count, 1)
+
+        mock_get_process_cache.return_value.version = 2
+        get_process_df("sql_engine")
+        self.assertEqual(mock_dataframe.call_count, 2)
+
+    @patch.dict('tasklit.src.utils.helpers._process_df_cache', clear=True)
+    @patch('tasklit.src.utils.helpers.database.get_process_cache')
     def test_get_process_df_returns_empty_df(self,
-                                             mock_pd_read_sql_table: MagicMock):
+                                             mock_get_process_cache: MagicMock):
         """
         GIVEN an sql engine for reading an SQL file
         WHEN passed to the 'get_process_df' function
-        THEN check that - if the file is missing - an empty dataframe is returned.
+        THEN check that - if no processes have been submitted - an empty dataframe is returned.
         """
-        mock_pd_read_sql_table.side_effect = ValueError("Dataframe file is missing.")
-        assert_frame_equal(get_process_df("sql_engine"), pd.DataFrame(FORMAT))
+        mock_get_process_cache.return_value.version = 0
+        mock_get_process_cache.return_value.rows = []
 
-    @patch('tasklit.src.utils.helpers.pd.read_sql_table')
+        df = get_process_df("sql_engine")
+
+        self.assertEqual(list(df.columns), list(FORMAT))
+        self.assertEqual(len(df), 0)
+
+    @patch.dict('tasklit.src.utils.helpers._process_df_cache', clear=True)
+    @patch('tasklit.src.utils.helpers.database.get_process_cache')
     def test_get_process_df_raises_error(self,
-                                         mock_pd_read_sql_table: MagicMock):
+                                         mock_get_process_cache: MagicMock):
         """
         GIVEN an sql engine for reading an SQL file with a pandas DF
         WHEN passed to the 'get_process_df' function
-        THEN check that OperationalError is raised if the file is missing.
+        THEN check that OperationalError is raised if the file cannot be read.
         """
-        mock_pd_read_sql_table.side_effect = OperationalError("Couldn't process DF.", {}, "")
+        mock_get_process_cache.return_value.refresh.side_effect = OperationalError("Couldn't process DF.", {}, "")
         with self.assertRaises(OperationalError):
             get_process_df("sql_engine")
 
-    @patch.object(psutil.Process, "status")
-    @patch('tasklit.src.utils.helpers.psutil.pid_exists')
+    @staticmethod
+    def get_process_info(pid: int, status: str) -> MagicMock:
+        process = MagicMock()
+        process.info = {
+            "pid": pid,
+            "status": status,
+            "create_time": 1609459200.0,
+            "cpu_percent": 1.5,
+            "memory_info": MagicMock(rss=8 * 2 ** 20),
+        }
+        return process
+
+    @patch('tasklit.src.utils.helpers.psutil.process_iter')
+    def test_get_process_status_snapshot(self,
+                                         mock_process_iter: MagicMock):
+        """
+        GIVEN the processes of the system
+        WHEN the 'get_process_status_snapshot' function is called
+        THEN check that their status is read in one pass and returned as a dataframe.
+        """
+        mock_process_iter.return_value = [self.get_process_info(1, "sleeping"), self.get_process_info(2, "running")]
+
+        snapshot = get_process_status_snapshot()
+
+        mock_process_iter.assert_called_once_with(PROCESS_STATUS_ATTRS, ad_value=None)
+        self.assertEqual(list(snapshot.index), [1, 2])
+        self.assertEqual(list(snapshot["status"]), ["sleeping", "running"])
+        self.assertEqual(list(snapshot["create time"]), [1609459200.0, 1609459200.0])
+
+    @patch('tasklit.src.utils.helpers.psutil.process_iter')
     def test_update_process_status_info_running_process(self,
-                                                        mock_pid_exists: MagicMock,
-                                                        mock_process_status: MagicMock):
+                                                        mock_process_iter: MagicMock):
         """
         GIVEN a dataframe with information for an existing running process
         WHEN passed to the 'update_process_status_info' function
         THEN check that process status is correctly identified as 'running'.
         """
-        mock_pid_exists.return_value = True
-        mock_process_status.return_value = "running"
+        mock_process_iter.return_value = [self.get_process_info(self.test_process_id, "running")]
+        df = self.test_df.assign(**{"process id": [self.test_process_id]})
 
-        update_process_status_info(self.test_df)
+        update_process_status_info(df)
 
-        self.assertEqual(self.test_df.at[0, "running"], True)
+        self.assertEqual(df.at[0, "running"], True)
+        self.assertEqual(df.at[0, "cpu %"], 1.5)
 
-    @patch.object(psutil.Process, "status")
-    @patch('tasklit.src.utils.helpers.psutil.pid_exists')
+    @patch('tasklit.src.utils.helpers.psutil.process_iter')
     def test_update_process_status_info_zombie_process(self,
-                                                       mock_pid_exists: MagicMock,
-                                                       mock_process_status: MagicMock):
+                                                       mock_process_iter: MagicMock):
         """
         GIVEN a dataframe with information for an existing zombie process
         WHEN passed to the 'update_process_status_info' function
         THEN check that process status is correctly identified as not 'running'.
         """
-        mock_pid_exists.return_value = True
-        mock_process_status.return_value = "zombie"
+        mock_process_iter.return_value = [self.get_process_info(self.test_process_id, "zombie")]
+        df = self.test_df.assign(**{"process id": [self.test_process_id]})
 
-        update_process_status_info(self.test_df)
+        update_process_status_info(df)
 
-        self.assertEqual(self.test_df.at[0, "running"], False)
+        self.assertEqual(df.at[0, "running"], False)
 
-    @patch('tasklit.src.utils.helpers.psutil.pid_exists')
+    @patch('tasklit.src.utils.helpers.psutil.process_iter')
     def test_update_process_status_info_missing_process(self,
-                                                        mock_pid_exists: MagicMock):
+                                                        mock_process_iter: MagicMock):
         """
-        GIVEN a dataframe with information for a process that does not exist
+        GIVEN a dataframe with information for a process that does not exist and a task without process
         WHEN passed to the 'update_process_status_info' function
         THEN check that process status is correctly identified as not 'running'.
         """
-        mock_pid_exists.return_value = False
-
-        update_process_status_info(self.test_df)
-
-        self.assertEqual(self.test_df.at[0, "running"], False)
-
-    @patch('tasklit.src.utils.helpers.save_df_to_sql')
-    @patch('tasklit.src.utils.helpers.create_process_info_dataframe')
-    @patch('tasklit.src.utils.helpers.start_scheduler_process')
-    def test_submit_job(self,
-                        mock_start_process: MagicMock,
-                        mock_create_df: MagicMock,
-                        mock_save_df: MagicMock):
-        """
-        GIVEN job execution parameters
-        WHEN passed to the 'submit_job' function
-        THEN check that job execution functions are called.
-        """
-        mock_start_process.return_value = True
-        mock_create_df.return_value = True
-        mock_save_df.return_value = True
-
-        submit_job(
-            "test",
-            "test",
-            datetime(2020, 1, 1),
-            timedelta(days=1),
-            None,
-            "test",
-            "test",
-            1,
-            "test"
-        )
-
-        mock_start_process.assert_called_with(
-            'test',
-            'test',
-            datetime(2020, 1, 1, 0, 0),
-            timedelta(days=1),
-            None,
-            'test',
-            'test'
-        )
-        mock_create_df.assert_called_with(
-            'test',
-            'test',
-            True,
-            1
-        )
-        mock_save_df.assert_called_with(
-            True,
-            'test'
-        )
+        mock_process_iter.return_value = [self.get_process_info(1, "running")]
+        df = pd.concat([self.test_df, self.test_df.assign(**{"process id": [self.test_process_id]})])
 
-    @patch('tasklit.src.utils.helpers.Process')
-    def test_start_scheduler_process(self,
-                                     mock_process: MagicMock):
-        """
-        GIVEN job execution parameters
-        WHEN passed to the 'start_process' function
-        THEN check that a scheduler process is started and related process ID is returned.
-        """
-        process_mock = MagicMock()
-        process_mock.start = lambda: True
-        process_mock.pid = 123
-        mock_process.return_value = process_mock
+        update_process_status_info(df)
 
-        self.assertEqual(
-            start_scheduler_process(
-                "test",
-                "test",
-                datetime(2020, 1, 1),
-                timedelta(days=1),
-                None,
-                "test",
-                "test"
-            ),
-            process_mock.pid
-        )
+        self.assertEqual(list(df["running"]), [False, False])
+        self.assertTrue(df["cpu %"].isna().all())
 
-    @patch('tasklit.src.utils.helpers.pd.DataFrame')
-    def test_save_df_to_sql(self,
-                            mock_df: MagicMock):
+    @patch('tasklit.src.utils.helpers.psutil.process_iter')
+    def test_update_process_status_info_reused_process_id(self,
+                                                          mock_process_iter: MagicMock):
         """
-        GIVEN a mocked pd.Dataframe object
-        WHEN passed to the 'save_df_to_sql' function
-        THEN check that df.to_sql method is called with correct parameters.
+        GIVEN a dataframe with a task whose process ID now belongs to a process created at another time
+        WHEN passed to the 'update_process_status_info' function
+        THEN check that process status is correctly identified as not 'running'.
         """
-        save_df_to_sql(mock_df, "engine")
-        mock_df.to_sql.assert_called_with('processes', con='engine', if_exists='append', index=False)
+        mock_process_iter.return_value = [self.get_process_info(self.test_process_id, "running")]
+        df = self.test_df.assign(**{"process id": [self.test_process_id], "process created": [1609455600.0]})
 
-    @patch('tasklit.src.utils.helpers.pd.DataFrame')
-    def test_save_df_to_sql_raises_error(self,
-                                         mock_df: MagicMock):
-        """
-        GIVEN a mocked pd.Dataframe object
-        WHEN passed to the 'save_df_to_sql' function
-        THEN check that an error is raised if sql file creation fails.
-        """
-        mock_df.to_sql.side_effect = OperationalError("Failed to create the sql file.", {}, "")
-        with self.assertRaises(OperationalError):
-            save_df_to_sql(mock_df, "engine")
+        update_process_status_info(df)
 
-    def test_create_process_info_dataframe(self):
-        """
-        GIVEN parameters related to a specific job (e.g. name, command, etc.)
-        WHEN passed to the 'create_process_info_dataframe' function
-        THEN check that a dataframe with these parameters is returned.
-        """
-        with patch('tasklit.src.utils.helpers.datetime') as mock_datetime:
-            mock_datetime.now.return_value = None
-            test_df_copy = self.test_df.copy()
-            test_df_copy["created"] = mock_datetime.now.return_value
-            assert_frame_equal(
-                create_process_info_dataframe(
-                    None,
-                    self.test_job_name,
-                    None,
-                    self.task_ids[0]
-                ),
-                self.test_df
-            )
+        self.assertEqual(df.at[0, "running"], False)
+        self.assertTrue(df["cpu %"].isna().all())
 
-    def test_write_job_execution_log(self):
+    @patch('tasklit.src.utils.helpers.database.insert_tasks')
+    @patch('tasklit.src.utils.helpers.start_scheduler_process')
+    def test_submit_job(self,
+                        mock_start_process: MagicMock,
+                        mock_insert_tasks: MagicMock):
         """
-        GIVEN job info that should be logged (e.g. job name, command, etc.)
-        WHEN passed to the 'write_job_execution_log' function
-        THEN check that correct log file information is logged.
+        GIVEN a task
+        WHEN passed to the 'submit_job' function
+        THEN check that its scheduler process is started and the task is saved.
         """
-        with patch('tasklit.src.utils.helpers.datetime') as mock_datetime:
-            mock_datetime.now.strftime.return_value = '2021-01-01 00:00:00'
-
-            with patch('builtins.open', mock_open()) as mock_file:
-                write_job_execution_log(
-                    self.test_job_name,
-                    self.test_command,
-                    mock_datetime.now,
-                    "Executed"
-                )
-
-                mock_file.return_value.write.assert_has_calls([
-                    # 1 call for '*.txt' log write
-                    call(f'2021-01-01 00:00:00 Executed {DEFAULT_TEST_COMMAND}\n'),
-                    # 2 calls for '*_stdout.txt' log write
-                    call(f"\n{'=' * 70} \n"),
-                    call(f'2021-01-01 00:00:00 Executed {DEFAULT_TEST_COMMAND}\n')
-                ])
-
-                mock_file.assert_called_with(self.stdout_log_filepath, 'a')
+        task = Task("test", "test", Schedule.create(datetime(2020, 1, 1), timedelta(days=1), None, "Daily", "Now"))
+        mock_insert_tasks.return_value = [1]
 
-    def test_write_job_execution_log_raises_error(self):
-        """
-        GIVEN job info that should be logged (e.g. job name, command, etc.)
-        WHEN passed to the 'write_job_execution_log' function
-        THEN check that an error is raised if the log file cannot be accessed.
-        """
-        with patch('tasklit.src.utils.helpers.datetime') as mock_datetime:
-            mock_datetime.now.strftime.return_value = '2021-01-01 00:00:00'
-
-            with patch('builtins.open', mock_open()) as mock_file:
-                mock_file.side_effect = OSError
-
-                with self.assertRaises(OSError):
-                    write_job_execution_log(
-                        self.test_job_name,
-                        self.test_command,
-                        mock_datetime.now,
-                        "Executed"
-                    )
-
-    @patch('tasklit.src.utils.helpers.match_duration')
-    @patch('tasklit.src.utils.helpers.match_weekday')
-    def test_process_should_execute(self,
-                                    mock_match_weekday: MagicMock,
-                                    mock_match_duration: MagicMock):
-        """
-        GIVEN current daytime information
-        WHEN passed to the 'test_process_should_execute' function
-        THEN check that a decision is made to execute the process if both checks pass.
-        """
-        mock_match_weekday.return_value = True
-        mock_match_duration.return_value = True
-
-        self.assertEqual(process_should_execute(
-            datetime.now(),
-            datetime.now(),
-            timedelta(1),
-            []
-        ),
-            True
-        )
+        task_id = submit_job(task, "sql_engine")
 
-    @patch('tasklit.src.utils.helpers.match_duration')
-    @patch('tasklit.src.utils.helpers.match_weekday')
-    def test_process_should_not_execute(self,
-                                        mock_match_weekday: MagicMock,
-                                        mock_match_duration: MagicMock):
-        """
-        GIVEN current daytime information
-        WHEN passed to the 'test_process_should_execute' function
-        THEN check that a decision is made to NOT execute the process if
-            at least one of the checks fails.
-        """
-        mock_match_weekday.return_value = True
-        mock_match_duration.return_value = False
-
-        self.assertEqual(process_should_execute(
-            datetime.now(),
-            datetime.now(),
-            timedelta(1),
-            []
-        ),
-            False
-        )
+        mock_start_process.assert_called_with(task)
+        mock_insert_tasks.assert_called_with([task], "sql_engine")
+        self.assertEqual(task_id, 1)
 
     @patch('tasklit.src.utils.helpers.st.error')
     @patch('tasklit.src.utils.helpers.refresh_app')
@@ -796,37 +516,57 @@ class UtilFunctionsTestCase(unittest.TestCase):
 
         mock_create.assert_called()
 
-    @patch('tasklit.src.utils.helpers.st.checkbox')
-    @patch('tasklit.src.utils.helpers.st.empty')
-    @patch('tasklit.src.utils.helpers.read_log')
+    @patch('tasklit.src.utils.helpers.st.container')
+    @patch('tasklit.src.utils.helpers.st.button')
+    @patch('tasklit.src.utils.helpers.stream_log_file')
     @patch('tasklit.src.utils.helpers.terminate_process')
     @patch('tasklit.src.utils.helpers.launch_command_process')
     def test_test_command_run(self,
                               mock_launch_process: MagicMock,
                               mock_terminate_process: MagicMock,
-                              mock_read_log: MagicMock,
-                              mock_st_empty: MagicMock,
-                              mock_st_checkbox: MagicMock):
+                              mock_stream_log: MagicMock,
+                              mock_st_button: MagicMock,
+                              mock_st_container: MagicMock):
         """
         GIVEN a command to test
         WHEN passed to the 'test_command_run' function
-        THEN check that related test commands are called and
-            the test process is terminated when the 'stop' button is pressed.
+        THEN check that the test log is streamed until the process finishes
+            and the finished process is not terminated.
         """
-        mock_st_checkbox.return_value = True
-        mock_launch_process.poll.return_value = None
-        mock_launch_process.return_value.pid = 123
-        mock_read_log.return_value = ["Log file", " Contents"]
-        mock_st_empty.return_value.code.return_value = lambda x: x
+        mock_launch_process.return_value.poll.return_value = 0
 
         test_command_run(self.test_command)
 
-        mock_st_empty.assert_called()
-        mock_st_checkbox.assert_called()
-        mock_read_log.assert_called_with(DEFAULT_LOG_DIR_OUT)
-        mock_st_empty.return_value.code.assert_called_with(
-            "".join(mock_read_log.return_value)
-        )
+        mock_launch_process.assert_called_with(self.test_command, DEFAULT_LOG_DIR_OUT)
+        mock_st_button.assert_called_with("Stop")
+        mock_stream_log.assert_called()
+        self.assertEqual(mock_stream_log.call_args[0][0], DEFAULT_LOG_DIR_OUT)
+        self.assertEqual(mock_stream_log.call_args[0][1](), True)
+        mock_terminate_process.assert_not_called()
+
+    @patch('tasklit.src.utils.helpers.st.container')
+    @patch('tasklit.src.utils.helpers.st.button')
+    @patch('tasklit.src.utils.helpers.stream_log_file')
+    @patch('tasklit.src.utils.helpers.terminate_process')
+    @patch('tasklit.src.utils.helpers.launch_command_process')
+    def test_test_command_run_interrupted(self,
+                                          mock_launch_process: MagicMock,
+                                          mock_terminate_process: MagicMock,
+                                          mock_stream_log: MagicMock,
+                                          mock_st_button: MagicMock,
+                                          mock_st_container: MagicMock):
+        """
+        GIVEN a command to test
+        WHEN the log stream of the 'test_command_run' function is interrupted by an app rerun
+        THEN check that the still running test process is terminated.
+        """
+        mock_launch_process.return_value.poll.return_value = None
+        mock_launch_process.return_value.pid = 123
+        mock_stream_log.side_effect = RerunException(None)
+
+        with self.assertRaises(RerunException):
+            test_command_run(self.test_command)
+
         mock_terminate_process.assert_called_with(
             mock_launch_process.return_value.pid
         )
@@ -1018,99 +758,6 @@ class UtilFunctionsTestCase(unittest.TestCase):
 
             self.assertEqual(start_date, datetime(2021, 1, 5, 0, 0))
 
-    def test_match_duration_unmatched(self):
-        """
-        GIVEN current datetime that does not exceed scheduling parameters
-        WHEN passed to the 'match_duration' function
-        THEN check decision is made to not execute the job.
-        """
-        now = self.now_datetime
-        start = datetime(2021, 1, 2, 00, 00)
-        duration = timedelta(1)
-
-        self.assertEqual(match_duration(now, start, duration), False)
-
-    def test_match_duration_matched(self):
-        """
-        GIVEN current datetime that exceeds scheduling parameters
-        WHEN passed to the 'get_command_execution_start' function
-        THEN check decision is made to execute the job.
-        """
-        now = self.now_datetime
-        start = datetime(2020, 12, 30, 00, 00)
-        duration = timedelta(1)
-
-        self.assertEqual(match_duration(now, start, duration), True)
-
-    @patch('tasklit.src.utils.helpers.write_job_execution_log')
-    @patch('tasklit.src.utils.helpers.launch_command_process')
-    def test_execute_job(self,
-                         mock_launch_process: MagicMock,
-                         mock_write_log: MagicMock):
-        """
-        GIVEN parameters for executing a job
-        WHEN passed to the 'execute_job' function
-        THEN check that related job execution methods are called.
-        """
-        mock_launch_process.return_value.wait.return_value = True
-
-        execute_job(
-            self.test_command,
-            self.stdout_log_filepath,
-            self.test_job_name,
-            self.now_datetime,
-        )
-
-        mock_launch_process.assert_called_with(
-            self.test_command,
-            self.stdout_log_filepath
-        )
-        mock_launch_process.return_value.wait.assert_called()
-        mock_write_log.assert_called_with(
-            self.test_job_name,
-            self.test_command,
-            self.now_datetime,
-            'Executed'
-        )
-
-    @patch('tasklit.src.utils.helpers.time.sleep')
-    @patch('tasklit.src.utils.helpers.process_should_execute')
-    @patch('tasklit.src.utils.helpers.execute_job')
-    def test_schedule_process_job_once(self,
-                                       mock_execute: MagicMock,
-                                       mock_should_execute: MagicMock,
-                                       mock_sleep: MagicMock):
-        """
-        GIVEN parameters for launching a scheduler process
-        WHEN passed to the 'schedule_process_job' function
-        THEN check that the function correctly decides on whether
-            to execute the job once or multiple times.
-        """
-        execution_frequency = "Once"
-        execution_type = ""
-
-        with patch('tasklit.src.utils.helpers.datetime') as mock_datetime:
-            mock_datetime.now.return_value = self.now_datetime
-
-            schedule_process_job(
-                self.test_command,
-                self.test_job_name,
-                self.now_datetime,
-                timedelta(days=1),
-                None,
-                execution_frequency,
-                execution_type
-            )
-
-            mock_execute.assert_called_with(
-                self.test_command,
-                self.stdout_log_filepath,
-                self.test_job_name,
-                self.now_datetime
-            )
-            mock_should_execute.assert_not_called()
-            mock_sleep.assert_not_called()
-
     def test_get_interval_duration_weekdays(self):
         """
         GIVEN selected weekdays
@@ -1158,68 +805,20 @@ class UtilFunctionsTestCase(unittest.TestCase):
             timedelta(days=7)
         )
 
-    @patch('tasklit.src.utils.helpers.time.sleep', side_effect=InterruptedError)
-    @patch('tasklit.src.utils.helpers.process_should_execute')
-    @patch('tasklit.src.utils.helpers.execute_job')
-    def test_schedule_process_job_sleep(self,
-                                        mock_execute: MagicMock,
-                                        mock_should_execute: MagicMock,
-                                        mock_sleep: MagicMock):
+    def test_select_cron_expression(self):
         """
-        GIVEN parameters for launching a scheduler process
-        WHEN passed to the 'schedule_process_job' function
-        THEN check that correct decision to wait is taken
-            based on the result of the process_should_execute check.
+        GIVEN a valid and an invalid cron expression entered in the UI
+        WHEN the 'select_cron_expression' function is called
+        THEN check that the valid expression is returned and the invalid one is reported.
         """
-        execution_frequency = "Daily"
-        execution_type = "Now"
-        mock_should_execute.return_value = False
-
-        with patch('tasklit.src.utils.helpers.datetime') as mock_datetime:
-            mock_datetime.now.return_value = self.now_datetime
+        unit_col, info_col = MagicMock(), MagicMock()
+        unit_col.text_input.side_effect = ["*/5 * * * *", "61 * * * *"]
 
-            with self.assertRaises(InterruptedError):
+        self.assertEqual(select_cron_expression(unit_col, info_col), "*/5 * * * *")
+        info_col.text.assert_called()
 
-                schedule_process_job(
-                    self.test_command,
-                    self.test_job_name,
-                    self.now_datetime,
-                    timedelta(days=1),
-                    None,
-                    execution_frequency,
-                    execution_type
-                )
-
-    @patch('tasklit.src.utils.helpers.time.sleep')
-    @patch('tasklit.src.utils.helpers.process_should_execute')
-    @patch('tasklit.src.utils.helpers.execute_job', side_effect=InterruptedError)
-    def test_schedule_process_job_execute(self,
-                                          mock_execute: MagicMock,
-                                          mock_should_execute: MagicMock,
-                                          mock_sleep: MagicMock):
-        """
-        GIVEN parameters for launching a scheduler process
-        WHEN passed to the 'schedule_process_job' function
-        THEN check that correct decision is taken to execute the process.
-        """
-        execution_frequency = "Daily"
-        execution_type = "Now"
-        mock_should_execute.return_value = True
-
-        with patch('tasklit.src.utils.helpers.datetime') as mock_datetime:
-            mock_datetime.now.return_value = self.now_datetime
-
-            with self.assertRaises(InterruptedError):
-
-                schedule_process_job(
-                    self.test_command,
-                    self.test_job_name,
-                    self.now_datetime,
-                    timedelta(days=1),
-                    None,
-                    execution_frequency,
-                    execution_type
-                )
+        self.assertIsNone(select_cron_expression(unit_col, info_col))
+        info_col.error.assert_called()
 
     @patch('tasklit.src.utils.job_names.random.choice')
     def test_get_job_name(self,
@@ -1,5 +1,7 @@
 import unittest
 
+from datetime import datetime
+
 from unittest.mock import (
     patch,
     MagicMock
@@ -7,7 +9,12 @@ from unittest.mock import (
 
 import pandas as pd
 
+from pandas.testing import assert_frame_equal
+
 from tasklit.pages.homepage import homepage
+from tasklit.settings.consts import AUTO_REFRESH_INTERVAL
+from tasklit.src.utils.status_monitor import TaskSnapshot
+from tasklit.src.utils.task_table import TaskTableQuery
 
 
 class HomepageTestCase(unittest.TestCase):
@@ -33,6 +40,7 @@ class HomepageTestCase(unittest.TestCase):
                 "task_id": [1],
                 "created": ["2020-01-01 00:00:00"],
                 "process id": [123],
+                "process created": [None],
                 "job name": ["nostalgic_strauss"],
                 "command": ["ping 123"],
                 "last update": [None],
@@ -58,82 +66,108 @@ class HomepageTestCase(unittest.TestCase):
         mock_st_write.assert_called_with('# 🕙 Tasklit')
         mock_st_text.assert_called_with('A browser-based task scheduling system. Running on Tasklit.pc.')
 
-    @patch('tasklit.pages.homepage.st.table')
-    @patch('tasklit.pages.homepage.helper_functions.update_df_process_last_update_info')
-    @patch('tasklit.pages.homepage.helper_functions.update_process_status_info')
-    @patch('tasklit.pages.homepage.helper_functions.get_process_df')
+    @staticmethod
+    def get_snapshot(df: pd.DataFrame) -> TaskSnapshot:
+        return TaskSnapshot(df, datetime(2020, 1, 1, 12))
+
+    @patch('tasklit.pages.homepage.live_updates.run_live_updates')
+    @patch('tasklit.pages.homepage.live_updates.render_task_table')
+    @patch('tasklit.pages.homepage.task_table.select_task_table_query')
+    @patch('tasklit.pages.homepage.st.empty')
+    @patch('tasklit.pages.homepage.status_monitor.get_status_monitor')
     def test_display_process_df(self,
-                                mock_get_df: MagicMock,
-                                mock_update_status: MagicMock,
-                                mock_update_last_edit: MagicMock,
-                                mock_st_table: MagicMock):
+                                mock_get_monitor: MagicMock,
+                                mock_st_empty: MagicMock,
+                                mock_select_query: MagicMock,
+                                mock_render_table: MagicMock,
+                                mock_live_updates: MagicMock):
         """
         GIVEN a dataframe with process information
         WHEN 'homepage' function is called
-        THEN check that correct version of the dataframe is rendered.
+        THEN check that the selected page of the latest task state of the status monitor is rendered.
         """
         test_df_copy = self.test_df.copy()
-        mock_get_df.return_value = test_df_copy
         test_df_copy["last update"] = self.last_update
-        mock_update_last_edit.return_value = test_df_copy
         test_df_copy["running"] = self.running
-        mock_update_status.return_value = test_df_copy
+        snapshot = self.get_snapshot(test_df_copy)
+        mock_get_monitor.return_value.get_snapshot.return_value = snapshot
 
         homepage("")
 
-        mock_st_table.assert_called_with(test_df_copy)
+        mock_get_monitor.assert_called_with("")
+        mock_render_table.assert_called_once_with(mock_st_empty.return_value, snapshot,
+                                                  mock_select_query.return_value)
 
+    @patch('tasklit.pages.homepage.live_updates.run_live_updates')
     @patch('tasklit.pages.homepage.layout_homepage_explore_task')
     @patch('tasklit.pages.homepage.layout_homepage_define_new_task')
     @patch('tasklit.pages.homepage.helper_functions.refresh_app')
-    @patch.object(pd.DataFrame, 'to_sql')
+    @patch('tasklit.pages.homepage.status_monitor.invalidate')
+    @patch('tasklit.pages.homepage.database.delete_processes')
     @patch('tasklit.pages.homepage.st.button')
-    @patch('tasklit.pages.homepage.st.table')
-    @patch('tasklit.pages.homepage.helper_functions.update_df_process_last_update_info')
-    @patch('tasklit.pages.homepage.helper_functions.update_process_status_info')
-    @patch('tasklit.pages.homepage.helper_functions.get_process_df')
+    @patch('tasklit.pages.homepage.st.empty')
+    @patch('tasklit.pages.homepage.status_monitor.get_status_monitor')
     def test_remove_inactive_processes(self,
-                                       mock_get_df: MagicMock,
-                                       mock_update_status: MagicMock,
-                                       mock_update_last_edit: MagicMock,
-                                       mock_st_table: MagicMock,
+                                       mock_get_monitor: MagicMock,
+                                       mock_st_empty: MagicMock,
                                        mock_st_button: MagicMock,
-                                       mock_df_to_sql: MagicMock,
+                                       mock_delete_processes: MagicMock,
+                                       mock_invalidate: MagicMock,
                                        mock_refresh: MagicMock,
                                        mock_new_task: MagicMock,
-                                       mock_explore_task: MagicMock):
+                                       mock_explore_task: MagicMock,
+                                       mock_live_updates: MagicMock):
         """
         GIVEN a dataframe with information of an inactive process
         WHEN 'homepage' function is called
-        THEN check that DataFrame information is saved to sql.
+        THEN check that the inactive process is removed from sql and the task state is refreshed.
         """
-        mock_get_df.return_value = mock_update_status.return_value = \
-            mock_update_last_edit.return_value = mock_st_table.return_value = self.test_df
+        mock_get_monitor.return_value.get_snapshot.return_value = self.get_snapshot(self.test_df)
         mock_st_button.return_value = True
 
         homepage("")
 
-        mock_df_to_sql.assert_called_with('processes', con='', if_exists='replace', index=False)
+        mock_delete_processes.assert_called()
+        self.assertEqual(list(mock_delete_processes.call_args[0][0]), [1])
+        self.assertEqual(mock_delete_processes.call_args[0][1], "")
+        mock_invalidate.assert_called_with("")
         mock_refresh.assert_called()
 
+    @patch('tasklit.pages.homepage.live_updates.run_live_updates')
+    @patch('tasklit.pages.homepage.st.checkbox')
+    @patch('tasklit.pages.homepage.layout_homepage_timeline')
     @patch('tasklit.pages.homepage.layout_homepage_explore_task')
+    @patch('tasklit.pages.homepage.layout_homepage_import_tasks')
     @patch('tasklit.pages.homepage.layout_homepage_define_new_task')
-    @patch('tasklit.pages.homepage.helper_functions.get_process_df')
+    @patch('tasklit.pages.homepage.status_monitor.get_status_monitor')
     def test_static_layouts(self,
-                            mock_get_df: MagicMock,
+                            mock_get_monitor: MagicMock,
                             mock_new_task: MagicMock,
-                            mock_explore_task: MagicMock):
+                            mock_import_tasks: MagicMock,
+                            mock_explore_task: MagicMock,
+                            mock_timeline: MagicMock,
+                            mock_st_checkbox: MagicMock,
+                            mock_live_updates: MagicMock):
         """
         GIVEN a dataframe with process information
-        WHEN 'homepage' function is called
-        THEN check that related static layout functions are called.
+        WHEN 'homepage' function is called with auto-refresh
+        THEN check that related static layout functions are called once
+            and the task table and live log output of the explored task are kept up to date.
         """
-        mock_get_df.return_value = self.test_df
+        snapshot = self.get_snapshot(self.test_df)
+        mock_get_monitor.return_value.get_snapshot.return_value = snapshot
+        mock_st_checkbox.return_value = True
 
         homepage("sql_engine")
 
-        mock_new_task.assert_called_with(self.test_df, "sql_engine")
-        mock_explore_task.assert_called_with(self.test_df)
-
-
-
+        mock_new_task.assert_called_once_with("sql_engine")
+        mock_import_tasks.assert_called_once_with("sql_engine")
+        assert_frame_equal(mock_explore_task.call_args[0][0], self.test_df)
+        self.assertEqual(mock_explore_task.call_args[0][1], "sql_engine")
+        assert_frame_equal(mock_timeline.call_args[0][0], self.test_df)
+        self.assertEqual(mock_timeline.call_args[0][1], "sql_engine")
+
+        sql_engine, live_snapshot, _, _, log_streams, query, refresh_interval = mock_live_updates.call_args[0]
+        self.assertEqual((sql_engine, live_snapshot), ("sql_engine", snapshot))
+        self.assertEqual((log_streams, refresh_interval), ([mock_explore_task.return_value], AUTO_REFRESH_INTERVAL))
+        self.assertEqual(query, TaskTableQuery())
@@ -25,11 +25,13 @@ class HomepageExploreTaskTestCase(unittest.TestCase):
         super(HomepageExploreTaskTestCase, cls).setUpClass()
         cls.task_id = 1
         cls.process_id = 123
+        cls.process_created = 1609459200.0
         cls.test_df = pd.DataFrame(
             {
                 "task_id": [1],
                 "created": ["2020-01-01 00:00:00"],
                 "process id": [123],
+                "process created": [1609459200.0],
                 "job name": ["nostalgic_strauss"],
                 "command": ["ping 123"],
                 "last update": [None],
@@ -37,9 +39,9 @@ class HomepageExploreTaskTestCase(unittest.TestCase):
             }
         )
 
+    @patch('tasklit.pages.layouts.homepage_explore_task.helper_functions.get_daemon_task_state')
     @patch('tasklit.pages.layouts.homepage_explore_task.helper_functions.refresh_app')
-    @patch('tasklit.pages.layouts.homepage_explore_task.helper_functions.st.success')
-    @patch('tasklit.pages.layouts.homepage_explore_task.helper_functions.terminate_process')
+    @patch('tasklit.pages.layouts.homepage_explore_task.helper_functions.stop_task_process')
     @patch('tasklit.pages.layouts.homepage_explore_task.st.button')
     @patch('tasklit.pages.layouts.homepage_explore_task.st.checkbox')
     @patch('tasklit.pages.layouts.homepage_explore_task.helper_functions.display_process_log_file')
@@ -55,21 +57,22 @@ class HomepageExploreTaskTestCase(unittest.TestCase):
                                        mock_display_log: MagicMock,
                                        mock_st_checkbox: MagicMock,
                                        mock_st_button: MagicMock,
-                                       mock_terminate: MagicMock,
-                                       mock_st_success: MagicMock,
-                                       mock_refresh: MagicMock):
+                                       mock_stop: MagicMock,
+                                       mock_refresh: MagicMock,
+                                       mock_daemon_task_state: MagicMock):
         """
-        GIVEN process ID and task ID
+        GIVEN process ID and task ID, without scheduler daemon
         WHEN task ID is selected in the 'explore task' tab
-        THEN check related task info methods are called.
+        THEN check related task info methods are called and the task is stopped directly.
         """
+        mock_daemon_task_state.return_value = None
         mock_st_expander.return_value.__enter__.return_value = True
         mock_st_selectbox.return_value = self.task_id
         mock_st_checkbox.return_value = True
         mock_st_button.return_value = True
         mock_display_log.side_effect = ["Execution Log", "Stdout log"]
 
-        layout_homepage_explore_task(self.test_df)
+        layout_homepage_explore_task(self.test_df, "sql_engine")
 
         mock_st_write.assert_has_calls([
             call('## Task Execution Log'),
@@ -81,14 +84,160 @@ class HomepageExploreTaskTestCase(unittest.TestCase):
             call('Stdout log')
         ])
 
-        mock_terminate.assert_called_with(self.process_id)
-        mock_st_success.assert_called_with(
+        mock_stop.assert_called_with("nostalgic_strauss", self.process_id, self.process_created)
+        mock_refresh.assert_called_with(
             f'Terminated task nostalgic_strauss with task_id {self.task_id} '
             f'and process id {self.process_id}.'
         )
-        mock_refresh.assert_called()
 
+    @patch('tasklit.pages.layouts.homepage_explore_task.helper_functions.get_daemon_task_state')
+    @patch('tasklit.pages.layouts.homepage_explore_task.helper_functions.read_job_output_tail')
+    @patch('tasklit.pages.layouts.homepage_explore_task.st.container')
+    @patch('tasklit.pages.layouts.homepage_explore_task.LogStream')
+    @patch('tasklit.pages.layouts.homepage_explore_task.helper_functions.is_process_running')
+    @patch('tasklit.pages.layouts.homepage_explore_task.st.button')
+    @patch('tasklit.pages.layouts.homepage_explore_task.st.checkbox')
+    @patch('tasklit.pages.layouts.homepage_explore_task.helper_functions.display_process_log_file')
+    @patch('tasklit.pages.layouts.homepage_explore_task.st.code')
+    @patch('tasklit.pages.layouts.homepage_explore_task.st.write')
+    @patch('tasklit.pages.layouts.homepage_explore_task.st.selectbox')
+    @patch('tasklit.pages.layouts.homepage_explore_task.st.expander')
+    def test_app_follow_live_output(self,
+                                    mock_st_expander: MagicMock,
+                                    mock_st_selectbox: MagicMock,
+                                    mock_st_write: MagicMock,
+                                    mock_st_code: MagicMock,
+                                    mock_display_log: MagicMock,
+                                    mock_st_checkbox: MagicMock,
+                                    mock_st_button: MagicMock,
+                                    mock_is_running: MagicMock,
+                                    mock_stream_log: MagicMock,
+                                    mock_st_container: MagicMock,
+                                    mock_read_output_tail: MagicMock,
+                                    mock_daemon_task_state: MagicMock):
+        """
+        GIVEN a running task
+        WHEN 'follow live output' is selected in the 'explore task' tab
+        THEN check that the in-memory output tail is displayed and
+            the task stdout log is returned for streaming until the task stops running.
+        """
+        running_df = self.test_df.copy()
+        running_df["running"] = True
+        mock_st_expander.return_value.__enter__.return_value = True
+        mock_st_selectbox.return_value = self.task_id
+        mock_st_checkbox.side_effect = [False, True]
+        mock_daemon_task_state.return_value = None
+        mock_is_running.return_value = False
+        mock_read_output_tail.return_value = "Live output"
+        mock_display_log.return_value = "Execution Log"
+
+        live_log = layout_homepage_explore_task(running_df, "sql_engine")
+
+        mock_read_output_tail.assert_called_with(self.process_id)
+        mock_st_code.assert_has_calls([
+            call('Execution Log'),
+            call('Live output')
+        ])
+        mock_display_log.assert_called_once()
+
+        self.assertIs(live_log, mock_stream_log.return_value)
+        self.assertTrue(mock_stream_log.call_args[0][0].endswith("nostalgic_strauss_stdout.txt"))
+        self.assertEqual(mock_stream_log.call_args[0][1](), True)
+        mock_is_running.assert_called_with(self.process_id, self.process_created)
+
+    @patch('tasklit.pages.layouts.homepage_explore_task.control.send_daemon_request')
+    @patch('tasklit.pages.layouts.homepage_explore_task.helper_functions.get_daemon_task_state')
+    @patch('tasklit.pages.layouts.homepage_explore_task.helper_functions.refresh_app')
+    @patch('tasklit.pages.layouts.homepage_explore_task.helper_functions.stop_task_process')
+    @patch('tasklit.pages.layouts.homepage_explore_task.st.columns')
+    @patch('tasklit.pages.layouts.homepage_explore_task.st.button')
+    @patch('tasklit.pages.layouts.homepage_explore_task.st.checkbox')
+    @patch('tasklit.pages.layouts.homepage_explore_task.helper_functions.display_process_log_file')
+    @patch('tasklit.pages.layouts.homepage_explore_task.st.code')
+    @patch('tasklit.pages.layouts.homepage_explore_task.st.write')
+    @patch('tasklit.pages.layouts.homepage_explore_task.st.selectbox')
+    @patch('tasklit.pages.layouts.homepage_explore_task.st.expander')
+    def test_app_task_actions_through_daemon(self,
+                                             mock_st_expander: MagicMock,
+                                             mock_st_selectbox: MagicMock,
+                                             mock_st_write: MagicMock,
+                                             mock_st_code: MagicMock,
+                                             mock_display_log: MagicMock,
+                                             mock_st_checkbox: MagicMock,
+                                             mock_st_button: MagicMock,
+                                             mock_st_columns: MagicMock,
+                                             mock_stop: MagicMock,
+                                             mock_refresh: MagicMock,
+                                             mock_daemon_task_state: MagicMock,
+                                             mock_send_request: MagicMock):
+        """
+        GIVEN a paused task and a running scheduler daemon
+        WHEN the task is resumed and killed in the 'explore task' tab
+        THEN check that both actions are sent to the daemon instead of stopping the task directly.
+        """
+        pause_col, run_col = MagicMock(), MagicMock()
+        pause_col.button.return_value = True
+        run_col.button.return_value = False
+        mock_st_columns.return_value = (pause_col, run_col)
+        mock_st_expander.return_value.__enter__.return_value = True
+        mock_st_selectbox.return_value = self.task_id
+        mock_st_checkbox.side_effect = [True, False]
+        mock_st_button.return_value = True
+        mock_display_log.return_value = "Log"
+        mock_daemon_task_state.return_value = {"task_id": self.task_id, "state": "paused"}
+        mock_send_request.return_value = {"task_id": self.task_id, "state": "running"}
+
+        layout_homepage_explore_task(self.test_df, "sql_engine")
 
+        pause_col.button.assert_called_once_with("Resume")
+        mock_send_request.assert_has_calls([
+            call("resume", task_id=self.task_id),
+            call("cancel", task_id=self.task_id)
+        ])
+        mock_stop.assert_not_called()
+        mock_refresh.assert_any_call(f"Task nostalgic_strauss with task_id {self.task_id} is running.")
 
+    @patch('tasklit.pages.layouts.homepage_explore_task.status_monitor.invalidate')
+    @patch('tasklit.pages.layouts.homepage_explore_task.database.delete_processes')
+    @patch('tasklit.pages.layouts.homepage_explore_task.helper_functions.get_daemon_task_state')
+    @patch('tasklit.pages.layouts.homepage_explore_task.helper_functions.refresh_app')
+    @patch('tasklit.pages.layouts.homepage_explore_task.helper_functions.stop_task_process')
+    @patch('tasklit.pages.layouts.homepage_explore_task.st.button')
+    @patch('tasklit.pages.layouts.homepage_explore_task.st.checkbox')
+    @patch('tasklit.pages.layouts.homepage_explore_task.helper_functions.display_process_log_file')
+    @patch('tasklit.pages.layouts.homepage_explore_task.st.code')
+    @patch('tasklit.pages.layouts.homepage_explore_task.st.write')
+    @patch('tasklit.pages.layouts.homepage_explore_task.st.selectbox')
+    @patch('tasklit.pages.layouts.homepage_explore_task.st.expander')
+    def test_app_kill_queued_task(self,
+                                  mock_st_expander: MagicMock,
+                                  mock_st_selectbox: MagicMock,
+                                  mock_st_write: MagicMock,
+                                  mock_st_code: MagicMock,
+                                  mock_display_log: MagicMock,
+                                  mock_st_checkbox: MagicMock,
+                                  mock_st_button: MagicMock,
+                                  mock_stop: MagicMock,
+                                  mock_refresh: MagicMock,
+                                  mock_daemon_task_state: MagicMock,
+                                  mock_delete: MagicMock,
+                                  mock_invalidate: MagicMock):
+        """
+        GIVEN a queued task without scheduler process, without scheduler daemon
+        WHEN the task is killed in the 'explore task' tab
+        THEN check that the task is removed without stopping any process.
+        """
+        queued_df = self.test_df.assign(**{"process id": [None], "process created": [None]})
+        mock_daemon_task_state.return_value = None
+        mock_st_expander.return_value.__enter__.return_value = True
+        mock_st_selectbox.return_value = self.task_id
+        mock_st_checkbox.side_effect = [True, False]
+        mock_st_button.return_value = True
+        mock_display_log.return_value = "Log"
 
+        layout_homepage_explore_task(queued_df, "sql_engine")
 
+        mock_stop.assert_not_called()
+        mock_delete.assert_called_once_with([self.task_id], "sql_engine")
+        mock_invalidate.assert_called_once_with("sql_engine")
+        mock_refresh.assert_called_once_with(f"Removed queued task nostalgic_strauss with task_id {self.task_id}.")
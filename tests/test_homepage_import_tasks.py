@@ -0,0 +1,59 @@
+import unittest
+
+from unittest.mock import (
+    patch,
+    MagicMock
+)
+
+from tasklit.pages.layouts.homepage_import_tasks import layout_homepage_import_tasks
+
+
+class HomepageImportTasksTestCase(unittest.TestCase):
+    """
+    Unittests for application homepage 'import tasks' layout.
+    """
+
+    @patch('tasklit.pages.layouts.homepage_import_tasks.helper_functions.refresh_app')
+    @patch('tasklit.pages.layouts.homepage_import_tasks.status_monitor.invalidate')
+    @patch('tasklit.pages.layouts.homepage_import_tasks.job_specs.submit_job_specs')
+    @patch('tasklit.pages.layouts.homepage_import_tasks.st.button')
+    @patch('tasklit.pages.layouts.homepage_import_tasks.st.file_uploader')
+    def test_app_submit_imported_tasks(self,
+                                       mock_file_uploader: MagicMock,
+                                       mock_st_button: MagicMock,
+                                       mock_submit: MagicMock,
+                                       mock_invalidate: MagicMock,
+                                       mock_refresh: MagicMock):
+        """
+        GIVEN an uploaded CSV job file
+        WHEN the 'submit all' button is clicked
+        THEN check that all jobs are submitted in one batch and the app is refreshed once.
+        """
+        mock_file_uploader.return_value.name = "jobs.csv"
+        mock_file_uploader.return_value.getvalue.return_value = b"command,job_name\nping 1,a\nping 2,b\n"
+        mock_st_button.return_value = True
+        mock_submit.return_value = [7, 8]
+
+        layout_homepage_import_tasks("sql_engine")
+
+        job_specs, sql_engine = mock_submit.call_args[0]
+        self.assertEqual([job_spec.command for job_spec in job_specs], ["ping 1", "ping 2"])
+        self.assertEqual(sql_engine, "sql_engine")
+        mock_invalidate.assert_called_once_with("sql_engine")
+        mock_refresh.assert_called_once_with("Submitted 2 tasks with task_ids 7 - 8.")
+
+    @patch('tasklit.pages.layouts.homepage_import_tasks.job_specs.submit_job_specs')
+    @patch('tasklit.pages.layouts.homepage_import_tasks.st.file_uploader')
+    def test_app_without_upload(self,
+                                mock_file_uploader: MagicMock,
+                                mock_submit: MagicMock):
+        """
+        GIVEN no uploaded job file
+        WHEN the 'import tasks' layout is rendered
+        THEN check that no jobs are submitted.
+        """
+        mock_file_uploader.return_value = None
+
+        layout_homepage_import_tasks("sql_engine")
+
+        mock_submit.assert_not_called()
@@ -1,15 +1,14 @@
 import unittest
 
-from datetime import timedelta
+from datetime import datetime, timedelta
 
 from unittest.mock import (
     patch,
     MagicMock
 )
 
-import pandas as pd
-
 from tasklit.pages.layouts.homepage_new_task import layout_homepage_define_new_task
+from tasklit.src.utils.tasks import Schedule
 
 
 class HomepageNewTaskTestCase(unittest.TestCase):
@@ -20,22 +19,13 @@ class HomepageNewTaskTestCase(unittest.TestCase):
     @classmethod
     def setUpClass(cls) -> None:
         """
-        test_df: pd.DataFrame
-            Sample dataframe to mimic df with process information.
+        command: str
+            Sample command to submit.
+        job_name: str
+            Sample job name.
         """
         super(HomepageNewTaskTestCase, cls).setUpClass()
         cls.command = "ping me 123"
-        cls.test_df = pd.DataFrame(
-            {
-                "task_id": [1],
-                "created": ["2020-01-01 00:00:00"],
-                "process id": [123],
-                "job name": ["nostalgic_strauss"],
-                "command": ["ping 123"],
-                "last update": [None],
-                "running": [False],
-            }
-        )
         cls.job_name = "sleepy_strauss"
 
     @patch('tasklit.pages.layouts.homepage_new_task.helper_functions.refresh_app')
@@ -65,12 +55,13 @@ class HomepageNewTaskTestCase(unittest.TestCase):
         ]
         mock_st_button.return_value = True
 
-        layout_homepage_define_new_task(self.test_df, "sql_engine")
+        layout_homepage_define_new_task("sql_engine")
 
         mock_st_info.assert_called_with(f"Running '{self.command}'")
         mock_test_command_run.assert_called_with(self.command)
 
     @patch('tasklit.pages.layouts.homepage_new_task.helper_functions.refresh_app')
+    @patch('tasklit.pages.layouts.homepage_new_task.status_monitor.invalidate')
     @patch('tasklit.pages.layouts.homepage_new_task.helper_functions.submit_job')
     @patch('tasklit.pages.layouts.homepage_new_task.helper_functions.get_command_execution_start')
     @patch('tasklit.pages.layouts.homepage_new_task.helper_functions.get_interval_duration')
@@ -92,6 +83,7 @@ class HomepageNewTaskTestCase(unittest.TestCase):
                                 mock_get_duration: MagicMock,
                                 mock_execution_start: MagicMock,
                                 mock_submit: MagicMock,
+                                mock_invalidate: MagicMock,
                                 mock_refresh: MagicMock):
         """
         GIVEN job execution parameters
@@ -106,24 +98,22 @@ class HomepageNewTaskTestCase(unittest.TestCase):
             self.command
         ]
         mock_st_cols.return_value = (col1, col2, col3)
-        col3.selectbox.side_effect = ["Weekly", "Now"]
+        col3.selectbox.side_effect = ["Weekly", "Now", "Europe/Berlin", "holidays"]
         mock_get_interval_info.return_value = (None, None, ["Tue"])
         mock_get_duration.return_value = timedelta(days=1)
-        mock_execution_start.return_value = "2020-02-01 00:00:00"
+        mock_execution_start.return_value = datetime(2020, 2, 1)
 
-        layout_homepage_define_new_task(self.test_df, "sql_engine")
+        layout_homepage_define_new_task("sql_engine")
 
-        mock_submit.assert_called_with(
-            self.command,
-            self.job_name,
-            mock_execution_start.return_value,
-            timedelta(days=1),
-            ['Tue'],
-            "Weekly",
-            "Now",
-            2,
-            'sql_engine'
+        task, sql_engine = mock_submit.call_args[0]
+        self.assertEqual((task.command, task.job_name, sql_engine), (self.command, self.job_name, "sql_engine"))
+        self.assertEqual(
+            task.schedule,
+            Schedule("Weekly", datetime(2020, 2, 1), timedelta(days=1), ["Tue"], None, "Europe/Berlin", "holidays")
+        )
+        mock_invalidate.assert_called_once_with("sql_engine")
+        mock_refresh.assert_called_with(
+            f"Submitted task {self.job_name} with task_id {mock_submit.return_value} to execute {self.command}."
         )
-        mock_refresh.assert_called()
 
 
@@ -0,0 +1,52 @@
+import unittest
+
+from datetime import timedelta
+from unittest.mock import (
+    patch,
+    MagicMock
+)
+
+import pandas as pd
+
+from tasklit.pages.layouts.homepage_timeline import layout_homepage_timeline
+
+
+class HomepageTimelineTestCase(unittest.TestCase):
+    """
+    Unittests for application homepage 'upcoming runs' layout.
+    """
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        """
+        test_df: pd.DataFrame
+            Sample dataframe to mimic df with process information.
+        """
+        super(HomepageTimelineTestCase, cls).setUpClass()
+        cls.test_df = pd.DataFrame({"task_id": [1, 2], "running": [True, False]})
+
+    @patch('tasklit.pages.layouts.homepage_timeline.st.altair_chart')
+    @patch('tasklit.pages.layouts.homepage_timeline.timeline.count_upcoming_runs')
+    @patch('tasklit.pages.layouts.homepage_timeline.timeline.get_schedule_df')
+    @patch('tasklit.pages.layouts.homepage_timeline.st.radio')
+    def test_app_timeline(self,
+                          mock_st_radio: MagicMock,
+                          mock_get_schedule_df: MagicMock,
+                          mock_count_runs: MagicMock,
+                          mock_altair_chart: MagicMock):
+        """
+        GIVEN a running and a stopped task
+        WHEN the 'upcoming runs' layout is rendered
+        THEN check that only runs of the running task are charted.
+        """
+        mock_st_radio.return_value = "Next 24h"
+        mock_get_schedule_df.return_value = pd.DataFrame({"task_id": [1, 2]})
+        mock_count_runs.return_value = pd.DataFrame({"task_id": [1], "runs": [3]})
+
+        layout_homepage_timeline(self.test_df, "sql_engine")
+
+        schedule_df, start, end, bin_size = mock_count_runs.call_args[0]
+        self.assertEqual(list(schedule_df["task_id"]), [1])
+        self.assertEqual(end - start, timedelta(hours=24))
+        self.assertEqual(bin_size, timedelta(minutes=15))
+        mock_altair_chart.assert_called()
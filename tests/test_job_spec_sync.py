@@ -0,0 +1,203 @@
+import itertools
+import os
+import tempfile
+import unittest
+
+from datetime import datetime
+from typing import Callable
+from unittest.mock import (
+    patch,
+    MagicMock
+)
+
+from sqlalchemy import create_engine
+
+from tasklit.src.utils.database import (
+    delete_processes,
+    fetch_applied_job_specs,
+    fetch_processes,
+    initialize_database,
+    insert_process
+)
+from tasklit.src.utils.job_spec_sync import (
+    sync_job_specs,
+    JobSpecDirectory,
+    JobSpecSyncResult
+)
+from tasklit.src.utils.job_specs import (
+    get_job_spec_fingerprint,
+    JobSpec
+)
+from tasklit.src.utils.tasks import Task
+
+
+def start_process_stub(first_pid: int) -> Callable[[Task], int]:
+    """
+    Stand-in for 'start_scheduler_process' that allocates consecutive process IDs.
+    """
+    pids = itertools.count(first_pid)
+
+    def start_scheduler_process(task: Task) -> int:
+        task.pid = next(pids)
+        return task.pid
+
+    return start_scheduler_process
+
+
+class JobSpecSyncTestCase(unittest.TestCase):
+    """
+    Unittests for syncing a job spec directory with the running tasks.
+    """
+
+    def setUp(self) -> None:
+        """
+        temp_dir: tempfile.TemporaryDirectory
+            Temporary job spec directory.
+        sql_engine: sqlalchemy engine
+            Engine for an in-memory sample DB.
+        job_specs: dict
+            Sample job specs, keyed by job name.
+        """
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.sql_engine = create_engine("sqlite://")
+        initialize_database(self.sql_engine)
+        self.job_specs = {
+            "nostalgic_strauss": JobSpec("ping 123", "nostalgic_strauss", "Interval", "Minutes", 5),
+            "sleepy_strauss": JobSpec("ping 456", "sleepy_strauss"),
+        }
+
+    def tearDown(self) -> None:
+        self.sql_engine.dispose()
+        self.temp_dir.cleanup()
+
+    def write_spec_file(self, filename: str, content: str) -> str:
+        path = os.path.join(self.temp_dir.name, filename)
+
+        with open(path, "w", encoding="utf-8") as spec_file:
+            spec_file.write(content)
+
+        return path
+
+    def test_job_spec_directory_load(self):
+        """
+        GIVEN a directory with job spec files
+        WHEN 'JobSpecDirectory.load' is called repeatedly
+        THEN check that all jobs are returned and only modified files are parsed again.
+        """
+        self.write_spec_file("nightly.json", '[{"command": "ping 123", "job_name": "nostalgic_strauss"}]')
+        csv_path = self.write_spec_file("hourly.csv", "command\nping 456\n")
+        self.write_spec_file("notes.txt", "not a job file")
+        spec_directory = JobSpecDirectory(self.temp_dir.name)
+
+        hourly_job_name = f"hourly_{get_job_spec_fingerprint(JobSpec('ping 456', ''))[:10]}"
+
+        self.assertEqual(sorted(spec_directory.load()), [hourly_job_name, "nostalgic_strauss"])
+
+        with patch('tasklit.src.utils.job_spec_sync.load_job_specs') as mock_load_job_specs:
+            mock_load_job_specs.return_value = [JobSpec("ping 789", "hourly_1")]
+            spec_directory.load()
+            mock_load_job_specs.assert_not_called()
+
+            os.utime(csv_path, ns=(0, 0))
+            self.assertEqual(spec_directory.load()["hourly_1"].command, "ping 789")
+            self.assertEqual(mock_load_job_specs.call_count, 1)
+
+    def test_job_spec_directory_load_stable_names(self):
+        """
+        GIVEN a job spec file with unnamed jobs, two of them identical
+        WHEN a job is inserted at the top of the file
+        THEN check that the names of the other jobs do not change and identical jobs get distinct names.
+        """
+        csv_path = self.write_spec_file("hourly.csv", "command\nping 456\nping 789\nping 789\n")
+        spec_directory = JobSpecDirectory(self.temp_dir.name)
+        job_names = {job_name: job_spec.command for job_name, job_spec in spec_directory.load().items()}
+
+        self.write_spec_file("hourly.csv", "command\nping 123\nping 456\nping 789\nping 789\n")
+        os.utime(csv_path, ns=(0, 0))
+        changed_job_names = {job_name: job_spec.command for job_name, job_spec in spec_directory.load().items()}
+
+        self.assertEqual(sorted(job_names.values()), ["ping 456", "ping 789", "ping 789"])
+        self.assertEqual(len(changed_job_names), 4)
+        self.assertEqual({job_name: changed_job_names[job_name] for job_name in job_names}, job_names)
+
+    def test_job_spec_directory_load_raises_error(self):
+        """
+        GIVEN a directory with two jobs of the same name
+        WHEN 'JobSpecDirectory.load' is called
+        THEN check that ValueError is raised.
+        """
+        self.write_spec_file("a.json", '[{"command": "ping 123", "job_name": "nostalgic_strauss"}]')
+        self.write_spec_file("b.json", '[{"command": "ping 456", "job_name": "nostalgic_strauss"}]')
+
+        with self.assertRaisesRegex(ValueError, "more than once"):
+            JobSpecDirectory(self.temp_dir.name).load()
+
+    @patch('tasklit.src.utils.job_spec_sync.processes.terminate_process')
+    @patch('tasklit.src.utils.job_spec_sync.processes.is_process_running')
+    @patch('tasklit.src.utils.job_specs.processes.start_scheduler_process')
+    def test_sync_job_specs(self,
+                            mock_start_process: MagicMock,
+                            mock_is_running: MagicMock,
+                            mock_terminate: MagicMock):
+        """
+        GIVEN tasks started from job specs and a task submitted in the UI
+        WHEN job specs are synced after one job has been changed, one removed and one added
+        THEN check that only tasks of changed jobs are restarted and the UI task is kept.
+        """
+        mock_start_process.side_effect = start_process_stub(100)
+        mock_is_running.return_value = True
+        insert_process(
+            {"created": datetime(2021, 1, 1), "process id": 99, "job name": "ui_strauss", "command": "ping 1"},
+            self.sql_engine
+        )
+
+        self.assertEqual(sync_job_specs(self.job_specs, self.sql_engine), JobSpecSyncResult(2, 0, 0))
+        self.assertEqual(sync_job_specs(self.job_specs, self.sql_engine), JobSpecSyncResult(0, 0, 2))
+
+        changed_job_specs = {
+            "nostalgic_strauss": self.job_specs["nostalgic_strauss"]._replace(quantity=10),
+            "dreamy_strauss": JobSpec("ping 789", "dreamy_strauss"),
+        }
+
+        self.assertEqual(sync_job_specs(changed_job_specs, self.sql_engine), JobSpecSyncResult(2, 2, 0))
+        self.assertEqual(sorted(call[0][0] for call in mock_terminate.call_args_list), [100, 101])
+
+        rows = {row["job name"]: row for row in fetch_processes(self.sql_engine)}
+        self.assertEqual(sorted(rows), ["dreamy_strauss", "nostalgic_strauss", "ui_strauss"])
+        self.assertEqual(
+            rows["nostalgic_strauss"]["spec hash"],
+            get_job_spec_fingerprint(changed_job_specs["nostalgic_strauss"])
+        )
+        self.assertIsNone(rows["ui_strauss"]["spec hash"])
+
+    @patch('tasklit.src.utils.job_spec_sync.processes.terminate_process')
+    @patch('tasklit.src.utils.job_spec_sync.processes.is_process_running')
+    @patch('tasklit.src.utils.job_specs.processes.start_scheduler_process')
+    def test_sync_job_specs_keeps_removed_tasks_removed(self,
+                                                        mock_start_process: MagicMock,
+                                                        mock_is_running: MagicMock,
+                                                        mock_terminate: MagicMock):
+        """
+        GIVEN synced job specs, one of whose tasks has been removed
+        WHEN job specs are synced again, before and after the job has been changed, and after it has been removed
+        THEN check that the job is only submitted again once it has been changed, and forgotten once removed.
+        """
+        mock_start_process.side_effect = start_process_stub(100)
+        mock_is_running.return_value = False
+        sync_job_specs(self.job_specs, self.sql_engine)
+        delete_processes([row["task_id"] for row in fetch_processes(self.sql_engine)
+                          if row["job name"] == "sleepy_strauss"], self.sql_engine)
+
+        self.assertEqual(sync_job_specs(self.job_specs, self.sql_engine), JobSpecSyncResult(0, 0, 2))
+        self.assertEqual([row["job name"] for row in fetch_processes(self.sql_engine)], ["nostalgic_strauss"])
+
+        changed_job_specs = dict(self.job_specs, sleepy_strauss=JobSpec("ping 789", "sleepy_strauss"))
+
+        self.assertEqual(sync_job_specs(changed_job_specs, self.sql_engine), JobSpecSyncResult(1, 0, 1))
+        self.assertEqual(sorted(row["job name"] for row in fetch_processes(self.sql_engine)),
+                         ["nostalgic_strauss", "sleepy_strauss"])
+
+        self.assertEqual(sync_job_specs({"nostalgic_strauss": self.job_specs["nostalgic_strauss"]}, self.sql_engine),
+                         JobSpecSyncResult(0, 1, 1))
+        self.assertEqual(sorted(fetch_applied_job_specs(self.sql_engine)), ["nostalgic_strauss"])
+        mock_terminate.assert_not_called()
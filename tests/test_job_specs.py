@@ -0,0 +1,250 @@
+import itertools
+import unittest
+
+from datetime import datetime, timedelta
+from typing import Callable
+from unittest.mock import (
+    patch,
+    MagicMock
+)
+
+from sqlalchemy.exc import OperationalError
+
+from tasklit.src.utils.job_specs import (
+    get_job_spec_schedule,
+    load_job_specs,
+    parse_job_spec,
+    parse_job_specs,
+    submit_job_specs,
+    JobSpec
+)
+from tasklit.src.utils.tasks import Task
+
+
+def start_process_stub(first_pid: int) -> Callable[[Task], int]:
+    """
+    Stand-in for 'start_scheduler_process' that allocates consecutive process IDs.
+    """
+    pids = itertools.count(first_pid)
+
+    def start_scheduler_process(task: Task) -> int:
+        task.pid = next(pids)
+        return task.pid
+
+    return start_scheduler_process
+
+
+class JobSpecsTestCase(unittest.TestCase):
+    """
+    Unittests for reading and submitting job spec files.
+    """
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        """
+        interval_spec: JobSpec
+            Sample job executed every 5 minutes.
+        daily_spec: JobSpec
+            Sample job executed on Mondays and Fridays.
+        """
+        super(JobSpecsTestCase, cls).setUpClass()
+        cls.interval_spec = JobSpec("ping 123", "nostalgic_strauss", "Interval", "Minutes", 5)
+        cls.daily_spec = JobSpec(
+            "ping 456", "sleepy_strauss", "Daily", weekdays=("Mon", "Fri"), start=datetime(2021, 1, 2, 12)
+        )
+
+    def test_parse_job_spec(self):
+        """
+        GIVEN job definitions with interval and daily frequency
+        WHEN passed to the 'parse_job_spec' function
+        THEN check that job specs with converted settings are returned.
+        """
+        self.assertEqual(
+            parse_job_spec({
+                "command": "ping 123",
+                "job_name": "nostalgic_strauss",
+                "frequency": "Interval",
+                "unit": "Minutes",
+                "quantity": "5",
+                "weekdays": "",
+            }),
+            self.interval_spec
+        )
+        self.assertEqual(
+            parse_job_spec({
+                "command": "ping 456",
+                "job_name": "sleepy_strauss",
+                "frequency": "Daily",
+                "weekdays": "mon; fri",
+                "start": "2021-01-02 12:00:00",
+            }),
+            self.daily_spec
+        )
+
+    def test_parse_job_spec_timezone(self):
+        """
+        GIVEN a job definition with a timezone
+        WHEN passed to the 'parse_job_spec' function
+        THEN check that the timezone is kept.
+        """
+        self.assertEqual(
+            parse_job_spec({"command": "ping 123", "job_name": "sleepy_strauss", "timezone": "Asia/Tokyo"}),
+            JobSpec("ping 123", "sleepy_strauss", timezone="Asia/Tokyo")
+        )
+
+    @patch('tasklit.src.utils.job_specs.get_job_name')
+    def test_parse_job_spec_defaults(self,
+                                     mock_get_job_name: MagicMock):
+        """
+        GIVEN a job definition with a command only
+        WHEN passed to the 'parse_job_spec' function
+        THEN check that a job executed once, immediately, with a generated job name is returned.
+        """
+        mock_get_job_name.return_value = "sleepy_strauss"
+
+        self.assertEqual(
+            parse_job_spec({"command": "ping 123"}),
+            JobSpec("ping 123", "sleepy_strauss", "Once")
+        )
+
+    def test_parse_job_specs_raises_error(self):
+        """
+        GIVEN job definitions with invalid settings
+        WHEN passed to the 'parse_job_specs' function
+        THEN check that ValueError naming the invalid job is raised.
+        """
+        for entry in [
+            {"job_name": "nostalgic_strauss"},
+            {"command": "ping 123", "frequency": "Hourly"},
+            {"command": "ping 123", "frequency": "Interval", "unit": "Fortnights"},
+            {"command": "ping 123", "frequency": "Interval", "unit": "Minutes", "quantity": 60},
+            {"command": "ping 123", "frequency": "Daily", "weekdays": "Mon,Someday"},
+            {"command": "ping 123", "colour": "blue"},
+            {"command": "ping 123", "frequency": "Cron", "cron": "* * *"},
+            {"command": "ping 123", "timezone": "Mars/Olympus_Mons"},
+            {"command": "ping 123", "calendar": "martian_holidays"},
+        ]:
+            with self.assertRaisesRegex(ValueError, "Job 2"):
+                parse_job_specs([{"command": "ping 123"}, entry])
+
+    def test_load_job_specs(self):
+        """
+        GIVEN the same job definitions as CSV, JSON and YAML
+        WHEN passed to the 'load_job_specs' function
+        THEN check that the same job specs are returned.
+        """
+        contents = {
+            "csv": (
+                b"command,job_name,frequency,unit,quantity,weekdays,start\n"
+                b"ping 123,nostalgic_strauss,Interval,Minutes,5,,\n"
+                b"ping 456,sleepy_strauss,Daily,,,\"Mon,Fri\",2021-01-02 12:00:00\n"
+            ),
+            "json": (
+                '[{"command": "ping 123", "job_name": "nostalgic_strauss", "frequency": "Interval",'
+                ' "unit": "Minutes", "quantity": 5},'
+                ' {"command": "ping 456", "job_name": "sleepy_strauss", "frequency": "Daily",'
+                ' "weekdays": ["Mon", "Fri"], "start": "2021-01-02T12:00:00"}]'
+            ),
+            ".yaml": (
+                "jobs:\n"
+                "  - {command: ping 123, job_name: nostalgic_strauss, frequency: Interval, unit: Minutes, quantity: 5}\n"
+                "  - command: ping 456\n"
+                "    job_name: sleepy_strauss\n"
+                "    frequency: Daily\n"
+                "    weekdays: [Mon, Fri]\n"
+                "    start: 2021-01-02 12:00:00\n"
+            ),
+        }
+
+        for file_format, content in contents.items():
+            self.assertEqual(load_job_specs(content, file_format), [self.interval_spec, self.daily_spec])
+
+        with self.assertRaises(ValueError):
+            load_job_specs("", "xml")
+
+    def test_load_job_specs_crontab(self):
+        """
+        GIVEN the content of a user crontab
+        WHEN passed to the 'load_job_specs' function
+        THEN check that every schedule line becomes a cron job and other lines are skipped.
+        """
+        content = (
+            "# m h dom mon dow command\n"
+            "SHELL=/bin/sh\n"
+            "\n"
+            "*/5 * * * 1-5 ping 123\n"
+            "@daily date +\\%Y\n"
+        )
+
+        self.assertEqual(
+            load_job_specs(content, "crontab"),
+            [
+                JobSpec("ping 123", "crontab_1", "Cron", cron="*/5 * * * 1-5"),
+                JobSpec("date +%Y", "crontab_2", "Cron", cron="@daily"),
+            ]
+        )
+
+        with self.assertRaises(ValueError):
+            load_job_specs("@reboot ping 123\n", "crontab")
+
+    def test_get_job_spec_schedule(self):
+        """
+        GIVEN job specs that start immediately or at a scheduled date
+        WHEN passed to the 'get_job_spec_schedule' function
+        THEN check that daily jobs start on the next selected weekday.
+        """
+        now = datetime(2021, 1, 1)
+
+        self.assertEqual(
+            get_job_spec_schedule(self.interval_spec, now),
+            (now, timedelta(minutes=5), "Now")
+        )
+        self.assertEqual(
+            get_job_spec_schedule(self.daily_spec, now),
+            (datetime(2021, 1, 4, 12), timedelta(days=1), "Scheduled")
+        )
+
+    @patch('tasklit.src.utils.job_specs.database.insert_tasks')
+    @patch('tasklit.src.utils.job_specs.processes.start_scheduler_process')
+    def test_submit_job_specs(self,
+                              mock_start_process: MagicMock,
+                              mock_insert_tasks: MagicMock):
+        """
+        GIVEN a batch of job specs
+        WHEN passed to the 'submit_job_specs' function
+        THEN check that a scheduler process is started per job and all are saved at once.
+        """
+        mock_start_process.side_effect = start_process_stub(101)
+        mock_insert_tasks.return_value = [1, 2]
+
+        self.assertEqual(submit_job_specs([self.interval_spec, self.daily_spec], "sql_engine"), [1, 2])
+
+        self.assertEqual(mock_start_process.call_count, 2)
+        self.assertEqual(mock_start_process.call_args[0][0].schedule.weekdays, ("Mon", "Fri"))
+        tasks, sql_engine = mock_insert_tasks.call_args[0]
+        self.assertEqual([task.pid for task in tasks], [101, 102])
+        self.assertEqual([task.spec_hash for task in tasks], [None, None])
+        self.assertEqual(sql_engine, "sql_engine")
+
+    @patch('tasklit.src.utils.job_specs.processes.terminate_process')
+    @patch('tasklit.src.utils.job_specs.processes.is_process_running')
+    @patch('tasklit.src.utils.job_specs.database.insert_tasks')
+    @patch('tasklit.src.utils.job_specs.processes.start_scheduler_process')
+    def test_submit_job_specs_raises_error(self,
+                                           mock_start_process: MagicMock,
+                                           mock_insert_tasks: MagicMock,
+                                           mock_is_running: MagicMock,
+                                           mock_terminate: MagicMock):
+        """
+        GIVEN a batch of job specs that cannot be saved
+        WHEN passed to the 'submit_job_specs' function
+        THEN check that the started scheduler processes are stopped and OperationalError is raised.
+        """
+        mock_start_process.side_effect = start_process_stub(101)
+        mock_insert_tasks.side_effect = OperationalError("Couldn't save jobs.", {}, "")
+        mock_is_running.return_value = True
+
+        with self.assertRaises(OperationalError):
+            submit_job_specs([self.interval_spec, self.daily_spec], "sql_engine")
+
+        self.assertEqual([call[0][0] for call in mock_terminate.call_args_list], [101, 102])
@@ -0,0 +1,113 @@
+import unittest
+
+from datetime import datetime
+from unittest.mock import (
+    patch,
+    MagicMock
+)
+
+import pandas as pd
+
+from pandas.testing import assert_frame_equal
+
+from tasklit.src.utils.live_updates import (
+    render_task_table,
+    run_live_updates
+)
+from tasklit.src.utils.status_monitor import TaskSnapshot
+from tasklit.src.utils.task_table import TaskTableQuery
+
+
+class StopLiveUpdates(Exception):
+    """
+    Stands in for Streamlit interrupting the script on user input.
+    """
+
+
+class LiveUpdatesTestCase(unittest.TestCase):
+    """
+    Unittests for updating the task table and live log output of a rendered page.
+    """
+
+    def setUp(self) -> None:
+        """
+        snapshot: TaskSnapshot
+            Snapshot of the task state the page has been rendered with.
+        next_snapshot: TaskSnapshot
+            Snapshot published after the page has been rendered.
+        """
+        self.snapshot = TaskSnapshot(
+            pd.DataFrame({"task_id": [1], "process created": [None], "running": [True]}),
+            datetime(2021, 1, 1, 12)
+        )
+        self.next_snapshot = TaskSnapshot(
+            pd.DataFrame({"task_id": [1], "process created": [None], "running": [False]}),
+            datetime(2021, 1, 1, 12, 0, 2)
+        )
+
+    @patch('tasklit.src.utils.live_updates.render_task_table')
+    @patch('tasklit.src.utils.live_updates.status_monitor.get_status_monitor')
+    def test_run_live_updates_without_auto_refresh(self,
+                                                   mock_get_monitor: MagicMock,
+                                                   mock_render_table: MagicMock):
+        """
+        GIVEN a page with live log output and without auto-refresh
+        WHEN the page is kept up to date
+        THEN check that the log output is updated every frame until it has finished and the task table is left as is.
+        """
+        monitor = mock_get_monitor.return_value
+        monitor.wait_for_snapshot.return_value = self.snapshot
+        log_stream = MagicMock()
+        log_stream.update.side_effect = [False, False, True]
+        table_slot = MagicMock()
+
+        run_live_updates("sql_engine", self.snapshot, table_slot, MagicMock(), [log_stream], TaskTableQuery(), 0,
+                         frame_interval=0.25)
+
+        self.assertEqual(log_stream.update.call_count, 3)
+        monitor.wait_for_snapshot.assert_called_with(self.snapshot, 0.25)
+        monitor.get_snapshot.assert_not_called()
+        mock_render_table.assert_not_called()
+
+    @patch('tasklit.src.utils.live_updates.render_task_table')
+    @patch('tasklit.src.utils.live_updates.status_monitor.get_status_monitor')
+    def test_run_live_updates_with_auto_refresh(self,
+                                                mock_get_monitor: MagicMock,
+                                                mock_render_table: MagicMock):
+        """
+        GIVEN a page with auto-refresh
+        WHEN the status monitor publishes new task state
+        THEN check that only the task table is rendered again, once per published snapshot,
+            until Streamlit interrupts the updates.
+        """
+        monitor = mock_get_monitor.return_value
+        monitor.get_snapshot.side_effect = [self.next_snapshot, self.next_snapshot, self.next_snapshot]
+        monitor.wait_for_snapshot.side_effect = [self.next_snapshot, self.next_snapshot, StopLiveUpdates()]
+        table_slot = MagicMock()
+
+        with self.assertRaises(StopLiveUpdates):
+            run_live_updates("sql_engine", self.snapshot, table_slot, MagicMock(), [], TaskTableQuery(), 1e-9)
+
+        mock_get_monitor.assert_called_with("sql_engine")
+        mock_render_table.assert_called_once_with(table_slot, self.next_snapshot, TaskTableQuery())
+        monitor.wait_for_snapshot.assert_called_with(self.next_snapshot, 1)
+
+    @patch('tasklit.src.utils.live_updates.st.caption')
+    @patch('tasklit.src.utils.live_updates.st.table')
+    def test_render_task_table(self,
+                               mock_st_table: MagicMock,
+                               mock_st_caption: MagicMock):
+        """
+        GIVEN a snapshot with more tasks than fit on a page
+        WHEN the task table is rendered
+        THEN check that only the selected page is rendered, without hidden columns, along with its position.
+        """
+        snapshot = TaskSnapshot(
+            pd.DataFrame({"task_id": [1, 2, 3], "process created": [None] * 3, "running": [True, False, True]}),
+            datetime(2021, 1, 1, 12)
+        )
+
+        render_task_table(MagicMock(), snapshot, TaskTableQuery(page=2, page_size=2))
+
+        assert_frame_equal(mock_st_table.call_args[0][0], pd.DataFrame({"task_id": [3], "running": [True]}, index=[2]))
+        mock_st_caption.assert_called_with("Showing tasks 3-3 of 3, page 2 of 2.")
@@ -0,0 +1,125 @@
+import os
+import tempfile
+import unittest
+
+from unittest.mock import (
+    call,
+    patch,
+    MagicMock
+)
+
+from tasklit.src.utils.log_stream import (
+    LogTail,
+    stream_log_file
+)
+
+
+class LogStreamTestCase(unittest.TestCase):
+    """
+    Unittests for live log streaming utilities.
+    """
+
+    def setUp(self) -> None:
+        """
+        log_dir: tempfile.TemporaryDirectory
+            Temporary directory holding the sample log file.
+        log_filename: str
+            Sample log filename.
+        """
+        self.log_dir = tempfile.TemporaryDirectory()
+        self.log_filename = os.path.join(self.log_dir.name, "sample_stdout.txt")
+
+    def tearDown(self) -> None:
+        self.log_dir.cleanup()
+
+    def write_log(self, text: str, mode: str = "a") -> None:
+        with open(self.log_filename, mode, encoding="utf-8") as file:
+            file.write(text)
+
+    def test_log_tail_missing_file(self):
+        """
+        GIVEN a path to a log file that has not been created yet
+        WHEN new output is requested from 'LogTail'
+        THEN check that an empty string is returned.
+        """
+        tail = LogTail(self.log_filename)
+
+        self.assertEqual(tail.read_new(), "")
+
+    def test_log_tail_returns_appended_lines_only(self):
+        """
+        GIVEN a log file that is being appended to
+        WHEN new output is requested from 'LogTail' multiple times
+        THEN check that only complete lines appended since the previous read are returned.
+        """
+        tail = LogTail(self.log_filename)
+        self.write_log("first line\nsecond ")
+
+        self.assertEqual(tail.read_new(), "first line\n")
+
+        self.write_log("line\nthird")
+
+        self.assertEqual(tail.read_new(), "second line\n")
+        self.assertEqual(tail.read_new(), "")
+        self.assertEqual(tail.read_new(flush=True), "third")
+
+        tail.close()
+
+    def test_log_tail_truncated_file(self):
+        """
+        GIVEN a log file that is re-created by a new job run
+        WHEN new output is requested from 'LogTail'
+        THEN check that reading starts over from the beginning of the file.
+        """
+        tail = LogTail(self.log_filename)
+        self.write_log("old output of a previous run\n")
+        tail.read_new()
+
+        self.write_log("new run\n", mode="w")
+
+        self.assertEqual(tail.read_new(), "new run\n")
+
+        tail.close()
+
+    def test_log_tail_backlog(self):
+        """
+        GIVEN a log file with existing output and a backlog size
+        WHEN new output is requested from 'LogTail'
+        THEN check that only the end of the existing output is returned.
+        """
+        self.write_log("a" * 100 + "\nlast line\n")
+        tail = LogTail(self.log_filename, backlog_bytes=10)
+
+        self.assertEqual(tail.read_new(), "last line\n")
+
+        tail.close()
+
+    @patch('tasklit.src.utils.log_stream.time.sleep')
+    def test_stream_log_file(self,
+                             mock_sleep: MagicMock):
+        """
+        GIVEN a log file written by a process that finishes after a few frames
+        WHEN passed to the 'stream_log_file' function
+        THEN check that every frame only renders the newly appended output.
+        """
+        container = MagicMock()
+        output = container.container.return_value
+        frames = iter([
+            ("line 1\n", False),
+            ("", False),
+            ("line 2\nline 3", True),
+        ])
+
+        def is_finished():
+            text, finished = next(frames)
+            self.write_log(text)
+            return finished
+
+        stream_log_file(self.log_filename, is_finished, container, frame_interval=0)
+
+        output.text.assert_has_calls([
+            call("line 1"),
+            call("line 2\nline 3"),
+        ])
+        self.assertEqual(output.text.call_count, 2)
+        self.assertEqual(mock_sleep.call_count, 2)
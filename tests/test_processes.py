@@ -0,0 +1,275 @@
+import os
+import pickle
+import subprocess
+import time
+import unittest
+
+from datetime import datetime, timedelta
+from unittest.mock import (
+    create_autospec,
+    patch,
+    MagicMock
+)
+
+import psutil
+
+import tasklit
+
+from tasklit.src.utils.processes import (
+    get_running_processes,
+    get_task_process,
+    is_process_running,
+    is_running_in_snapshot,
+    stop_process_tree,
+    start_scheduler_process,
+    terminate_child_processes,
+    terminate_process
+)
+from tasklit.src.utils.tasks import Schedule, Task
+
+
+class ProcessesTestCase(unittest.TestCase):
+    """
+    Unittests for controlling the scheduler processes of tasks.
+    """
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        """
+        test_process_id: str
+            Sample process id.
+        """
+        super(ProcessesTestCase, cls).setUpClass()
+        cls.test_process_id = 12345
+
+    @patch('psutil.wait_procs')
+    def test_terminate_child_processes_processes_found(self,
+                                                       mock_wait_procs: MagicMock):
+        """
+        GIVEN a parent process object that has spawned child processes
+        WHEN passed to the 'terminate_child_processes' function
+        THEN check that related process termination methods are called.
+        """
+        parent_process = MagicMock()
+        parent_process.children.return_value = [
+            MagicMock(
+                name="Child Proc 1",
+                terminate=lambda: True
+            ),
+            MagicMock(
+                name="Child Proc 2",
+                terminate=lambda: True
+            )
+        ]
+        mock_wait_procs.return_value = ([], [
+            MagicMock(return_value=lambda: True),
+            MagicMock(return_value=lambda: True)
+        ])
+
+        # Check that process.terminate() is being called on child processes
+        for child_process in parent_process.children.return_value:
+            mock_terminate = create_autospec(child_process.teminate, return_value=True)
+
+            terminate_child_processes(parent_process)
+
+            mock_wait_procs.assert_called()
+            mock_terminate.assert_called()
+
+        # Check that process.terminate() is being called on any child processes
+        # that might have been left alive.
+        for alive_process in mock_wait_procs.return_value[1]:
+            mock_terminate = create_autospec(alive_process.terminate, return_value=True)
+
+            terminate_child_processes(parent_process)
+
+            mock_wait_procs.assert_called()
+            mock_terminate.assert_called()
+
+    @patch('psutil.wait_procs')
+    def test_terminate_child_processes_processes_not_found(self,
+                                                           mock_wait_procs: MagicMock):
+        """
+        GIVEN a parent process object that has NOT spawned child processes
+        WHEN passed to the 'terminate_child_processes' function
+        THEN check that related process termination methods are NOT called.
+        """
+        parent_process = MagicMock()
+        parent_process.children.return_value = []
+        mock_wait_procs.return_value = ([], [])
+
+        # Check that process.terminate() is not called
+        for child_process in parent_process.children.return_value:
+            mock_terminate = create_autospec(child_process.teminate, return_value=True)
+
+            terminate_child_processes(parent_process)
+
+            mock_wait_procs.assert_not_called()
+            mock_terminate.assert_not_called()
+
+        # Check that process.terminate() is not called
+        for alive_process in mock_wait_procs.return_value[1]:
+            mock_terminate = create_autospec(alive_process.terminate, return_value=True)
+
+            terminate_child_processes(parent_process)
+
+            mock_wait_procs.assert_not_called()
+            mock_terminate.assert_not_called()
+
+    @patch.dict('tasklit.src.utils.processes._process_handles', clear=True)
+    @patch('tasklit.src.utils.processes.terminate_child_processes')
+    def test_terminate_process_with_child_processes(self,
+                                                    mock_terminate_child_procs: MagicMock):
+        """
+        GIVEN an ID of an existing process
+        WHEN passed to the 'terminate_process' function
+        THEN check that related process termination methods have been called.
+        """
+        with patch('tasklit.src.utils.processes.psutil.Process') as mock_psutil_process:
+            mock_psutil_process.return_value = MagicMock()
+            mock_terminate_child_procs.return_value = True
+            mock_psutil_process.terminate.return_value = lambda: True
+            mock_terminate = create_autospec(mock_psutil_process.terminate, return_value=True)
+
+            mock_psutil_process.kill.return_value = lambda: True
+            mock_kill = create_autospec(mock_psutil_process.kill, return_value=True)
+
+            terminate_process(self.test_process_id)
+
+            mock_psutil_process.return_value.suspend.assert_called_once()
+            mock_terminate_child_procs.assert_called()
+            mock_terminate.assert_called()
+            mock_kill.assert_called()
+
+    @patch.dict('tasklit.src.utils.processes._process_handles', clear=True)
+    def test_terminate_process_raises_error(self):
+        """
+        GIVEN an ID of a test process that does not exist
+        WHEN passed to the 'terminate_process' function
+        THEN check that psutil.NoSuchProcess error is raised.
+        """
+        with patch('tasklit.src.utils.processes.psutil.Process') as mock_psutil_process:
+            mock_psutil_process.side_effect = psutil.NoSuchProcess("Cannot find the process.")
+            with self.assertRaises(psutil.NoSuchProcess):
+                terminate_process(self.test_process_id)
+
+    @patch.dict('tasklit.src.utils.processes._process_handles', clear=True)
+    @patch('tasklit.src.utils.processes.psutil.Process')
+    def test_get_task_process_reused_process_id(self,
+                                                mock_psutil_process: MagicMock):
+        """
+        GIVEN the ID of a task process that now belongs to a process created at another time
+        WHEN passed to the 'get_task_process' function
+        THEN check that no process is returned, unless the task has no creation time.
+        """
+        mock_psutil_process.return_value.create_time.return_value = 1609459200.0
+
+        self.assertIsNone(get_task_process(self.test_process_id, 1609459100.0))
+        self.assertIs(get_task_process(self.test_process_id, 1609459200.5), mock_psutil_process.return_value)
+        self.assertIs(get_task_process(self.test_process_id), mock_psutil_process.return_value)
+
+    @patch.dict('tasklit.src.utils.processes._process_handles', clear=True)
+    @patch('tasklit.src.utils.processes.psutil.Process')
+    def test_get_task_process_reuses_handle(self,
+                                            mock_psutil_process: MagicMock):
+        """
+        GIVEN the ID and creation time of a task process
+        WHEN passed to the 'get_task_process' function repeatedly
+        THEN check that the validated process handle is reused until the process is gone.
+        """
+        mock_psutil_process.return_value.create_time.return_value = 1609459200.0
+
+        process = get_task_process(self.test_process_id, 1609459200.0)
+        self.assertIs(get_task_process(self.test_process_id, 1609459200.0), process)
+        mock_psutil_process.assert_called_once_with(self.test_process_id)
+
+        process.is_running.return_value = False
+        self.assertIsNone(get_task_process(self.test_process_id, 1609459200.0))
+
+    @patch.dict('tasklit.src.utils.processes._process_handles', clear=True)
+    @patch('tasklit.src.utils.processes.psutil.Process')
+    def test_is_process_running(self,
+                                mock_psutil_process: MagicMock):
+        """
+        GIVEN processes that are sleeping, have exited or do not exist
+        WHEN passed to the 'is_process_running' function
+        THEN check that only processes which have not exited are identified as running.
+        """
+        mock_psutil_process.return_value.status.return_value = psutil.STATUS_SLEEPING
+        self.assertTrue(is_process_running(1))
+
+        mock_psutil_process.return_value.status.return_value = psutil.STATUS_ZOMBIE
+        self.assertFalse(is_process_running(1))
+
+        mock_psutil_process.side_effect = psutil.NoSuchProcess(2)
+        self.assertFalse(is_process_running(2))
+
+    @patch('tasklit.src.utils.processes.Popen')
+    def test_start_scheduler_process(self,
+                                     mock_popen: MagicMock):
+        """
+        GIVEN a task
+        WHEN passed to the 'start_scheduler_process' function
+        THEN check that the scheduler entry module is started with the pickled task on stdin
+            and the process ID is returned and set on the task.
+        """
+        mock_popen.return_value.pid = 123
+        task = Task("test", "test", Schedule.create(datetime(2020, 1, 1), timedelta(days=1), None, "Daily", "Now"))
+
+        self.assertEqual(start_scheduler_process(task), 123)
+        self.assertEqual(task.pid, 123)
+
+        args, kwargs = mock_popen.call_args
+        self.assertEqual(args[0][1:], ["-m", "tasklit.src.utils.scheduler"])
+        self.assertIn(os.path.dirname(os.path.dirname(os.path.abspath(tasklit.__file__))),
+                      kwargs["env"]["PYTHONPATH"].split(os.pathsep))
+        sent_task = pickle.loads(mock_popen.return_value.stdin.write.call_args[0][0])
+        self.assertEqual((sent_task.command, sent_task.schedule), (task.command, task.schedule))
+
+    @patch('tasklit.src.utils.processes.psutil.process_iter')
+    def test_get_running_processes(self,
+                                   mock_process_iter: MagicMock):
+        """
+        GIVEN a sleeping and an exited process
+        WHEN a snapshot is taken with the 'get_running_processes' function
+        THEN check that only the process which has not exited is part of it, with its creation time,
+            and that processes are checked against it by ID and creation time.
+        """
+        mock_process_iter.return_value = [
+            MagicMock(info={"pid": 1, "status": psutil.STATUS_SLEEPING, "create_time": 1609459200.0}),
+            MagicMock(info={"pid": 2, "status": psutil.STATUS_ZOMBIE, "create_time": 1609459200.0}),
+        ]
+
+        running_processes = get_running_processes()
+
+        self.assertEqual(running_processes, {1: 1609459200.0})
+        self.assertTrue(is_running_in_snapshot(running_processes, 1))
+        self.assertTrue(is_running_in_snapshot(running_processes, 1, 1609459200.5))
+        self.assertFalse(is_running_in_snapshot(running_processes, 1, 1609459300.0))
+        self.assertFalse(is_running_in_snapshot(running_processes, 2))
+
+    @unittest.skipIf(os.name == "nt", "POSIX shell needed")
+    def test_stop_process_tree_kills_processes_ignoring_sigterm(self):
+        """
+        GIVEN a process that ignores SIGTERM and runs a child process
+        WHEN passed to the 'stop_process_tree' function
+        THEN check that both processes are killed once the timeout has passed and the stop is reported as successful.
+        """
+        process = subprocess.Popen(["sh", "-c", "trap '' TERM; sleep 30 & wait"])
+        # Give the shell time to install the trap and start its child.
+        time.sleep(0.2)
+        child = psutil.Process(process.pid).children()[0]
+
+        self.assertTrue(stop_process_tree(process.pid, 0.2))
+
+        # The shell is reaped while waiting for it to exit, its child is left to init as a zombie at most.
+        self.assertFalse(psutil.pid_exists(process.pid))
+        self.assertFalse(child.is_running() and child.status() != psutil.STATUS_ZOMBIE)
+        process.wait(1)
+
+    def test_stop_process_tree_missing_process(self):
+        """
+        GIVEN a process ID without process
+        WHEN passed to the 'stop_process_tree' function
+        THEN check that the stop is reported as successful.
+        """
+        self.assertTrue(stop_process_tree(2 ** 31 - 1, 0.2))
@@ -0,0 +1,229 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+
+from datetime import datetime, timedelta
+from unittest.mock import (
+    patch,
+    MagicMock
+)
+
+from sqlalchemy import create_engine
+
+from tasklit.src.utils.database import (
+    initialize_database,
+    insert_process
+)
+from tasklit.src.utils.file_locks import locked_file
+from tasklit.src.utils.retention import (
+    get_log_job_name,
+    trim_execution_log,
+    RetentionCollector,
+    RetentionPolicy
+)
+
+
+class RetentionTestCase(unittest.TestCase):
+    """
+    Unittests for retention garbage collection of process information, run history and logs.
+    """
+
+    def setUp(self) -> None:
+        """
+        temp_dir: tempfile.TemporaryDirectory
+            Temporary directory for the DB file and log files.
+        log_dir: str
+            Sample log folder.
+        sql_engine: sqlalchemy engine
+            Engine for a sample DB file.
+        policy: RetentionPolicy
+            Sample retention limits.
+        """
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.log_dir = os.path.join(self.temp_dir.name, "logs")
+        os.mkdir(self.log_dir)
+        self.sql_engine = create_engine(f"sqlite:///{self.temp_dir.name}/process_data.db")
+        self.policy = RetentionPolicy(max_age=timedelta(days=1), max_runs_per_task=2, max_log_bytes=1024)
+        now = datetime.now()
+        initialize_database(self.sql_engine)
+
+        for task_id, created, job_name in [
+            (1, now - timedelta(days=2), "old_strauss"),
+            (2, now - timedelta(days=2), "running_strauss"),
+            (3, now, "new_strauss"),
+        ]:
+            insert_process(
+                {
+                    "task_id": task_id,
+                    "created": created,
+                    "process id": 100 + task_id,
+                    "job name": job_name,
+                    "command": "ping 123",
+                },
+                self.sql_engine
+            )
+
+    def tearDown(self) -> None:
+        self.sql_engine.dispose()
+        self.temp_dir.cleanup()
+
+    def write_log(self, filename: str, text: str, age: timedelta = timedelta(0)) -> str:
+        path = os.path.join(self.log_dir, filename)
+
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(text)
+
+        timestamp = time.time() - age.total_seconds()
+        os.utime(path, (timestamp, timestamp))
+
+        return path
+
+    def get_task_ids(self):
+        with self.sql_engine.connect() as connection:
+            return [row[0] for row in connection.execute("SELECT task_id FROM processes ORDER BY task_id")]
+
+    def test_get_log_job_name(self):
+        """
+        GIVEN execution and stdout log filenames
+        WHEN passed to the 'get_log_job_name' function
+        THEN check that the related job name is returned.
+        """
+        self.assertEqual(get_log_job_name("nostalgic_strauss.txt"), "nostalgic_strauss")
+        self.assertEqual(get_log_job_name("nostalgic_strauss_stdout.txt"), "nostalgic_strauss")
+
+    def test_trim_execution_log(self):
+        """
+        GIVEN an execution log with more entries than should be kept
+        WHEN passed to the 'trim_execution_log' function
+        THEN check that only the latest entries are kept.
+        """
+        path = self.write_log("old_strauss.txt", "run 1\nrun 2\nrun 3\n")
+
+        self.assertEqual(trim_execution_log(path, 2), 1)
+
+        with open(path, encoding="utf-8") as file:
+            self.assertEqual(file.read(), "run 2\nrun 3\n")
+
+    def test_trim_execution_log_waits_for_writers(self):
+        """
+        GIVEN an execution log that a scheduler process is appending to
+        WHEN it is trimmed meanwhile
+        THEN check that trimming waits for the append and keeps the appended entry.
+        """
+        path = self.write_log("old_strauss.txt", "run 1\nrun 2\nrun 3\n")
+
+        with open(path, "a", encoding="utf-8") as writer, locked_file(writer):
+            trimmer = threading.Thread(target=trim_execution_log, args=(path, 2))
+            trimmer.start()
+            trimmer.join(0.2)
+            self.assertTrue(trimmer.is_alive())
+            writer.write("run 4\n")
+
+        trimmer.join()
+
+        with open(path, encoding="utf-8") as file:
+            self.assertEqual(file.read(), "run 3\nrun 4\n")
+
+    @patch('tasklit.src.utils.retention.remove_output_buffer')
+    @patch('tasklit.src.utils.retention.processes.is_process_running')
+    def test_collect_processes_keeps_queued_tasks(self,
+                                                  mock_is_running: MagicMock,
+                                                  mock_remove_buffer: MagicMock):
+        """
+        GIVEN an old task that is still queued, without scheduler process
+        WHEN the 'RetentionCollector' examines the table
+        THEN check that the queued task is kept.
+        """
+        mock_is_running.return_value = False
+        insert_process({"task_id": 4, "created": datetime.now() - timedelta(days=2), "process id": None,
+                        "job name": "queued_strauss", "command": "ping 123"}, self.sql_engine)
+
+        RetentionCollector(self.sql_engine, self.policy, self.log_dir).collect_processes()
+
+        self.assertEqual(self.get_task_ids(), [3, 4])
+        self.assertNotIn(None, [call[0][0] for call in mock_remove_buffer.call_args_list])
+
+    @patch('tasklit.src.utils.retention.remove_scheduler_socket')
+    @patch('tasklit.src.utils.retention.remove_output_buffer')
+    @patch('tasklit.src.utils.retention.processes.is_process_running')
+    def test_collect_processes_keeps_sockets_of_running_job_names(self,
+                                                                  mock_is_running: MagicMock,
+                                                                  mock_remove_buffer: MagicMock,
+                                                                  mock_remove_socket: MagicMock):
+        """
+        GIVEN a stopped task that has the same job name as a running task
+        WHEN the 'RetentionCollector' examines the table
+        THEN check that the output buffer of the stopped task is released, but the control socket of the job is kept.
+        """
+        mock_is_running.side_effect = lambda pid, create_time: pid == 102
+        insert_process({"task_id": 4, "created": datetime.now(), "process id": 104,
+                        "job name": "running_strauss", "command": "ping 123"}, self.sql_engine)
+
+        RetentionCollector(self.sql_engine, self.policy, self.log_dir).collect_processes()
+
+        mock_remove_buffer.assert_any_call(104)
+        self.assertEqual(sorted(call[0][0] for call in mock_remove_socket.call_args_list),
+                         ["new_strauss", "old_strauss"])
+
+    @patch('tasklit.src.utils.retention.remove_output_buffer')
+    @patch('tasklit.src.utils.retention.processes.is_process_running')
+    def test_collect_processes(self,
+                               mock_is_running: MagicMock,
+                               mock_remove_buffer: MagicMock):
+        """
+        GIVEN a processes table with old, running and recent tasks
+        WHEN the 'RetentionCollector' examines the table in batches
+        THEN check that only old tasks that are no longer running are deleted.
+        """
+        mock_is_running.side_effect = lambda pid, create_time: pid == 102
+        collector = RetentionCollector(self.sql_engine, self.policy, self.log_dir, batch_size=2)
+
+        self.assertEqual(collector.collect_processes(), 2)
+        self.assertEqual(self.get_task_ids(), [2, 3])
+        self.assertEqual(collector.collect_processes(), 1)
+        self.assertEqual(collector.collect_processes(), 0)
+
+        mock_remove_buffer.assert_any_call(101)
+        mock_remove_buffer.assert_any_call(103)
+        self.assertEqual(mock_remove_buffer.call_count, 2)
+
+    def test_collect_logs(self):
+        """
+        GIVEN logs of known tasks and of deleted tasks
+        WHEN the 'RetentionCollector' examines the log folder
+        THEN check that run history is trimmed and only logs of deleted tasks are removed,
+            either because they are too old or because the log folder is too large.
+        """
+        known_log = self.write_log("new_strauss.txt", "2021-01-01 00:00:00 Executed ping 123\n" * 60)
+        known_stdout = self.write_log("new_strauss_stdout.txt", "x" * 2048, age=timedelta(days=3))
+        expired_log = self.write_log("gone_strauss.txt", "run\n", age=timedelta(days=2))
+        oversized_log = self.write_log("big_strauss_stdout.txt", "x" * 2048, age=timedelta(hours=1))
+        collector = RetentionCollector(self.sql_engine, self.policy, self.log_dir)
+
+        self.assertEqual(collector.collect_logs(), 4)
+        self.assertEqual(collector.collect_logs(), 0)
+
+        self.assertTrue(os.path.exists(known_stdout))
+        self.assertFalse(os.path.exists(expired_log))
+        self.assertFalse(os.path.exists(oversized_log))
+
+        with open(known_log, encoding="utf-8") as file:
+            self.assertEqual(len(file.readlines()), 2)
+
+    @patch('tasklit.src.utils.retention.RetentionCollector.collect_logs')
+    @patch('tasklit.src.utils.retention.RetentionCollector.collect_processes')
+    def test_step_completes_pass(self,
+                                 mock_collect_processes: MagicMock,
+                                 mock_collect_logs: MagicMock):
+        """
+        GIVEN a processes table and a log folder that take a different amount of batches
+        WHEN 'RetentionCollector.step' is called repeatedly
+        THEN check that 0 is only returned once both have been fully examined.
+        """
+        mock_collect_processes.side_effect = [5, 0]
+        mock_collect_logs.side_effect = [5, 5, 5, 0]
+        collector = RetentionCollector(self.sql_engine, self.policy, self.log_dir)
+
+        self.assertEqual([collector.step() for _ in range(4)], [10, 5, 5, 0])
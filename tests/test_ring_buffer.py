@@ -0,0 +1,164 @@
+import os
+import unittest
+
+from unittest.mock import MagicMock, patch
+
+from tasklit.src.utils.ring_buffer import (
+    get_output_buffer_name,
+    read_job_output_tail,
+    remove_output_buffer,
+    OutputRingBuffer
+)
+
+
+class OutputRingBufferTestCase(unittest.TestCase):
+    """
+    Unittests for in-memory job output buffers.
+    """
+
+    def setUp(self) -> None:
+        """
+        pid: int
+            Process ID of the sample output buffer, that of the test process.
+        output_buffer: OutputRingBuffer
+            Small output buffer owned by the test.
+        """
+        self.pid = os.getpid()
+        self.output_buffer = OutputRingBuffer.create(self.pid, capacity=16)
+
+    def tearDown(self) -> None:
+        self.output_buffer.close()
+        self.output_buffer.unlink()
+
+    def test_get_output_buffer_name(self):
+        """
+        GIVEN a process ID
+        WHEN passed to the 'get_output_buffer_name' function
+        THEN check that a short shared memory name is returned, the same for the same process only.
+        """
+        name = get_output_buffer_name(self.pid)
+
+        self.assertEqual(name, get_output_buffer_name(float(self.pid)))
+        self.assertNotEqual(name, get_output_buffer_name(self.pid + 1))
+        self.assertLessEqual(len(name), 30)
+
+    def test_write_and_read(self):
+        """
+        GIVEN output that fits into the buffer
+        WHEN it is written to the buffer
+        THEN check that all of it is read back.
+        """
+        self.output_buffer.write(b"hello ")
+        self.output_buffer.write(b"world")
+
+        self.assertEqual(self.output_buffer.read(), b"hello world")
+
+    def test_write_wraps_around(self):
+        """
+        GIVEN more output than the buffer capacity
+        WHEN it is written to the buffer in chunks
+        THEN check that only the most recent bytes are kept, oldest first.
+        """
+        for chunk in (b"0123456789", b"abcdefghij", b"XYZ"):
+            self.output_buffer.write(chunk)
+
+        self.assertEqual(self.output_buffer.read(), b"789abcdefghijXYZ")
+
+    def test_write_chunk_larger_than_capacity(self):
+        """
+        GIVEN a single output chunk larger than the buffer capacity
+        WHEN it is written to the buffer
+        THEN check that the end of the chunk is kept.
+        """
+        self.output_buffer.write(b"x" * 40 + b"0123456789abcdef")
+
+        self.assertEqual(self.output_buffer.read(), b"0123456789abcdef")
+
+    def test_reset(self):
+        """
+        GIVEN a buffer with output of a previous job run
+        WHEN the buffer is reset
+        THEN check that no output is returned.
+        """
+        self.output_buffer.write(b"previous run")
+        self.output_buffer.reset()
+
+        self.assertEqual(self.output_buffer.read(), b"")
+
+    def test_read_job_output_tail(self):
+        """
+        GIVEN a job whose output buffer has wrapped around
+        WHEN passed to the 'read_job_output_tail' function
+        THEN check that the partially overwritten first line is dropped.
+        """
+        self.output_buffer.write(b"first line\nsecond\nthird\n")
+
+        self.assertEqual(read_job_output_tail(self.pid), "second\nthird\n")
+
+    def test_read_job_output_tail_missing(self):
+        """
+        GIVEN a job without an output buffer
+        WHEN passed to the 'read_job_output_tail' function
+        THEN check that None is returned.
+        """
+        self.assertEqual(read_job_output_tail(2 ** 31 - 1), None)
+
+    @patch('tasklit.src.utils.ring_buffer.resource_tracker')
+    def test_attach_untracks_buffer(self,
+                                    mock_resource_tracker: MagicMock):
+        """
+        GIVEN an existing output buffer
+        WHEN attached to with the 'OutputRingBuffer.attach' method
+        THEN check that the shared memory block is unregistered from the resource tracker by its public name.
+        """
+        output_buffer = OutputRingBuffer.attach(self.pid)
+        output_buffer.close()
+
+        mock_resource_tracker.unregister.assert_called_once_with(
+            f"/{get_output_buffer_name(self.pid)}", "shared_memory"
+        )
+
+    @patch('tasklit.src.utils.ring_buffer.resource_tracker', None)
+    def test_attach_without_resource_tracker(self):
+        """
+        GIVEN a platform without the multiprocessing resource tracker (e.g. Windows)
+        WHEN an output buffer is attached to and removed
+        THEN check that it is read and removed without untracking it.
+        """
+        pid = 2 ** 31 - 2
+        output_buffer = OutputRingBuffer.create(pid, capacity=16)
+        output_buffer.write(b"output\n")
+
+        self.assertEqual(read_job_output_tail(pid), "output\n")
+
+        output_buffer.close()
+        output_buffer.unlink()
+
+        self.assertEqual(read_job_output_tail(pid), None)
+
+    def test_unlink_removed_buffer(self):
+        """
+        GIVEN an output buffer that has been removed by another process, e.g. the retention clean-up
+        WHEN its owner removes it
+        THEN check that no error is raised and the buffer is reported as already removed.
+        """
+        self.assertTrue(remove_output_buffer(self.pid))
+        self.assertFalse(remove_output_buffer(self.pid))
+
+        self.output_buffer.close()
+        self.assertFalse(self.output_buffer.unlink())
+
+        self.output_buffer = OutputRingBuffer.create(self.pid, capacity=16)
+
+    def test_create_replaces_stale_buffer(self):
+        """
+        GIVEN the leftover output buffer of an exited scheduler process
+        WHEN a scheduler process that got the same process ID creates its output buffer
+        THEN check that it starts empty.
+        """
+        self.output_buffer.write(b"stale output\n")
+
+        output_buffer = OutputRingBuffer.create(self.pid, capacity=16)
+
+        self.assertEqual(output_buffer.read(), b"")
+        output_buffer.close()
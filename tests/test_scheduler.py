@@ -0,0 +1,788 @@
+import os
+import subprocess
+import sys
+import threading
+import unittest
+
+from datetime import date, datetime, timedelta, timezone
+from unittest.mock import (
+    mock_open,
+    patch,
+    MagicMock,
+    call
+)
+
+from tasklit.src.utils.control import ControlError
+from tasklit.src.utils.scheduler import (
+    capture_process_output,
+    execute_job,
+    get_next_cron_run,
+    launch_command_process,
+    match_duration,
+    match_weekday,
+    process_should_execute,
+    run_cron_schedule,
+    run_daily_schedule,
+    run_interval_schedule,
+    schedule_process_job,
+    write_job_execution_log,
+    SchedulerControl,
+    SchedulerStopped
+)
+from tasklit.src.utils.calendars import Calendar
+from tasklit.src.utils.cron import CronSchedule
+from tasklit.src.utils.tasks import Schedule, Task
+from tasklit.settings.consts import BASE_LOG_DIR, SCHEDULER_STOP_TIMEOUT, WEEK_DAYS
+
+if os.name == 'nt':
+    DEFAULT_TEST_COMMAND = 'ping 8.8.8.8'
+else:
+    DEFAULT_TEST_COMMAND = 'ping 8.8.8.8 -c 5'
+
+
+class SchedulerTestCase(unittest.TestCase):
+    """
+    Unittests for scheduler process functions.
+    """
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        """
+        test_log_filename: str
+            Sample log filename.
+        test_job_name: str
+            Sample job name.
+        test_command: str
+            Sample test command.
+        stdout_log_filepath: str
+            Sample filepath to the process stdout log file.
+        now_datetime: datetime
+            Sample output of datetime.now().
+        """
+        super(SchedulerTestCase, cls).setUpClass()
+        cls.test_log_filename = "sample_logfile.txt"
+        cls.test_job_name = "infallible_strauss"
+        cls.test_command = DEFAULT_TEST_COMMAND
+        HOME_DIR = os.path.join(os.path.expanduser('~'), '.tasklit')
+        cls.stdout_log_filepath = os.path.join(HOME_DIR, 'logs/infallible_strauss_stdout.txt')
+        cls.now_datetime = datetime(2021, 1, 1, 00, 00)
+
+    def test_scheduler_module_is_lightweight(self):
+        """
+        GIVEN the scheduler entry module
+        WHEN it is imported in a fresh interpreter
+        THEN check that none of the app's heavy dependencies are loaded.
+        """
+        heavy_modules = ["streamlit", "pandas", "altair", "sqlalchemy", "numpy"]
+        loaded = subprocess.run(
+            [sys.executable, "-c",
+             f"import sys, tasklit.src.utils.scheduler; print([m for m in {heavy_modules} if m in sys.modules])"],
+            stdout=subprocess.PIPE, check=True, universal_newlines=True
+        ).stdout.strip()
+
+        self.assertEqual(loaded, "[]")
+
+    def test_match_weekday_day_matched(self):
+        """
+        GIVEN a number corresponding to a day of the week and a list of select weekdays
+        WHEN passed to the 'function_should_execute' function
+        THEN check that correct decision is made to execute a function if the days are mapped.
+        """
+        with patch('tasklit.src.utils.scheduler.datetime') as mock_datetime:
+            for day_number, day in WEEK_DAYS.items():
+                mock_datetime.now.weekday.return_value = day_number
+                self.assertEqual(match_weekday(
+                    mock_datetime.now,
+                    list(WEEK_DAYS.values())
+                ), True)
+
+    def test_match_weekday_no_weekdays_provided(self):
+        """
+        GIVEN only a number representing today's date
+        WHEN passed to the 'function_should_execute' function
+        THEN check that correct decision is made to execute a function.
+        """
+        with patch('tasklit.src.utils.scheduler.datetime') as mock_datetime:
+            self.assertEqual(
+                match_weekday(
+                    mock_datetime.now,
+                    []
+                ), True)
+
+    def test_match_weekday_no_execution(self):
+        """
+        GIVEN a number corresponding to a day of the week and a list of select weekdays
+        WHEN passed to the 'function_should_execute' function
+        THEN check that correct decision is made to NOT execute a function if the days cannot be mapped.
+        """
+        with patch('tasklit.src.utils.scheduler.datetime') as mock_datetime:
+            for day_number, day in WEEK_DAYS.items():
+                mock_datetime.now.weekday.return_value = day_number
+                self.assertEqual(
+                    match_weekday(
+                        mock_datetime.now,
+                        ["Uknown Day"]
+                    ), False)
+
+    def test_match_weekday_raises_error(self):
+        """
+        GIVEN a number corresponding to a day of the week and a list of select weekdays
+        WHEN passed to the 'function_should_execute' function
+        THEN check that an error is raised if the number is missing in the app settings day mapping.
+        """
+        with patch('tasklit.src.utils.scheduler.datetime') as mock_datetime:
+            for day_number, day in WEEK_DAYS.items():
+                mock_datetime.now.weekday.return_value = day_number
+
+                with patch('tasklit.settings.consts.WEEK_DAYS') as mocked_weekdays:
+                    mocked_weekdays.__getitem__.side_effect = KeyError("Failed to map the day.")
+
+                    with self.assertRaises(KeyError):
+                        match_weekday(
+                            mock_datetime.now,
+                            list(WEEK_DAYS.values())
+                        )
+
+    @patch('tasklit.src.utils.scheduler.Popen')
+    def test_launch_command_process(self,
+                                    mock_popen: MagicMock):
+        """
+        GIVEN a command to execute and a respective job name
+        WHEN passed to the 'run_job' function
+        THEN check that correct object type is returned.
+        """
+        mock_popen.return_value = MagicMock()
+        with patch('builtins.open', mock_open(read_data=self.test_command)) as mock_file:
+            self.assertEqual(
+                launch_command_process(self.test_command, self.test_log_filename),
+                mock_popen.return_value
+            )
+            mock_file.assert_called_with(self.test_log_filename, 'w')
+
+    @patch('tasklit.src.utils.scheduler.Popen')
+    def test_launch_command_process_raises_error(self,
+                                                 mock_popen: MagicMock):
+        """
+        GIVEN a command to execute and a respective job name
+        WHEN passed to the 'run_job' function
+        THEN check that an error is raised if log file creation fails.
+        """
+        mock_popen.side_effect = OSError("File creation failed.")
+        with patch('builtins.open', mock_open(read_data=self.test_command)):
+            with self.assertRaises(OSError):
+                launch_command_process(self.test_command, self.test_log_filename)
+
+    @patch('tasklit.src.utils.scheduler.locked_file')
+    @patch('tasklit.src.utils.scheduler.os.utime')
+    def test_write_job_execution_log(self,
+                                     mock_utime: MagicMock,
+                                     mock_locked_file: MagicMock):
+        """
+        GIVEN job info that should be logged (e.g. job name, command, etc.)
+        WHEN passed to the 'write_job_execution_log' function
+        THEN check that correct log file information is logged and the log folder is marked as changed.
+        """
+        with patch('tasklit.src.utils.scheduler.datetime') as mock_datetime:
+            mock_datetime.now.strftime.return_value = '2021-01-01 00:00:00'
+
+            with patch('builtins.open', mock_open()) as mock_file:
+                write_job_execution_log(
+                    self.test_job_name,
+                    self.test_command,
+                    mock_datetime.now,
+                    "Executed"
+                )
+
+                mock_file.return_value.write.assert_has_calls([
+                    # 1 call for '*.txt' log write
+                    call(f'2021-01-01 00:00:00 Executed {DEFAULT_TEST_COMMAND}\n'),
+                    # 2 calls for '*_stdout.txt' log write
+                    call(f"\n{'=' * 70} \n"),
+                    call(f'2021-01-01 00:00:00 Executed {DEFAULT_TEST_COMMAND}\n')
+                ])
+
+                mock_file.assert_called_with(self.stdout_log_filepath, 'a')
+                mock_utime.assert_called_once_with(BASE_LOG_DIR)
+
+    def test_write_job_execution_log_raises_error(self):
+        """
+        GIVEN job info that should be logged (e.g. job name, command, etc.)
+        WHEN passed to the 'write_job_execution_log' function
+        THEN check that an error is raised if the log file cannot be accessed.
+        """
+        with patch('tasklit.src.utils.scheduler.datetime') as mock_datetime:
+            mock_datetime.now.strftime.return_value = '2021-01-01 00:00:00'
+
+            with patch('builtins.open', mock_open()) as mock_file:
+                mock_file.side_effect = OSError
+
+                with self.assertRaises(OSError):
+                    write_job_execution_log(
+                        self.test_job_name,
+                        self.test_command,
+                        mock_datetime.now,
+                        "Executed"
+                    )
+
+    @patch('tasklit.src.utils.scheduler.match_duration')
+    @patch('tasklit.src.utils.scheduler.match_weekday')
+    def test_process_should_execute(self,
+                                    mock_match_weekday: MagicMock,
+                                    mock_match_duration: MagicMock):
+        """
+        GIVEN current daytime information
+        WHEN passed to the 'test_process_should_execute' function
+        THEN check that a decision is made to execute the process if both checks pass.
+        """
+        mock_match_weekday.return_value = True
+        mock_match_duration.return_value = True
+
+        self.assertEqual(process_should_execute(
+            datetime.now(),
+            datetime.now(),
+            timedelta(1),
+            []
+        ),
+            True
+        )
+
+    @patch('tasklit.src.utils.scheduler.match_duration')
+    @patch('tasklit.src.utils.scheduler.match_weekday')
+    def test_process_should_not_execute(self,
+                                        mock_match_weekday: MagicMock,
+                                        mock_match_duration: MagicMock):
+        """
+        GIVEN current daytime information
+        WHEN passed to the 'test_process_should_execute' function
+        THEN check that a decision is made to NOT execute the process if
+            at least one of the checks fails.
+        """
+        mock_match_weekday.return_value = True
+        mock_match_duration.return_value = False
+
+        self.assertEqual(process_should_execute(
+            datetime.now(),
+            datetime.now(),
+            timedelta(1),
+            []
+        ),
+            False
+        )
+
+    def test_match_duration_unmatched(self):
+        """
+        GIVEN current datetime that does not exceed scheduling parameters
+        WHEN passed to the 'match_duration' function
+        THEN check decision is made to not execute the job.
+        """
+        now = self.now_datetime
+        start = datetime(2021, 1, 2, 00, 00)
+        duration = timedelta(1)
+
+        self.assertEqual(match_duration(now, start, duration), False)
+
+    def test_match_duration_matched(self):
+        """
+        GIVEN current datetime that exceeds scheduling parameters
+        WHEN passed to the 'get_command_execution_start' function
+        THEN check decision is made to execute the job.
+        """
+        now = self.now_datetime
+        start = datetime(2020, 12, 30, 00, 00)
+        duration = timedelta(1)
+
+        self.assertEqual(match_duration(now, start, duration), True)
+
+    @patch('tasklit.src.utils.scheduler.write_job_execution_log')
+    @patch('tasklit.src.utils.scheduler.launch_command_process')
+    def test_execute_job(self,
+                         mock_launch_process: MagicMock,
+                         mock_write_log: MagicMock):
+        """
+        GIVEN parameters for executing a job
+        WHEN passed to the 'execute_job' function
+        THEN check that related job execution methods are called.
+        """
+        mock_launch_process.return_value.wait.return_value = True
+
+        execute_job(
+            self.test_command,
+            self.stdout_log_filepath,
+            self.test_job_name,
+            self.now_datetime,
+        )
+
+        mock_launch_process.assert_called_with(
+            self.test_command,
+            self.stdout_log_filepath
+        )
+        mock_launch_process.return_value.wait.assert_called()
+        mock_write_log.assert_called_with(
+            self.test_job_name,
+            self.test_command,
+            self.now_datetime,
+            'Executed'
+        )
+
+    @patch('tasklit.src.utils.scheduler.write_job_execution_log')
+    @patch('tasklit.src.utils.scheduler.capture_process_output')
+    @patch('tasklit.src.utils.scheduler.Popen')
+    def test_execute_job_output_buffer(self,
+                                       mock_popen: MagicMock,
+                                       mock_capture_output: MagicMock,
+                                       mock_write_log: MagicMock):
+        """
+        GIVEN parameters for executing a job and an in-memory output buffer
+        WHEN passed to the 'execute_job' function
+        THEN check that piped process output is captured into the log file and the buffer.
+        """
+        output_buffer = MagicMock()
+
+        execute_job(
+            self.test_command,
+            self.stdout_log_filepath,
+            self.test_job_name,
+            self.now_datetime,
+            output_buffer
+        )
+
+        mock_capture_output.assert_called_with(
+            mock_popen.return_value,
+            self.stdout_log_filepath,
+            output_buffer
+        )
+        mock_popen.return_value.wait.assert_called()
+        mock_write_log.assert_called()
+
+    def test_capture_process_output(self):
+        """
+        GIVEN a process with piped output and an in-memory output buffer
+        WHEN passed to the 'capture_process_output' function
+        THEN check that every output chunk is written to both the log file and the buffer.
+        """
+        process = MagicMock()
+        process.stdout.read1.side_effect = [b"line 1\n", b"line 2\n", b""]
+        output_buffer = MagicMock()
+
+        with patch('builtins.open', mock_open()) as mock_file:
+            capture_process_output(process, self.stdout_log_filepath, output_buffer)
+
+            mock_file.assert_called_with(self.stdout_log_filepath, 'wb')
+            mock_file.return_value.write.assert_has_calls([call(b"line 1\n"), call(b"line 2\n")])
+
+        output_buffer.reset.assert_called()
+        output_buffer.write.assert_has_calls([call(b"line 1\n"), call(b"line 2\n")])
+
+    @patch('tasklit.src.utils.scheduler.SchedulerControl')
+    @patch('tasklit.src.utils.scheduler.ControlServer')
+    @patch('tasklit.src.utils.scheduler.OutputRingBuffer')
+    @patch('tasklit.src.utils.scheduler.time.sleep')
+    @patch('tasklit.src.utils.scheduler.process_should_execute')
+    @patch('tasklit.src.utils.scheduler.execute_job')
+    def test_schedule_process_job_once(self,
+                                       mock_execute: MagicMock,
+                                       mock_should_execute: MagicMock,
+                                       mock_sleep: MagicMock,
+                                       mock_output_buffer: MagicMock,
+                                       mock_control_server: MagicMock,
+                                       mock_scheduler_control: MagicMock):
+        """
+        GIVEN parameters for launching a scheduler process
+        WHEN passed to the 'schedule_process_job' function
+        THEN check that the function correctly decides on whether
+            to execute the job once or multiple times.
+        """
+        execution_frequency = "Once"
+        execution_type = ""
+
+        with patch('tasklit.src.utils.scheduler.datetime') as mock_datetime:
+            mock_datetime.now.return_value = self.now_datetime
+
+            schedule_process_job(Task(
+                self.test_command,
+                self.test_job_name,
+                Schedule.create(self.now_datetime, timedelta(days=1), None, execution_frequency, execution_type)
+            ))
+
+            mock_execute.assert_called_with(
+                self.test_command,
+                self.stdout_log_filepath,
+                self.test_job_name,
+                self.now_datetime,
+                mock_output_buffer.create.return_value,
+                mock_scheduler_control.return_value
+            )
+            mock_should_execute.assert_not_called()
+            mock_sleep.assert_not_called()
+            mock_output_buffer.create.return_value.unlink.assert_called()
+            mock_control_server.return_value.close.assert_called()
+
+    @patch('tasklit.src.utils.scheduler.SchedulerControl')
+    @patch('tasklit.src.utils.scheduler.ControlServer')
+    @patch('tasklit.src.utils.scheduler.run_daily_schedule')
+    @patch('tasklit.src.utils.scheduler.OutputRingBuffer')
+    def test_schedule_process_job_daily(self,
+                                        mock_output_buffer: MagicMock,
+                                        mock_run_daily: MagicMock,
+                                        mock_control_server: MagicMock,
+                                        mock_scheduler_control: MagicMock):
+        """
+        GIVEN parameters for launching a scheduler process with daily frequency, starting now
+        WHEN passed to the 'schedule_process_job' function
+        THEN check that the job is first executed at the start date, in the given timezone.
+        """
+        schedule_process_job(Task(
+            self.test_command,
+            self.test_job_name,
+            Schedule.create(self.now_datetime, timedelta(days=1), ["Mon"], "Daily", "Now", None, "Europe/Berlin")
+        ))
+
+        mock_run_daily.assert_called_with(
+            self.test_command,
+            self.stdout_log_filepath,
+            self.test_job_name,
+            self.now_datetime,
+            ("Mon",),
+            mock_output_buffer.create.return_value,
+            "Europe/Berlin",
+            None,
+            mock_scheduler_control.return_value
+        )
+
+    @patch('tasklit.src.utils.scheduler.time.sleep')
+    @patch('tasklit.src.utils.scheduler.execute_job')
+    def test_run_daily_schedule(self,
+                                mock_execute: MagicMock,
+                                mock_sleep: MagicMock):
+        """
+        GIVEN a daily schedule at 02:30 in a timezone that skips 02:00 - 03:00 on the next day
+        WHEN passed to the 'run_daily_schedule' function
+        THEN check that the job runs at 02:30 local time and right after the DST gap on the next day.
+        """
+        mock_execute.side_effect = [None, InterruptedError]
+
+        with patch('tasklit.src.utils.scheduler.datetime') as mock_datetime:
+            mock_datetime.now.side_effect = [
+                datetime(2021, 3, 27, 1, 0, tzinfo=timezone.utc),
+                datetime(2021, 3, 27, 1, 30, tzinfo=timezone.utc),
+                datetime(2021, 3, 27, 1, 31, tzinfo=timezone.utc),
+                datetime(2021, 3, 27, 1, 31, tzinfo=timezone.utc),
+                datetime(2021, 3, 28, 1, 30, tzinfo=timezone.utc),
+            ]
+
+            with self.assertRaises(InterruptedError):
+                run_daily_schedule(
+                    self.test_command,
+                    self.stdout_log_filepath,
+                    self.test_job_name,
+                    datetime(2021, 3, 27, 2, 30),
+                    None,
+                    MagicMock(),
+                    "Europe/Berlin"
+                )
+
+        mock_sleep.assert_called_once_with(1)
+        self.assertEqual(
+            [call[0][3] for call in mock_execute.call_args_list],
+            [datetime(2021, 3, 27, 1, 30, tzinfo=timezone.utc), datetime(2021, 3, 28, 1, 30, tzinfo=timezone.utc)]
+        )
+
+    @patch('tasklit.src.utils.scheduler.time.sleep')
+    @patch('tasklit.src.utils.scheduler.execute_job')
+    def test_run_cron_schedule(self,
+                               mock_execute: MagicMock,
+                               mock_sleep: MagicMock):
+        """
+        GIVEN a cron expression firing every minute
+        WHEN passed to the 'run_cron_schedule' function
+        THEN check that the job is executed at every fire time after the start,
+            waiting in between.
+        """
+        mock_execute.side_effect = [None, InterruptedError]
+        output_buffer = MagicMock()
+
+        with patch('tasklit.src.utils.scheduler.datetime') as mock_datetime:
+            mock_datetime.now.side_effect = [
+                datetime(2021, 1, 1, 0, 0, 30, tzinfo=timezone.utc),
+                datetime(2021, 1, 1, 0, 0, 40, tzinfo=timezone.utc),
+                datetime(2021, 1, 1, 0, 1, 0, tzinfo=timezone.utc),
+                datetime(2021, 1, 1, 0, 1, 5, tzinfo=timezone.utc),
+                datetime(2021, 1, 1, 0, 2, 1, tzinfo=timezone.utc),
+            ]
+
+            with self.assertRaises(InterruptedError):
+                run_cron_schedule(
+                    self.test_command,
+                    self.stdout_log_filepath,
+                    self.test_job_name,
+                    datetime(2021, 1, 1, 0, 0, 30),
+                    "* * * * *",
+                    output_buffer,
+                    "UTC"
+                )
+
+        mock_sleep.assert_called_once_with(1)
+        self.assertEqual(
+            [call[0][3] for call in mock_execute.call_args_list],
+            [datetime(2021, 1, 1, 0, 1, 0, tzinfo=timezone.utc), datetime(2021, 1, 1, 0, 2, 1, tzinfo=timezone.utc)]
+        )
+
+    @patch('tasklit.src.utils.scheduler.time.monotonic')
+    @patch('tasklit.src.utils.scheduler.time.sleep')
+    @patch('tasklit.src.utils.scheduler.execute_job')
+    def test_run_interval_schedule(self,
+                                   mock_execute: MagicMock,
+                                   mock_sleep: MagicMock,
+                                   mock_monotonic: MagicMock):
+        """
+        GIVEN a half second interval starting in 2 seconds
+        WHEN passed to the 'run_interval_schedule' function
+        THEN check that runs are timed with the monotonic clock and runs missed
+            during a long execution are skipped without leaving the interval grid.
+        """
+        mock_execute.side_effect = [None, None, InterruptedError]
+        mock_monotonic.side_effect = [100.0, 100.5, 102.0, 102.1, 102.5, 104.2, 104.5]
+
+        with patch('tasklit.src.utils.scheduler.datetime') as mock_datetime:
+            mock_datetime.now.return_value = self.now_datetime.replace(tzinfo=timezone.utc)
+
+            with self.assertRaises(InterruptedError):
+                run_interval_schedule(
+                    self.test_command,
+                    self.stdout_log_filepath,
+                    self.test_job_name,
+                    self.now_datetime + timedelta(seconds=2),
+                    timedelta(milliseconds=500),
+                    MagicMock(),
+                    "UTC"
+                )
+
+        mock_sleep.assert_called_once_with(1.5)
+        self.assertEqual(mock_execute.call_count, 3)
+
+    @patch('tasklit.src.utils.scheduler.calendars.get_calendar')
+    @patch('tasklit.src.utils.scheduler.time.monotonic')
+    @patch('tasklit.src.utils.scheduler.time.sleep')
+    @patch('tasklit.src.utils.scheduler.execute_job')
+    def test_run_interval_schedule_calendar(self,
+                                            mock_execute: MagicMock,
+                                            mock_sleep: MagicMock,
+                                            mock_monotonic: MagicMock,
+                                            mock_get_calendar: MagicMock):
+        """
+        GIVEN a 10 second interval and a calendar blocking the next 25 seconds
+        WHEN passed to the 'run_interval_schedule' function
+        THEN check that the blocked runs are skipped at once and the schedule continues on its grid.
+        """
+        now = self.now_datetime.replace(tzinfo=timezone.utc)
+        mock_get_calendar.return_value = Calendar(
+            "maintenance", blackouts=[(self.now_datetime, self.now_datetime + timedelta(seconds=25))]
+        )
+        mock_sleep.side_effect = InterruptedError
+        mock_monotonic.side_effect = [100.0, 100.0, 101.0]
+
+        with patch('tasklit.src.utils.scheduler.datetime') as mock_datetime:
+            mock_datetime.now.return_value = now
+
+            with self.assertRaises(InterruptedError):
+                run_interval_schedule(
+                    self.test_command,
+                    self.stdout_log_filepath,
+                    self.test_job_name,
+                    self.now_datetime,
+                    timedelta(seconds=10),
+                    MagicMock(),
+                    "UTC",
+                    "maintenance"
+                )
+
+        mock_sleep.assert_called_once_with(29.0)
+        mock_execute.assert_not_called()
+
+    def test_get_next_cron_run(self):
+        """
+        GIVEN a cron expression firing hourly and a calendar with a holiday and a blackout window
+        WHEN passed to the 'get_next_cron_run' function
+        THEN check that fire times within blocked periods are skipped.
+        """
+        calendar = Calendar(
+            "holidays", [date(2021, 1, 2)], [(datetime(2021, 1, 1, 10, 30), datetime(2021, 1, 1, 12))]
+        )
+        cron_schedule = CronSchedule("0 * * * *")
+
+        self.assertEqual(
+            get_next_cron_run(cron_schedule, datetime(2021, 1, 1, 9, 30, tzinfo=timezone.utc), calendar),
+            datetime(2021, 1, 1, 10, tzinfo=timezone.utc)
+        )
+        self.assertEqual(
+            get_next_cron_run(cron_schedule, datetime(2021, 1, 1, 10, 15, tzinfo=timezone.utc), calendar),
+            datetime(2021, 1, 1, 12, tzinfo=timezone.utc)
+        )
+        self.assertEqual(
+            get_next_cron_run(cron_schedule, datetime(2021, 1, 1, 23, 15, tzinfo=timezone.utc), calendar),
+            datetime(2021, 1, 3, tzinfo=timezone.utc)
+        )
+
+    @patch('tasklit.src.utils.scheduler.SchedulerControl')
+    @patch('tasklit.src.utils.scheduler.ControlServer')
+    @patch('tasklit.src.utils.scheduler.run_interval_schedule')
+    @patch('tasklit.src.utils.scheduler.OutputRingBuffer')
+    def test_schedule_process_job_interval(self,
+                                           mock_output_buffer: MagicMock,
+                                           mock_run_interval: MagicMock,
+                                           mock_control_server: MagicMock,
+                                           mock_scheduler_control: MagicMock):
+        """
+        GIVEN parameters for launching a scheduled process with interval frequency
+        WHEN passed to the 'schedule_process_job' function
+        THEN check that the first run is one interval after the start date.
+        """
+        schedule_process_job(Task(
+            self.test_command,
+            self.test_job_name,
+            Schedule.create(self.now_datetime, timedelta(seconds=10), None, "Interval", "Scheduled", None, "UTC")
+        ))
+
+        mock_run_interval.assert_called_with(
+            self.test_command,
+            self.stdout_log_filepath,
+            self.test_job_name,
+            self.now_datetime + timedelta(seconds=10),
+            timedelta(seconds=10),
+            mock_output_buffer.create.return_value,
+            "UTC",
+            None,
+            mock_scheduler_control.return_value
+        )
+
+    @patch('tasklit.src.utils.scheduler.SchedulerControl')
+    @patch('tasklit.src.utils.scheduler.ControlServer')
+    @patch('tasklit.src.utils.scheduler.run_cron_schedule')
+    @patch('tasklit.src.utils.scheduler.OutputRingBuffer')
+    def test_schedule_process_job_cron(self,
+                                       mock_output_buffer: MagicMock,
+                                       mock_run_cron: MagicMock,
+                                       mock_control_server: MagicMock,
+                                       mock_scheduler_control: MagicMock):
+        """
+        GIVEN parameters for launching a scheduler process with cron frequency
+        WHEN passed to the 'schedule_process_job' function
+        THEN check that the job is executed according to the cron expression.
+        """
+        schedule_process_job(Task(
+            self.test_command,
+            self.test_job_name,
+            Schedule.create(self.now_datetime, timedelta(days=1), None, "Cron", "Now", "*/5 * * * *", "UTC")
+        ))
+
+        mock_run_cron.assert_called_with(
+            self.test_command,
+            self.stdout_log_filepath,
+            self.test_job_name,
+            self.now_datetime,
+            "*/5 * * * *",
+            mock_output_buffer.create.return_value,
+            "UTC",
+            None,
+            mock_scheduler_control.return_value
+        )
+        mock_output_buffer.create.return_value.unlink.assert_called()
+
+    @patch('tasklit.src.utils.scheduler.stop_process_tree')
+    def test_scheduler_control(self,
+                               mock_stop_process_tree: MagicMock):
+        """
+        GIVEN the control of a scheduler process that runs a job
+        WHEN it is paused, resumed, asked to run now and to stop
+        THEN check that its state follows the requests, a requested run is taken once
+            and stopping stops the running job and ends waiting for the next run.
+        """
+        mock_stop_process_tree.return_value = True
+        scheduler_control = SchedulerControl(self.test_job_name)
+        scheduler_control.job_started(MagicMock(pid=123))
+
+        self.assertTrue(scheduler_control.handle({"command": "pause"})["paused"])
+        self.assertFalse(scheduler_control.handle({"command": "resume", "pid": os.getpid()})["paused"])
+        self.assertTrue(scheduler_control.handle({"command": "run_now"})["run_requested"])
+        self.assertTrue(scheduler_control.take_run_request())
+        self.assertFalse(scheduler_control.take_run_request())
+
+        with self.assertRaises(ControlError):
+            scheduler_control.handle({"command": "pause", "pid": os.getpid() + 1})
+        with self.assertRaises(ControlError):
+            scheduler_control.handle({"command": "restart"})
+
+        stop_timer = threading.Timer(0.05, scheduler_control.handle, [{"command": "stop"}])
+        stop_timer.start()
+
+        with self.assertRaises(SchedulerStopped):
+            scheduler_control.wait(10)
+        stop_timer.join()
+
+        mock_stop_process_tree.assert_called_once_with(123, SCHEDULER_STOP_TIMEOUT)
+        with self.assertRaises(SchedulerStopped):
+            scheduler_control.take_run_request()
+
+    @patch('tasklit.src.utils.scheduler.stop_process_tree')
+    def test_scheduler_control_job_cannot_be_stopped(self,
+                                                     mock_stop_process_tree: MagicMock):
+        """
+        GIVEN the control of a scheduler process whose running job survives being killed
+        WHEN it is asked to stop
+        THEN check that the stop is reported as failed, so that the scheduler process gets terminated,
+            and that no further runs are started.
+        """
+        mock_stop_process_tree.return_value = False
+        scheduler_control = SchedulerControl(self.test_job_name)
+        scheduler_control.job_started(MagicMock(pid=123))
+
+        with self.assertRaises(ControlError):
+            scheduler_control.handle({"command": "stop"})
+        with self.assertRaises(SchedulerStopped):
+            scheduler_control.take_run_request()
+
+    @patch('tasklit.src.utils.scheduler.stop_process_tree')
+    def test_scheduler_control_job_started_while_stopping(self,
+                                                          mock_stop_process_tree: MagicMock):
+        """
+        GIVEN the control of a scheduler process without running job
+        WHEN it is asked to stop and a job is started afterwards
+        THEN check that the stop succeeds and the late job is stopped right away.
+        """
+        scheduler_control = SchedulerControl(self.test_job_name)
+
+        self.assertFalse(scheduler_control.handle({"command": "stop"})["paused"])
+        mock_stop_process_tree.assert_not_called()
+
+        scheduler_control.job_started(MagicMock(pid=123))
+        scheduler_control.job_finished()
+
+        mock_stop_process_tree.assert_called_once_with(123, SCHEDULER_STOP_TIMEOUT)
+
+    @patch('tasklit.src.utils.scheduler.execute_job')
+    def test_run_interval_schedule_paused(self,
+                                          mock_execute: MagicMock):
+        """
+        GIVEN a paused interval schedule with a requested run
+        WHEN the schedule runs until its scheduler process is asked to stop
+        THEN check that only the requested run is executed and stopping ends the schedule.
+        """
+        scheduler_control = SchedulerControl(self.test_job_name)
+        scheduler_control.handle({"command": "pause"})
+        scheduler_control.handle({"command": "run_now"})
+        stop_timer = threading.Timer(0.2, scheduler_control.handle, [{"command": "stop"}])
+        stop_timer.start()
+
+        with self.assertRaises(SchedulerStopped):
+            run_interval_schedule(
+                self.test_command,
+                self.stdout_log_filepath,
+                self.test_job_name,
+                datetime.now(),
+                timedelta(milliseconds=10),
+                MagicMock(),
+                scheduler_control=scheduler_control
+            )
+        stop_timer.join()
+
+        self.assertEqual(mock_execute.call_count, 1)
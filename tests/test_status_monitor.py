@@ -0,0 +1,135 @@
+import threading
+import unittest
+
+from unittest.mock import (
+    patch,
+    MagicMock
+)
+
+import pandas as pd
+
+from tasklit.src.utils.status_monitor import (
+    run_status_monitor,
+    StatusMonitor
+)
+
+
+class StatusMonitorTestCase(unittest.TestCase):
+    """
+    Unittests for the status monitor shared by all app sessions.
+    """
+
+    def setUp(self) -> None:
+        """
+        test_df: pd.DataFrame
+            Sample dataframe to mimic df with process information.
+        """
+        self.test_df = pd.DataFrame({"task_id": [1], "process id": [123], "job name": ["nostalgic_strauss"]})
+
+    @patch('tasklit.src.utils.status_monitor.helper_functions.update_df_process_last_update_info')
+    @patch('tasklit.src.utils.status_monitor.helper_functions.update_process_status_info')
+    @patch('tasklit.src.utils.status_monitor.helper_functions.get_process_df')
+    def test_refresh(self,
+                     mock_get_df: MagicMock,
+                     mock_update_status: MagicMock,
+                     mock_update_last_edit: MagicMock):
+        """
+        GIVEN a status monitor
+        WHEN the task state is refreshed
+        THEN check that the processes table, process status and last update are read and published.
+        """
+        mock_get_df.return_value = self.test_df
+        monitor = StatusMonitor("sql_engine")
+
+        snapshot = monitor.refresh()
+
+        mock_get_df.assert_called_with("sql_engine")
+        mock_update_status.assert_called_with(self.test_df)
+        mock_update_last_edit.assert_called_with(self.test_df)
+        self.assertIs(snapshot.df, self.test_df)
+        self.assertIs(monitor.get_snapshot(), snapshot)
+
+    @patch('tasklit.src.utils.status_monitor.helper_functions.update_df_process_last_update_info')
+    @patch('tasklit.src.utils.status_monitor.helper_functions.update_process_status_info')
+    @patch('tasklit.src.utils.status_monitor.helper_functions.get_process_df')
+    def test_get_snapshot_until_invalidated(self,
+                                            mock_get_df: MagicMock,
+                                            mock_update_status: MagicMock,
+                                            mock_update_last_edit: MagicMock):
+        """
+        GIVEN a status monitor that has not refreshed yet
+        WHEN the snapshot is read repeatedly
+        THEN check that it is only refreshed on the spot the first time and after it has been invalidated.
+        """
+        mock_get_df.return_value = self.test_df
+        monitor = StatusMonitor("sql_engine")
+
+        monitor.get_snapshot()
+        monitor.get_snapshot()
+        self.assertEqual(mock_get_df.call_count, 1)
+
+        monitor.invalidate()
+        monitor.get_snapshot()
+        self.assertEqual(mock_get_df.call_count, 2)
+
+    @patch('tasklit.src.utils.status_monitor.helper_functions.get_process_df')
+    def test_failed_refresh(self,
+                            mock_get_df: MagicMock):
+        """
+        GIVEN a status monitor whose refresh fails
+        WHEN the snapshot is read
+        THEN check that the error is raised and the snapshot is refreshed again on the next read.
+        """
+        mock_get_df.side_effect = OSError("Database is gone.")
+        monitor = StatusMonitor("sql_engine")
+
+        with self.assertRaises(OSError):
+            monitor.get_snapshot()
+        with self.assertRaises(OSError):
+            monitor.get_snapshot()
+
+        self.assertEqual(mock_get_df.call_count, 2)
+
+    @patch('tasklit.src.utils.status_monitor.helper_functions.update_df_process_last_update_info')
+    @patch('tasklit.src.utils.status_monitor.helper_functions.update_process_status_info')
+    @patch('tasklit.src.utils.status_monitor.helper_functions.get_process_df')
+    def test_wait_for_snapshot(self,
+                               mock_get_df: MagicMock,
+                               mock_update_status: MagicMock,
+                               mock_update_last_edit: MagicMock):
+        """
+        GIVEN a snapshot that has been seen by an app session
+        WHEN the session waits for the next snapshot
+        THEN check that it gets the next snapshot once published, or the seen one after the timeout.
+        """
+        mock_get_df.return_value = self.test_df
+        monitor = StatusMonitor("sql_engine")
+        snapshot = monitor.refresh()
+
+        self.assertIs(monitor.wait_for_snapshot(snapshot, 0.01), snapshot)
+
+        refresh_thread = threading.Timer(0.05, monitor.refresh)
+        refresh_thread.start()
+        next_snapshot = monitor.wait_for_snapshot(snapshot, 5)
+        refresh_thread.join()
+
+        self.assertIsNot(next_snapshot, snapshot)
+        self.assertIs(next_snapshot, monitor.get_snapshot())
+
+    @patch('tasklit.src.utils.status_monitor.logger')
+    def test_run_status_monitor(self,
+                                mock_logger: MagicMock):
+        """
+        GIVEN a status monitor whose first refresh fails
+        WHEN the monitor loop runs
+        THEN check that the error is logged and the task state keeps being refreshed until stopped.
+        """
+        stop_event = threading.Event()
+        monitor = MagicMock()
+        monitor.refresh.side_effect = [OSError("Database is gone."), None, None]
+        monitor.wait.side_effect = lambda timeout: monitor.refresh.call_count == 3 and stop_event.set()
+
+        run_status_monitor(monitor, stop_event)
+
+        self.assertEqual(monitor.refresh.call_count, 3)
+        mock_logger.exception.assert_called_once()
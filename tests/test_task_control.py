@@ -0,0 +1,111 @@
+import os
+import tempfile
+import unittest
+
+from datetime import datetime, timedelta
+from unittest.mock import (
+    patch,
+    ANY,
+    MagicMock
+)
+
+import psutil
+
+import tasklit.src.utils.database as database
+
+from tasklit.src.utils.control import (
+    get_scheduler_socket_path,
+    send_request,
+    ControlError,
+    ControlServer
+)
+from tasklit.src.utils.scheduler import SchedulerControl, SchedulerStopped
+from tasklit.src.utils.task_control import start_task_control, TaskControl
+from tasklit.src.utils.tasks import Schedule, Task
+
+
+class TaskControlTestCase(unittest.TestCase):
+    """
+    Unittests for the control service of the scheduler daemon.
+    """
+
+    def setUp(self) -> None:
+        """
+        temp_dir: tempfile.TemporaryDirectory
+            Folder of the sample DB and control sockets.
+        sql_engine: sqlalchemy engine
+            Engine for the sample DB.
+        """
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.sql_engine = database.get_sql_engine(f"sqlite:///{self.temp_dir.name}/process_data.db")
+
+    def tearDown(self) -> None:
+        self.sql_engine.dispose()
+        self.temp_dir.cleanup()
+
+    @patch('tasklit.src.utils.task_control.task_starter.get_task_starter')
+    def test_submit_tasks(self,
+                          mock_get_starter: MagicMock):
+        """
+        GIVEN the control service of the scheduler daemon
+        WHEN tasks are submitted and invalid requests are sent
+        THEN check that submitted tasks are saved as queued, the task starter is woken up
+            and invalid requests are rejected.
+        """
+        task_control = TaskControl(self.sql_engine)
+
+        submitted = task_control.handle({"command": "submit", "tasks": [{"command": "ping 123"},
+                                                                        {"command": "ping 456"}]})
+
+        self.assertEqual(submitted["task_ids"], [1, 2])
+        mock_get_starter.return_value.wake.assert_called_once()
+        self.assertEqual(task_control.handle({"command": "state", "task_id": 2})["state"], "queued")
+        self.assertEqual([task["task_id"] for task in task_control.handle({"command": "state"})], [1, 2])
+
+        for request in [{"command": "submit", "tasks": {"command": "ping 123", "frequency": "Hourly"}},
+                        {"command": "pause"},
+                        {"command": "pause", "task_id": "1"},
+                        {"command": "pause", "task_id": 1},
+                        {"command": "state", "task_id": 3},
+                        {"command": "restart", "task_id": 1}]:
+            with self.assertRaises(ControlError):
+                task_control.handle(request)
+
+    @patch('tasklit.src.utils.scheduler.stop_process_tree')
+    def test_task_actions_over_control_sockets(self,
+                                               mock_stop_process_tree: MagicMock):
+        """
+        GIVEN a running task whose scheduler process listens on its control socket, and the daemon's control socket
+        WHEN the task is paused, run now, resumed and cancelled through the daemon
+        THEN check that every request reaches the scheduler process and the answered states follow it.
+        """
+        schedule = Schedule("Interval", datetime(2021, 1, 1), timedelta(minutes=5), timezone="UTC")
+        database.insert_tasks([Task("ping 123", "nostalgic_strauss", schedule, pid=os.getpid(),
+                                    process_created=psutil.Process().create_time())], self.sql_engine)
+        scheduler_control = SchedulerControl("nostalgic_strauss")
+        scheduler_control.job_started(MagicMock(pid=123))
+        mock_stop_process_tree.return_value = True
+        daemon_socket = os.path.join(self.temp_dir.name, "tasklit.sock")
+
+        with patch('tasklit.src.utils.control.settings.CONTROL_SOCKET_DIR', self.temp_dir.name):
+            scheduler_server = ControlServer(get_scheduler_socket_path("nostalgic_strauss"),
+                                             scheduler_control.handle).start()
+            daemon_server = start_task_control(self.sql_engine, daemon_socket)
+
+            try:
+                self.assertEqual(send_request(daemon_socket, "pause", task_id=1)["state"], "paused")
+                self.assertEqual([task["state"] for task in send_request(daemon_socket, "state")], ["paused"])
+
+                self.assertEqual(send_request(daemon_socket, "run_now", task_id=1)["state"], "paused")
+                self.assertTrue(scheduler_control.take_run_request())
+
+                self.assertEqual(send_request(daemon_socket, "resume", task_id=1)["state"], "running")
+                self.assertEqual(send_request(daemon_socket, "cancel", task_id=1),
+                                 {"task_id": 1, "removed": False})
+            finally:
+                daemon_server.close()
+                scheduler_server.close()
+
+        with self.assertRaises(SchedulerStopped):
+            scheduler_control.take_run_request()
+        mock_stop_process_tree.assert_called_once_with(123, ANY)
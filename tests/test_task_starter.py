@@ -0,0 +1,146 @@
+import threading
+import unittest
+
+from datetime import datetime, timedelta
+from unittest.mock import (
+    call,
+    patch,
+    MagicMock
+)
+
+from sqlalchemy.exc import OperationalError
+
+from tasklit.src.utils.task_starter import (
+    run_task_starter,
+    TaskStarter
+)
+from tasklit.src.utils.tasks import Schedule, Task
+
+
+class TaskStarterTestCase(unittest.TestCase):
+    """
+    Unittests for starting the scheduler processes of queued tasks.
+    """
+
+    def setUp(self) -> None:
+        """
+        test_rows: List[Dict[str, Any]]
+            Sample rows of queued tasks.
+        """
+        schedule = Schedule("Once", datetime(2021, 1, 1), timedelta(days=1), timezone="UTC")
+        self.test_rows = [
+            dict(Task(f"ping {task_id}", f"queued_strauss_{task_id}", schedule, task_id=task_id).to_record(),
+                 task_id=task_id, **{"process id": None, "process created": None, "spec hash": None})
+            for task_id in (1, 2)
+        ]
+
+    @patch('tasklit.src.utils.task_starter.processes.terminate_process')
+    @patch('tasklit.src.utils.task_starter.processes.start_scheduler_process')
+    @patch('tasklit.src.utils.task_starter.database.update_task_processes')
+    @patch('tasklit.src.utils.task_starter.database.fetch_queued_processes')
+    def test_step(self,
+                  mock_fetch_queued: MagicMock,
+                  mock_update_processes: MagicMock,
+                  mock_start_process: MagicMock,
+                  mock_terminate: MagicMock):
+        """
+        GIVEN two queued tasks, one of which is cancelled while its process is started
+        WHEN the starter takes a step
+        THEN check that both processes are started and saved, and the process of the cancelled task is terminated.
+        """
+        mock_fetch_queued.return_value = self.test_rows
+        mock_update_processes.return_value = [2]
+
+        def start(task: Task) -> int:
+            task.pid, task.process_created = 100 + task.task_id, 1609459200.0
+            return task.pid
+
+        mock_start_process.side_effect = start
+
+        self.assertEqual(TaskStarter("sql_engine").step(), 2)
+
+        self.assertEqual([task.pid for task in mock_update_processes.call_args[0][0]], [101, 102])
+        mock_terminate.assert_called_once_with(102, 1609459200.0)
+
+    @patch('tasklit.src.utils.task_starter.processes.terminate_process')
+    @patch('tasklit.src.utils.task_starter.processes.start_scheduler_process')
+    @patch('tasklit.src.utils.task_starter.database.update_task_processes')
+    @patch('tasklit.src.utils.task_starter.database.fetch_queued_processes')
+    def test_step_save_fails(self,
+                             mock_fetch_queued: MagicMock,
+                             mock_update_processes: MagicMock,
+                             mock_start_process: MagicMock,
+                             mock_terminate: MagicMock):
+        """
+        GIVEN two queued tasks whose processes cannot be saved once started
+        WHEN the starter takes a step
+        THEN check that the started processes are terminated again and the error is raised.
+        """
+        mock_fetch_queued.return_value = self.test_rows
+        mock_update_processes.side_effect = OperationalError("UPDATE", {}, Exception("database is locked"))
+
+        def start(task: Task) -> int:
+            task.pid, task.process_created = 100 + task.task_id, 1609459200.0
+            return task.pid
+
+        mock_start_process.side_effect = start
+
+        with self.assertRaises(OperationalError):
+            TaskStarter("sql_engine").step()
+
+        self.assertEqual(mock_terminate.call_args_list, [call(101, 1609459200.0), call(102, 1609459200.0)])
+
+    @patch('tasklit.src.utils.task_starter.time.monotonic')
+    @patch('tasklit.src.utils.task_starter.logger')
+    @patch('tasklit.src.utils.task_starter.processes.start_scheduler_process')
+    @patch('tasklit.src.utils.task_starter.database.update_task_processes')
+    @patch('tasklit.src.utils.task_starter.database.fetch_queued_processes')
+    def test_step_start_fails(self,
+                              mock_fetch_queued: MagicMock,
+                              mock_update_processes: MagicMock,
+                              mock_start_process: MagicMock,
+                              mock_logger: MagicMock,
+                              mock_monotonic: MagicMock):
+        """
+        GIVEN two queued tasks, the first of which cannot be started
+        WHEN the starter takes steps before and after the retry delay of the failed task
+        THEN check that the task queued after it is started and saved, the failed task is logged
+            and left out until its retry delay has passed, and the delay doubles with every failure.
+        """
+        starter = TaskStarter("sql_engine")
+        mock_fetch_queued.side_effect = [self.test_rows, [], self.test_rows[:1]]
+        mock_update_processes.return_value = []
+        mock_start_process.side_effect = [OSError("Too many processes."), 102, OSError("Too many processes.")]
+        mock_monotonic.side_effect = [1000.0, 1000.0, 1001.0, 1010.0, 1010.0]
+
+        self.assertEqual(starter.step(), 1)
+        self.assertEqual([task.task_id for task in mock_update_processes.call_args[0][0]], [2])
+        self.assertEqual(starter.failed_tasks, {1: (1, 1005.0)})
+        mock_logger.exception.assert_called_once()
+
+        self.assertEqual(starter.step(), 0)
+        self.assertEqual(mock_fetch_queued.call_args[0][2], [1])
+
+        self.assertEqual(starter.step(), 0)
+        self.assertEqual(mock_fetch_queued.call_args[0][2], [])
+        self.assertEqual(starter.failed_tasks, {1: (2, 1020.0)})
+
+    @patch('tasklit.src.utils.task_starter.logger')
+    def test_run_task_starter(self,
+                              mock_logger: MagicMock):
+        """
+        GIVEN a task starter whose first step fails
+        WHEN the starter loop runs
+        THEN check that the error is logged, full batches are followed by the next step right away
+            and the starter waits once there is nothing to start, until stopped.
+        """
+        stop_event = threading.Event()
+        starter = MagicMock()
+        starter.step.side_effect = [OSError("Database is gone."), 50, 0]
+        starter.wait.side_effect = lambda timeout: starter.step.call_count == 3 and stop_event.set()
+
+        run_task_starter(starter, stop_event)
+
+        self.assertEqual(starter.step.call_count, 3)
+        self.assertEqual(starter.wait.call_count, 2)
+        mock_logger.exception.assert_called_once()
@@ -0,0 +1,79 @@
+import unittest
+
+import pandas as pd
+
+from tasklit.src.utils.task_table import (
+    get_task_page,
+    query_tasks,
+    RUNNING_TASKS,
+    STOPPED_TASKS,
+    TaskTableQuery
+)
+
+
+class TaskTableTestCase(unittest.TestCase):
+    """
+    Unittests for filtering, sorting and paging the task table.
+    """
+
+    def setUp(self) -> None:
+        """
+        test_df: pd.DataFrame
+            Sample dataframe to mimic df with process information.
+        """
+        self.test_df = pd.DataFrame(
+            {
+                "task_id": [1, 2, 3, 4],
+                "process created": [None] * 4,
+                "job name": ["nostalgic_strauss", "Backup_DB", "gifted_bach", "db_vacuum"],
+                "command": ["ping 123", "pg_dump tasks", "echo db", "vacuumdb"],
+                "last update": ["2021-01-01 12:00:00", "", "2021-01-01 11:00:00", None],
+                "running": [True, False, True, False],
+            }
+        )
+
+    def test_query_tasks_by_status(self):
+        """
+        GIVEN a df with running and stopped tasks
+        WHEN the tasks are filtered by status
+        THEN check that only the tasks with the selected status are kept.
+        """
+        self.assertEqual(list(query_tasks(self.test_df, TaskTableQuery(status=RUNNING_TASKS))["task_id"]), [1, 3])
+        self.assertEqual(list(query_tasks(self.test_df, TaskTableQuery(status=STOPPED_TASKS))["task_id"]), [2, 4])
+
+    def test_query_tasks_by_search(self):
+        """
+        GIVEN a df with process information
+        WHEN the tasks are searched
+        THEN check that tasks whose job name or command contains the text, in any case, are kept.
+        """
+        tasks = query_tasks(self.test_df, TaskTableQuery(search=" DB "))
+
+        self.assertEqual(list(tasks["task_id"]), [2, 3, 4])
+
+    def test_query_tasks_sorted(self):
+        """
+        GIVEN a df with process information, with missing values
+        WHEN the tasks are sorted
+        THEN check that they are in the requested order.
+        """
+        by_name = query_tasks(self.test_df, TaskTableQuery(sort_by="job name", descending=True))
+        by_update = query_tasks(self.test_df, TaskTableQuery(sort_by="last update"))
+
+        self.assertEqual(list(by_name["task_id"]), [1, 3, 4, 2])
+        self.assertEqual(list(by_update["task_id"])[:3], [2, 3, 1])
+
+    def test_get_task_page(self):
+        """
+        GIVEN a df with more tasks than fit on a page
+        WHEN a page is selected, also past the last page
+        THEN check that only the tasks of the page are returned, with the amount of tasks and the displayed page.
+        """
+        page_df, tasks, page = get_task_page(self.test_df, TaskTableQuery(page=2, page_size=3))
+        _, _, last_page = get_task_page(self.test_df, TaskTableQuery(page=5, page_size=3))
+        empty_df, no_tasks, first_page = get_task_page(self.test_df, TaskTableQuery(search="missing"))
+
+        self.assertEqual(list(page_df["task_id"]), [4])
+        self.assertNotIn("process created", page_df.columns)
+        self.assertEqual((tasks, page, last_page), (4, 2, 2))
+        self.assertEqual((len(empty_df), no_tasks, first_page), (0, 0, 1))
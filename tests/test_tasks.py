@@ -0,0 +1,100 @@
+import pickle
+import unittest
+
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+from tasklit.src.utils.tasks import Schedule, Task
+
+
+class TasksTestCase(unittest.TestCase):
+    """
+    Unittests for the task and schedule types.
+    """
+
+    def test_schedule_create(self):
+        """
+        GIVEN schedules that start now, are scheduled or use a cron expression
+        WHEN passed to 'Schedule.create'
+        THEN check that the first run matches when the scheduler process first executes the job.
+        """
+        start = datetime(2021, 1, 1)
+
+        self.assertEqual(
+            Schedule.create(start, timedelta(hours=1), None, "Interval", "Now", timezone_name="Europe/Berlin"),
+            Schedule("Interval", start, timedelta(hours=1), timezone="Europe/Berlin")
+        )
+        self.assertEqual(
+            Schedule.create(start, timedelta(days=1), ["Mon"], "Daily", "Scheduled", timezone_name="UTC").first_run,
+            datetime(2021, 1, 2)
+        )
+        self.assertEqual(
+            Schedule.create(start, timedelta(days=1), None, "Cron", "Scheduled", "0 * * * *").first_run,
+            start
+        )
+
+    def test_schedule_to_record(self):
+        """
+        GIVEN a daily schedule without timezone
+        WHEN converted into processes table columns
+        THEN check that the local timezone is saved and weekdays are comma separated.
+        """
+        with patch('tasklit.src.utils.tasks.timezones.get_local_timezone_name', return_value="UTC"):
+            schedule = Schedule.create(
+                datetime(2021, 1, 1), timedelta(days=1), ["Mon", "Tue"], "Daily", "Scheduled",
+                calendar_name="holidays"
+            )
+
+        self.assertEqual(
+            schedule.to_record(),
+            {
+                "frequency": "Daily",
+                "first run": datetime(2021, 1, 2),
+                "interval": 86400.0,
+                "weekdays": "Mon,Tue",
+                "cron": None,
+                "timezone": "UTC",
+                "calendar": "holidays",
+            }
+        )
+        self.assertEqual(Schedule.from_record(schedule.to_record()), schedule)
+
+    def test_task_record_round_trip(self):
+        """
+        GIVEN a saved task
+        WHEN converted into a processes table row and back
+        THEN check that the task is unchanged.
+        """
+        schedule = Schedule("Cron", datetime(2021, 1, 1), timedelta(days=1), cron="*/5 * * * *", timezone="UTC")
+        task = Task("ping 123", "sleepy_strauss", schedule, pid=123, created=datetime(2021, 1, 1), task_id=7,
+                    process_created=1609459200.0)
+        record = task.to_record()
+
+        keys = ("task_id", "created", "process id", "process created", "job name", "command", "spec hash")
+
+        self.assertEqual(
+            {key: record[key] for key in keys},
+            {
+                "task_id": 7,
+                "created": datetime(2021, 1, 1),
+                "process id": 123,
+                "process created": 1609459200.0,
+                "job name": "sleepy_strauss",
+                "command": "ping 123",
+                "spec hash": None,
+            }
+        )
+        self.assertEqual(Task.from_record(record), task)
+        self.assertNotIn("task_id", Task("ping 123", "sleepy_strauss", schedule).to_record())
+
+    def test_tasks_are_compact_and_picklable(self):
+        """
+        GIVEN a task
+        WHEN it is handed to a scheduler process
+        THEN check that it has no per-instance dict and survives pickling.
+        """
+        task = Task("ping 123", "sleepy_strauss", Schedule("Once", datetime(2021, 1, 1), timedelta(0), timezone="UTC"))
+
+        self.assertFalse(hasattr(task, "__dict__"))
+        self.assertFalse(hasattr(task.schedule, "__dict__"))
+        self.assertEqual(pickle.loads(pickle.dumps(task)), task)
@@ -0,0 +1,177 @@
+import unittest
+
+from datetime import date, datetime, timedelta, timezone
+
+from unittest.mock import patch, MagicMock
+
+import pandas as pd
+
+from tasklit.src.utils.calendars import Calendar
+from tasklit.src.utils.cron import CronSchedule
+from tasklit.src.utils.timeline import (
+    count_upcoming_runs,
+    SCHEDULE_COLUMNS,
+    get_timeline_chart,
+    get_weekday_masks
+)
+
+
+class TimelineTestCase(unittest.TestCase):
+    """
+    Unittests for the upcoming runs timeline.
+    """
+
+    def setUp(self) -> None:
+        """
+        start: datetime
+            Start of the sample time window, a Friday.
+        schedule_df: pd.DataFrame
+            Sample schedules of interval, daily, cron, one-off and legacy tasks.
+        """
+        self.start = datetime(2021, 1, 1, 10, 7, 30)
+        self.schedule_df = pd.DataFrame(
+            [
+                (1, "interval_strauss", "Interval", datetime(2021, 1, 1, 9), 600.0, None, None, "UTC", None),
+                (2, "daily_strauss", "Daily", datetime(2020, 12, 30, 12), 86400.0, "Mon,Tue", None, "UTC", None),
+                (3, "cron_strauss", "Cron", datetime(2021, 1, 1), 86400.0, None, "*/20 9-17 * * mon-fri", "UTC", None),
+                (4, "seconds_strauss", "Cron", datetime(2021, 1, 1), 86400.0, None, "*/15 * * * * *", "UTC", None),
+                (5, "once_strauss", "Once", datetime(2021, 1, 1), 86400.0, None, None, "UTC", None),
+                (6, "legacy_strauss", None, None, None, None, None, None, None),
+            ],
+            columns=SCHEDULE_COLUMNS
+        )
+
+    def test_get_weekday_masks(self):
+        """
+        GIVEN comma separated weekdays
+        WHEN passed to the 'get_weekday_masks' function
+        THEN check that bitsets with Monday as bit 0 are returned, all days if not restricted.
+        """
+        self.assertEqual(list(get_weekday_masks(pd.Series(["Mon,Wed", None, "Sun"]))), [0b101, 0b1111111, 1 << 6])
+
+    def test_count_upcoming_runs(self):
+        """
+        GIVEN schedules of different types
+        WHEN passed to the 'count_upcoming_runs' function for the next 7 days
+        THEN check that the runs per task match the fire times listed one by one.
+        """
+        end = self.start + timedelta(days=7)
+
+        runs_df = count_upcoming_runs(self.schedule_df, self.start, end, timedelta(hours=2))
+        runs = runs_df.groupby("task_id")["runs"].sum().to_dict()
+
+        self.assertEqual(runs[1], 7 * 24 * 6)
+        # Monday and Tuesday at 12:00
+        self.assertEqual(runs[2], 2)
+        self.assertEqual(
+            runs[3],
+            len(CronSchedule("*/20 9-17 * * mon-fri").fire_times(self.start, end - timedelta(seconds=1)))
+        )
+        self.assertEqual(runs[4], len(CronSchedule("*/15 * * * * *").fire_times(self.start, end)))
+        self.assertNotIn(5, runs)
+        self.assertNotIn(6, runs)
+
+    def test_count_upcoming_runs_bins(self):
+        """
+        GIVEN an interval schedule and a window starting within a bin
+        WHEN passed to the 'count_upcoming_runs' function
+        THEN check that runs before the window start are not counted and bins are aligned.
+        """
+        runs_df = count_upcoming_runs(
+            self.schedule_df.iloc[[0]], self.start, self.start + timedelta(hours=1), timedelta(minutes=15)
+        )
+
+        self.assertEqual(
+            list(runs_df["start"]),
+            [datetime(2021, 1, 1, 10, minute, tzinfo=timezone.utc) for minute in (0, 15, 30, 45)] +
+            [datetime(2021, 1, 1, 11, tzinfo=timezone.utc)]
+        )
+        # runs at 10:10, 10:20, 10:30, 10:40, 10:50 and 11:00
+        self.assertEqual(list(runs_df["runs"]), [1, 1, 2, 1, 1])
+        self.assertEqual(runs_df["end"].iloc[0], datetime(2021, 1, 1, 10, 15, tzinfo=timezone.utc))
+
+    def test_count_upcoming_runs_future_start(self):
+        """
+        GIVEN a cron schedule starting in the future
+        WHEN passed to the 'count_upcoming_runs' function
+        THEN check that only runs after its start are counted.
+        """
+        schedule_df = self.schedule_df.iloc[[2]].copy()
+        schedule_df["first run"] = datetime(2021, 1, 4, 12)
+
+        runs_df = count_upcoming_runs(schedule_df, self.start, self.start + timedelta(days=1), timedelta(hours=2))
+
+        self.assertTrue(runs_df.empty)
+
+    def test_count_upcoming_runs_timezones(self):
+        """
+        GIVEN daily, interval and cron schedules on the wall clock of New York, across the start of DST
+        WHEN passed to the 'count_upcoming_runs' function with a window in UTC
+        THEN check that runs are placed in the UTC bins of their wall clock times.
+        """
+        schedule_df = self.schedule_df.iloc[[0, 1, 2]].assign(timezone="America/New_York")
+        schedule_df["first run"] = [datetime(2021, 3, 12, 12), datetime(2021, 3, 12, 12), datetime(2021, 3, 12)]
+        schedule_df["interval"] = [86400.0 / 2, 86400.0, 86400.0]
+        schedule_df["weekdays"] = None
+        schedule_df["cron"] = [None, None, "0 12 * * *"]
+
+        runs_df = count_upcoming_runs(
+            schedule_df, datetime(2021, 3, 13), datetime(2021, 3, 15, 23), timedelta(hours=1)
+        )
+        run_hours = runs_df.groupby("task_id")["start"].apply(lambda starts: [start.hour for start in starts])
+
+        # 12:00 is 17:00 UTC before and 16:00 UTC after the clocks have been set forward on March 14th 2021.
+        self.assertEqual(run_hours[2], [17, 16, 16])
+        self.assertEqual(run_hours[3], [17, 16, 16])
+        # Interval runs keep their real time distance from the first run at 17:00 UTC.
+        self.assertEqual(run_hours[1], [5, 17, 5, 17, 5, 17])
+
+    @patch('tasklit.src.utils.timeline.calendars.get_calendar')
+    def test_count_upcoming_runs_calendar(self, mock_get_calendar: MagicMock):
+        """
+        GIVEN interval, daily and cron schedules following a calendar with a holiday and a blackout window
+        WHEN passed to the 'count_upcoming_runs' function
+        THEN check that blocked runs are left out and tasks with invalid calendars are not counted.
+        """
+        calendar = Calendar(
+            "holidays", [date(2021, 1, 4)], [(datetime(2021, 1, 5, 11, 30), datetime(2021, 1, 5, 12, 30))]
+        )
+
+        def get_calendar(name):
+            if name == "broken":
+                raise ValueError("broken.csv: Row 2: invalid date.")
+            return calendar if name else None
+
+        mock_get_calendar.side_effect = get_calendar
+        schedule_df = self.schedule_df.iloc[[0, 1, 2]].assign(calendar="holidays")
+        schedule_df["weekdays"] = None
+        broken_df = self.schedule_df.iloc[[0]].assign(task_id=7, calendar="broken")
+        end = self.start + timedelta(days=7)
+
+        runs_df = count_upcoming_runs(pd.concat([schedule_df, broken_df]), self.start, end, timedelta(hours=2))
+        runs = runs_df.groupby("task_id")["runs"].sum().to_dict()
+
+        # Six runs per hour, none on Monday and none within the one hour window on Tuesday
+        self.assertEqual(runs[1], 7 * 24 * 6 - 24 * 6 - 6)
+        # Every day at 12:00 but Monday and Tuesday
+        self.assertEqual(runs[2], 5)
+        # Every 20 minutes from 9:00 to 17:40 on weekdays but Monday and between 11:30 and 12:30 on Tuesday
+        self.assertEqual(
+            runs[3],
+            len(CronSchedule("*/20 9-17 * * mon-fri").fire_times(self.start, end - timedelta(seconds=1))) - 27 - 3
+        )
+        self.assertNotIn(7, runs)
+
+    def test_get_timeline_chart(self):
+        """
+        GIVEN upcoming runs per task and time bin
+        WHEN passed to the 'get_timeline_chart' function
+        THEN check that a chart with a task and a congestion view is returned.
+        """
+        runs_df = count_upcoming_runs(
+            self.schedule_df, self.start, self.start + timedelta(days=1), timedelta(minutes=15)
+        )
+
+        chart = get_timeline_chart(runs_df).to_dict()
+
+        self.assertEqual([view["mark"] for view in chart["vconcat"]], ["rect", "bar"])
@@ -0,0 +1,59 @@
+import os
+import unittest
+
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+from tasklit.src.utils.timezones import (
+    get_local_timezone_name,
+    get_timezone,
+    to_utc
+)
+
+
+class TimezonesTestCase(unittest.TestCase):
+    """
+    Unittests for timezone handling of schedules.
+    """
+
+    def setUp(self) -> None:
+        get_local_timezone_name.cache_clear()
+        self.addCleanup(get_local_timezone_name.cache_clear)
+
+    def test_get_timezone(self):
+        """
+        GIVEN a known and an unknown timezone name
+        WHEN passed to the 'get_timezone' function
+        THEN check that the known timezone is returned, loaded only once, and ValueError is raised otherwise.
+        """
+        self.assertEqual(str(get_timezone("Europe/Berlin")), "Europe/Berlin")
+        self.assertIs(get_timezone("Europe/Berlin"), get_timezone("Europe/Berlin"))
+
+        with self.assertRaises(ValueError):
+            get_timezone("Mars/Olympus_Mons")
+
+    def test_get_local_timezone_name(self):
+        """
+        GIVEN a known and an unknown timezone in the TZ environment variable
+        WHEN the 'get_local_timezone_name' function is called
+        THEN check that the known timezone is returned and UTC is used otherwise.
+        """
+        with patch.dict(os.environ, {"TZ": ":Asia/Tokyo"}):
+            self.assertEqual(get_local_timezone_name(), "Asia/Tokyo")
+
+        get_local_timezone_name.cache_clear()
+
+        with patch.dict(os.environ, {"TZ": "Mars/Olympus_Mons"}):
+            self.assertEqual(get_local_timezone_name(), "UTC")
+
+    def test_to_utc(self):
+        """
+        GIVEN wall clock times around the DST changes of a timezone
+        WHEN passed to the 'to_utc' function
+        THEN check that repeated times resolve to their first occurrence and skipped times move past the gap.
+        """
+        zone = get_timezone("Europe/Berlin")
+
+        self.assertEqual(to_utc(datetime(2021, 1, 1, 12), zone), datetime(2021, 1, 1, 11, tzinfo=timezone.utc))
+        self.assertEqual(to_utc(datetime(2021, 10, 31, 2, 30), zone), datetime(2021, 10, 31, 0, 30, tzinfo=timezone.utc))
+        self.assertEqual(to_utc(datetime(2021, 3, 28, 2, 30), zone), datetime(2021, 3, 28, 1, 30, tzinfo=timezone.utc))